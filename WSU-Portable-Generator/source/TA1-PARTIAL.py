@@ -21,15 +21,20 @@
 # ************************************************************************************************ #
 
 import configparser
+import contextlib
 import cProfile
 import datetime
 import copy
+import functools
 import json
 import logging
 import logging.handlers
 import optparse
+import os
 import pika
 import psycopg2
+import psycopg2.errorcodes
+import psycopg2.pool
 import pytz
 import queue
 import random
@@ -38,7 +43,7 @@ import sys
 import threading
 import time
 import uuid
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 
 from objects import rabbitmq
 from objects import objects
@@ -73,6 +78,10 @@ class LiveGeneratorThread(threading.Thread):
         self.hint_level = hint_level
         self.phase = phase
         self.done = False
+        # put() and stop() wake the connection's IO loop once it is running, the lock keeps
+        # them from doing so while the connection is being closed.
+        self._wake_lock = threading.Lock()
+        self._wakeable = False
 
         if self.domain not in objects.VALID_DOMAINS:
             raise objects.AiqDataException(value='INVALID DOMAIN!')
@@ -106,18 +115,21 @@ class LiveGeneratorThread(threading.Thread):
                                   hint_level=self.hint_level,
                                   phase=self.phase)
 
+        with self._wake_lock:
+            self._wakeable = True
+
         # Begin our loop.
         while not self.done:
             try:
                 # Try getting a message to send.
-                message = self.ta2_response_queue.get(block=True, timeout=0.2)
-                self.log.debug('message: {}'.format(str(message)))
+                message = self.ta2_response_queue.get_nowait()
+                self.log.debug('message: %s', objects.LogSummary(message))
 
                 response = None
                 try:
                     # If we have a message, we can send it to the generator.
                     response = self.amqp.send_generator_data(data_request=message)
-                    self.log.debug('response: {}'.format(str(response)))
+                    self.log.debug('response: %s', objects.LogSummary(response))
                 except objects.AiqExperimentException:
                     self.log.warning('Generator took too long to respond.')
                     response = objects.ExperimentException(
@@ -128,17 +140,36 @@ class LiveGeneratorThread(threading.Thread):
                 self.live_output_queue.put(response)
 
             except queue.Empty:
-                # If the queue was empty then let amqp do a little work before trying again.
-                self.amqp.process_data_events()
+                # If the queue was empty then wait in the IO loop, answering heartbeats, until
+                # put() or stop() wakes us.
+                self.amqp.process_data_events(time_limit=None)
 
         # Stop the connection as we exit.
+        with self._wake_lock:
+            self._wakeable = False
         self.amqp.stop()
         self.log.debug('exiting')
         return
 
+    def put(self, message: objects.AiqObject):
+        # Queue a message for the generator and wake the thread to send it, from any thread.
+        self.ta2_response_queue.put(message)
+        self._wake()
+        return
+
+    def _wake(self):
+        with self._wake_lock:
+            if self._wakeable:
+                try:
+                    self.amqp.call_later_threadsafe(function=lambda: None)
+                except pika.exceptions.AMQPError:
+                    self.log.warning('Unable to wake the generator connection.')
+        return
+
     def stop(self):
         self.log.debug('stop()')
         self.done = True
+        self._wake()
         return
 
 
@@ -207,6 +238,833 @@ class LogMessage:
         return
 
 
+class DatabasePool:
+    # The postgres connections of the TA1 and its helper threads.  connection() checks one out of
+    # a psycopg2 ThreadedConnectionPool for a single transaction, waiting at most timeout seconds
+    # for a free one, and replaces connections the server has dropped.
+    HEALTH_CHECK_SECONDS = 30.0
+
+    def __init__(self, log: logging.Logger, db_name: str, db_host: str, db_port: str,
+                 db_user: str, db_pass: str, size: int, timeout: float):
+        self.name = 'DatabasePool'
+        self.log = log.getChild(self.name)
+        self.db_name = db_name
+        self.db_host = db_host
+        self.db_port = db_port
+        self.db_user = db_user
+        self.db_pass = db_pass
+        self.size = max(1, int(size))
+        self.timeout = float(timeout)
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(self.size)
+        # [id(connection)] = time the connection was last returned to the pool.
+        self._returned = dict()
+        return
+
+    def connect(self):
+        """Creates the pool, only returns once the database accepts a connection.
+        """
+        self.log.debug('connect()')
+        while self._pool is None:
+            try:
+                self._pool = psycopg2.pool.ThreadedConnectionPool(minconn=1,
+                                                                  maxconn=self.size,
+                                                                  database=self.db_name,
+                                                                  host=self.db_host,
+                                                                  port=self.db_port,
+                                                                  user=self.db_user,
+                                                                  password=self.db_pass)
+            except psycopg2.Error as e:
+                self.log.error("Error trying to connect to the database: " + str(e.pgerror))
+                time.sleep(1)
+        return
+
+    def is_healthy(self, conn) -> bool:
+        # Connections that sat in the pool for a while are pinged, the server may have dropped
+        # them without the client knowing.  New connections have not been returned yet.
+        if conn.closed != 0:
+            return False
+        returned = self._returned.get(id(conn))
+        if returned is None or time.time() - returned < self.HEALTH_CHECK_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cr:
+                cr.execute('SELECT 1;')
+            conn.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise psycopg2.InterfaceError('No database connection became free within {} seconds.'
+                                          .format(self.timeout))
+        try:
+            conn = self._pool.getconn()
+            if not self.is_healthy(conn):
+                self.log.warning('Replacing a dropped database connection.')
+                self._returned.pop(id(conn), None)
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+        except BaseException:
+            self._slots.release()
+            raise
+        return conn
+
+    def putconn(self, conn):
+        # A connection that failed is closed instead of going back to the pool.
+        if conn.closed != 0:
+            self._returned.pop(id(conn), None)
+        else:
+            self._returned[id(conn)] = time.time()
+        self._pool.putconn(conn, close=conn.closed != 0)
+        self._slots.release()
+        return
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Checks a connection out of the pool for one transaction, committed when the block
+        exits normally and rolled back on an exception.
+
+        Raises
+        ------
+        psycopg2.InterfaceError
+            No connection became free within the timeout.
+        """
+        conn = self.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.putconn(conn)
+
+    def close(self):
+        self.log.debug('close()')
+        if self._pool is not None:
+            self._pool.closeall()
+        return
+
+
+class DatabaseWriteBehind(threading.Thread):
+    # Buffers the rows the TA1 writes every tick (data, test_instance, test_label and the episode
+    # size) and writes them with multi-row statements on a pooled connection, one transaction per
+    # batch.  The TA1 allocates the data_id and test_instance_id of the rows from the table
+    # sequences, so no tick waits on an INSERT ... RETURNING.
+    def __init__(self, log: logging.Logger, db_pool: DatabasePool, batch_rows: int):
+        threading.Thread.__init__(self, daemon=True)
+        self.name = 'DatabaseWriteBehind'
+        self.log = log.getChild(self.name)
+        self.db_pool = db_pool
+        self.batch_rows = max(1, int(batch_rows))
+        self._batch = self.new_batch()
+        self._batches = queue.Queue()
+        self._errors = list()
+        self._errors_lock = threading.Lock()
+        # [trial_episode_id][data_id] = test_instance_id for the trial episodes still running,
+        # the sessions of a TA1 interleave their ticks.
+        self._test_instance_ids = dict()
+        self.log.debug('Initialized')
+        return
+
+    @staticmethod
+    def new_batch() -> dict:
+        # test_instance rows are kept by test_instance_id so update_test_instance() can fill in
+        # the stamps of a row that has not been written yet.
+        return dict({'data': list(),
+                     'test_instance': dict(),
+                     'test_instance_update': list(),
+                     'test_label': list(),
+                     'episode_size': dict(),
+                     'rows': 0,
+                     'done': None})
+
+    def run(self):
+        self.log.debug('run()')
+        while True:
+            batch = self._batches.get()
+            if batch is None:
+                break
+            self.write_batch(batch=batch)
+            if batch['done'] is not None:
+                batch['done'].set()
+        self.log.debug('exiting')
+        return
+
+    @staticmethod
+    def batch_statements(batch: dict) -> list:
+        # The statements of a batch as (sql, rows, template), parents first so the foreign keys
+        # hold.
+        statements = list()
+        if len(batch['data']) > 0:
+            sql = ('INSERT INTO data (data_id, episode_id, feature_vector, label, data_index) '
+                   'VALUES %s;')
+            statements.append((sql, batch['data'], None))
+        if len(batch['test_instance']) > 0:
+            sql = ('INSERT INTO test_instance (test_instance_id, trial_episode_id, data_id, '
+                   'utc_stamp_sent, utc_stamp_received, utc_remote_stamp_arrived, '
+                   'utc_remote_stamp_replied) VALUES %s;')
+            statements.append((sql, list(batch['test_instance'].values()), None))
+        if len(batch['test_instance_update']) > 0:
+            sql = ('UPDATE test_instance SET utc_stamp_received=v.received, '
+                   'utc_remote_stamp_arrived=v.arrived, utc_remote_stamp_replied=v.replied '
+                   'FROM (VALUES %s) AS v (test_instance_id, received, arrived, replied) '
+                   'WHERE test_instance.test_instance_id=v.test_instance_id;')
+            statements.append((sql, batch['test_instance_update'],
+                               '(%s, %s::timestamp, %s::timestamp, %s::timestamp)'))
+        if len(batch['test_label']) > 0:
+            sql = ('INSERT INTO test_label (test_instance_id, label_prediction, performance, '
+                   'feedback) VALUES %s;')
+            statements.append((sql, batch['test_label'], None))
+        if len(batch['episode_size']) > 0:
+            sql = ('UPDATE episode SET size=v.size FROM (VALUES %s) AS v (episode_id, size) '
+                   'WHERE episode.episode_id=v.episode_id;')
+            statements.append((sql, list(batch['episode_size'].items()), None))
+        return statements
+
+    def write_batch(self, batch: dict):
+        if batch['rows'] == 0:
+            return
+        self.log.debug('write_batch(rows=%s)', batch['rows'])
+        statements = self.batch_statements(batch=batch)
+        # The whole batch is one transaction.  A dropped connection is retried once on a new
+        # one, a batch the database refuses is written again row by row.
+        for attempt in range(2):
+            try:
+                with self.db_pool.connection() as db_conn:
+                    with db_conn.cursor() as cr:
+                        for sql, rows, template in statements:
+                            execute_values(cr, sql, rows, template=template, page_size=len(rows))
+                        db_conn.commit()
+                return
+            except psycopg2.InterfaceError as e:
+                self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+                if attempt == 0:
+                    continue
+                self.add_error("Database connection unavailable, {} rows of the episode were "
+                               "not saved.".format(batch['rows']))
+            except psycopg2.DatabaseError as e:
+                self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
+                self.write_each_row(statements=statements)
+                return
+        return
+
+    def write_each_row(self, statements: list):
+        # Every row in its own transaction, parents first, so only the rows the database refuses
+        # (and the rows that reference them) are lost, as with the sync write_mode.
+        refused = 0
+        for index, (sql, rows, template) in enumerate(statements):
+            for row_index, row in enumerate(rows):
+                try:
+                    with self.db_pool.connection() as db_conn:
+                        with db_conn.cursor() as cr:
+                            execute_values(cr, sql, [row], template=template)
+                            db_conn.commit()
+                except psycopg2.InterfaceError as e:
+                    self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+                    lost = len(rows) - row_index + sum([len(later[1])
+                                                        for later in statements[index + 1:]])
+                    self.add_error("Database connection unavailable, {} rows of the episode "
+                                   "were not saved.".format(lost))
+                    return
+                except psycopg2.DatabaseError as e:
+                    self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
+                    refused += 1
+        if refused > 0:
+            self.add_error("There were errors saving {} rows of the episode.".format(refused))
+        return
+
+    def add_error(self, message: str):
+        with self._errors_lock:
+            self._errors.append(message)
+        return
+
+    def add_data(self, data_id: int, episode_id: int, feature_vector: dict, label: dict,
+                 data_index: int):
+        self._batch['data'].append((data_id, episode_id, Json(feature_vector), Json(label),
+                                    data_index))
+        self.added_row()
+        return
+
+    def set_episode_size(self, episode_id: int, size: int):
+        # Only the last size of an episode in a batch is written.
+        self._batch['episode_size'][episode_id] = size
+        return
+
+    def get_test_instance_id(self, data_id: int, trial_episode_id: int) -> int:
+        return self._test_instance_ids.get(trial_episode_id, dict()).get(data_id)
+
+    def add_test_instance(self, test_instance_id: int, data_id: int, trial_episode_id: int):
+        self._test_instance_ids.setdefault(trial_episode_id, dict())[data_id] = test_instance_id
+        self._batch['test_instance'][test_instance_id] = list([
+            test_instance_id, trial_episode_id, data_id, datetime.datetime.now(tz=pytz.utc),
+            None, None, None])
+        self.added_row()
+        return
+
+    def forget_trial_episode(self, trial_episode_id: int):
+        self._test_instance_ids.pop(trial_episode_id, None)
+        return
+
+    def update_test_instance(self, test_instance_id: int, remote_stamp_arrived: datetime.datetime,
+                             remote_stamp_delivered: datetime.datetime):
+        if test_instance_id is None:
+            return
+        stamp_received = datetime.datetime.now(tz=pytz.utc)
+        row = self._batch['test_instance'].get(test_instance_id)
+        if row is not None:
+            row[4:7] = [stamp_received, remote_stamp_arrived, remote_stamp_delivered]
+        else:
+            self._batch['test_instance_update'].append((test_instance_id, stamp_received,
+                                                        remote_stamp_arrived,
+                                                        remote_stamp_delivered))
+            self.added_row()
+        return
+
+    def add_test_label(self, test_instance_id: int, label_prediction: dict, performance: float,
+                       feedback: dict = None):
+        if test_instance_id is None:
+            return
+        if feedback is not None:
+            feedback = Json(feedback)
+        self._batch['test_label'].append((test_instance_id, Json(label_prediction), performance,
+                                          feedback))
+        self.added_row()
+        return
+
+    def added_row(self):
+        self._batch['rows'] += 1
+        if self._batch['rows'] >= self.batch_rows:
+            self.flush(wait=False)
+        return
+
+    def flush(self, wait: bool) -> list:
+        """Hands the buffered rows to the writer thread.
+
+        Parameters
+        ----------
+        wait : bool
+            Only return once every row buffered so far is written.
+
+        Returns
+        -------
+        list
+            The errors writing batches since the last flush.
+        """
+        batch = self._batch
+        self._batch = self.new_batch()
+        if wait:
+            batch['done'] = threading.Event()
+        if batch['rows'] > 0 or len(batch['episode_size']) > 0 or wait:
+            # The episode size can change without adding a row of its own.
+            batch['rows'] = max(batch['rows'], len(batch['episode_size']))
+            self._batches.put(batch)
+        if wait:
+            batch['done'].wait()
+        with self._errors_lock:
+            errors = self._errors
+            self._errors = list()
+        return errors
+
+    def stop(self):
+        self.log.debug('stop()')
+        self.flush(wait=False)
+        self._batches.put(None)
+        self.join()
+        return
+
+
+class ExperimentLogWriter(threading.Thread):
+    # Buffers the experiment_log records of the TA1 and writes them with one multi-row INSERT
+    # every flush_seconds, or sooner once flush_rows are waiting.  add() never waits: at most
+    # max_rows records are held in memory, and while the database falls that far behind the
+    # records that do not fit are appended to spill_path instead.  Once a batch is written again
+    # the spilled records are written too, also when the TA1 is restarted with the same file.
+    # A batch that fails on a dropped connection is retried and kept for the next batch.  A
+    # batch the database refuses is written row by row so only the rows it refuses are lost,
+    # and those are logged.
+    WRITE_ATTEMPTS = 3
+    RETRY_SECONDS = 0.5
+    FLUSH_TIMEOUT_SECONDS = 10.0
+    STOP_TIMEOUT_SECONDS = 60.0
+    INSERT_SQL = ('INSERT INTO experiment_log (model_experiment_id, utc_stamp, action, message, '
+                  'object, experiment_trial_id) VALUES %s;')
+
+    def __init__(self, log: logging.Logger, db_pool: DatabasePool, flush_seconds: float,
+                 flush_rows: int, max_rows: int, spill_path: str):
+        threading.Thread.__init__(self, daemon=True)
+        self.name = 'ExperimentLogWriter'
+        self.log = log.getChild(self.name)
+        self.db_pool = db_pool
+        self.flush_seconds = max(0.0, float(flush_seconds))
+        self.flush_rows = max(1, int(flush_rows))
+        self.max_rows = max(self.flush_rows, int(max_rows))
+        self.spill_path = spill_path
+        self._records = queue.Queue(maxsize=self.max_rows)
+        # Records of batches that could not be written yet, written first with the next batch.
+        self._pending = list()
+        # False from a batch that could not be written until one is, the spilled records are
+        # only written back while the database takes writes.
+        self._writing = True
+        self._stopping = False
+        self._spilled = 0
+        self._spill_lock = threading.Lock()
+        self.log.debug('Initialized')
+        return
+
+    def run(self):
+        self.log.debug('run()')
+        running = True
+        while running:
+            rows = self._pending
+            self._pending = list()
+            waiters = list()
+            deadline = time.time() + self.flush_seconds
+            # Records keep being taken off the queue while a batch waits to be written, so
+            # flush() and stop() are answered and add() spills as little as possible.
+            backlog = self._records.qsize()
+            while len(rows) < self.flush_rows or backlog > 0:
+                try:
+                    if len(rows) < self.flush_rows:
+                        record = self._records.get(timeout=max(0.0, deadline - time.time()))
+                    else:
+                        backlog -= 1
+                        record = self._records.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    running = False
+                    self._stopping = True
+                    break
+                if isinstance(record, threading.Event):
+                    waiters.append(record)
+                    break
+                rows.append(record)
+            self.keep_pending(rows=self.write_rows(rows=rows))
+            if self._writing and len(self._pending) == 0:
+                self.replay_spill()
+            self.log_spilled()
+            for waiter in waiters:
+                waiter.set()
+        if len(self._pending) > 0:
+            self.spill(records=self._pending)
+            self._pending = list()
+            self.log_spilled()
+        self.log.debug('exiting')
+        return
+
+    def keep_pending(self, rows: list):
+        # The records that do not fit in memory are spilled, oldest first.
+        if len(rows) > self.max_rows:
+            self.spill(records=rows[:len(rows) - self.max_rows])
+            rows = rows[len(rows) - self.max_rows:]
+        self._pending = rows
+        return
+
+    def write_rows(self, rows: list) -> list:
+        """Writes a batch of experiment log records.
+
+        Parameters
+        ----------
+        rows : list
+            The records to write.
+
+        Returns
+        -------
+        list
+            The records that could not be written because the database was unavailable.
+        """
+        if len(rows) == 0:
+            return list()
+        # Once stop() was called a batch is only tried once, what is left is spilled.
+        attempts = self.WRITE_ATTEMPTS
+        if self._stopping:
+            attempts = 1
+        for attempt in range(attempts):
+            if attempt > 0:
+                time.sleep(self.RETRY_SECONDS)
+            try:
+                with self.db_pool.connection() as db_conn:
+                    with db_conn.cursor() as cr:
+                        execute_values(cr, self.INSERT_SQL, rows, page_size=len(rows))
+                        db_conn.commit()
+                self._writing = True
+                return list()
+            except psycopg2.InterfaceError as e:
+                self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+            except psycopg2.DatabaseError as e:
+                self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
+                return self.write_each_row(rows=rows)
+        self._writing = False
+        self.log.warning('Keeping {} experiment log records to write with the next batch.'
+                         .format(len(rows)))
+        return rows
+
+    def write_each_row(self, rows: list) -> list:
+        refused = 0
+        for index in range(len(rows)):
+            try:
+                with self.db_pool.connection() as db_conn:
+                    with db_conn.cursor() as cr:
+                        execute_values(cr, self.INSERT_SQL, rows[index:index + 1])
+                        db_conn.commit()
+            except psycopg2.InterfaceError as e:
+                self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+                self._writing = False
+                return rows[index:]
+            except psycopg2.DatabaseError as e:
+                self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
+                self.log.error('Experiment log record refused by the database: {}'.format(
+                    self.record_to_line(record=rows[index]).strip()))
+                refused += 1
+        if refused > 0:
+            self.log.error('{} experiment log records were not saved.'.format(refused))
+        self._writing = True
+        return list()
+
+    @staticmethod
+    def record_to_line(record: tuple) -> str:
+        data_object = None
+        if record[4] is not None:
+            data_object = record[4].adapted
+        return json.dumps([record[0], record[1].isoformat(), record[2], record[3], data_object,
+                           record[5]], default=str) + '\n'
+
+    @staticmethod
+    def line_to_record(line: str) -> tuple:
+        values = json.loads(line)
+        data_object = None
+        if values[4] is not None:
+            data_object = Json(values[4])
+        return (values[0],
+                datetime.datetime.fromisoformat(values[1]),
+                values[2],
+                values[3],
+                data_object,
+                values[5])
+
+    def spill(self, records: list):
+        self.spill_lines(lines=[self.record_to_line(record=record) for record in records])
+        return
+
+    def spill_lines(self, lines):
+        # Appends records to the spill file, only when that fails are they lost.
+        count = 0
+        spill_file = None
+        with self._spill_lock:
+            try:
+                for line in lines:
+                    if spill_file is None:
+                        spill_file = open(self.spill_path, 'a')
+                    spill_file.write(line)
+                    count += 1
+            except OSError as e:
+                self.log.error('Experiment log records were lost, unable to write {}: {}'
+                               .format(self.spill_path, str(e)))
+            finally:
+                if spill_file is not None:
+                    spill_file.close()
+            self._spilled += count
+        return
+
+    def log_spilled(self):
+        with self._spill_lock:
+            spilled = self._spilled
+            self._spilled = 0
+        if spilled > 0:
+            self.log.warning('Spilled {} experiment log records to {}, the database is not '
+                             'keeping up.'.format(spilled, self.spill_path))
+        return
+
+    def replay_spill(self):
+        # Writes the spilled records back max_rows at a time.  The spill file is moved aside
+        # first so add() can keep spilling, a replay that was cut short is finished first.
+        replay_path = self.spill_path + '.replay'
+        with self._spill_lock:
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+        written = 0
+        try:
+            with open(replay_path, 'r') as replay_file:
+                rows = list()
+                for line in replay_file:
+                    try:
+                        rows.append(self.line_to_record(line=line))
+                    except ValueError:
+                        self.log.error('Skipping unreadable experiment log record: {}'.format(
+                            line.strip()))
+                    if len(rows) >= self.max_rows:
+                        failed = self.write_rows(rows=rows)
+                        if len(failed) > 0:
+                            self.spill(records=failed)
+                            self.spill_lines(lines=replay_file)
+                            break
+                        written += len(rows)
+                        rows = list()
+                else:
+                    failed = self.write_rows(rows=rows)
+                    self.spill(records=failed)
+                    written += len(rows) - len(failed)
+            os.remove(replay_path)
+        except OSError as e:
+            self.log.error('Unable to read the spilled experiment log records in {}: {}'.format(
+                replay_path, str(e)))
+        if written > 0:
+            self.log.info('Wrote {} spilled experiment log records.'.format(written))
+        return
+
+    def add(self, msg: LogMessage):
+        data_object = None
+        if msg.data_object is not None:
+            data_object = Json(msg.data_object)
+        record = (msg.model_experiment_id,
+                  datetime.datetime.now(tz=pytz.utc),
+                  msg.action,
+                  msg.message,
+                  data_object,
+                  msg.experiment_trial_id)
+        try:
+            self._records.put_nowait(record)
+        except queue.Full:
+            self.spill(records=[record])
+        return
+
+    def flush(self) -> bool:
+        """Waits up to FLUSH_TIMEOUT_SECONDS until every record added so far is written, or kept
+        to write with the next batch while the database is unavailable.
+
+        Returns
+        -------
+        bool
+            False if the writer did not get to the records in time.
+        """
+        done = threading.Event()
+        try:
+            self._records.put(done, timeout=self.FLUSH_TIMEOUT_SECONDS)
+        except queue.Full:
+            done = None
+        if done is None or not done.wait(timeout=self.FLUSH_TIMEOUT_SECONDS):
+            self.log.warning('The experiment log was not written within {} seconds.'.format(
+                self.FLUSH_TIMEOUT_SECONDS))
+            return False
+        return True
+
+    def stop(self):
+        self.log.debug('stop()')
+        try:
+            self._records.put(None, timeout=self.STOP_TIMEOUT_SECONDS)
+            self.join(timeout=self.STOP_TIMEOUT_SECONDS)
+        except queue.Full:
+            pass
+        if self.is_alive():
+            self.log.error('The experiment log writer did not stop within {} seconds.'.format(
+                self.STOP_TIMEOUT_SECONDS))
+        return
+
+
+class RecordedDataPrefetcher(threading.Thread):
+    # Fetches the rows of a recorded episode one chunk ahead of the TA1.  While the TA1 serves one
+    # chunk from its data_cache the next chunk is fetched, and the chunk size follows the rate the
+    # TA2 consumes rows at, so a chunk lasts about PREFETCH_SECONDS.  Every chunk is its own query
+    # on a pooled connection that goes back to the pool right after, so a long episode does not
+    # hold a connection the other sessions need.
+    PREFETCH_SECONDS = 5.0
+    MIN_CHUNK = 50
+    MAX_CHUNK = 2000
+
+    def __init__(self, log: logging.Logger, db_pool: DatabasePool, episode_id: int,
+                 at_data_index: int, chunk_size: int):
+        threading.Thread.__init__(self, daemon=True)
+        self.name = 'RecordedDataPrefetcher'
+        self.log = log.getChild(self.name)
+        self.db_pool = db_pool
+        self.episode_id = episode_id
+        # The data_index after the last row handed to the TA1.
+        self.next_data_index = at_data_index
+        # The data_index of the first row of the chunk fetched next.
+        self._fetch_data_index = at_data_index
+        self.chunk_size = self.clamp_chunk_size(chunk_size)
+        self.error = None
+        self._condition = threading.Condition()
+        self._ready = None
+        self._wanted = True
+        self._exhausted = False
+        self._stopping = False
+        self._done = False
+        self._last_take = None
+        self._last_taken = 0
+        return
+
+    def clamp_chunk_size(self, chunk_size: float) -> int:
+        return int(min(self.MAX_CHUNK, max(self.MIN_CHUNK, chunk_size)))
+
+    def fetch_chunk(self, chunk_size: int) -> list:
+        with self.db_pool.connection() as db_conn:
+            with db_conn.cursor() as cr:
+                sql = ('SELECT data_index, feature_vector, label, data_id FROM data WHERE '
+                       'episode_id=%s AND data_index>=%s ORDER BY data_index LIMIT %s;')
+                data = (self.episode_id,
+                        self._fetch_data_index,
+                        chunk_size,)
+                cr.execute(sql, data)
+                return cr.fetchall()
+
+    def run(self):
+        self.log.debug('run(episode_id=%s, at_data_index=%s)', self.episode_id,
+                       self.next_data_index)
+        try:
+            while not self._exhausted:
+                with self._condition:
+                    while not self._wanted and not self._stopping:
+                        self._condition.wait()
+                    if self._stopping:
+                        break
+                    chunk_size = self.chunk_size
+                rows = self.fetch_chunk(chunk_size=chunk_size)
+                chunk = dict()
+                for row in rows:
+                    chunk[row[0]] = dict({'data_index': row[0],
+                                          'feature_vector': row[1],
+                                          'label': row[2],
+                                          'data_id': row[3]})
+                if len(rows) > 0:
+                    self._fetch_data_index = rows[-1][0] + 1
+                with self._condition:
+                    self._ready = chunk
+                    self._wanted = False
+                    self._exhausted = len(rows) < chunk_size
+                    self._condition.notify_all()
+        except psycopg2.Error as e:
+            self.log.error("psycopg2.Error: " + str(e.pgerror))
+            with self._condition:
+                self.error = str(e)
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+        self.log.debug('exiting')
+        return
+
+    def take(self) -> dict:
+        """Waits for the chunk being fetched and starts fetching the next one.
+
+        Returns
+        -------
+        dict
+            The rows of the chunk by data_index, empty once the episode has no more rows, or None
+            when the rows could not be fetched.
+        """
+        with self._condition:
+            while self._ready is None and not self._done:
+                self._condition.wait()
+            chunk = self._ready
+            self._ready = None
+            if chunk is None:
+                if self.error is not None:
+                    return None
+                return dict()
+            # The previous chunk was served between the last take and this one.
+            now = time.time()
+            if self._last_take is not None and now > self._last_take:
+                rate = self._last_taken / (now - self._last_take)
+                self.chunk_size = self.clamp_chunk_size(rate * self.PREFETCH_SECONDS)
+            self._last_take = now
+            self._last_taken = len(chunk)
+            if len(chunk) > 0:
+                self.next_data_index = max(chunk) + 1
+            if not self._exhausted:
+                self._wanted = True
+                self._condition.notify_all()
+        return chunk
+
+    def stop(self):
+        self.log.debug('stop()')
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self.join()
+        return
+
+
+class UniqueDraw:
+    # Draws integers from low to high, both included, without drawing any of them twice.  This is
+    # a Fisher-Yates shuffle that only remembers the positions it swapped, so creating one and
+    # every draw are O(1) whatever the size of the range, e.g. the 4 billion testing seeds.
+    def __init__(self, low: int, high: int):
+        self.low = low
+        self._remaining = max(0, high - low + 1)
+        # [position] = value swapped into a position that was drawn.
+        self._swapped = dict()
+        return
+
+    def __len__(self):
+        return self._remaining
+
+    def draw(self) -> int:
+        if self._remaining == 0:
+            raise IndexError('No values left to draw.')
+        position = random.randrange(self._remaining)
+        self._remaining -= 1
+        value = self._swapped.get(position, position)
+        # Move the last value still in the range into the position drawn.
+        self._swapped[position] = self._swapped.pop(self._remaining, self._remaining)
+        return self.low + value
+
+
+class ExperimentSession:
+    # One experiment the TA1 is serving on its private queue.  The TA1 works on one session at a
+    # time, the fields of the others are parked here between their requests.
+    def __init__(self, model_experiment_id: int, private_queue: str):
+        self.model_experiment_id = model_experiment_id
+        self.private_queue = private_queue
+        # [field name] = value of the TA1 field, None while this is the active session.
+        self.fields = None
+        self.started = time.time()
+        self.last_request = self.started
+        self.requests = 0
+        return
+
+    def memory_bytes(self, fields: dict = None) -> int:
+        """Estimates the memory held by the fields of the session, the caches and AIQ objects
+        they reference included, each object counted once.
+
+        Parameters
+        ----------
+        fields : dict, optional
+            The fields to measure, the parked fields of the session by default.
+
+        Returns
+        -------
+        int
+            The number of bytes.
+        """
+        if fields is None:
+            fields = self.fields
+        size = 0
+        seen = set()
+        stack = list(fields.values())
+        while len(stack) > 0:
+            value = stack.pop()
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            size += sys.getsizeof(value)
+            if isinstance(value, dict):
+                stack.extend(value.keys())
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple, set)):
+                stack.extend(value)
+            elif isinstance(value, objects.AiqObject):
+                for cls in type(value).__mro__:
+                    for name in getattr(cls, '__slots__', tuple()):
+                        if hasattr(value, name):
+                            stack.append(getattr(value, name))
+                if hasattr(value, '__dict__'):
+                    stack.append(vars(value))
+        return size
+
+
 class TA1:
     def __init__(self, options):
         # The very first thing we must do is identify what options from command line versus
@@ -313,6 +1171,10 @@ class TA1:
             self.log.info('Sleeping for {} seconds before continuing...'.format(sleep_seconds))
         time.sleep(sleep_seconds)
 
+        # The TA1 keeps taking new experiments until this many are running on their private
+        # queues.
+        self._max_sessions = max(1, config.getint('options', 'max_sessions'))
+
         # for section in config.sections():
         #     for key in config[section]:
         #         self.log.warning('{}.{} = {}'.format(section, key, config[section][key]))
@@ -323,7 +1185,33 @@ class TA1:
         self.db_port = config.get("postgresql", "port")
         self.db_name = objects.DATABASE_PATTERN.format(config.get('postgresql', 'database'))
         self.log.warning('database: {}'.format(self.db_name))
-        self.db_conn = None
+        self.db_pool = None
+        # Every session streaming a recorded episode holds one connection, the write behind and the
+        # experiment log writer hold one each, and adding an episode to a dataset holds one for
+        # the lock while it works with another.
+        self._db_pool_size = config.getint("postgresql", "pool_size")
+        if self._db_pool_size < self._max_sessions + 4:
+            self.log.warning('postgresql pool_size {} is too small for {} sessions, using {}.'
+                             .format(self._db_pool_size, self._max_sessions,
+                                     self._max_sessions + 4))
+            self._db_pool_size = self._max_sessions + 4
+        self._db_pool_timeout = config.getfloat("postgresql", "pool_timeout")
+        self._db_write_mode = config.get("postgresql", "write_mode")
+        if self._db_write_mode not in objects.VALID_DB_WRITE_MODES:
+            self.log.warning('Unknown postgresql write_mode {}, using {}.'.format(
+                self._db_write_mode, objects.DEFAULT_TA1_DB_WRITE_MODE))
+            self._db_write_mode = objects.DEFAULT_TA1_DB_WRITE_MODE
+        self._db_write_rows = max(1, config.getint("postgresql", "write_batch_rows"))
+        self._db_writer = None
+        self._log_flush_seconds = config.getfloat("postgresql", "log_flush_seconds")
+        self._log_flush_rows = config.getint("postgresql", "log_flush_rows")
+        self._log_max_rows = config.getint("postgresql", "log_max_rows")
+        self._log_spill_file = config.get("postgresql", "log_spill_file").format(
+            socket.gethostname())
+        self._log_writer = None
+        # [sequence] = list of ids allocated for rows the write behind will insert.
+        self._db_id_pool = dict()
+        self._data_prefetch = None
         self.amqp_user = config.get("amqp", "user")
         self.amqp_pass = config.get("amqp", "pass")
         self.amqp_host = config.get("amqp", "host")
@@ -334,6 +1222,8 @@ class TA1:
         self._AMQP_EXPERIMENT_TIMEOUT -= 5
         if self.is_testing and not self.is_demo:
             self._AMQP_EXPERIMENT_TIMEOUT = 60
+        # Every session starts from this timeout, the training gap multiplies its own.
+        self._AMQP_SESSION_TIMEOUT = self._AMQP_EXPERIMENT_TIMEOUT
         self._TIMEOUT_MULTIPLIER = config.getint('sail-on', 'training_timeout_multiplier')
         self._AMQP_EXP_CALLBACK_ID = None
         self._AMQP_SOTA_CALLBACK_ID = None
@@ -463,6 +1353,7 @@ class TA1:
         self.benchmark_data = None
 
         self._SHORT_DEMO_EPISODE_SIZE = 200
+        self._HEARTBEAT_SLICE = 2.0
         self._TESTING_DATA_SIZE = 100
         self._SAIL_ON_TRIALS = self._server_trials
         if self.is_testing:
@@ -480,6 +1371,8 @@ class TA1:
         self._TEST_WINDOW_BEFORE_NOVEL = random.randint(200, 4000)
         self._TEST_WINDOW_PROGRESS = 0
         self._DATA_CACHE_SIZE = 100
+        self._DATASET_LOCK_CLASS = 1
+        self._DATASET_LOCK_WAIT = 30.0
         self._DATA_CACHE_RELOAD = 2
         self._VALID_DATA_TYPES = list(['train', 'test'])
         self._TorN = 0
@@ -500,6 +1393,21 @@ class TA1:
         self._exper_no_training = False
         self._exper_just_one_trial = False
         self._exper_generator_config = None
+        # [(domain, novelty, difficulty)] = objects.NoveltyDescription for the experiment.
+        self._novelty_descriptions = dict()
+        # The SAIL-ON state machine, [(state class, request class)] = handler, the handler and
+        # timing name resolved for every (state class, request class) seen, and [timing name] =
+        # rabbitmq.LatencyHistogram of the transitions of the experiment.
+        self._SAIL_ON_TRANSITIONS = self.build_sail_on_transitions()
+        self._sail_on_dispatch = dict()
+        self._sail_on_timing = dict()
+        # [model_experiment_id] = ExperimentSession, and [private_queue] = model_experiment_id.
+        self._sessions = dict()
+        self._session_queues = dict()
+        # The session whose fields are in the TA1 fields, None between experiments.
+        self._session = None
+        self._session_field_names = list(self.new_session_fields())
+        self._accepting_experiments = False
 
         self.amqp = rabbitmq.Connection(agent_name=self.name,
                                         amqp_user=self.amqp_user,
@@ -510,12 +1418,22 @@ class TA1:
                                         amqp_ssl=self.amqp_ssl,
                                         request_timeout=self._AMQP_EXPERIMENT_TIMEOUT)
 
-        self.subscribe_experiment_queue()
-        self.subscribe_sota_queue()
+        self.start_accepting_experiments()
         self.setup_publish_analysis_queue()
 
         self.connect_db()
-        self.reconnect_db()
+        if self._db_write_mode != objects.DB_WRITE_SYNC:
+            self._db_writer = DatabaseWriteBehind(log=self.log,
+                                                  db_pool=self.db_pool,
+                                                  batch_rows=self._db_write_rows)
+            self._db_writer.start()
+            self._log_writer = ExperimentLogWriter(log=self.log,
+                                                   db_pool=self.db_pool,
+                                                   flush_seconds=self._log_flush_seconds,
+                                                   flush_rows=self._log_flush_rows,
+                                                   max_rows=self._log_max_rows,
+                                                   spill_path=self._log_spill_file)
+            self._log_writer.start()
         random.seed(time.time())
         return
 
@@ -528,6 +1446,14 @@ class TA1:
         config.set("postgresql", "host", "hostname")
         config.set("postgresql", "port", "port")
         config.set("postgresql", "database", "database")
+        config.set("postgresql", "pool_size", str(objects.DEFAULT_TA1_DB_POOL_SIZE))
+        config.set("postgresql", "pool_timeout", str(objects.DEFAULT_TA1_DB_POOL_TIMEOUT))
+        config.set("postgresql", "write_mode", str(objects.DEFAULT_TA1_DB_WRITE_MODE))
+        config.set("postgresql", "write_batch_rows", str(objects.DEFAULT_TA1_DB_WRITE_ROWS))
+        config.set("postgresql", "log_flush_seconds", str(objects.DEFAULT_TA1_LOG_FLUSH_SECONDS))
+        config.set("postgresql", "log_flush_rows", str(objects.DEFAULT_TA1_LOG_FLUSH_ROWS))
+        config.set("postgresql", "log_max_rows", str(objects.DEFAULT_TA1_LOG_MAX_ROWS))
+        config.set("postgresql", "log_spill_file", str(objects.DEFAULT_TA1_LOG_SPILL_FILE))
         config.add_section("amqp")
         config.set("amqp", "user", "username")
         config.set("amqp", "pass", "password")
@@ -565,6 +1491,7 @@ class TA1:
         config.set('options', 'load_experiment_json', str(objects.DEFAULT_TA1_LOAD_EXPERIMENT_JSON))
         config.set('options', 'experiment_json_file', str(objects.DEFAULT_TA1_JSON_EXPERIMENT_FILE))
         config.set('options', 'startup_sleep_window', str(objects.DEFAULT_TA1_SLEEP_WINDOW))
+        config.set('options', 'max_sessions', str(objects.DEFAULT_TA1_MAX_SESSIONS))
         return config
 
     def subscribe_experiment_queue(self):
@@ -597,6 +1524,241 @@ class TA1:
         self.amqp.remove_subscribe_to_queue(queue_name=objects.REGISTER_SOTA_QUEUE)
         return
 
+    def start_accepting_experiments(self):
+        if not self._accepting_experiments and len(self._sessions) < self._max_sessions:
+            self.subscribe_experiment_queue()
+            self.subscribe_sota_queue()
+            self._accepting_experiments = True
+        return
+
+    def stop_accepting_experiments(self):
+        if self._accepting_experiments and len(self._sessions) >= self._max_sessions:
+            self.unsubscribe_experiment_queue()
+            self.unsubscribe_sota_queue()
+            self._accepting_experiments = False
+        return
+
+    def new_session_fields(self) -> dict:
+        """Builds the values the TA1 fields of an experiment hold before it starts.
+
+        Returns
+        -------
+        dict
+            [field name] = value.
+        """
+        fields = dict({'private_queue': None,
+                       'user_id': None,
+                       'current_domain': None,
+                       'model_experiment_id': None,
+                       'experiment_type': None,
+                       'experiment_trial_id': None,
+                       'experiment_trial': None,
+                       'trial_episode_id': None,
+                       'trial_episode_performance': None,
+                       'trial_predicted_novelty': False,
+                       'trial_budget_active': False,
+                       'novelty_initiated': False,
+                       'novelty_visibility': 0,
+                       'novelty_level': None,
+                       'novelty_vis_index': None,
+                       'episode_hint_json': None,
+                       'rolling_score': list(),
+                       'STATE': None,
+                       'SOTA_STATE': None,
+                       'hold_during_training_gap': False,
+                       'refresh_dataset_cache': False,
+                       'episode_data_count': 0,
+                       'episode_data_total': 0,
+                       'benchmark_data': None,
+                       'sota_client_ex_req': None,
+                       'sota_client_ex_response': None,
+                       'episode_cache': dict(),
+                       'episode_index_cache': dict(),
+                       'dataset_cache': dict(),
+                       'data_cache': dict(),
+                       'domain_cache': list(),
+                       'domain_ids': dict(),
+                       'episode_id_list': list(),
+                       'episode_id_list_index': None,
+                       '_AMQP_EXPERIMENT_TIMEOUT': self._AMQP_SESSION_TIMEOUT,
+                       '_AMQP_EXP_CALLBACK_ID': None,
+                       '_training_episodes': 0,
+                       '_testing_episodes': 0,
+                       '_server_novelty_index': 0,
+                       '_sota_server_novelty_index': 0,
+                       '_TEST_NUM_N_ZERO': 0,
+                       '_TEST_NUM_N_L': 0,
+                       '_TEST_EPISODE_BEFORE_NOVEL': 0,
+                       '_TEST_EPISODE_PROGRESS': 0,
+                       '_TEST_WINDOW_BEFORE_NOVEL': random.randint(200, 4000),
+                       '_TEST_WINDOW_PROGRESS': 0,
+                       '_TorN': 0,
+                       '_TorN_OPTIONS': list([0, 0]),
+                       '_live_thread': None,
+                       '_ta2_response': queue.Queue(),
+                       '_live_output': queue.Queue(),
+                       '_data_prefetch': None,
+                       '_experiment': None,
+                       '_exper_train_index': None,
+                       '_exper_novelty_index': None,
+                       '_exper_trial_index': None,
+                       '_exper_episode_index': None,
+                       '_exper_trial_novelty_desc': None,
+                       '_exper_end_training_early': False,
+                       '_exper_end_experiment_early': False,
+                       '_exper_no_testing': False,
+                       '_exper_no_training': False,
+                       '_exper_just_one_trial': False,
+                       '_exper_generator_config': None,
+                       '_novelty_descriptions': dict(),
+                       '_sail_on_timing': dict()})
+        return fields
+
+    def save_session_fields(self) -> dict:
+        fields = dict()
+        for name in self._session_field_names:
+            fields[name] = getattr(self, name)
+        return fields
+
+    def load_session_fields(self, fields: dict):
+        for name in self._session_field_names:
+            setattr(self, name, fields[name])
+        return
+
+    def park_session(self):
+        """Parks the fields of the active session, if any, and leaves the TA1 fields as they are
+        before an experiment starts, ready for a new one.
+        """
+        if self._session is not None:
+            self._session.fields = self.save_session_fields()
+            self._session = None
+        self.load_session_fields(fields=self.new_session_fields())
+        return
+
+    def activate_session(self, private_queue: str) -> ExperimentSession:
+        """Makes the session served on private_queue the active one, parking the previous one.
+
+        Parameters
+        ----------
+        private_queue : str
+            The private RPC queue of the session.
+
+        Returns
+        -------
+        ExperimentSession
+            The session, or None when it has ended.
+        """
+        model_experiment_id = self._session_queues.get(private_queue)
+        session = self._sessions.get(model_experiment_id)
+        if session is not self._session:
+            if session is None:
+                self.park_session()
+            else:
+                if self._session is not None:
+                    self._session.fields = self.save_session_fields()
+                self.load_session_fields(fields=session.fields)
+                session.fields = None
+                self._session = session
+        return session
+
+    def open_session(self, callback_function):
+        """Sets up a new private RPC queue for the experiment in the TA1 fields and serves the
+        experiment as a session from now on.  The general queues are left once max_sessions
+        experiments are running.
+
+        Parameters
+        ----------
+        callback_function : function
+            The request handler of the experiment type, on_aiq_request or on_sail_on_request.
+        """
+        if self.model_experiment_id in self._sessions:
+            # The TA2 came back for an experiment this TA1 is still serving, the old private
+            # queue is abandoned.
+            self.log.warning('Replacing the session of model_experiment_id {}.'.format(
+                self.model_experiment_id))
+            self.retire_session(session=self._sessions[self.model_experiment_id])
+        self.private_queue = objects.SERVER_RPC_QUEUE + '.{}'.format(uuid.uuid4().hex)
+        self.amqp.setup_subscribe_to_queue(
+            queue_name=self.private_queue,
+            queue_exclusive=True,
+            queue_auto_delete=True,
+            casas_events=True,
+            callback_function=functools.partial(self.on_session_request, self.private_queue,
+                                                callback_function),
+            callback_full_params=True)
+        self._session = ExperimentSession(model_experiment_id=self.model_experiment_id,
+                                          private_queue=self.private_queue)
+        self._sessions[self.model_experiment_id] = self._session
+        self._session_queues[self.private_queue] = self.model_experiment_id
+        self.stop_accepting_experiments()
+        self.log_sessions()
+        return
+
+    def retire_session(self, session: ExperimentSession):
+        """Stops serving a parked session without ending its experiment.
+
+        Parameters
+        ----------
+        session : ExperimentSession
+            The session to drop.
+        """
+        self.amqp.remove_subscribe_to_queue(queue_name=session.private_queue)
+        if session.fields['_AMQP_EXP_CALLBACK_ID'] is not None:
+            self.amqp.cancel_call_later(timeout_id=session.fields['_AMQP_EXP_CALLBACK_ID'])
+        if session.fields['_data_prefetch'] is not None:
+            session.fields['_data_prefetch'].stop()
+        if session.fields['_live_thread'] is not None:
+            session.fields['_live_thread'].stop()
+        self._session_queues.pop(session.private_queue, None)
+        self._sessions.pop(session.model_experiment_id, None)
+        return
+
+    def end_session(self):
+        """Stops serving the active session on its private queue and takes new experiments again.
+        The callers reset the TA1 fields of the experiment.
+        """
+        if self.private_queue is not None:
+            self.amqp.remove_subscribe_to_queue(queue_name=self.private_queue)
+            model_experiment_id = self._session_queues.pop(self.private_queue, None)
+            self._sessions.pop(model_experiment_id, None)
+        self._session = None
+        self.start_accepting_experiments()
+        self.log_sessions()
+        return
+
+    def log_sessions(self):
+        for session in self._sessions.values():
+            if session is self._session:
+                fields = self.save_session_fields()
+                state = self.STATE
+            else:
+                fields = session.fields
+                state = fields['STATE']
+            self.log.info('session {}: {} requests, idle {:.1f}s, {:.1f} MB, {}'.format(
+                session.model_experiment_id, session.requests,
+                time.time() - session.last_request,
+                session.memory_bytes(fields=fields) / 1048576.0,
+                type(state).__name__))
+        self.log.info('{} of {} sessions running.'.format(len(self._sessions),
+                                                           self._max_sessions))
+        return
+
+    def on_session_request(self, private_queue: str, callback_function, ch, method, props, body,
+                           request):
+        # Every request on a private queue is handled with the fields of its own session.
+        session = self.activate_session(private_queue=private_queue)
+        if session is not None:
+            session.requests += 1
+            session.last_request = time.time()
+        callback_function(ch, method, props, body, request)
+        return
+
+    def on_session_timeout(self, private_queue: str):
+        session = self.activate_session(private_queue=private_queue)
+        if session is not None:
+            self.force_end_experiment()
+        return
+
     def setup_publish_analysis_queue(self):
         self.amqp.setup_publish_to_queue(queue_name=objects.ANALYSIS_READY_QUEUE,
                                          queue_durable=True,
@@ -605,6 +1767,8 @@ class TA1:
         return
 
     def publish_analysis(self, model_experiment_id: int):
+        # The analysis reads the rows of the experiment, so they must be written first.
+        self.flush_db_writes(errormsgs=list(), wait=True)
         analysis_ready = objects.AnalysisReady(model_experiment_id=model_experiment_id)
 
         self.amqp.publish_to_queue(queue_name=objects.ANALYSIS_READY_QUEUE,
@@ -613,6 +1777,7 @@ class TA1:
 
     def publish_partial_analysis(self, model_experiment_id: int = None,
                                  experiment_trial_id: int = None):
+        self.flush_db_writes(errormsgs=list(), wait=True)
         analysis_partial = objects.AnalysisPartial(
             model_experiment_id=model_experiment_id,
             experiment_trial_id=experiment_trial_id)
@@ -635,79 +1800,108 @@ class TA1:
                 x = False
             except KeyboardInterrupt:
                 break
+        self.stop_data_prefetch()
+        for session in self._sessions.values():
+            if session.fields is not None and session.fields['_data_prefetch'] is not None:
+                session.fields['_data_prefetch'].stop()
+        if self._log_writer is not None:
+            self._log_writer.stop()
+        if self._db_writer is not None:
+            self._db_writer.stop()
+        self.db_pool.close()
         return
 
     def connect_db(self):
-        """Creates the psycopg2 connection to the postgres database.
+        """Creates the pool of psycopg2 connections to the postgres database, only returns once
+        the database accepts a connection.
         """
         self.log.debug("connect_db()")
-        try:
-            self.db_conn = psycopg2.connect(database=self.db_name,
-                                            host=self.db_host,
-                                            port=self.db_port,
-                                            user=self.db_user,
-                                            password=self.db_pass)
-        except psycopg2.Error as e:
-            self.log.error("Error trying to connect to the database: " + str(e.pgerror))
-            time.sleep(1)
+        self.db_pool = DatabasePool(log=self.log,
+                                    db_name=self.db_name,
+                                    db_host=self.db_host,
+                                    db_port=self.db_port,
+                                    db_user=self.db_user,
+                                    db_pass=self.db_pass,
+                                    size=self._db_pool_size,
+                                    timeout=self._db_pool_timeout)
+        self.db_pool.connect()
         return
 
-    def reconnect_db(self):
-        """This is called when the connection is disconnected while working, only returns once the
-        connection is valid again.
+    def flush_db_writes(self, errormsgs: list, wait: bool = None):
+        """Hands the rows buffered by the write behind to its thread.
+
+        Parameters
+        ----------
+        errormsgs : list
+            Errors writing earlier batches are added to this list.
+        wait : bool, optional
+            Wait until the rows and the experiment log are written, by default only in the
+            episode write_mode.
         """
-        self.log.debug("reconnect_db()")
-        while self.db_conn is None:
-            self.connect_db()
-        while self.db_conn.closed != 0:
-            self.connect_db()
+        if self._db_writer is not None:
+            if wait is None:
+                wait = self._db_write_mode == objects.DB_WRITE_EPISODE
+            errormsgs.extend(self._db_writer.flush(wait=wait))
+            if wait and self._log_writer is not None:
+                self._log_writer.flush()
         return
 
+    def allocate_db_ids(self, sequence: str, count: int, errormsgs: list) -> list:
+        self.log.debug('allocate_db_ids(sequence=%s, count=%s)', sequence, count)
+        ids = list()
+        try:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
+                    sql = 'SELECT nextval(%s) FROM generate_series(1, %s);'
+                    data = (sequence,
+                            count,)
+                    cr.execute(sql, data)
+                    ids = [row[0] for row in cr.fetchall()]
+                    db_conn.commit()
+        except psycopg2.InterfaceError as e:
+            self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+            errormsgs.append("Database connection unavailable, please try again in a few minutes")
+        except psycopg2.DatabaseError as e:
+            self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
+            errormsgs.append("There were errors allocating row ids.")
+        return ids
+
+    def next_db_id(self, sequence: str, errormsgs: list) -> int:
+        # Ids are taken from the sequence a batch at a time for the rows the write behind
+        # inserts, so the ids of a tick are known without waiting on the database.
+        pool = self._db_id_pool.get(sequence)
+        if pool is None or len(pool) == 0:
+            pool = self.allocate_db_ids(sequence=sequence,
+                                        count=self._db_write_rows,
+                                        errormsgs=errormsgs)
+            pool.reverse()
+            self._db_id_pool[sequence] = pool
+        if len(pool) == 0:
+            return None
+        return pool.pop()
+
     def log_message(self, msg: LogMessage):
+        self.log.debug('%s   %s   %s', msg.action, msg.message, objects.LogSummary(msg.data_object))
+        if self._log_writer is not None:
+            self._log_writer.add(msg=msg)
+            return
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
-                    self.log.debug('{}   {}   {}'.format(msg.action, msg.message, msg.data_object))
-                    if msg.message is None and msg.data_object is None:
-                        sql = ('INSERT INTO experiment_log (model_experiment_id, action) '
-                               'VALUES (%s, %s) RETURNING experiment_log_id;')
-                        data = (msg.model_experiment_id,
-                                msg.action,)
-                    elif msg.message is not None and msg.data_object is None:
-                        sql = ('INSERT INTO experiment_log (model_experiment_id, action, message) '
-                               'VALUES (%s, %s, %s) RETURNING experiment_log_id;')
-                        data = (msg.model_experiment_id,
-                                msg.action,
-                                msg.message,)
-                    elif msg.message is None and msg.data_object is not None:
-                        sql = ('INSERT INTO experiment_log (model_experiment_id, action, object) '
-                               'VALUES (%s, %s, %s) RETURNING experiment_log_id;')
-                        data = (msg.model_experiment_id,
-                                msg.action,
-                                Json(msg.data_object),)
-                    else:
-                        sql = ('INSERT INTO experiment_log (model_experiment_id, action, message, '
-                               'object) VALUES (%s, %s, %s, %s) RETURNING experiment_log_id;')
-                        data = (msg.model_experiment_id,
-                                msg.action,
-                                msg.message,
-                                Json(msg.data_object),)
-                    self.log.debug(cr.mogrify(sql, data))
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
+                    data_object = None
+                    if msg.data_object is not None:
+                        data_object = Json(msg.data_object)
+                    sql = ('INSERT INTO experiment_log (model_experiment_id, action, message, '
+                           'object, experiment_trial_id) VALUES (%s, %s, %s, %s, %s);')
+                    data = (msg.model_experiment_id,
+                            msg.action,
+                            msg.message,
+                            data_object,
+                            msg.experiment_trial_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
-                    if msg.experiment_trial_id is not None:
-                        row = cr.fetchone()
-                        if row is not None:
-                            experiment_log_id = row[0]
-                            sql = ('UPDATE experiment_log SET experiment_trial_id=%s '
-                                   'WHERE experiment_log_id=%s;')
-                            data = (msg.experiment_trial_id,
-                                    experiment_log_id)
-                            cr.execute(sql, data)
-                            self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
         return
@@ -716,8 +1910,8 @@ class TA1:
         self.log.debug('handle_user( {}, {} )'.format(aiq_username, aiq_secret))
         user_id = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = "SELECT user_id FROM users WHERE username=%s AND secret=%s;"
                     data = (aiq_username, aiq_secret,)
                     cr.execute(sql, data)
@@ -730,7 +1924,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors collecting the user.")
@@ -740,8 +1933,8 @@ class TA1:
         self.log.debug('handle_organization( {} )'.format(organization_name))
         organization_id = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = 'SELECT organization_id FROM organization WHERE name=%s;'
                     data = (organization_name,)
                     cr.execute(sql, data)
@@ -761,7 +1954,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors handling the organization.")
@@ -770,8 +1962,8 @@ class TA1:
     def handle_organization_users(self, organization_id: int, user_id: int, errormsgs: list):
         self.log.debug('handle_organization_users( {}, {} )'.format(organization_id, user_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT organization_id, user_id FROM organization_users WHERE '
                            'organization_id=%s AND user_id=%s;')
                     data = (organization_id,
@@ -784,11 +1976,10 @@ class TA1:
                         data = (organization_id,
                                 user_id,)
                         cr.execute(sql, data)
-                        self.db_conn.commit()
+                        db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors building the organization_users.")
@@ -801,8 +1992,8 @@ class TA1:
         c_secret = None
         c_organization = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT users.user_id, users.username, users.secret, organization.name '
                            'FROM users '
                            'INNER JOIN model ON model.user_id = users.user_id '
@@ -824,7 +2015,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors collecting the user_id.")
@@ -840,8 +2030,8 @@ class TA1:
                                        user_id=user_id,
                                        errormsgs=errormsgs)
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT name, organization_id, description, model_id FROM model WHERE '
                            'user_id=%s AND name=%s AND organization_id=%s;')
                     data = (user_id,
@@ -864,7 +2054,7 @@ class TA1:
                                 organization_id,
                                 model_request.description,)
                         cr.execute(sql, data)
-                        self.db_conn.commit()
+                        db_conn.commit()
                         model = self.handle_model(model_request=model_request,
                                                   user_id=user_id,
                                                   errormsgs=errormsgs)
@@ -873,7 +2063,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors collecting/inserting the model.")
@@ -886,8 +2075,8 @@ class TA1:
             str(experiment_request), vhost))
         experiment_response = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     if experiment_request.seed is None:
                         experiment_request.seed = random.randint(1, 1000000000)
                     experiment_secret = uuid.uuid4().hex
@@ -906,7 +2095,7 @@ class TA1:
                             vhost,
                             phase,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
                     row = cr.fetchone()
                     if row is not None:
                         experiment_response = objects.ExperimentResponse(
@@ -920,12 +2109,11 @@ class TA1:
                             data = (experiment_request.description,
                                     row[0],)
                             cr.execute(sql, data)
-                            self.db_conn.commit()
+                            db_conn.commit()
                     self.log.debug('experiment_response: {}'.format(str(experiment_response)))
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the experiment.")
@@ -937,18 +2125,17 @@ class TA1:
         self.log.debug('add_json_to_model_experiment(model_experiment_id={})'.format(
                        model_experiment_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE model_experiment SET experiment_json=%s WHERE '
                            'model_experiment_id=%s;')
                     data = (Json(experiment.get_json_obj()),
                             model_experiment_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the experiment JSON.")
@@ -960,18 +2147,17 @@ class TA1:
                        'sota_experiment_id={})'.format(model_experiment_id,
                                                        sota_model_experiment_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE model_experiment SET sota_experiment_id=%s '
                            'WHERE model_experiment_id=%s;')
                     data = (sota_model_experiment_id,
                             model_experiment_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the experiment.")
@@ -983,8 +2169,8 @@ class TA1:
         self.log.debug('get_model_experiment_id_from_secret(vhost={})'.format(vhost))
         model_experiment_id = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT model_experiment_id, is_active FROM model_experiment WHERE '
                            'vhost=%s AND secret=%s;')
                     data = (vhost,
@@ -1004,7 +2190,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors searching for the experiment.")
@@ -1018,8 +2203,8 @@ class TA1:
             vhost))
         model_experiment_id = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT model_experiment_id, is_active FROM model_experiment WHERE '
                            'model_id=%s AND vhost=%s AND secret=%s;')
                     data = (model.model_id,
@@ -1040,7 +2225,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors searching for the experiment.")
@@ -1052,8 +2236,8 @@ class TA1:
             model_experiment_id))
         experiment = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT experiment_json FROM model_experiment WHERE '
                            'model_experiment_id=%s;')
                     data = (model_experiment_id,)
@@ -1076,7 +2260,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors getting the experiment json.")
@@ -1086,53 +2269,29 @@ class TA1:
         self.log.debug('lock_experiment_trial_to_clear()')
         experiment_trial_id = None
         try:
-            my_uuid = str(uuid.uuid4())
-            is_locked = False
-            max_wait = 10.0
-            end_time = float(time.time()) + max_wait
-            while not is_locked and float(time.time()) < end_time:
-                with self.db_conn:
-                    with self.db_conn.cursor() as cr:
-                        sql = ('SELECT experiment_trial_id FROM experiment_trial WHERE '
-                               'is_active=%s AND is_complete=%s AND '
-                               'utc_last_updated<(NOW() - interval\'1 hour\') LIMIT 1;')
-                        data = (True,
-                                False,)
-                        self.log.debug(cr.mogrify(sql, data))
-                        cr.execute(sql, data)
-                        row = cr.fetchone()
-                        if row is None:
-                            # There is no available trial, so no point in trying again.
-                            is_locked = True
-                        elif row is not None:
-                            ext_id = row[0]
-                            sql = ('UPDATE experiment_trial SET locked_by=%s, '
-                                   'utc_last_updated=NOW() WHERE '
-                                   'is_active=%s AND is_complete=%s AND '
-                                   'utc_last_updated<(NOW() - interval\'1 hour\') AND '
-                                   'experiment_trial_id=%s;')
-                            data = (my_uuid,
-                                    True,
-                                    False,
-                                    ext_id,)
-                            cr.execute(sql, data)
-                            self.db_conn.commit()
-                            sql = ('SELECT experiment_trial_id FROM experiment_trial WHERE '
-                                   'locked_by=%s AND experiment_trial_id=%s;')
-                            data = (my_uuid,
-                                    ext_id,)
-                            cr.execute(sql, data)
-                            row = cr.fetchone()
-                            if row is not None:
-                                if row[0] is not None:
-                                    experiment_trial_id = row[0]
-                                    is_locked = True
-                            if not is_locked:
-                                self.amqp.sleep(duration=(random.random() / 2.0))
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
+                    # Claim one abandoned trial in a single statement, trials another TA1 is
+                    # claiming right now are skipped instead of waited on.
+                    sql = ('UPDATE experiment_trial SET locked_by=%s, utc_last_updated=NOW() '
+                           'WHERE experiment_trial_id=('
+                           'SELECT experiment_trial_id FROM experiment_trial WHERE '
+                           'is_active=%s AND is_complete=%s AND '
+                           'utc_last_updated<(NOW() - interval\'1 hour\') '
+                           'LIMIT 1 FOR UPDATE SKIP LOCKED) '
+                           'RETURNING experiment_trial_id;')
+                    data = (str(uuid.uuid4()),
+                            True,
+                            False,)
+                    self.log.debug(cr.mogrify(sql, data))
+                    cr.execute(sql, data)
+                    row = cr.fetchone()
+                    if row is not None:
+                        experiment_trial_id = row[0]
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors locking the experiment_trial for clearing.")
@@ -1141,8 +2300,8 @@ class TA1:
     def clear_abandoned_trial(self, experiment_trial_id: int, errormsgs: list):
         self.log.debug('clear_abandoned_trial(experiment_trial_id={})'.format(experiment_trial_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     trial_sql = ('UPDATE experiment_trial SET locked_by=NULL, is_active=%s, '
                                  'utc_last_updated=NULL WHERE experiment_trial_id=%s;')
                     episode_sql = ('UPDATE trial_episode SET novelty=NULL, performance=NULL, '
@@ -1175,11 +2334,10 @@ class TA1:
                             experiment_trial_id,)
                     self.log.debug(cr.mogrify(trial_sql, data))
                     cr.execute(trial_sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the experiment_trial.")
@@ -1195,34 +2353,78 @@ class TA1:
 
     def add_all_experiment_trials(self, model_experiment_id: int, experiment: objects.Experiment,
                                   errormsgs: list):
+        """Inserts the experiment_trial and trial_episode rows of every trial in the experiment in
+        one transaction.  The novelty descriptions of every domain, novelty and difficulty in the
+        experiment are requested together before the rows are built.
+        """
         self.log.debug('add_all_experiment_trials()')
+        trials = list()
         for novelty_group in experiment.novelty_groups:
             for i, trial in enumerate(novelty_group.trials):
-                # Refresh any needed AMQP heartbeats.
-                self.amqp.process_data_events()
-
                 domain = None
                 if len(trial.episodes) > 0:
                     domain = trial.episodes[0].domain
                 for ep in trial.episodes:
                     self.log.debug(str(ep.get_json_obj()))
-                description = self.get_novelty_description(domain=domain,
-                                                           novelty=trial.novelty,
-                                                           difficulty=trial.difficulty)
-                experiment_trial_id = self.handle_experiment_trial(
-                    model_experiment_id=model_experiment_id,
-                    novelty_description=description.novelty_description,
-                    trial=i,
-                    novelty=trial.novelty,
-                    novelty_visibility=trial.novelty_visibility,
-                    difficulty=trial.difficulty,
-                    is_active=False,
-                    hint_level=trial.hint_level,
-                    errormsgs=errormsgs)
+                trials.append((i, trial, (domain, trial.novelty, trial.difficulty)))
+        if len(trials) == 0:
+            return
+        self.prefetch_novelty_descriptions(keys=[key for i, trial, key in trials])
+        for i, trial, key in trials:
+            if key not in self._novelty_descriptions:
+                errormsgs.append('No novelty description for domain {}, novelty {} and '
+                                 'difficulty {}.'.format(*key))
+                return
 
-                self.add_all_trial_episodes(experiment_trial_id=experiment_trial_id,
-                                            trial=trial,
-                                            errormsgs=errormsgs)
+        try:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
+                    # Take the ids from the sequence so the episodes can reference their trial.
+                    sql = 'SELECT nextval(%s) FROM generate_series(1, %s);'
+                    data = ('experiment_trial_experiment_trial_id_seq',
+                            len(trials),)
+                    cr.execute(sql, data)
+                    experiment_trial_ids = [row[0] for row in cr.fetchall()]
+                    trial_rows = list()
+                    episode_rows = list()
+                    for experiment_trial_id, (i, trial, key) in \
+                            zip(experiment_trial_ids, trials):
+                        description = self._novelty_descriptions[key]
+                        trial_rows.append((experiment_trial_id,
+                                           model_experiment_id,
+                                           i,
+                                           trial.novelty,
+                                           trial.novelty_visibility,
+                                           trial.difficulty,
+                                           Json(description.novelty_description),
+                                           False,
+                                           trial.hint_level,))
+                        episode_rows.extend(self.trial_episode_rows(
+                            experiment_trial_id=experiment_trial_id,
+                            trial=trial))
+                    sql = ('INSERT INTO experiment_trial (experiment_trial_id, '
+                           'model_experiment_id, trial, novelty, novelty_visibility, difficulty, '
+                           'novelty_description, is_active, hint_level) VALUES %s;')
+                    self.execute_values_pages(cr=cr, sql=sql, rows=trial_rows)
+                    if len(episode_rows) > 0:
+                        sql = ('INSERT INTO trial_episode (experiment_trial_id, episode_index, '
+                               'novelty, novelty_initiated, hint_level) VALUES %s;')
+                        self.execute_values_pages(cr=cr, sql=sql, rows=episode_rows)
+                    db_conn.commit()
+        except psycopg2.InterfaceError as e:
+            self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+            errormsgs.append("Database connection unavailable, please try again in a few minutes")
+        except psycopg2.DatabaseError as e:
+            self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
+            errormsgs.append("There were errors inserting the experiment trials.")
+        return
+
+    def execute_values_pages(self, cr, sql: str, rows: list, page_size: int = 1000):
+        # execute_values() one page at a time, refreshing any needed AMQP heartbeats in between.
+        for start in range(0, len(rows), page_size):
+            if start > 0:
+                self.amqp.process_data_events()
+            execute_values(cr, sql, rows[start:start + page_size], page_size=page_size)
         return
 
     def handle_experiment_trial(self, model_experiment_id: int, novelty_description: dict,
@@ -1242,8 +2444,8 @@ class TA1:
                                                        novelty_visibility))
         experiment_trial_id = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('INSERT INTO experiment_trial (model_experiment_id, trial, novelty, '
                            'novelty_visibility, difficulty, novelty_description, is_active, '
                            'hint_level) '
@@ -1257,14 +2459,13 @@ class TA1:
                             is_active,
                             hint_level,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
                     row = cr.fetchone()
                     if row is not None:
                         experiment_trial_id = row[0]
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the experiment_trial.")
@@ -1283,22 +2484,20 @@ class TA1:
                                       errormsgs=errormsgs)
         return
 
-    def add_all_trial_episodes(self, experiment_trial_id: int, trial: objects.Trial,
-                               errormsgs: list):
-        self.log.debug('add_all_trial_episodes(experiment_trial_id={}, len_episodes={})'
-                       .format(experiment_trial_id, len(trial.episodes)))
-        for i in range(len(trial.episodes)):
-            novelty_initiated = (trial.episodes[i].novelty == trial.episodes[i].trial_novelty)
-            if trial.episodes[i].trial_novelty == objects.NOVELTY_200:
+    @staticmethod
+    def trial_episode_rows(experiment_trial_id: int, trial: objects.Trial) -> list:
+        # The trial_episode rows of a trial, in the column order handle_trial_episode() uses.
+        rows = list()
+        for episode in trial.episodes:
+            novelty_initiated = (episode.novelty == episode.trial_novelty)
+            if episode.trial_novelty == objects.NOVELTY_200:
                 novelty_initiated = False
-            self.handle_trial_episode(experiment_trial_id=experiment_trial_id,
-                                      episode_index=trial.episodes[i].trial_episode_index,
-                                      novelty=trial.episodes[i].novelty,
-                                      novelty_initiated=novelty_initiated,
-                                      hint_level=trial.episodes[i].hint_level,
-                                      errormsgs=errormsgs)
-
-        return
+            rows.append((experiment_trial_id,
+                         episode.trial_episode_index,
+                         episode.novelty,
+                         novelty_initiated,
+                         episode.hint_level,))
+        return rows
 
     def handle_trial_episode(self, experiment_trial_id: int, episode_index: int, novelty: int,
                              novelty_initiated: bool, hint_level: int, errormsgs: list):
@@ -1310,8 +2509,8 @@ class TA1:
                                novelty_initiated,
                                hint_level))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('INSERT INTO trial_episode (experiment_trial_id, episode_index, '
                            'novelty, novelty_initiated, hint_level) VALUES (%s, %s, %s, %s, %s);')
                     data = (experiment_trial_id,
@@ -1320,11 +2519,10 @@ class TA1:
                             novelty_initiated,
                             hint_level,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the trial_episode.")
@@ -1333,18 +2531,17 @@ class TA1:
     def start_experiment_trial(self, experiment_trial_id: int, errormsgs: list):
         self.log.debug('start_experiment_trial(experiment_trial_id={})'.format(experiment_trial_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE experiment_trial SET is_active=%s, utc_stamp_started=NOW(), '
                            'utc_last_updated=NOW() WHERE experiment_trial_id=%s;')
                     data = (True,
                             experiment_trial_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors starting the experiment_trial.")
@@ -1354,17 +2551,16 @@ class TA1:
         self.log.debug('update_experiment_trial(experiment_trial_id={})'.format(
             experiment_trial_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE experiment_trial SET utc_last_updated=NOW() '
                            'WHERE experiment_trial_id=%s;')
                     data = (experiment_trial_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the experiment_trial.")
@@ -1373,19 +2569,18 @@ class TA1:
     def end_experiment_trial(self, experiment_trial_id: int, errormsgs: list):
         self.log.debug('end_experiment_trial(experiment_trial_id={})'.format(experiment_trial_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE experiment_trial SET is_active=%s, is_complete=%s, '
                            'utc_stamp_ended=NOW(), locked_by=NULL WHERE experiment_trial_id=%s;')
                     data = (False,
                             True,
                             experiment_trial_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors ending the experiment_trial.")
@@ -1395,56 +2590,30 @@ class TA1:
         self.log.debug('lock_experiment_trial(model_experiment_id={})'.format(model_experiment_id))
         experiment_trial_id = None
         try:
-            my_uuid = str(uuid.uuid4())
-            is_locked = False
-            max_wait = 10.0
-            end_time = float(time.time()) + max_wait
-            while not is_locked and float(time.time()) < end_time:
-                with self.db_conn:
-                    with self.db_conn.cursor() as cr:
-                        sql = ('SELECT experiment_trial_id FROM experiment_trial WHERE '
-                               'model_experiment_id=%s AND is_active=%s AND is_complete=%s AND '
-                               'locked_by IS NULL ORDER BY trial LIMIT 1;')
-                        data = (model_experiment_id,
-                                False,
-                                False,)
-                        self.log.debug(cr.mogrify(sql, data))
-                        cr.execute(sql, data)
-                        row = cr.fetchone()
-                        if row is None:
-                            # There is no available trial, so no point in trying again.
-                            is_locked = True
-                        elif row is not None:
-                            ext_id = row[0]
-                            sql = ('UPDATE experiment_trial SET locked_by=%s WHERE '
-                                   'model_experiment_id=%s AND is_active=%s AND is_complete=%s AND '
-                                   'locked_by IS NULL AND experiment_trial_id=%s;')
-                            data = (my_uuid,
-                                    model_experiment_id,
-                                    False,
-                                    False,
-                                    ext_id,)
-                            cr.execute(sql, data)
-                            self.db_conn.commit()
-                            sql = ('SELECT experiment_trial_id FROM experiment_trial WHERE '
-                                   'locked_by=%s AND model_experiment_id=%s AND '
-                                   'experiment_trial_id=%s;')
-                            data = (my_uuid,
-                                    model_experiment_id,
-                                    ext_id,)
-                            cr.execute(sql, data)
-                            row = cr.fetchone()
-                            if row is not None:
-                                if row[0] is not None:
-                                    experiment_trial_id = row[0]
-                                    is_locked = True
-                            if not is_locked:
-                                self.amqp.sleep(duration=(random.random() / 2.0))
-        except psycopg2.InterfaceError as e:
-            self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
-            errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
-        except psycopg2.DatabaseError as e:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
+                    # Claim the first free trial in a single statement, trials another TA1 is
+                    # claiming right now are skipped instead of waited on.
+                    sql = ('UPDATE experiment_trial SET locked_by=%s '
+                           'WHERE experiment_trial_id=('
+                           'SELECT experiment_trial_id FROM experiment_trial WHERE '
+                           'model_experiment_id=%s AND is_active=%s AND is_complete=%s AND '
+                           'locked_by IS NULL ORDER BY trial LIMIT 1 FOR UPDATE SKIP LOCKED) '
+                           'RETURNING experiment_trial_id;')
+                    data = (str(uuid.uuid4()),
+                            model_experiment_id,
+                            False,
+                            False,)
+                    self.log.debug(cr.mogrify(sql, data))
+                    cr.execute(sql, data)
+                    row = cr.fetchone()
+                    if row is not None:
+                        experiment_trial_id = row[0]
+                    db_conn.commit()
+        except psycopg2.InterfaceError as e:
+            self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
+            errormsgs.append("Database connection unavailable, please try again in a few minutes")
+        except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors locking the experiment_trial.")
         return experiment_trial_id
@@ -1453,8 +2622,8 @@ class TA1:
         self.log.debug('set_experiment_trial_index(experiment_trial_id={})'.format(
             experiment_trial_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT trial, novelty, novelty_visibility, difficulty, hint_level, '
                            'novelty_description FROM experiment_trial '
                            'WHERE experiment_trial_id=%s;')
@@ -1489,7 +2658,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors setting the experiment_trial index in TA1.")
@@ -1497,15 +2665,12 @@ class TA1:
 
     def start_trial_episode(self, experiment_trial_id: int, episode_index: int,
                             budget_active: bool, errormsgs: list) -> int:
-        self.log.debug('start_trial_episode(experiment_trial_id={}, episode_index={}, '
-                       'budget_active={})'
-                       .format(experiment_trial_id,
-                               episode_index,
-                               budget_active))
+        self.log.debug('start_trial_episode(experiment_trial_id=%s, episode_index=%s, '
+                       'budget_active=%s)', experiment_trial_id, episode_index, budget_active)
         trial_episode_id = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT trial_episode_id FROM trial_episode '
                            'WHERE experiment_trial_id=%s AND episode_index=%s;')
                     data = (experiment_trial_id,
@@ -1519,30 +2684,33 @@ class TA1:
                         data = (budget_active,
                                 trial_episode_id,)
                         cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors starting the trial_episode.")
         return trial_episode_id
 
     def stop_trial_episode(self, trial_episode_id: int, errormsgs: list):
-        self.log.debug('stop_trial_episode(trial_episode_id={})'.format(trial_episode_id))
+        self.log.debug('stop_trial_episode(trial_episode_id=%s)', trial_episode_id)
+        # Write the rows of the episode before marking it ended.
+        self.flush_db_writes(errormsgs=errormsgs)
+        self.stop_data_prefetch()
+        if self._db_writer is not None:
+            self._db_writer.forget_trial_episode(trial_episode_id=trial_episode_id)
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE trial_episode SET utc_stamp_ended=NOW() '
                            'WHERE trial_episode_id=%s;')
                     data = (trial_episode_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors stopping the trial_episode.")
@@ -1562,8 +2730,8 @@ class TA1:
                                novelty_characterization,
                                hint_json))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE trial_episode SET novelty=%s, performance=%s, '
                            'novelty_probability=%s, novelty_threshold=%s, '
                            'novelty_characterization=%s '
@@ -1587,11 +2755,10 @@ class TA1:
                                 Json(hint_json),
                                 trial_episode_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the trial_episode.")
@@ -1601,8 +2768,8 @@ class TA1:
         self.log.debug("handle_domains()")
         domain_id_dict = dict()
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = 'SELECT name, domain_id FROM domain WHERE name=ANY(%s);'
                     data = (list(experiment_request.domain_dict.keys()),)
                     cr.execute(sql, data)
@@ -1613,7 +2780,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors collecting the domains.")
@@ -1624,8 +2790,8 @@ class TA1:
                                domain_id_dict: dict, errormsgs: list):
         self.log.debug('set_experiment_domains()')
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     for domain in list(domain_id_dict.keys()):
                         if experiment_request.domain_dict[domain]:
                             sql = ('SELECT model_experiment_id, domain_id FROM experiment_domain '
@@ -1640,11 +2806,10 @@ class TA1:
                                 data = (experiment_response.model_experiment_id,
                                         domain_id_dict[domain],)
                                 cr.execute(sql, data)
-                                self.db_conn.commit()
+                                db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the experiment domains.")
@@ -1653,8 +2818,8 @@ class TA1:
     def update_experiment_end(self, model_experiment_id: int, errormsgs: list):
         self.log.debug('update_experiment_end(model_experiment_id={})'.format(model_experiment_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT COUNT(*) FROM experiment_trial WHERE '
                            'model_experiment_id=%s AND is_complete=%s;')
                     data = (model_experiment_id,
@@ -1676,14 +2841,13 @@ class TA1:
                         data = (False,
                                 model_experiment_id,)
                         cr.execute(sql, data)
-                        self.db_conn.commit()
+                        db_conn.commit()
 
                         # Publish this experiment for a full analysis.
                         self.publish_analysis(model_experiment_id=model_experiment_id)
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the experiment.")
@@ -1692,8 +2856,8 @@ class TA1:
     def refresh_dataset_in_cache(self, dataset_id: int, errormsgs: list):
         self.log.debug('refresh_dataset_in_cache(dataset_id={})'.format(dataset_id))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT domain_id, data_type, novelty, difficulty, episodes, name, '
                            'version, trial_novelty FROM dataset WHERE dataset_id=%s;')
                     data = (dataset_id,)
@@ -1720,7 +2884,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors refreshing the cached dataset.")
@@ -1730,8 +2893,8 @@ class TA1:
                        errormsgs: list):
         self.log.debug('get_dataset_id()')
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT dataset_id FROM dataset WHERE novelty=%s AND data_type=%s '
                            'AND domain_id=%s AND difficulty=%s and trial_novelty=%s;')
                     data = (novel,
@@ -1763,7 +2926,7 @@ class TA1:
                                 t_nov,)
                         self.log.debug(cr.mogrify(sql, data))
                         cr.execute(sql, data)
-                        self.db_conn.commit()
+                        db_conn.commit()
                     sql = ('SELECT dataset_id, episodes, name, version FROM dataset WHERE '
                            'novelty=%s AND data_type=%s AND domain_id=%s AND difficulty=%s '
                            'AND trial_novelty=%s ORDER BY version DESC;')
@@ -1790,7 +2953,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors gathering the dataset IDs.")
@@ -2017,8 +3179,8 @@ class TA1:
         self.log.debug('get_dataset_episodes(dataset_id={})'.format(dataset_id))
         episodes = 0
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = 'SELECT count(*) FROM episode WHERE dataset_id=%s;'
                     data = (dataset_id,)
                     cr.execute(sql, data)
@@ -2029,7 +3191,6 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors gathering the dataset episodes count.")
@@ -2039,144 +3200,95 @@ class TA1:
         self.log.debug('update_dataset_episodes(dataset_id={}, episodes={})'.format(dataset_id,
                                                                                     episodes))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = 'UPDATE dataset SET episodes=%s WHERE dataset_id=%s'
                     data = (episodes,
                             dataset_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the dataset episodes count.")
         return
 
-    def lock_dataset(self, dataset_id: int, my_uuid: str, errormsgs: list):
-        self.log.debug('lock_dataset(dataset_id={}, my_uuid={})'.format(dataset_id, my_uuid))
-        try:
-            is_locked = False
-            max_wait = 30.0
-            end_time = float(time.time()) + max_wait
-            while not is_locked and float(time.time()) < end_time:
-                with self.db_conn:
-                    with self.db_conn.cursor() as cr:
-                        sql = ('UPDATE dataset SET locked_by=%s, locked_at=NOW() WHERE '
-                               'dataset_id=%s AND ( locked_by IS NULL OR '
-                               'locked_at<(NOW() - interval \'10 seconds\') ) '
-                               'RETURNING locked_by;')
-                        data = (my_uuid,
-                                dataset_id,)
-                        self.log.debug(cr.mogrify(sql, data))
-                        cr.execute(sql, data)
-                        row = cr.fetchone()
-                        if row is not None:
-                            if row[0] is not None:
-                                if my_uuid == row[0]:
-                                    is_locked = True
-                        if not is_locked:
-                            sql = ('SELECT locked_by, locked_at, NOW() FROM dataset WHERE '
-                                   'dataset_id=%s;')
-                            data = (dataset_id,)
-                            cr.execute(sql, data)
-                            row = cr.fetchone()
-                            self.log.debug('not locked... locked_by={}, locked_at={} NOW()={} '
-                                           'remaining={}'.format(row[0],
-                                                                 str(row[1]),
-                                                                 str(row[2]),
-                                                                 end_time - time.time()))
-                            self.amqp.sleep(duration=(random.random() / 2.0))
-            # The dataset is now locked and we may modify it.
-            if not is_locked:
-                # The dataset took too long to lock, throw an exception.
-                raise objects.AiqExperimentException('Could not lock the dataset.')
-        except psycopg2.InterfaceError as e:
-            self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
-            errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
-        except psycopg2.DatabaseError as e:
-            self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
-            errormsgs.append("There were errors locking the dataset.")
-        return
+    @contextlib.contextmanager
+    def lock_dataset(self, dataset_id: int):
+        """Holds a transaction level advisory lock on the dataset while the block runs, waiting at
+        most _DATASET_LOCK_WAIT seconds for it.  Waiting TA1s are woken by postgres when the lock
+        is released, and the lock of a TA1 that dies is released with its connection.
 
-    def unlock_dataset(self, dataset_id: int, my_uuid: str, errormsgs: list):
-        self.log.debug('unlock_dataset(dataset_id={}, my_uuid={})'.format(dataset_id, my_uuid))
-        try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
-                    sql = ('UPDATE dataset SET locked_by=NULL WHERE '
-                           'dataset_id=%s AND locked_by=%s;')
-                    data = (dataset_id,
-                            my_uuid,)
+        Raises
+        ------
+        objects.AiqExperimentException
+            The dataset could not be locked in time.
+        """
+        self.log.debug('lock_dataset(dataset_id={})'.format(dataset_id))
+        with self.db_pool.connection() as db_conn:
+            with db_conn.cursor() as cr:
+                sql = 'SET LOCAL lock_timeout=%s;'
+                data = ('{}ms'.format(int(self._DATASET_LOCK_WAIT * 1000)),)
+                cr.execute(sql, data)
+                sql = 'SELECT pg_advisory_xact_lock(%s, %s);'
+                data = (self._DATASET_LOCK_CLASS,
+                        dataset_id,)
+                try:
                     cr.execute(sql, data)
-        except psycopg2.InterfaceError as e:
-            self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
-            errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
-        except psycopg2.DatabaseError as e:
-            self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
-            errormsgs.append("There were errors unlocking the dataset.")
-        return
+                except psycopg2.OperationalError as e:
+                    if e.pgcode == psycopg2.errorcodes.LOCK_NOT_AVAILABLE:
+                        # The dataset took too long to lock, throw an exception.
+                        raise objects.AiqExperimentException('Could not lock the dataset.')
+                    raise
+            yield
 
     def add_episode_to_dataset(self, dataset_id: int, seed: int, errormsgs: list) -> int:
         self.log.debug('add_episode_to_dataset( dataset_id={}, seed={} )'.format(dataset_id,
                                                                                  seed))
         episode_index = -1
         try:
-            # with self.db_conn:
-            #     with self.db_conn.cursor() as cr:
-            # First we need to lock the dataset to add a new episode and update the count.
-            my_uuid = str(uuid.uuid4())
-            self.lock_dataset(dataset_id=dataset_id,
-                              my_uuid=my_uuid,
-                              errormsgs=errormsgs)
-
-            # Refresh the dataset cache while locked.
-            self.refresh_dataset_in_cache(dataset_id=dataset_id,
-                                          errormsgs=errormsgs)
-
-            # Now get the episode count.
-            episodes = self.get_dataset_episodes(dataset_id=dataset_id,
-                                                 errormsgs=errormsgs)
-            episode_index = episodes
-
-            # Add the new episode to the episode_cache so we can then add episode_id.
-            self.add_episode_to_cache(dataset_id=dataset_id,
-                                      episode_index=episode_index)
-            episodes += 1
-
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
-                    # Insert the new episode.
-                    sql = ('INSERT INTO episode (dataset_id, episode_index, size, seed) '
-                           'VALUES (%s, %s, %s, %s) RETURNING episode_id;')
-                    data = (dataset_id,
-                            episode_index,
-                            0,
-                            seed)
-                    cr.execute(sql, data)
-                    row = cr.fetchone()
-                    if row is not None:
-                        episode_id = row[0]
-                        self.episode_cache[dataset_id][episode_index]['episode_id'] = episode_id
-                        self.episode_cache[dataset_id][episode_index]['size'] = 0
+            # First we need to lock the dataset to add a new episode and update the count, the
+            # lock is released at the end of the block.
+            with self.lock_dataset(dataset_id=dataset_id):
+                # Refresh the dataset cache while locked.
+                self.refresh_dataset_in_cache(dataset_id=dataset_id,
+                                              errormsgs=errormsgs)
 
-            # Update the dataset with new episodes value.
-            self.update_dataset_episodes(dataset_id=dataset_id,
-                                         episodes=episodes,
-                                         errormsgs=errormsgs)
+                # Now get the episode count.
+                episodes = self.get_dataset_episodes(dataset_id=dataset_id,
+                                                     errormsgs=errormsgs)
+                episode_index = episodes
+
+                # Add the new episode to the episode_cache so we can then add episode_id.
+                self.add_episode_to_cache(dataset_id=dataset_id,
+                                          episode_index=episode_index)
+                episodes += 1
+
+                with self.db_pool.connection() as db_conn:
+                    with db_conn.cursor() as cr:
+                        # Insert the new episode.
+                        sql = ('INSERT INTO episode (dataset_id, episode_index, size, seed) '
+                               'VALUES (%s, %s, %s, %s) RETURNING episode_id;')
+                        data = (dataset_id,
+                                episode_index,
+                                0,
+                                seed)
+                        cr.execute(sql, data)
+                        row = cr.fetchone()
+                        if row is not None:
+                            episode_id = row[0]
+                            self.episode_cache[dataset_id][episode_index]['episode_id'] = episode_id
+                            self.episode_cache[dataset_id][episode_index]['size'] = 0
 
-            # Finally, unlock the dataset row.
-            self.unlock_dataset(dataset_id=dataset_id,
-                                my_uuid=my_uuid,
-                                errormsgs=errormsgs)
+                # Update the dataset with new episodes value.
+                self.update_dataset_episodes(dataset_id=dataset_id,
+                                             episodes=episodes,
+                                             errormsgs=errormsgs)
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors gathering the dataset episodes count.")
@@ -2187,8 +3299,8 @@ class TA1:
         self.add_episode_to_cache(dataset_id=dataset_id,
                                   episode_index=episode_index)
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT episode_id, size FROM episode WHERE '
                            'dataset_id=%s AND episode_index=%s;')
                     data = (dataset_id,
@@ -2201,19 +3313,17 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors gathering the episode IDs.")
         return
 
     def load_data_to_cache(self, episode_id: int, at_data_index: int, errormsgs: list):
-        self.log.debug('load_data_to_cache( episode_id={}, at_data_index={} )'.format(
-            episode_id,
-            at_data_index))
+        self.log.debug('load_data_to_cache( episode_id=%s, at_data_index=%s )', episode_id,
+                       at_data_index)
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT data_index, feature_vector, label, data_id FROM data WHERE '
                            'episode_id=%s AND data_index BETWEEN %s AND %s '
                            'ORDER BY data_index;')
@@ -2234,26 +3344,81 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors loading data to the cache.")
         return
 
+    def start_data_prefetch(self, episode_id: int, at_data_index: int):
+        self.log.debug('start_data_prefetch(episode_id=%s, at_data_index=%s)', episode_id,
+                       at_data_index)
+        self.stop_data_prefetch()
+        self._data_prefetch = RecordedDataPrefetcher(log=self.log,
+                                                     db_pool=self.db_pool,
+                                                     episode_id=episode_id,
+                                                     at_data_index=at_data_index,
+                                                     chunk_size=self._DATA_CACHE_SIZE)
+        self._data_prefetch.start()
+        return
+
+    def stop_data_prefetch(self):
+        if self._data_prefetch is not None:
+            self._data_prefetch.stop()
+            self._data_prefetch = None
+        return
+
+    def fill_data_cache(self, episode_id: int, at_data_index: int, errormsgs: list):
+        """Adds the next chunk of a recorded episode to the data_cache, from the prefetcher when it
+        streams this episode and with load_data_to_cache() when it cannot.
+
+        Parameters
+        ----------
+        episode_id : int
+            The episode being served.
+        at_data_index : int
+            The data_index of the next data instance the TA2 gets.
+        errormsgs : list
+            Errors loading the data are added to this list.
+        """
+        self.log.debug('fill_data_cache( episode_id=%s, at_data_index=%s )', episode_id,
+                       at_data_index)
+        # The rows before next_data_index are already in the data_cache.
+        prefetch = self._data_prefetch
+        if prefetch is None or prefetch.episode_id != episode_id or \
+                at_data_index > prefetch.next_data_index:
+            self.start_data_prefetch(episode_id=episode_id,
+                                     at_data_index=at_data_index)
+            prefetch = self._data_prefetch
+        chunk = prefetch.take()
+        if chunk is None:
+            self.log.warning('Prefetching episode {} failed, loading it directly.'.format(
+                episode_id))
+            self.stop_data_prefetch()
+            self.load_data_to_cache(episode_id=episode_id,
+                                    at_data_index=at_data_index,
+                                    errormsgs=errormsgs)
+            return
+        if episode_id not in self.data_cache:
+            self.data_cache[episode_id] = dict()
+        self.data_cache[episode_id].update(chunk)
+        return
+
     def update_episode_size(self, episode_id: int, size: int, errormsgs: list):
-        self.log.debug('update_episode_size(episode_id={}, size={})'.format(episode_id, size))
+        self.log.debug('update_episode_size(episode_id=%s, size=%s)', episode_id, size)
+        if self._db_writer is not None:
+            self._db_writer.set_episode_size(episode_id=episode_id, size=size)
+            return
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = 'UPDATE episode SET size=%s WHERE episode_id=%s'
                     data = (size,
                             episode_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the episode size..")
@@ -2261,15 +3426,27 @@ class TA1:
 
     def create_data_instance(self, episode_id: int, feature_vector: dict, label: dict,
                              data_index: int, errormsgs: list) -> int:
-        self.log.debug('create_data_instance( episode_id={}, feature_vector={}, label={}, '
-                       'data_index={} )'.format(episode_id,
-                                                str(feature_vector),
-                                                str(label),
-                                                data_index))
+        self.log.debug('create_data_instance( episode_id=%s, feature_vector=%s, label=%s, '
+                       'data_index=%s )', episode_id, objects.LogSummary(feature_vector),
+                       objects.LogSummary(label), data_index)
         data_id = -1
+        if self._db_writer is not None:
+            data_id = self.next_db_id(sequence='data_data_id_seq', errormsgs=errormsgs)
+            if data_id is None:
+                return -1
+            # The feature vector is not changed after it is sent, so a shallow copy without the
+            # image is enough for the write behind.
+            tmp_fv = dict(feature_vector)
+            tmp_fv.pop('image', None)
+            self._db_writer.add_data(data_id=data_id,
+                                     episode_id=episode_id,
+                                     feature_vector=tmp_fv,
+                                     label=label,
+                                     data_index=data_index)
+            return data_id
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     tmp_fv = copy.deepcopy(feature_vector)
                     if 'image' in tmp_fv:
                         del tmp_fv['image']
@@ -2284,23 +3461,36 @@ class TA1:
                     row = cr.fetchone()
                     if row is not None:
                         data_id = row[0]
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the data instance.")
         return data_id
 
     def create_test_instance(self, data_id: int, trial_episode_id: int, errormsgs: list):
-        self.log.debug('create_test_instance( data_id={}, trial_episode_id={} )'.format(
-            data_id, trial_episode_id))
+        self.log.debug('create_test_instance( data_id=%s, trial_episode_id=%s )', data_id,
+                       trial_episode_id)
         test_instance_id = None
+        if self._db_writer is not None:
+            # Without its data row (allocating the ids failed) the batch could not be written.
+            if data_id is None or data_id < 0:
+                return None
+            test_instance_id = self._db_writer.get_test_instance_id(
+                data_id=data_id, trial_episode_id=trial_episode_id)
+            if test_instance_id is None:
+                test_instance_id = self.next_db_id(sequence='test_instance_test_instance_id_seq',
+                                                   errormsgs=errormsgs)
+                if test_instance_id is not None:
+                    self._db_writer.add_test_instance(test_instance_id=test_instance_id,
+                                                      data_id=data_id,
+                                                      trial_episode_id=trial_episode_id)
+            return test_instance_id
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT test_instance_id FROM test_instance WHERE '
                            'data_id=%s AND trial_episode_id=%s;')
                     data = (data_id,
@@ -2318,11 +3508,10 @@ class TA1:
                         row = cr.fetchone()
                         if row is not None:
                             test_instance_id = row[0]
-                        self.db_conn.commit()
+                        db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the test_instance.")
@@ -2334,9 +3523,14 @@ class TA1:
                        'stamp_delivered={})'.format(test_instance_id,
                                                     remote_stamp_arrived,
                                                     remote_stamp_delivered))
+        if self._db_writer is not None:
+            self._db_writer.update_test_instance(test_instance_id=test_instance_id,
+                                                 remote_stamp_arrived=remote_stamp_arrived,
+                                                 remote_stamp_delivered=remote_stamp_delivered)
+            return
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('UPDATE test_instance SET utc_stamp_received=NOW(), '
                            'utc_remote_stamp_arrived=%s, utc_remote_stamp_replied=%s '
                            'WHERE test_instance_id=%s;')
@@ -2344,11 +3538,10 @@ class TA1:
                             remote_stamp_delivered,
                             test_instance_id,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors updating the test_instance.")
@@ -2362,9 +3555,15 @@ class TA1:
                                label_prediction,
                                performance,
                                str(feedback)))
+        if self._db_writer is not None:
+            self._db_writer.add_test_label(test_instance_id=test_instance_id,
+                                           label_prediction=label_prediction,
+                                           performance=performance,
+                                           feedback=feedback)
+            return
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     if feedback is None:
                         sql = ('INSERT INTO test_label (test_instance_id, label_prediction, '
                                'performance) '
@@ -2382,11 +3581,10 @@ class TA1:
                                 performance,
                                 Json(feedback),)
                         cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the test_label.")
@@ -2397,8 +3595,8 @@ class TA1:
         self.log.debug('insert_sota_experiment(domain_id={}, model_experiment_id={}, vhost={}, '
                        'experiment)'.format(domain_id, model_experiment_id, vhost))
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('INSERT INTO sota_experiments (experiment_json, domain_id, version, '
                            'model_experiment_id, vhost) '
                            'VALUES (%s, %s, %s, %s, %s);')
@@ -2408,11 +3606,10 @@ class TA1:
                             model_experiment_id,
                             vhost,)
                     cr.execute(sql, data)
-                    self.db_conn.commit()
+                    db_conn.commit()
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the SOTA experiment.")
@@ -2423,8 +3620,8 @@ class TA1:
         self.log.debug('get_sota_experiment(domain_id={}, vhost={})'.format(domain_id, vhost))
         experiment = None
         try:
-            with self.db_conn:
-                with self.db_conn.cursor() as cr:
+            with self.db_pool.connection() as db_conn:
+                with db_conn.cursor() as cr:
                     sql = ('SELECT sota_experiments_id FROM sota_experiments WHERE '
                            'version=%s AND '
                            'domain_id=%s AND '
@@ -2445,7 +3642,7 @@ class TA1:
                         data = (sota_uuid,
                                 sota_experiments_id,)
                         cr.execute(sql, data)
-                        self.db_conn.commit()
+                        db_conn.commit()
                         sql = ('SELECT experiment_json, model_experiment_id '
                                'FROM sota_experiments WHERE '
                                'sota_experiments_id=%s AND '
@@ -2466,15 +3663,14 @@ class TA1:
         except psycopg2.InterfaceError as e:
             self.log.error("psycopg2.InterfaceError: " + str(e.pgerror))
             errormsgs.append("Database connection unavailable, please try again in a few minutes")
-            self.reconnect_db()
         except psycopg2.DatabaseError as e:
             self.log.error("psycopg2.DatabaseError: " + str(e.pgerror))
             errormsgs.append("There were errors inserting the SOTA experiment.")
         return experiment
 
     def get_novelty_indicator_value(self):
-        self.log.debug('get_novelty_indicator_value() visibility={} initiated={}'.format(
-            self.novelty_visibility, self.novelty_initiated))
+        self.log.debug('get_novelty_indicator_value() visibility=%s initiated=%s',
+                       self.novelty_visibility, self.novelty_initiated)
         novelty_indicator = None
 
         # Don't send any info.
@@ -2507,7 +3703,7 @@ class TA1:
         return score
 
     def get_episode_dataset_id(self, episode_id: int, episode_index: int):
-        self.log.debug('get_episode_dataset_id({}, {})'.format(episode_id, episode_index))
+        self.log.debug('get_episode_dataset_id(%s, %s)', episode_id, episode_index)
         dataset_id = -1
         for d_id_key in list(self.episode_cache.keys()):
             if episode_index in self.episode_cache[d_id_key]:
@@ -2597,9 +3793,10 @@ class TA1:
         if self.is_demo:
             return self.build_demo_sail_on_experiment(domain_id=domain_id,
                                                       data_source=data_source)
-        training_seeds = list()
+        # Live training episodes all get different seeds.
+        training_seeds = UniqueDraw(low=0, high=objects.SEED_NUM_TRAINING)
         training_episodes = list()
-        episode_indexes = list()
+        episode_indexes = None
         domain = self.domain_names[domain_id]
         num_episodes = self._ep_by_domain[domain][objects.DTYPE_TRAIN]
         # Build an even split between the different difficulties.
@@ -2622,19 +3819,16 @@ class TA1:
                     available_episodes = \
                         self.dataset_cache[domain_id][objects.DTYPE_TRAIN][objects.NOVELTY_200][
                             difficulty][objects.NOVELTY_200]['episodes']
-                    episode_indexes = list(range(available_episodes))
+                    episode_indexes = UniqueDraw(low=0, high=available_episodes - 1)
                 for i in list(range(type_episodes[difficulty])):
                     episode_index = None
                     # Guarantee unique seeds for every training episode.
-                    seed = random.randint(0, objects.SEED_NUM_TRAINING)
                     # We only care about this for live training.
                     if data_source == objects.SOURCE_LIVE:
-                        while seed in training_seeds:
-                            seed = random.randint(0, objects.SEED_NUM_TRAINING)
-                        training_seeds.append(seed)
+                        seed = training_seeds.draw()
                     else:
-                        episode_index = random.choice(episode_indexes)
-                        episode_indexes.remove(episode_index)
+                        seed = random.randint(0, objects.SEED_NUM_TRAINING)
+                        episode_index = episode_indexes.draw()
                     ep = objects.Episode(novelty=objects.NOVELTY_200,
                                          difficulty=difficulty,
                                          seed=seed,
@@ -2645,7 +3839,7 @@ class TA1:
                                          use_image=self._image_by_domain[domain],
                                          hint_level=objects.HINT_NONE,
                                          phase=self._PHASE)
-                    training_episodes.append(copy.deepcopy(ep))
+                    training_episodes.append(ep)
             # Give training_episodes a good shuffle before putting it in the Training object.
             random.shuffle(training_episodes)
         else:
@@ -2674,13 +3868,12 @@ class TA1:
                                                                 size=novelty_eps_count)
                 for i in list(range(novelty_eps_count)):
                     # Guarantee unique seeds for every training episode.
-                    seed = random.randint(0, objects.SEED_NUM_TRAINING)
                     # We only care about this for live training.
                     if data_source == objects.SOURCE_LIVE:
-                        while seed in training_seeds:
-                            seed = random.randint(0, objects.SEED_NUM_TRAINING)
-                        training_seeds.append(seed)
+                        seed = training_seeds.draw()
                         episode_index = None
+                    else:
+                        seed = random.randint(0, objects.SEED_NUM_TRAINING)
                     ep = objects.Episode(novelty=objects.NOVELTY_200,
                                          difficulty=difficulty,
                                          seed=seed,
@@ -2692,7 +3885,7 @@ class TA1:
                                          use_image=self._image_by_domain[domain],
                                          hint_level=objects.HINT_NONE,
                                          phase=self._PHASE)
-                    training_episodes.append(copy.deepcopy(ep))
+                    training_episodes.append(ep)
                     if data_source == objects.SOURCE_RECORDED:
                         episode_index += 1
 
@@ -2707,47 +3900,20 @@ class TA1:
                 testing_novelty.append(n)
 
         novelty_groups = list()
-        testing_seeds = list()
-        episode_indexes = dict()
         num_episodes = self._ep_by_domain[domain][objects.DTYPE_TEST]
         pre_novel_episodes = self._ep_by_domain[domain]['pre-novel']
         data_type = objects.DTYPE_TEST
         if data_source == objects.SOURCE_LIVE:
             data_type = objects.DTYPE_LIVE_TEST
-        else:
-            episode_indexes[objects.NOVELTY_200] = dict()
-            for d in self._server_difficulty:
-                episode_indexes[objects.NOVELTY_200][d] = dict()
-                for n in testing_novelty:
-                    available_episodes = self.dataset_cache[domain_id][objects.DTYPE_TEST][
-                        objects.NOVELTY_200][d][n]['episodes']
-                    episode_indexes[objects.NOVELTY_200][d][n] = list(range(available_episodes))
         novelty_diff = list()
 
         for n in testing_novelty:
             for d in self._server_difficulty:
                 novelty_diff.append((n, d))
-                if data_source == objects.SOURCE_RECORDED and domain != objects.DOMAIN_SMARTENV:
-                    if objects.NOVELTY_200 not in episode_indexes:
-                        episode_indexes[objects.NOVELTY_200] = dict()
-                    if d not in episode_indexes[objects.NOVELTY_200]:
-                        episode_indexes[objects.NOVELTY_200][d] = dict()
-                    if n not in episode_indexes:
-                        episode_indexes[n] = dict()
-                    if d not in episode_indexes[n]:
-                        episode_indexes[n][d] = dict()
-                    if n not in episode_indexes[objects.NOVELTY_200][d]:
-                        size = self.dataset_cache[domain_id][objects.DTYPE_TEST][
-                            objects.NOVELTY_200][d][n]['episodes']
-                        episode_indexes[objects.NOVELTY_200][d][n] = list(range(size))
-                    if n not in episode_indexes[n][d]:
-                        size = self.dataset_cache[domain_id][objects.DTYPE_TEST][
-                            n][d][n]['episodes']
-                        episode_indexes[n][d][n] = list(range(size))
 
         for novelty_visibility in self._server_novelty_visibility:
             for novelty, difficulty in novelty_diff:
-                hint_list = copy.deepcopy(self._server_hint)
+                hint_list = list(self._server_hint)
                 if novelty == objects.NOVELTY_200:
                     hint_list = list([objects.HINT_NONE])
                 if novelty_visibility == objects.NOVELTY_VISIBILITY_0:
@@ -2762,9 +3928,9 @@ class TA1:
                         n_level = objects.SEED_NUM_TESTING
 
                     trials = list()
-                    # Reset testing seeds list for each config permutation.
-                    del testing_seeds
-                    testing_seeds = list()
+                    # Reset testing seeds for each config permutation.
+                    testing_seeds = UniqueDraw(low=objects.SEED_NUM_TRAINING,
+                                               high=objects.SEED_NUM_TESTING)
                     for t in list(range(self._SAIL_ON_TRIALS)):
                         ep_before_nov, ep_n_level, ep_n_zero = \
                             self.calculate_episode_numbers_for_domain(
@@ -2781,6 +3947,9 @@ class TA1:
                         episode_index_z = None
                         episode_index_l = None
                         episode_index = None
+                        # Recorded episodes are drawn without replacement within each trial.
+                        episode_indexes_z = None
+                        episode_indexes_l = None
                         if data_source == objects.SOURCE_RECORDED:
                             if domain == objects.DOMAIN_SMARTENV:
                                 episode_index_z = self.select_first_episode_index(
@@ -2800,31 +3969,27 @@ class TA1:
                             else:
                                 size = self.dataset_cache[domain_id][objects.DTYPE_TEST][
                                     objects.NOVELTY_200][difficulty][novelty]['episodes']
-                                episode_indexes[objects.NOVELTY_200][difficulty][novelty] = \
-                                    list(range(size))
+                                episode_indexes_z = UniqueDraw(low=0, high=size - 1)
                                 size = self.dataset_cache[domain_id][objects.DTYPE_TEST][novelty][
                                     difficulty][novelty]['episodes']
-                                episode_indexes[novelty][difficulty][novelty] = list(range(size))
+                                episode_indexes_l = UniqueDraw(low=0, high=size - 1)
+                                # Without novelty both come from the same dataset.
+                                if novelty == objects.NOVELTY_200:
+                                    episode_indexes_l = episode_indexes_z
                         trial_episodes = list()
                         for i in list(range(ep_before_nov)):
                             # Guarantee unique seeds for every training episode.
-                            seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                  objects.SEED_NUM_TESTING)
                             # We only care about this for live training.
                             if data_source == objects.SOURCE_LIVE:
-                                while seed in testing_seeds:
-                                    seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                          objects.SEED_NUM_TESTING)
-                                testing_seeds.append(seed)
+                                seed = testing_seeds.draw()
                             else:
+                                seed = random.randint(objects.SEED_NUM_TRAINING,
+                                                      objects.SEED_NUM_TESTING)
                                 if domain == objects.DOMAIN_SMARTENV:
                                     episode_index = episode_index_z
                                     episode_index_z += 1
                                 else:
-                                    episode_index = random.choice(episode_indexes[
-                                        objects.NOVELTY_200][difficulty][novelty])
-                                    episode_indexes[objects.NOVELTY_200][difficulty][
-                                        novelty].remove(episode_index)
+                                    episode_index = episode_indexes_z.draw()
                             ep = objects.Episode(novelty=objects.NOVELTY_200,
                                                  difficulty=difficulty,
                                                  seed=seed,
@@ -2835,7 +4000,7 @@ class TA1:
                                                  use_image=self._image_by_domain[domain],
                                                  hint_level=objects.HINT_NONE,
                                                  phase=self._PHASE)
-                            trial_episodes.append(copy.deepcopy(ep))
+                            trial_episodes.append(ep)
                         # Only shuffle the episodes if not smartenv.
                         if domain != objects.DOMAIN_SMARTENV:
                             random.shuffle(trial_episodes)
@@ -2848,23 +4013,17 @@ class TA1:
                             # novelty has been initiated (big red button).
                             episode_index = None
                             # Guarantee unique seeds for every training episode.
-                            seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                  objects.SEED_NUM_TESTING)
                             # We only care about this for live training.
                             if data_source == objects.SOURCE_LIVE:
-                                while seed in testing_seeds:
-                                    seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                          objects.SEED_NUM_TESTING)
-                                testing_seeds.append(seed)
+                                seed = testing_seeds.draw()
                             else:
+                                seed = random.randint(objects.SEED_NUM_TRAINING,
+                                                      objects.SEED_NUM_TESTING)
                                 if domain == objects.DOMAIN_SMARTENV:
                                     episode_index = episode_index_l
                                     episode_index_l += 1
                                 else:
-                                    episode_index = random.choice(episode_indexes[novelty][
-                                                                      difficulty][novelty])
-                                    episode_indexes[novelty][difficulty][novelty].remove(
-                                        episode_index)
+                                    episode_index = episode_indexes_l.draw()
                             ep = objects.Episode(novelty=novelty,
                                                  difficulty=difficulty,
                                                  seed=seed,
@@ -2875,30 +4034,23 @@ class TA1:
                                                  use_image=self._image_by_domain[domain],
                                                  hint_level=hint_level,
                                                  phase=self._PHASE)
-                            trial_episodes.append(copy.deepcopy(ep))
+                            trial_episodes.append(ep)
 
                         temp_episodes = list()
                         for i in list(range(ep_n_zero)):
                             episode_index = None
                             # Guarantee unique seeds for every training episode.
-                            seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                  objects.SEED_NUM_TESTING)
                             # We only care about this for live training.
                             if data_source == objects.SOURCE_LIVE:
-                                while seed in testing_seeds:
-                                    seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                          objects.SEED_NUM_TESTING)
-                                testing_seeds.append(seed)
+                                seed = testing_seeds.draw()
                             else:
+                                seed = random.randint(objects.SEED_NUM_TRAINING,
+                                                      objects.SEED_NUM_TESTING)
                                 if domain == objects.DOMAIN_SMARTENV:
                                     episode_index = episode_index_z
                                     episode_index_z += 1
                                 else:
-                                    episode_index = random.choice(episode_indexes[
-                                                                      objects.NOVELTY_200][
-                                                                      difficulty][novelty])
-                                    episode_indexes[objects.NOVELTY_200][difficulty][
-                                        novelty].remove(episode_index)
+                                    episode_index = episode_indexes_z.draw()
                             ep = objects.Episode(novelty=objects.NOVELTY_200,
                                                  difficulty=difficulty,
                                                  seed=seed,
@@ -2909,7 +4061,7 @@ class TA1:
                                                  use_image=self._image_by_domain[domain],
                                                  hint_level=objects.HINT_NONE,
                                                  phase=self._PHASE)
-                            temp_episodes.append(copy.deepcopy(ep))
+                            temp_episodes.append(ep)
                         # We remove 1 from ep_n_level for the episode immediately after the big red
                         # button is pressed.  Only do this if ep_n_level is greater than 0 and
                         # self._testing_novelty_p2 is greater than 0.0.
@@ -2918,23 +4070,17 @@ class TA1:
                         for i in list(range(ep_n_level)):
                             episode_index = None
                             # Guarantee unique seeds for every training episode.
-                            seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                  objects.SEED_NUM_TESTING)
                             # We only care about this for live training.
                             if data_source == objects.SOURCE_LIVE:
-                                while seed in testing_seeds:
-                                    seed = random.randint(objects.SEED_NUM_TRAINING,
-                                                          objects.SEED_NUM_TESTING)
-                                testing_seeds.append(seed)
+                                seed = testing_seeds.draw()
                             else:
+                                seed = random.randint(objects.SEED_NUM_TRAINING,
+                                                      objects.SEED_NUM_TESTING)
                                 if domain == objects.DOMAIN_SMARTENV:
                                     episode_index = episode_index_l
                                     episode_index_l += 1
                                 else:
-                                    episode_index = random.choice(episode_indexes[novelty][
-                                                                      difficulty][novelty])
-                                    episode_indexes[novelty][difficulty][novelty].remove(
-                                        episode_index)
+                                    episode_index = episode_indexes_l.draw()
                             ep = objects.Episode(novelty=novelty,
                                                  difficulty=difficulty,
                                                  seed=seed,
@@ -2945,13 +4091,12 @@ class TA1:
                                                  use_image=self._image_by_domain[domain],
                                                  hint_level=hint_level,
                                                  phase=self._PHASE)
-                            temp_episodes.append(copy.deepcopy(ep))
+                            temp_episodes.append(ep)
                         # Only shuffle the episodes if not smartenv.
                         if domain != objects.DOMAIN_SMARTENV:
                             random.shuffle(temp_episodes)
 
-                        for ep in temp_episodes:
-                            trial_episodes.append(copy.deepcopy(ep))
+                        trial_episodes.extend(temp_episodes)
 
                         for i in range(len(trial_episodes)):
                             # Iterate through and give day offsets for smartenv domain.
@@ -2965,9 +4110,9 @@ class TA1:
                                               novelty_visibility=novelty_visibility,
                                               difficulty=difficulty,
                                               hint_level=hint_level)
-                        trials.append(copy.deepcopy(trial))
+                        trials.append(trial)
                     novelty_group = objects.NoveltyGroup(trials=trials)
-                    novelty_groups.append(copy.deepcopy(novelty_group))
+                    novelty_groups.append(novelty_group)
 
         new_experiment = objects.Experiment(training=training,
                                             novelty_groups=novelty_groups,
@@ -3003,7 +4148,7 @@ class TA1:
                                      use_image=self._image_by_domain[domain],
                                      hint_level=objects.HINT_NONE,
                                      phase=self._PHASE)
-                training_episodes.append(copy.deepcopy(ep))
+                training_episodes.append(ep)
 
             for i in range(len(training_episodes)):
                 training_episodes[i].trial_episode_index = i
@@ -3031,7 +4176,7 @@ class TA1:
                                              use_image=self._image_by_domain[domain],
                                              hint_level=objects.HINT_NONE,
                                              phase=self._PHASE)
-                        trial_episodes.append(copy.deepcopy(ep))
+                        trial_episodes.append(ep)
                     for i in range(len(trial_episodes)):
                         trial_episodes[i].trial_episode_index = i
                     trial = objects.Trial(episodes=trial_episodes,
@@ -3039,9 +4184,9 @@ class TA1:
                                           novelty_visibility=visibility,
                                           difficulty=difficulty,
                                           hint_level=objects.HINT_NONE)
-                    novelty_trials.append(copy.deepcopy(trial))
+                    novelty_trials.append(trial)
             novelty_group = objects.NoveltyGroup(trials=novelty_trials)
-            novelty_groups.append(copy.deepcopy(novelty_group))
+            novelty_groups.append(novelty_group)
             new_experiment = objects.Experiment(training=training,
                                                 novelty_groups=novelty_groups,
                                                 budget=self._budget_by_domain[domain],
@@ -3063,7 +4208,7 @@ class TA1:
                                      use_image=self._image_by_domain[domain],
                                      hint_level=objects.HINT_NONE,
                                      phase=self._PHASE)
-                training_episodes.append(copy.deepcopy(ep))
+                training_episodes.append(ep)
             for i in range(len(training_episodes)):
                 training_episodes[i].trial_episode_index = i
             training = objects.Training(episodes=training_episodes)
@@ -3088,7 +4233,7 @@ class TA1:
                                          use_image=self._image_by_domain[domain],
                                          hint_level=objects.HINT_NONE,
                                          phase=self._PHASE)
-                    trial_episodes.append(copy.deepcopy(ep))
+                    trial_episodes.append(ep)
                 for i in range(len(trial_episodes)):
                     trial_episodes[i].trial_episode_index = i
                 trial = objects.Trial(episodes=trial_episodes,
@@ -3096,9 +4241,9 @@ class TA1:
                                       novelty_visibility=visibility,
                                       difficulty=difficulty,
                                       hint_level=objects.HINT_NONE)
-                novelty_trials.append(copy.deepcopy(trial))
+                novelty_trials.append(trial)
             novelty_group = objects.NoveltyGroup(trials=novelty_trials)
-            novelty_groups.append(copy.deepcopy(novelty_group))
+            novelty_groups.append(novelty_group)
             new_experiment = objects.Experiment(training=training,
                                                 novelty_groups=novelty_groups,
                                                 budget=self._budget_by_domain[domain],
@@ -3172,19 +4317,10 @@ class TA1:
                                         errormsgs=errormsgs)
 
         if len(errormsgs) == 0:
-            # Things have gone well. Setup a new RPC queue just for this experiment and stop
-            # listening to the other "general" queues.
-            self.private_queue = objects.SERVER_RPC_QUEUE + '.{}'.format(uuid.uuid4().hex)
+            # Things have gone well. Setup a new RPC queue just for this experiment, the other
+            # "general" queues are left once max_sessions experiments are running.
+            self.open_session(callback_function=self.on_aiq_request)
             experiment_response.server_rpc_queue = self.private_queue
-            self.amqp.setup_subscribe_to_queue(
-                queue_name=self.private_queue,
-                queue_exclusive=True,
-                queue_auto_delete=True,
-                casas_events=True,
-                callback_function=self.on_aiq_request,
-                callback_full_params=True)
-            self.unsubscribe_experiment_queue()
-            self.unsubscribe_sota_queue()
         return experiment_response
 
     def setup_sail_on_experiment(self, model: objects.Model, request: objects.RequestExperiment,
@@ -3233,23 +4369,17 @@ class TA1:
                                         errormsgs=errormsgs)
 
         if len(errormsgs) == 0:
-            # Things have gone well. Setup a new RPC queue just for this experiment and stop
-            # listening to the other "general" queues.
-            self.private_queue = objects.SERVER_RPC_QUEUE + '.{}'.format(uuid.uuid4().hex)
+            # Things have gone well. Setup a new RPC queue just for this experiment, the other
+            # "general" queues are left once max_sessions experiments are running.
+            self.open_session(callback_function=self.on_sail_on_request)
             experiment_response.server_rpc_queue = self.private_queue
-            self.amqp.setup_subscribe_to_queue(
-                queue_name=self.private_queue,
-                queue_exclusive=True,
-                queue_auto_delete=True,
-                casas_events=True,
-                callback_function=self.on_sail_on_request,
-                callback_full_params=True)
-            self.unsubscribe_experiment_queue()
-            self.unsubscribe_sota_queue()
+            experiment_response.step_rpc = True
         return experiment_response
 
     def on_experiment_request(self, ch, method, props, body, request):
-        self.log.info('on_experiment_request( {} )'.format(str(request)))
+        self.log.info('on_experiment_request( %s )', objects.LogSummary(request))
+        # A new experiment starts from fresh fields, the running ones keep theirs.
+        self.park_session()
         errormsgs = list()
         experiment_response = None
         response = objects.CasasResponse(status='success',
@@ -3467,23 +4597,15 @@ class TA1:
                                          errormsgs=errormsgs)
 
             if len(errormsgs) == 0:
-                # Things have gone well. Setup a new RPC queue just for this experiment and stop
-                # listening to the other "general" queues.
-                self.private_queue = objects.SERVER_RPC_QUEUE + '.{}'.format(uuid.uuid4().hex)
-                self.amqp.setup_subscribe_to_queue(
-                    queue_name=self.private_queue,
-                    queue_exclusive=True,
-                    queue_auto_delete=True,
-                    casas_events=True,
-                    callback_function=self.on_sail_on_request,
-                    callback_full_params=True)
-                self.unsubscribe_experiment_queue()
-                self.unsubscribe_sota_queue()
+                # Things have gone well. Setup a new RPC queue just for this experiment, the other
+                # "general" queues are left once max_sessions experiments are running.
+                self.open_session(callback_function=self.on_sail_on_request)
                 experiment_response = objects.ExperimentResponse(
                     server_rpc_queue=self.private_queue,
                     experiment_secret=request.experiment_secret,
                     model_experiment_id=self.model_experiment_id,
-                    experiment_timeout=self._AMQP_EXPERIMENT_TIMEOUT)
+                    experiment_timeout=self._AMQP_EXPERIMENT_TIMEOUT,
+                    step_rpc=True)
         else:
             errormsgs.append('This queue is only for requesting to start an experiment.')
 
@@ -3518,11 +4640,12 @@ class TA1:
                                            correlation_id=props.correlation_id)
                 self._AMQP_EXP_CALLBACK_ID = self.amqp.call_later(
                     seconds=self._AMQP_EXPERIMENT_TIMEOUT,
-                    function=self.force_end_experiment)
+                    function=functools.partial(self.on_session_timeout, self.private_queue))
         return
 
     def on_sota_register_request(self, ch, method, props, body, request):
         self.log.debug('on_sota_register_request()')
+        self.park_session()
         response = objects.SotaIdle()
         errormsgs = list()
 
@@ -3701,27 +4824,17 @@ class TA1:
                         self.STATE = objects.BenchmarkRequest(
                             benchmark_script='BENCHMARKING SCRIPT GOES HERE.')
 
-                        # Setup a new RPC queue just for this experiment and stop listening to
-                        # the other general queues used for requesting to start.
-                        self.private_queue = objects.SERVER_RPC_QUEUE + '.{}'.format(
-                            uuid.uuid4().hex)
+                        # Setup a new RPC queue just for this experiment, the other general queues
+                        # used for requesting to start are left once max_sessions are running.
+                        self.open_session(callback_function=self.on_sail_on_request)
                         response.server_rpc_queue = self.private_queue
-                        self.amqp.setup_subscribe_to_queue(
-                            queue_name=self.private_queue,
-                            queue_exclusive=True,
-                            queue_auto_delete=True,
-                            casas_events=True,
-                            callback_function=self.on_sail_on_request,
-                            callback_full_params=True)
-                        self.unsubscribe_experiment_queue()
-                        self.unsubscribe_sota_queue()
 
                         if self._AMQP_EXP_CALLBACK_ID is not None:
                             self.amqp.cancel_call_later(
                                 timeout_id=self._AMQP_EXP_CALLBACK_ID)
                         self._AMQP_EXP_CALLBACK_ID = self.amqp.call_later(
                             seconds=self._AMQP_EXPERIMENT_TIMEOUT,
-                            function=self.force_end_experiment)
+                            function=functools.partial(self.on_session_timeout, self.private_queue))
         elif isinstance(request, objects.RequestExperimentTrials):
             # First check that the request is not too old.
             is_valid = True
@@ -3839,31 +4952,22 @@ class TA1:
                     self.STATE = objects.BenchmarkRequest(
                         benchmark_script='BENCHMARKING SCRIPT GOES HERE.')
 
-                    # Setup a new RPC queue just for this experiment and stop listening to
-                    # the other general queues used for requesting to start.
-                    self.private_queue = objects.SERVER_RPC_QUEUE + '.{}'.format(
-                        uuid.uuid4().hex)
-                    self.amqp.setup_subscribe_to_queue(
-                        queue_name=self.private_queue,
-                        queue_exclusive=True,
-                        queue_auto_delete=True,
-                        casas_events=True,
-                        callback_function=self.on_sail_on_request,
-                        callback_full_params=True)
-                    self.unsubscribe_experiment_queue()
-                    self.unsubscribe_sota_queue()
+                    # Setup a new RPC queue just for this experiment, the other general queues
+                    # used for requesting to start are left once max_sessions are running.
+                    self.open_session(callback_function=self.on_sail_on_request)
                     response = objects.ExperimentResponse(
                         server_rpc_queue=self.private_queue,
                         experiment_secret=request.experiment_secret,
                         model_experiment_id=self.model_experiment_id,
-                        experiment_timeout=self._AMQP_EXPERIMENT_TIMEOUT)
+                        experiment_timeout=self._AMQP_EXPERIMENT_TIMEOUT,
+                        step_rpc=True)
 
                     if self._AMQP_EXP_CALLBACK_ID is not None:
                         self.amqp.cancel_call_later(
                             timeout_id=self._AMQP_EXP_CALLBACK_ID)
                     self._AMQP_EXP_CALLBACK_ID = self.amqp.call_later(
                         seconds=self._AMQP_EXPERIMENT_TIMEOUT,
-                        function=self.force_end_experiment)
+                        function=functools.partial(self.on_session_timeout, self.private_queue))
 
         err_response = None
         if len(errormsgs) > 0:
@@ -4171,8 +5275,7 @@ class TA1:
             elif isinstance(self.STATE, objects.ExperimentEnd):
                 self.update_experiment_end(model_experiment_id=self.model_experiment_id,
                                            errormsgs=errormsgs)
-                self.amqp.remove_subscribe_to_queue(queue_name=self.private_queue)
-                self.subscribe_experiment_queue()
+                self.end_session()
                 self.private_queue = None
                 self.current_domain = None
                 self.model_experiment_id = None
@@ -4405,7 +5508,7 @@ class TA1:
                                            casas_object=response,
                                            correlation_id=props.correlation_id)
             elif data is not None:
-                self.log.debug('REPLY: {}'.format(str(data)))
+                self.log.debug('REPLY: %s', objects.LogSummary(data))
                 self.amqp.publish_to_queue(queue_name=props.reply_to,
                                            casas_object=data,
                                            correlation_id=props.correlation_id)
@@ -4427,48 +5530,76 @@ class TA1:
         if self.STATE is not None:
             self._AMQP_EXP_CALLBACK_ID = self.amqp.call_later(
                 seconds=self._AMQP_EXPERIMENT_TIMEOUT,
-                function=self.force_end_experiment)
+                function=functools.partial(self.on_session_timeout, self.private_queue))
         return
     """
 
-    def get_novelty_description(self, domain: str, novelty: int, difficulty: str) -> \
-            objects.NoveltyDescription:
-        self.log.debug('get_novelty_description(domain={}, novelty={}, difficulty={})'
-                       .format(domain, novelty, difficulty))
-        response_queue = queue.Queue()
-        tmp_thread = NoveltyDescriptionThread(log=self.log,
-                                              amqp_user=self.amqp_user,
-                                              amqp_pass=self.amqp_pass,
-                                              amqp_host=self.amqp_host,
-                                              amqp_port=self.amqp_port,
-                                              amqp_vhost=self.amqp_vhost,
-                                              amqp_ssl=self.amqp_ssl,
-                                              response_queue=response_queue,
-                                              domain=domain,
-                                              novelty=novelty,
-                                              difficulty=difficulty,
-                                              request_timeout=self._AMQP_EXPERIMENT_TIMEOUT)
-        tmp_thread.start()
-        start = time.time()
-        done = False
+    def wait_for_thread_response(self, response_queue: queue.Queue):
+        # We are inside a consumer callback of self.amqp here, so its IO loop can not dispatch
+        # and the worker threads hand back their responses through a queue.  The queue wakes us
+        # as soon as the response is put, the wait is only sliced to keep heartbeats flowing.
+        deadline = time.time() + self._AMQP_EXPERIMENT_TIMEOUT
         response = None
-        while abs(time.time() - start) < self._AMQP_EXPERIMENT_TIMEOUT and not done:
+        remaining = float(self._AMQP_EXPERIMENT_TIMEOUT)
+        while response is None and remaining > 0.0:
             try:
-                response = response_queue.get(block=True, timeout=2.0)
-                done = True
+                response = response_queue.get(block=True,
+                                              timeout=min(self._HEARTBEAT_SLICE, remaining))
             except queue.Empty:
                 self.amqp.process_data_events()
-        tmp_thread.stop()
-        tmp_thread.join()
-        del tmp_thread
-        del response_queue
+            remaining = deadline - time.time()
         return response
 
+    def get_novelty_description(self, domain: str, novelty: int, difficulty: str) -> \
+            objects.NoveltyDescription:
+        self.log.debug('get_novelty_description(domain={}, novelty={}, difficulty={})'
+                       .format(domain, novelty, difficulty))
+        # Every trial of a domain, novelty and difficulty has the same description.
+        key = (domain, novelty, difficulty)
+        self.prefetch_novelty_descriptions(keys=[key])
+        return self._novelty_descriptions.get(key)
+
+    def prefetch_novelty_descriptions(self, keys: list):
+        """Requests the novelty descriptions that are not cached yet at the same time, each on
+        its own connection, and caches the answers.
+
+        Parameters
+        ----------
+        keys : list
+            The (domain, novelty, difficulty) of the descriptions, repeats are requested once.
+        """
+        requests = dict()
+        for key in keys:
+            if key in self._novelty_descriptions or key in requests:
+                continue
+            response_queue = queue.Queue()
+            tmp_thread = NoveltyDescriptionThread(log=self.log,
+                                                  amqp_user=self.amqp_user,
+                                                  amqp_pass=self.amqp_pass,
+                                                  amqp_host=self.amqp_host,
+                                                  amqp_port=self.amqp_port,
+                                                  amqp_vhost=self.amqp_vhost,
+                                                  amqp_ssl=self.amqp_ssl,
+                                                  response_queue=response_queue,
+                                                  domain=key[0],
+                                                  novelty=key[1],
+                                                  difficulty=key[2],
+                                                  request_timeout=self._AMQP_EXPERIMENT_TIMEOUT)
+            tmp_thread.start()
+            requests[key] = (response_queue, tmp_thread)
+        for key, (response_queue, tmp_thread) in requests.items():
+            response = self.wait_for_thread_response(response_queue=response_queue)
+            tmp_thread.stop()
+            tmp_thread.join()
+            if response is not None:
+                self._novelty_descriptions[key] = response
+        return
+
     def prepare_episode(self, episode: objects.Episode, errormsgs: list):
-        self.log.debug('prepare_episode(episode={})'.format(str(episode)))
+        self.log.debug('prepare_episode(episode=%s)', objects.LogSummary(episode))
         # Check if recorded or live training episode.
         if episode.data_type in [objects.DTYPE_TRAIN, objects.DTYPE_TEST]:
-            self.log.info('prepare_episode({})'.format(str(episode)))
+            self.log.info('prepare_episode(%s)', objects.LogSummary(episode))
             # Get the next episode_id, episode_index, and dataset_id for the episode.
             domain_id = self.domain_ids[episode.domain]
             dataset_id = self.dataset_cache[domain_id][episode.data_type][episode.novelty][
@@ -4483,11 +5614,13 @@ class TA1:
             self.episode_data_total = self.episode_cache[dataset_id][episode.episode_index]['size']
             del self.rolling_score
             self.rolling_score = list()
-            # Load the episode data to the data_cache.
-            self.load_data_to_cache(
-                episode_id=episode_id,
-                at_data_index=0,
-                errormsgs=errormsgs)
+            # Load the first chunk of the episode data to the data_cache, the next chunk is
+            # fetched while this one is served.
+            self.start_data_prefetch(episode_id=episode_id,
+                                     at_data_index=0)
+            self.fill_data_cache(episode_id=episode_id,
+                                 at_data_index=0,
+                                 errormsgs=errormsgs)
         elif episode.data_type in [objects.DTYPE_LIVE_TRAIN, objects.DTYPE_LIVE_TEST]:
             self.episode_data_count = 0
             del self._ta2_response
@@ -4551,7 +5684,7 @@ class TA1:
 
     def get_episode_data(self, request: objects.RequestData, episode: objects.Episode,
                          errormsgs: list) -> objects.AiqObject:
-        self.log.debug('get_episode_data(request={})'.format(str(request)))
+        self.log.debug('get_episode_data(request=%s)', objects.LogSummary(request))
         data = objects.AiqObject()
         # Check if recorded or live training episode.
         if episode.data_type in [objects.DTYPE_TRAIN, objects.DTYPE_TEST]:
@@ -4590,17 +5723,9 @@ class TA1:
                     novelty_indicator=self.get_novelty_indicator_value())
             data.utc_remote_epoch_received = None
         elif episode.data_type in [objects.DTYPE_LIVE_TRAIN, objects.DTYPE_LIVE_TEST]:
-            self._ta2_response.put(request)
-            start = time.time()
-            done = False
-            response = None
-            while abs(time.time() - start) < self._AMQP_EXPERIMENT_TIMEOUT and not done:
-                try:
-                    response = self._live_output.get(block=True, timeout=2.0)
-                    done = True
-                except queue.Empty:
-                    self.amqp.process_data_events()
-            self.log.debug('GEN RESPONSE: {}'.format(str(response)))
+            self._live_thread.put(request)
+            response = self.wait_for_thread_response(response_queue=self._live_output)
+            self.log.debug('GEN RESPONSE: %s', objects.LogSummary(response))
             if isinstance(response, objects.ExperimentException):
                 data = copy.deepcopy(response)
                 self._live_thread.stop()
@@ -4656,7 +5781,7 @@ class TA1:
     def process_episode_data_prediction(self, request: objects.BasicDataPrediction,
                                         episode: objects.Episode, errormsgs: list)\
             -> objects.AiqObject:
-        self.log.debug('process_episode_data_prediction({})'.format(str(request)))
+        self.log.debug('process_episode_data_prediction(%s)', objects.LogSummary(request))
         data = objects.AiqObject()
         # We have some basic things that apply to ALL episode types first.
         # Get the episode_id, episode_index, and dataset_id for the episode.
@@ -4677,13 +5802,13 @@ class TA1:
             data_index = self.episode_cache[dataset_id][episode.episode_index]['data_index']
             dataset_size = self.episode_cache[dataset_id][episode.episode_index]['size']
             # Update the score.
-            self.log.debug('data_cache keys: {}'.format(str(self.data_cache.keys())))
-            self.log.debug('episode_id = {}'.format(episode.episode_id))
-            self.log.debug('data_cache[ep_id] keys: {}'.format(str(self.data_cache[
-                episode.episode_id].keys())))
-            self.log.debug('data_index = {}'.format(data_index))
-            self.log.debug('data_cache object = {}'.format(
-                self.data_cache[episode.episode_id][data_index]))
+            self.log.debug('data_cache keys: %s', objects.LogSummary(self.data_cache.keys()))
+            self.log.debug('episode_id = %s', episode.episode_id)
+            self.log.debug('data_cache[ep_id] keys: %s',
+                           objects.LogSummary(self.data_cache[episode.episode_id].keys()))
+            self.log.debug('data_index = %s', data_index)
+            self.log.debug('data_cache object = %s',
+                           objects.LogSummary(self.data_cache[episode.episode_id][data_index]))
             self.update_rolling_score(
                 solution=self.data_cache[episode.episode_id][data_index]['label'],
                 prediction=request.label_prediction)
@@ -4749,18 +5874,11 @@ class TA1:
                                                   performance=performance,
                                                   feedback=feedback)
         elif episode.data_type in [objects.DTYPE_LIVE_TRAIN, objects.DTYPE_LIVE_TEST]:
-            self._ta2_response.put(request)
-            start = time.time()
-            done = False
-            response = None
-            while abs(time.time() - start) < self._AMQP_EXPERIMENT_TIMEOUT and not done:
-                try:
-                    response = self._live_output.get(block=True, timeout=2.0)
-                    self.trial_episode_performance = response.performance
-                    done = True
-                except queue.Empty:
-                    self.amqp.process_data_events()
-            self.log.debug('GEN RESPONSE: {}'.format(str(response)))
+            self._live_thread.put(request)
+            response = self.wait_for_thread_response(response_queue=self._live_output)
+            if response is not None:
+                self.trial_episode_performance = response.performance
+            self.log.debug('GEN RESPONSE: %s', objects.LogSummary(response))
             feedback = None
             if self.trial_budget_active:
                 if random.random() < self._experiment.budget:
@@ -4774,7 +5892,7 @@ class TA1:
                 if self.is_shortdemo:
                     # Only end an episode early like this if it is a shortdemo.
                     if self.episode_data_count >= self._SHORT_DEMO_EPISODE_SIZE:
-                        self._ta2_response.put(objects.GeneratorReset())
+                        self._live_thread.put(objects.GeneratorReset())
                         response = objects.EpisodeEnd(performance=response.performance,
                                                       feedback=feedback)
                 # Log the response values in the database.
@@ -4807,567 +5925,723 @@ class TA1:
                     self._live_thread = None
         return data
 
-    def on_sail_on_request(self, ch, method, props, body, request):
-        self.log.debug('on_sail_on_request( {} )'.format(str(request)))
-        self.log.debug('STATE: {}'.format(str(self.STATE)))
-        errormsgs = list()
-        data = None
-        current_episode = None
+    def refresh_episode_data_cache(self, episode: objects.Episode, errormsgs: list):
+        self.log.debug('refresh_episode_data_cache(episode=%s)', objects.LogSummary(episode))
+        # Get the next episode_id, episode_index, and dataset_id for the episode.
+        episode_id = episode.episode_id
+        episode_index = episode.episode_index
+        dataset_id = self.get_episode_dataset_id(episode_id=episode_id,
+                                                 episode_index=episode_index)
+        # Get the current data_index for the episode.
+        data_index = self.episode_cache[dataset_id][episode_index]['data_index']
+        # Add the prefetched chunk of the episode data to the data_cache.
+        self.fill_data_cache(episode_id=episode_id,
+                             at_data_index=data_index,
+                             errormsgs=errormsgs)
         self.refresh_dataset_cache = False
-        response = objects.CasasResponse(status='success',
-                                         response_type='data',
-                                         error_message='No Errors')
+        return
 
-        if self._AMQP_EXP_CALLBACK_ID is not None:
-            self.amqp.cancel_call_later(timeout_id=self._AMQP_EXP_CALLBACK_ID)
-            self._AMQP_EXP_CALLBACK_ID = None
+    def get_episode_step_data(self, request: objects.BasicDataPrediction,
+                              episode: objects.Episode, errormsgs: list) -> objects.AiqObject:
+        self.log.debug('get_episode_step_data(request=%s)', objects.LogSummary(request))
+        # The prediction may have drained the recorded data cache, so reload it before
+        # reading the next data instance.
+        if self.refresh_dataset_cache:
+            self.refresh_episode_data_cache(episode=episode,
+                                            errormsgs=errormsgs)
+        # Build the matching data request, the live generator expects a RequestData object.
+        if episode.data_type in [objects.DTYPE_TRAIN, objects.DTYPE_LIVE_TRAIN]:
+            data_request = objects.RequestTrainingData(
+                model_experiment_id=self.model_experiment_id,
+                secret=request.secret)
+        else:
+            data_request = objects.RequestTestingData(
+                model_experiment_id=self.model_experiment_id,
+                secret=request.secret)
+        data = self.get_episode_data(request=data_request,
+                                     episode=episode,
+                                     errormsgs=errormsgs)
+        return data
 
-        # SAIL-ON SAIL states sent back:
-        # - objects.ExperimentResponse
-        # - objects.BenchmarkRequest
-        # - objects.ExperimentStart
-        # - objects.TrainingStart
-        # - for e in episodes:
-        #     - objects.TrainingEpisodeStart
-        #     - Client then requests objects.TrainingData, and responds with
-        #       objects.TrainingDataAck. This repeats until we send an objects.TrainingEpisodeEnd
-        #       response instead of the same ack object back.
-        #     - During this, the TA1 state is objects.TrainingEpisodeActive.
-        # - objects.TrainingEnd
-        # - objects.TrainingModelEnd
-        # - for T trials:
-        #     - objects.TrialStart
-        #     - objects.TestingStart
-        #     - for e in trial episodes:
-        #         - objects.TestingEpisodeStart
-        #         - Client then requests objects.TestingData, and response with
-        #           objects.TestingDataPrediction. This repeats until we send an
-        #           objects.TestingEpisodeEnd response instead of an objects.TestingDataAck.
-        #         - During this, the TA1 state is objects.TestingEpisodeActive.
-        #     - objects.TrialEnd
-        # - objects.ExperimentEnd
+    def build_sail_on_transitions(self) -> dict:
+        """Builds the table of the SAIL-ON state machine run by on_sail_on_request().
+
+        SAIL-ON states sent back:
+        - objects.ExperimentResponse
+        - objects.BenchmarkRequest
+        - objects.ExperimentStart
+        - objects.TrainingStart
+        - for e in episodes:
+            - objects.TrainingEpisodeStart
+            - Client then requests objects.TrainingData, and responds with
+              objects.TrainingDataAck. This repeats until we send an objects.TrainingEpisodeEnd
+              response instead of the same ack object back.
+            - During this, the TA1 state is objects.TrainingEpisodeActive.
+        - objects.TrainingEnd
+        - objects.TrainingModelEnd
+        - for T trials:
+            - objects.TrialStart
+            - objects.TestingStart
+            - for e in trial episodes:
+                - objects.TestingEpisodeStart
+                - Client then requests objects.TestingData, and response with
+                  objects.TestingDataPrediction. This repeats until we send an
+                  objects.TestingEpisodeEnd response instead of an objects.TestingDataAck.
+                - During this, the TA1 state is objects.TestingEpisodeActive.
+                - Clients that were told step_rpc in objects.ExperimentResponse may instead send
+                  objects.TestingDataStep, which is answered with the ack and the next
+                  objects.TestingData in one objects.TestingDataStepResponse (same for training).
+            - objects.TrialEnd
+        - objects.ExperimentEnd
+
+        Returns
+        -------
+        dict
+            [(state class, request class)] = handler(request, errormsgs) returning the data to
+            send back and the episode the request was about.  A state class of object matches
+            any state, including None before the experiment starts.
+        """
+        transitions = dict()
+
+        # The TA2 polls with RequestState to move through the states between the episodes.
+        transitions[(object, objects.RequestState)] = self.sail_on_report_state
+        transitions[(objects.BenchmarkRequest, objects.RequestState)] = \
+            self.sail_on_benchmark_request
+        transitions[(objects.ExperimentStart, objects.RequestState)] = \
+            self.sail_on_experiment_start
+        transitions[(objects.TrainingStart, objects.RequestState)] = self.sail_on_training_start
+        transitions[(objects.TrainingEpisodeStart, objects.RequestState)] = \
+            self.sail_on_training_episode_start
+        transitions[(objects.TrainingEnd, objects.RequestState)] = self.sail_on_training_end
+        transitions[(objects.TrainingModelEnd, objects.RequestState)] = \
+            self.sail_on_training_model_end
+        transitions[(objects.TrialStart, objects.RequestState)] = self.sail_on_trial_start
+        transitions[(objects.TestingStart, objects.RequestState)] = self.sail_on_testing_start
+        transitions[(objects.TestingEpisodeStart, objects.RequestState)] = \
+            self.sail_on_testing_episode_start
+        transitions[(objects.TestingEnd, objects.RequestState)] = self.sail_on_testing_end
+        transitions[(objects.TrialEnd, objects.RequestState)] = self.sail_on_trial_end
+        transitions[(objects.ExperimentEnd, objects.RequestState)] = self.sail_on_experiment_end
+
+        transitions[(objects.ExperimentStart, objects.BenchmarkData)] = self.sail_on_benchmark_data
+        transitions[(object, objects.BenchmarkData)] = functools.partial(
+            self.sail_on_reject, 'ERROR: Will not accept BenchmarkData outside of the '
+                                 'initial benchmarking state!')
 
-        if isinstance(request, objects.RequestState):
-            data = copy.deepcopy(self.STATE)
-            self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
-                                            action=objects.REQ_STATE,
-                                            data_object=data.get_json_obj(),
-                                            experiment_trial_id=self.experiment_trial_id))
-            if isinstance(self.STATE, objects.BenchmarkRequest):
-                self.STATE = objects.ExperimentStart()
-            elif isinstance(self.STATE, objects.ExperimentStart):
-                if not self._exper_no_training:
-                    # We are not skipping testing, training can begin.
-                    self.STATE = objects.TrainingStart()
-                else:
-                    # Do a little housekeeping on any abandoned trials.
-                    self.clear_abandoned_trials(errormsgs=errormsgs)
-                    # We are skipping testing and jumping to 1 or more trials.
-                    self.experiment_trial_id = self.lock_experiment_trial(
-                        model_experiment_id=self.model_experiment_id,
-                        errormsgs=errormsgs)
+        # The per tick requests, TrainingDataStep and TestingDataStep are predictions too.
+        transitions[(objects.TrainingEpisodeActive, objects.RequestTrainingData)] = \
+            self.sail_on_training_data
+        transitions[(object, objects.RequestTrainingData)] = functools.partial(
+            self.sail_on_reject, 'ERROR: You are not allowed to request training data outside '
+                                 'of the TrainingEpisodeActive state!')
+        transitions[(objects.TrainingEpisodeActive, objects.TrainingDataPrediction)] = \
+            self.sail_on_training_prediction
+        transitions[(object, objects.TrainingDataPrediction)] = functools.partial(
+            self.sail_on_reject, 'ERROR: Will not accept a TrainingDataPrediction outside of the '
+                                 'TrainingEpisodeActive state!')
+        transitions[(objects.TestingEpisodeActive, objects.RequestTestingData)] = \
+            self.sail_on_testing_data
+        transitions[(object, objects.RequestTestingData)] = functools.partial(
+            self.sail_on_reject, 'ERROR: You are not allowed to request testing data outside '
+                                 'of the TestingEpisodeActive state!')
+        transitions[(objects.TestingEpisodeActive, objects.TestingDataPrediction)] = \
+            self.sail_on_testing_prediction
+        transitions[(object, objects.TestingDataPrediction)] = functools.partial(
+            self.sail_on_reject, 'ERROR: Will not accept a TestingDataPrediction outside of the '
+                                 'TestingEpisodeActive state!')
 
-                    if self.experiment_trial_id is None:
-                        # A value of None means there are no trials available.
-                        self.STATE = objects.ExperimentEnd()
-                    else:
-                        # We have claimed an experiment_trial_id to work on, proceeding to set
-                        # up TA1 to begin processing the trial.
-                        self.start_experiment_trial(experiment_trial_id=self.experiment_trial_id,
-                                                    errormsgs=errormsgs)
-                        self.set_experiment_trial_index(
-                            experiment_trial_id=self.experiment_trial_id,
-                            errormsgs=errormsgs)
+        # The novelty prediction of the episode that just ended.
+        transitions[(objects.TrainingEpisodeStart, objects.TrainingEpisodeNovelty)] = \
+            self.sail_on_training_novelty
+        transitions[(objects.TrainingEnd, objects.TrainingEpisodeNovelty)] = \
+            self.sail_on_training_novelty
+        transitions[(object, objects.TrainingEpisodeNovelty)] = functools.partial(
+            self.sail_on_reject, 'ERROR: Will not accept a TrainingEpisodeNovelty in this state!')
+        transitions[(objects.TestingEpisodeStart, objects.TestingEpisodeNovelty)] = \
+            self.sail_on_testing_novelty
+        transitions[(objects.TestingEnd, objects.TestingEpisodeNovelty)] = \
+            self.sail_on_testing_novelty
+        transitions[(object, objects.TestingEpisodeNovelty)] = functools.partial(
+            self.sail_on_reject, 'ERROR: Will not accept a TestingEpisodeNovelty in this state!')
+        return transitions
+
+    def get_sail_on_transition(self, request: objects.AiqObject) -> tuple:
+        """Looks up the handler of a request in the current state.  The table is searched along
+        the classes of the request and of the state, the most specific entry wins, and the
+        result is kept for the next request with the same classes.
+
+        Parameters
+        ----------
+        request : objects.AiqObject
+            The request from the TA2.
+
+        Returns
+        -------
+        tuple
+            The handler, None for requests the state machine ignores, and the name the timing
+            of the transition is kept under.
+        """
+        key = (type(self.STATE), type(request))
+        transition = self._sail_on_dispatch.get(key)
+        if transition is None:
+            handler = None
+            for request_class in key[1].__mro__:
+                for state_class in key[0].__mro__:
+                    handler = self._SAIL_ON_TRANSITIONS.get((state_class, request_class))
+                    if handler is not None:
+                        break
+                if handler is not None:
+                    break
+            transition = tuple([handler, '{}.{}'.format(key[0].__name__, key[1].__name__)])
+            self._sail_on_dispatch[key] = transition
+        return transition
+
+    def log_sail_on_timing(self):
+        if len(self._sail_on_timing) == 0:
+            return
+        timing = dict()
+        for name in sorted(self._sail_on_timing):
+            timing[name] = self._sail_on_timing[name].summary()
+            self.log.debug('%s: %s', name, timing[name])
+        self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                                        action='sail_on_timing',
+                                        data_object=timing,
+                                        experiment_trial_id=self.experiment_trial_id))
+        return
 
-                        # Set the state to TrialStart.
-                        self.STATE = objects.TrialStart(
-                            trial_number=self._exper_trial_index,
-                            message='Please RESET TA2 model to SAVED state.',
-                            novelty_description=self._exper_trial_novelty_desc)
-            elif isinstance(self.STATE, objects.TrainingStart):
-                self.trial_predicted_novelty = False
-                self.trial_budget_active = False
-                self.STATE = objects.TrainingEpisodeStart(
-                    episode_number=self._exper_train_index)
-            elif isinstance(self.STATE, objects.TrainingEpisodeStart):
-                self.STATE = objects.TrainingEpisodeActive()
+    def sail_on_reject(self, message: str, request: objects.AiqObject, errormsgs: list) -> tuple:
+        errormsgs.append(message)
+        return None, None
 
-                # Get the episode.
-                episode = self._experiment.training.episodes[self._exper_train_index]
-                current_episode = episode
+    def sail_on_report_state(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data = copy.deepcopy(self.STATE)
+        self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                                        action=objects.REQ_STATE,
+                                        data_object=data.get_json_obj(),
+                                        experiment_trial_id=self.experiment_trial_id))
+        return data, None
+
+    def sail_on_next_trial(self, errormsgs: list):
+        # Do a little housekeeping on any abandoned trials.
+        self.clear_abandoned_trials(errormsgs=errormsgs)
+        # Lets see if we can get another trial to process.
+        self.experiment_trial_id = self.lock_experiment_trial(
+            model_experiment_id=self.model_experiment_id,
+            errormsgs=errormsgs)
+
+        if self.experiment_trial_id is None:
+            # A value of None means there are no trials available.
+            self.STATE = objects.ExperimentEnd()
+        else:
+            # We have claimed an experiment_trial_id to work on, proceeding to set
+            # up TA1 to begin processing the trial.
+            self.start_experiment_trial(experiment_trial_id=self.experiment_trial_id,
+                                        errormsgs=errormsgs)
+            # Set the internal index values for this trial.
+            self.set_experiment_trial_index(
+                experiment_trial_id=self.experiment_trial_id,
+                errormsgs=errormsgs)
 
-                # Prepare the training episode.
-                self.prepare_episode(episode=episode,
-                                     errormsgs=errormsgs)
+            # Set the state to TrialStart.
+            self.STATE = objects.TrialStart(
+                trial_number=self._exper_trial_index,
+                message='Please RESET TA2 model to SAVED state.',
+                novelty_description=self._exper_trial_novelty_desc)
+        return
 
-                # Start the trial_episode and get the trial_episode_id.
-                self.trial_episode_id = self.start_trial_episode(
-                    experiment_trial_id=self.experiment_trial_id,
-                    episode_index=episode.trial_episode_index,
-                    budget_active=self.trial_budget_active,
-                    errormsgs=errormsgs)
+    def sail_on_benchmark_request(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        self.STATE = objects.ExperimentStart()
+        return data, current_episode
 
-                # Update the training trial as still active.
-                self.update_experiment_trial(experiment_trial_id=self.experiment_trial_id,
-                                             errormsgs=errormsgs)
-            elif isinstance(self.STATE, objects.TrainingEnd):
-                # objects.TrainingEnd is what we are sending to the TA2/SOTA, so there might be
-                # a long wait on what we set up here.
+    def sail_on_experiment_start(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        if not self._exper_no_training:
+            # We are not skipping testing, training can begin.
+            self.STATE = objects.TrainingStart()
+        else:
+            # We are skipping testing and jumping to 1 or more trials.
+            self.sail_on_next_trial(errormsgs=errormsgs)
+        return data, current_episode
 
-                # Set the training experiment_trial as done.
-                self.end_experiment_trial(experiment_trial_id=self.experiment_trial_id,
-                                          errormsgs=errormsgs)
+    def sail_on_training_start(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        self.trial_predicted_novelty = False
+        self.trial_budget_active = False
+        self.STATE = objects.TrainingEpisodeStart(
+            episode_number=self._exper_train_index)
+        return data, current_episode
+
+    def sail_on_training_episode_start(self, request: objects.RequestState,
+                                       errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        self.STATE = objects.TrainingEpisodeActive()
+
+        # Get the episode.
+        episode = self._experiment.training.episodes[self._exper_train_index]
+        current_episode = episode
+
+        # Prepare the training episode.
+        self.prepare_episode(episode=episode,
+                             errormsgs=errormsgs)
+
+        # Start the trial_episode and get the trial_episode_id.
+        self.trial_episode_id = self.start_trial_episode(
+            experiment_trial_id=self.experiment_trial_id,
+            episode_index=episode.trial_episode_index,
+            budget_active=self.trial_budget_active,
+            errormsgs=errormsgs)
+
+        # Update the training trial as still active.
+        self.update_experiment_trial(experiment_trial_id=self.experiment_trial_id,
+                                     errormsgs=errormsgs)
+        return data, current_episode
 
-                # The next state will be objects.TrainingModelEnd to set things up after any
-                # large blocks of time that might be needed for training a model.
-                self.STATE = objects.TrainingModelEnd()
-            elif isinstance(self.STATE, objects.TrainingModelEnd):
-                # Check if we were just training and need to revert the timeout.
-                if self.hold_during_training_gap:
-                    # Done with the training gap wait, returning the timeouts to normal limits.
-                    self.hold_during_training_gap = False
-                    self._AMQP_EXPERIMENT_TIMEOUT = (self._AMQP_EXPERIMENT_TIMEOUT
-                                                     / self._TIMEOUT_MULTIPLIER)
-
-                if self._exper_no_testing:
-                    # We have received a flag that they do not wish for any trials, so this is
-                    # the end of the experiment now.
-                    self.STATE = objects.ExperimentEnd()
-                else:
-                    # Do a little housekeeping on any abandoned trials.
-                    self.clear_abandoned_trials(errormsgs=errormsgs)
-                    # There was no flag for no testing, so we continue on to try and secure a
-                    # trial to evaluate on.
-                    self.experiment_trial_id = self.lock_experiment_trial(
-                        model_experiment_id=self.model_experiment_id,
-                        errormsgs=errormsgs)
+    def sail_on_training_end(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        # objects.TrainingEnd is what we are sending to the TA2/SOTA, so there might be
+        # a long wait on what we set up here.
 
-                    if self.experiment_trial_id is None:
-                        # A value of None means there are no trials available.
-                        self.STATE = objects.ExperimentEnd()
-                    else:
-                        # We have claimed an experiment_trial_id to work on, proceeding to set
-                        # up TA1 to begin processing the trial.
-                        self.start_experiment_trial(experiment_trial_id=self.experiment_trial_id,
-                                                    errormsgs=errormsgs)
-                        # Set the internal index values for this trial.
-                        self.set_experiment_trial_index(
-                            experiment_trial_id=self.experiment_trial_id,
-                            errormsgs=errormsgs)
+        # Set the training experiment_trial as done.
+        self.end_experiment_trial(experiment_trial_id=self.experiment_trial_id,
+                                  errormsgs=errormsgs)
 
-                        # Set the state to TrialStart.
-                        self.STATE = objects.TrialStart(
-                            trial_number=self._exper_trial_index,
-                            message='Please RESET TA2 model to SAVED state.',
-                            novelty_description=self._exper_trial_novelty_desc)
-            elif isinstance(self.STATE, objects.TrialStart):
-                # Set the state as TestingStart.
-                self.STATE = objects.TestingStart()
+        # The next state will be objects.TrainingModelEnd to set things up after any
+        # large blocks of time that might be needed for training a model.
+        self.STATE = objects.TrainingModelEnd()
+        return data, current_episode
+
+    def sail_on_training_model_end(self, request: objects.RequestState,
+                                   errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        # Check if we were just training and need to revert the timeout.
+        if self.hold_during_training_gap:
+            # Done with the training gap wait, returning the timeouts to normal limits.
+            self.hold_during_training_gap = False
+            self._AMQP_EXPERIMENT_TIMEOUT = (self._AMQP_EXPERIMENT_TIMEOUT
+                                             / self._TIMEOUT_MULTIPLIER)
+
+        if self._exper_no_testing:
+            # We have received a flag that they do not wish for any trials, so this is
+            # the end of the experiment now.
+            self.STATE = objects.ExperimentEnd()
+        else:
+            # There was no flag for no testing, so we continue on to try and secure a
+            # trial to evaluate on.
+            self.sail_on_next_trial(errormsgs=errormsgs)
+        return data, current_episode
 
-                self.trial_predicted_novelty = False
-                self.trial_budget_active = False
+    def sail_on_trial_start(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        # Set the state as TestingStart.
+        self.STATE = objects.TestingStart()
 
-                # Get the trial.
-                trial = self._experiment.novelty_groups[self._exper_novelty_index] \
-                    .trials[self._exper_trial_index]
+        self.trial_predicted_novelty = False
+        self.trial_budget_active = False
 
-                # Set the system novelty_visibility based on the trial's config.
-                self.novelty_visibility = trial.novelty_visibility
+        # Get the trial.
+        trial = self._experiment.novelty_groups[self._exper_novelty_index] \
+            .trials[self._exper_trial_index]
 
-                # Reset the episode index to 0.
-                self._exper_episode_index = 0
+        # Set the system novelty_visibility based on the trial's config.
+        self.novelty_visibility = trial.novelty_visibility
 
-                # Reset the novelty_initated value to false at the start of the trial.
-                self.novelty_initiated = False
+        # Reset the episode index to 0.
+        self._exper_episode_index = 0
 
-                # Log the cached benchmark data for this trial so we know the stats of the
-                # computer running this trial.
-                self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
-                                                action=self.benchmark_data.obj_type,
-                                                data_object=self.benchmark_data.get_json_obj(),
-                                                experiment_trial_id=self.experiment_trial_id))
-            elif isinstance(self.STATE, objects.TestingStart):
-                # Set the state to TestingEpisodeStart.
-                self.STATE = objects.TestingEpisodeStart(
-                    episode_number=self._exper_episode_index)
+        # Reset the novelty_initated value to false at the start of the trial.
+        self.novelty_initiated = False
 
-                # Get the trial.
-                trial = self._experiment.novelty_groups[self._exper_novelty_index] \
-                    .trials[self._exper_trial_index]
-                # Get the episode.
-                episode = trial.episodes[self._exper_episode_index]
-
-                # Check to see if the data_type is recorded.
-                if episode.data_type == objects.DTYPE_TEST:
-                    for i in range(len(trial.episodes)):
-                        # Get the episode_id, episode_index, and dataset_id for the episode.
-                        domain_id = self.domain_ids[trial.episodes[i].domain]
-                        dataset_id = self.dataset_cache[domain_id][episode.data_type][
-                            episode.novelty][episode.difficulty][episode.trial_novelty][
-                            'dataset_id']
-
-                        # Load episode_id and size to episode_cache from the database.
-                        self.get_episode_ids(dataset_id=dataset_id,
-                                             episode_index=trial.episodes[i].episode_index,
-                                             errormsgs=errormsgs)
-                        self.log.debug('i = {}'.format(i))
-                        self.log.debug('len(trial.episodes) = {}'.format(len(trial.episodes)))
-                        self.log.debug('dataset_id = {}'.format(dataset_id))
-                        self.log.debug('episode_cache dataset_ids = {}'.format(
-                            str(list(self.episode_cache.keys()).sort())))
-                        self.log.debug('trial.episodes[i].episode_index = {}'.format(
-                            trial.episodes[i].episode_index))
-                        self.log.debug('episode_cache[dataset_id].keys = {}'.format(
-                            str(list(self.episode_cache[dataset_id].keys()).sort())))
-                        # Update the episode_id in the Episode object.
-                        trial.episodes[i].episode_id = self.episode_cache[dataset_id][
-                            trial.episodes[i].episode_index]['episode_id']
-
-                    # Get the dataset_id for the current episode.
-                    domain_id = self.domain_ids[episode.domain]
-                    dataset_id = self.dataset_cache[domain_id][episode.data_type][episode.novelty][
-                        episode.difficulty][episode.trial_novelty]['dataset_id']
-
-                    # Set the current data_index for the episode to 0.
-                    self.episode_cache[dataset_id][episode.episode_index]['data_index'] = 0
-
-                    # Load the episode data to the data_cache.
-                    self.load_data_to_cache(
-                        episode_id=episode.episode_id,
-                        at_data_index=0,
-                        errormsgs=errormsgs)
-            elif isinstance(self.STATE, objects.TestingEpisodeStart):
-                self.STATE = objects.TestingEpisodeActive()
+        # Log the cached benchmark data for this trial so we know the stats of the
+        # computer running this trial.
+        self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                                        action=self.benchmark_data.obj_type,
+                                        data_object=self.benchmark_data.get_json_obj(),
+                                        experiment_trial_id=self.experiment_trial_id))
+        return data, current_episode
+
+    def sail_on_testing_start(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        # Set the state to TestingEpisodeStart.
+        self.STATE = objects.TestingEpisodeStart(
+            episode_number=self._exper_episode_index)
+
+        # Get the trial.
+        trial = self._experiment.novelty_groups[self._exper_novelty_index] \
+            .trials[self._exper_trial_index]
+        # Get the episode.
+        episode = trial.episodes[self._exper_episode_index]
+
+        # Check to see if the data_type is recorded.
+        if episode.data_type == objects.DTYPE_TEST:
+            for i in range(len(trial.episodes)):
+                # Get the episode_id, episode_index, and dataset_id for the episode.
+                domain_id = self.domain_ids[trial.episodes[i].domain]
+                dataset_id = self.dataset_cache[domain_id][episode.data_type][
+                    episode.novelty][episode.difficulty][episode.trial_novelty][
+                    'dataset_id']
+
+                # Load episode_id and size to episode_cache from the database.
+                self.get_episode_ids(dataset_id=dataset_id,
+                                     episode_index=trial.episodes[i].episode_index,
+                                     errormsgs=errormsgs)
+                self.log.debug('i = %s', i)
+                self.log.debug('len(trial.episodes) = %s', len(trial.episodes))
+                self.log.debug('dataset_id = %s', dataset_id)
+                self.log.debug('episode_cache dataset_ids = %s', self.episode_cache.keys())
+                self.log.debug('trial.episodes[i].episode_index = %s',
+                               trial.episodes[i].episode_index)
+                self.log.debug('episode_cache[dataset_id].keys = %s',
+                               self.episode_cache[dataset_id].keys())
+                # Update the episode_id in the Episode object.
+                trial.episodes[i].episode_id = self.episode_cache[dataset_id][
+                    trial.episodes[i].episode_index]['episode_id']
+
+            # Get the dataset_id for the current episode.
+            domain_id = self.domain_ids[episode.domain]
+            dataset_id = self.dataset_cache[domain_id][episode.data_type][episode.novelty][
+                episode.difficulty][episode.trial_novelty]['dataset_id']
 
-                # Get the trial.
-                trial = self._experiment.novelty_groups[self._exper_novelty_index] \
-                    .trials[self._exper_trial_index]
-                # Get the episode.
-                episode = trial.episodes[self._exper_episode_index]
-                current_episode = episode
+            # Set the current data_index for the episode to 0.
+            self.episode_cache[dataset_id][episode.episode_index]['data_index'] = 0
 
-                # Prepare the testing episode.
-                self.prepare_episode(episode=episode,
+            # Load the episode data to the data_cache.
+            self.load_data_to_cache(
+                episode_id=episode.episode_id,
+                at_data_index=0,
+                errormsgs=errormsgs)
+        return data, current_episode
+
+    def sail_on_testing_episode_start(self, request: objects.RequestState,
+                                      errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        self.STATE = objects.TestingEpisodeActive()
+
+        # Get the trial.
+        trial = self._experiment.novelty_groups[self._exper_novelty_index] \
+            .trials[self._exper_trial_index]
+        # Get the episode.
+        episode = trial.episodes[self._exper_episode_index]
+        current_episode = episode
+
+        # Prepare the testing episode.
+        self.prepare_episode(episode=episode,
+                             errormsgs=errormsgs)
+
+        # Start the trial_episode and get the trial_episode_id.
+        self.trial_episode_id = self.start_trial_episode(
+            experiment_trial_id=self.experiment_trial_id,
+            episode_index=episode.trial_episode_index,
+            budget_active=self.trial_budget_active,
+            errormsgs=errormsgs)
+
+        # Check to see if we reached novelty.
+        if episode.novelty != objects.NOVELTY_200 and not self.novelty_initiated:
+            self.novelty_initiated = True
+            self.log_message(
+                msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                               action='novelty_initiated',
+                               experiment_trial_id=self.experiment_trial_id))
+        # Update the current trial as still active.
+        self.update_experiment_trial(experiment_trial_id=self.experiment_trial_id,
                                      errormsgs=errormsgs)
+        return data, current_episode
 
-                # Start the trial_episode and get the trial_episode_id.
-                self.trial_episode_id = self.start_trial_episode(
-                    experiment_trial_id=self.experiment_trial_id,
-                    episode_index=episode.trial_episode_index,
-                    budget_active=self.trial_budget_active,
-                    errormsgs=errormsgs)
+    def sail_on_testing_end(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        self.STATE = objects.TrialEnd()
+        return data, current_episode
 
-                # Check to see if we reached novelty.
-                if episode.novelty != objects.NOVELTY_200 and not self.novelty_initiated:
-                    self.novelty_initiated = True
-                    self.log_message(
-                        msg=LogMessage(model_experiment_id=self.model_experiment_id,
-                                       action='novelty_initiated',
-                                       experiment_trial_id=self.experiment_trial_id))
-                # Update the current trial as still active.
-                self.update_experiment_trial(experiment_trial_id=self.experiment_trial_id,
-                                             errormsgs=errormsgs)
-            elif isinstance(self.STATE, objects.TestingEnd):
-                self.STATE = objects.TrialEnd()
-            elif isinstance(self.STATE, objects.TrialEnd):
-                # End the current experiment_trial.
-                self.end_experiment_trial(experiment_trial_id=self.experiment_trial_id,
-                                          errormsgs=errormsgs)
-                self.publish_partial_analysis(model_experiment_id=self.model_experiment_id,
-                                              experiment_trial_id=self.experiment_trial_id)
-                # Check to see if we still have more trials or if this is the end.
-                if self._exper_just_one_trial:
-                    # Just running one trial, moving toward clean end of things.
-                    self.STATE = objects.ExperimentEnd()
-                else:
-                    # Do a little housekeeping on any abandoned trials.
-                    self.clear_abandoned_trials(errormsgs=errormsgs)
-                    # Lets see if we can get another trial to process.
-                    self.experiment_trial_id = self.lock_experiment_trial(
-                        model_experiment_id=self.model_experiment_id,
-                        errormsgs=errormsgs)
+    def sail_on_trial_end(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        # End the current experiment_trial.
+        self.end_experiment_trial(experiment_trial_id=self.experiment_trial_id,
+                                  errormsgs=errormsgs)
+        self.publish_partial_analysis(model_experiment_id=self.model_experiment_id,
+                                      experiment_trial_id=self.experiment_trial_id)
+        # Check to see if we still have more trials or if this is the end.
+        if self._exper_just_one_trial:
+            # Just running one trial, moving toward clean end of things.
+            self.STATE = objects.ExperimentEnd()
+        else:
+            self.sail_on_next_trial(errormsgs=errormsgs)
+        return data, current_episode
 
-                    if self.experiment_trial_id is None:
-                        # A value of None means there are no trials available.
-                        self.STATE = objects.ExperimentEnd()
-                    else:
-                        # We have claimed an experiment_trial_id to work on, proceeding to set
-                        # up TA1 to begin processing the trial.
-                        self.start_experiment_trial(experiment_trial_id=self.experiment_trial_id,
+    def sail_on_experiment_end(self, request: objects.RequestState, errormsgs: list) -> tuple:
+        data, current_episode = self.sail_on_report_state(request=request, errormsgs=errormsgs)
+        if not self._exper_no_testing:
+            self.update_experiment_end(model_experiment_id=self.model_experiment_id,
+                                       errormsgs=errormsgs)
+        self.log_sail_on_timing()
+        self.end_session()
+        self.private_queue = None
+        self.current_domain = None
+        self.model_experiment_id = None
+        self.experiment_trial_id = None
+        self.trial_episode_id = None
+        self.trial_episode_performance = None
+        self.trial_predicted_novelty = False
+        self.trial_budget_active = False
+        self.experiment_type = None
+        self.novelty_initiated = False
+        self.novelty_visibility = 0
+        self._experiment = None
+        self._exper_train_index = None
+        self._exper_novelty_index = None
+        self._exper_trial_index = None
+        self._exper_episode_index = None
+        del self._exper_trial_novelty_desc
+        self._exper_trial_novelty_desc = None
+        self._exper_end_training_early = False
+        self._exper_end_experiment_early = False
+        self._exper_no_testing = False
+        self._exper_no_training = False
+        self._exper_just_one_trial = False
+        del self._exper_generator_config
+        self._exper_generator_config = None
+        self._novelty_descriptions = dict()
+        self._sail_on_timing = dict()
+        self.benchmark_data = None
+        self.STATE = None
+        del self.domain_ids
+        self.domain_ids = dict()
+        del self.domain_cache
+        self.domain_cache = list()
+        del self.dataset_cache
+        self.dataset_cache = dict()
+        del self.episode_cache
+        self.episode_cache = dict()
+        del self.data_cache
+        self.data_cache = dict()
+        del self.rolling_score
+        self.rolling_score = list()
+        if self._AMQP_EXP_CALLBACK_ID is not None:
+            self.amqp.cancel_call_later(timeout_id=self._AMQP_EXP_CALLBACK_ID)
+            self._AMQP_EXP_CALLBACK_ID = None
+        return data, current_episode
+
+    def sail_on_benchmark_data(self, request: objects.BenchmarkData, errormsgs: list) -> tuple:
+        self.benchmark_data = copy.deepcopy(request)
+        self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                                        action=request.obj_type,
+                                        data_object=request.get_json_obj(),
+                                        experiment_trial_id=self.experiment_trial_id))
+        return objects.BenchmarkAck(), None
+
+    def sail_on_training_data(self, request: objects.RequestTrainingData,
+                              errormsgs: list) -> tuple:
+        # Get the episode.
+        episode = self._experiment.training.episodes[self._exper_train_index]
+
+        # Get the data to send.
+        data = self.get_episode_data(request=request,
+                                     episode=episode,
+                                     errormsgs=errormsgs)
+        return data, episode
+
+    def sail_on_training_prediction(self, request: objects.TrainingDataPrediction,
+                                    errormsgs: list) -> tuple:
+        if request.end_early:
+            self._exper_end_training_early = True
+        # Get the episode.
+        episode = self._experiment.training.episodes[self._exper_train_index]
+
+        # Process the prediction.
+        data = self.process_episode_data_prediction(request=request,
+                                                    episode=episode,
                                                     errormsgs=errormsgs)
-                        self.set_experiment_trial_index(
-                            experiment_trial_id=self.experiment_trial_id,
-                            errormsgs=errormsgs)
 
-                        # Set the state to TrialStart.
-                        self.STATE = objects.TrialStart(
-                            trial_number=self._exper_trial_index,
-                            message='Please RESET TA2 model to SAVED state.',
-                            novelty_description=self._exper_trial_novelty_desc)
-            elif isinstance(self.STATE, objects.ExperimentEnd):
-                if not self._exper_no_testing:
-                    self.update_experiment_end(model_experiment_id=self.model_experiment_id,
-                                               errormsgs=errormsgs)
-                self.amqp.remove_subscribe_to_queue(queue_name=self.private_queue)
-                self.subscribe_experiment_queue()
-                self.subscribe_sota_queue()
-                self.private_queue = None
-                self.current_domain = None
-                self.model_experiment_id = None
-                self.experiment_trial_id = None
-                self.trial_episode_id = None
-                self.trial_episode_performance = None
-                self.trial_predicted_novelty = False
-                self.trial_budget_active = False
-                self.experiment_type = None
-                self.novelty_initiated = False
-                self.novelty_visibility = 0
-                self._experiment = None
-                self._exper_train_index = None
-                self._exper_novelty_index = None
-                self._exper_trial_index = None
-                self._exper_episode_index = None
-                del self._exper_trial_novelty_desc
-                self._exper_trial_novelty_desc = None
-                self._exper_end_training_early = False
-                self._exper_end_experiment_early = False
-                self._exper_no_testing = False
-                self._exper_no_training = False
-                self._exper_just_one_trial = False
-                del self._exper_generator_config
-                self._exper_generator_config = None
-                self.benchmark_data = None
-                self.STATE = None
-                del self.domain_ids
-                self.domain_ids = dict()
-                del self.domain_cache
-                self.domain_cache = list()
-                del self.dataset_cache
-                self.dataset_cache = dict()
-                del self.episode_cache
-                self.episode_cache = dict()
-                del self.data_cache
-                self.data_cache = dict()
-                del self.rolling_score
-                self.rolling_score = list()
-                if self._AMQP_EXP_CALLBACK_ID is not None:
-                    self.amqp.cancel_call_later(timeout_id=self._AMQP_EXP_CALLBACK_ID)
-                    self._AMQP_EXP_CALLBACK_ID = None
-        elif isinstance(request, objects.BenchmarkData):
-            if not isinstance(self.STATE, objects.ExperimentStart):
-                errormsgs.append('ERROR: Will not accept BenchmarkData outside of the '
-                                 'initial benchmarking state!')
-            else:
-                self.benchmark_data = copy.deepcopy(request)
-                self.log_message(msg=LogMessage(model_experiment_id=self.model_experiment_id,
-                                                action=request.obj_type,
-                                                data_object=request.get_json_obj(),
-                                                experiment_trial_id=self.experiment_trial_id))
-                data = objects.BenchmarkAck()
-        elif isinstance(request, objects.RequestTrainingData):
-            if not isinstance(self.STATE, objects.TrainingEpisodeActive):
-                errormsgs.append('ERROR: You are not allowed to request training data outside '
-                                 'of the TrainingEpisodeActive state!')
+        # Check to see if we received an objects.TrainingEpisodeEnd.
+        if isinstance(data, objects.EpisodeEnd):
+            self.stop_trial_episode(trial_episode_id=self.trial_episode_id,
+                                    errormsgs=errormsgs)
+            # Check to see if we have a next training episode.
+            next_episode_index = self._exper_train_index + 1
+            if next_episode_index < len(self._experiment.training.episodes) and \
+                    not self._exper_end_training_early:
+                # We still have more training episodes!
+                # Increment the training episode index.
+                self._exper_train_index += 1
+                self.STATE = objects.TrainingEpisodeStart(
+                    episode_number=self._exper_train_index)
             else:
-                # Get the episode.
-                episode = self._experiment.training.episodes[self._exper_train_index]
-                current_episode = episode
+                # This was the last training episode, prepare to move past training.
+                self.STATE = objects.TrainingEnd(
+                    message='Please SAVE TA2 model in current state.')
+                # Increasing the timeout length by multiplier so client/sota can train
+                # models without getting kicked from the experiment.
+                self.hold_during_training_gap = True
+                self._AMQP_EXPERIMENT_TIMEOUT = (self._AMQP_EXPERIMENT_TIMEOUT
+                                                 * self._TIMEOUT_MULTIPLIER)
+            self.log_message(
+                msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                               action=data.obj_type,
+                               data_object=data.get_json_obj(),
+                               experiment_trial_id=self.experiment_trial_id))
+
+        # A step request also wants the next training data in the same response.
+        if isinstance(request, objects.TrainingDataStep):
+            next_data = None
+            if isinstance(data, objects.TrainingDataAck) and len(errormsgs) == 0:
+                next_data = self.get_episode_step_data(request=request,
+                                                       episode=episode,
+                                                       errormsgs=errormsgs)
+            data = objects.TrainingDataStepResponse(ack=data,
+                                                    data=next_data)
+        return data, episode
+
+    def sail_on_testing_data(self, request: objects.RequestTestingData,
+                             errormsgs: list) -> tuple:
+        # Get the episode.
+        episode = self._experiment.novelty_groups[self._exper_novelty_index]\
+                      .trials[self._exper_trial_index]\
+                      .episodes[self._exper_episode_index]
+
+        # Get the data to send.
+        data = self.get_episode_data(request=request,
+                                     episode=episode,
+                                     errormsgs=errormsgs)
+        return data, episode
+
+    def sail_on_testing_prediction(self, request: objects.TestingDataPrediction,
+                                   errormsgs: list) -> tuple:
+        if request.end_early:
+            self._exper_end_experiment_early = True
+        # Get the trial.
+        trial = self._experiment.novelty_groups[self._exper_novelty_index] \
+                    .trials[self._exper_trial_index]
+        # Get the episode.
+        episode = trial.episodes[self._exper_episode_index]
 
-                # Get the data to send.
-                data = self.get_episode_data(request=request,
-                                             episode=episode,
-                                             errormsgs=errormsgs)
-        elif isinstance(request, objects.TrainingDataPrediction):
-            if not isinstance(self.STATE, objects.TrainingEpisodeActive):
-                errormsgs.append('ERROR: Will not accept a TrainingDataPrediction outside of the '
-                                 'TrainingEpisodeActive state!')
-            else:
-                if request.end_early:
-                    self._exper_end_training_early = True
-                # Get the episode.
-                episode = self._experiment.training.episodes[self._exper_train_index]
-                current_episode = episode
-
-                # Process the prediction.
-                data = self.process_episode_data_prediction(request=request,
-                                                            episode=episode,
-                                                            errormsgs=errormsgs)
-
-                # Check to see if we received an objects.TrainingEpisodeEnd.
-                if isinstance(data, objects.EpisodeEnd):
-                    self.stop_trial_episode(trial_episode_id=self.trial_episode_id,
-                                            errormsgs=errormsgs)
-                    # Check to see if we have a next training episode.
-                    next_episode_index = self._exper_train_index + 1
-                    if next_episode_index < len(self._experiment.training.episodes) and \
-                            not self._exper_end_training_early:
-                        # We still have more training episodes!
-                        # Increment the training episode index.
-                        self._exper_train_index += 1
-                        self.STATE = objects.TrainingEpisodeStart(
-                            episode_number=self._exper_train_index)
-                    else:
-                        # This was the last training episode, prepare to move past training.
-                        self.STATE = objects.TrainingEnd(
-                            message='Please SAVE TA2 model in current state.')
-                        # Increasing the timeout length by multiplier so client/sota can train
-                        # models without getting kicked from the experiment.
-                        self.hold_during_training_gap = True
-                        self._AMQP_EXPERIMENT_TIMEOUT = (self._AMQP_EXPERIMENT_TIMEOUT
-                                                         * self._TIMEOUT_MULTIPLIER)
-                    self.log_message(
-                        msg=LogMessage(model_experiment_id=self.model_experiment_id,
-                                       action=data.obj_type,
-                                       data_object=data.get_json_obj(),
-                                       experiment_trial_id=self.experiment_trial_id))
-        elif isinstance(request, objects.TrainingEpisodeNovelty):
-            if not isinstance(self.STATE, (objects.TrainingEpisodeStart, objects.TrainingEnd)):
-                errormsgs.append('ERROR: Will not accept a TrainingEpisodeNovelty in this state!')
+        # Process the prediction.
+        data = self.process_episode_data_prediction(request=request,
+                                                    episode=episode,
+                                                    errormsgs=errormsgs)
+
+        # Check to see if we received an objects.TestingEpisodeEnd.
+        if isinstance(data, objects.EpisodeEnd):
+            self.stop_trial_episode(trial_episode_id=self.trial_episode_id,
+                                    errormsgs=errormsgs)
+            # Check to see if we have a next testing episode.
+            next_episode_index = self._exper_episode_index + 1
+            if next_episode_index < len(trial.episodes) and \
+                    not self._exper_end_experiment_early:
+                # We still have more testing episodes!
+                # Increment the testing episode index.
+                self._exper_episode_index += 1
+                self.STATE = objects.TestingEpisodeStart(
+                    episode_number=self._exper_episode_index)
             else:
-                # Save the episode data.
-                self.set_trial_episode_stats(
-                    trial_episode_id=self.trial_episode_id,
-                    novelty=request.novelty,
-                    performance=self.trial_episode_performance,
-                    novelty_probability=request.novelty_probability,
-                    novelty_threshold=request.novelty_threshold,
-                    novelty_characterization=request.novelty_characterization,
-                    hint_json=self.episode_hint_json,
-                    errormsgs=errormsgs)
+                # This was the last testing episode in the trial.
+                self.STATE = objects.TestingEnd()
+            self.log_message(
+                msg=LogMessage(model_experiment_id=self.model_experiment_id,
+                               action=data.obj_type,
+                               data_object=data.get_json_obj(),
+                               experiment_trial_id=self.experiment_trial_id))
+
+        # A step request also wants the next testing data in the same response.
+        if isinstance(request, objects.TestingDataStep):
+            next_data = None
+            if isinstance(data, objects.TestingDataAck) and len(errormsgs) == 0:
+                next_data = self.get_episode_step_data(request=request,
+                                                       episode=episode,
+                                                       errormsgs=errormsgs)
+            data = objects.TestingDataStepResponse(ack=data,
+                                                   data=next_data)
+        return data, episode
+
+    def save_episode_novelty(self, request: objects.BasicEpisodeNovelty, errormsgs: list):
+        # Save the episode data.
+        self.set_trial_episode_stats(
+            trial_episode_id=self.trial_episode_id,
+            novelty=request.novelty,
+            performance=self.trial_episode_performance,
+            novelty_probability=request.novelty_probability,
+            novelty_threshold=request.novelty_threshold,
+            novelty_characterization=request.novelty_characterization,
+            hint_json=self.episode_hint_json,
+            errormsgs=errormsgs)
+
+        if not self.trial_budget_active:
+            # Check if they predicted novelty.
+            if request.novelty_probability is not None \
+                    and request.novelty_threshold is not None:
+                if request.novelty_probability >= request.novelty_threshold:
+                    self.trial_predicted_novelty = True
+                    self.trial_budget_active = True
+        return
 
-                if not self.trial_budget_active:
-                    # Check if they predicted novelty.
-                    if request.novelty_probability is not None \
-                            and request.novelty_threshold is not None:
-                        if request.novelty_probability >= request.novelty_threshold:
-                            self.trial_predicted_novelty = True
-                            self.trial_budget_active = True
+    def sail_on_training_novelty(self, request: objects.TrainingEpisodeNovelty,
+                                 errormsgs: list) -> tuple:
+        self.save_episode_novelty(request=request, errormsgs=errormsgs)
+        # Respond with a TrainingEpisodeNoveltyAck.
+        return objects.TrainingEpisodeNoveltyAck(), None
 
-                # Respond with a TrainingEpisodeNoveltyAck.
-                data = objects.TrainingEpisodeNoveltyAck()
-        elif isinstance(request, objects.RequestTestingData):
-            if not isinstance(self.STATE, objects.TestingEpisodeActive):
-                errormsgs.append('ERROR: You are not allowed to request testing data outside '
-                                 'of the TestingEpisodeActive state!')
-            else:
-                # Get the episode.
-                episode = self._experiment.novelty_groups[self._exper_novelty_index]\
-                              .trials[self._exper_trial_index]\
-                              .episodes[self._exper_episode_index]
-                current_episode = episode
-
-                # Get the data to send.
-                data = self.get_episode_data(request=request,
-                                             episode=episode,
-                                             errormsgs=errormsgs)
-        elif isinstance(request, objects.TestingDataPrediction):
-            if not isinstance(self.STATE, objects.TestingEpisodeActive):
-                errormsgs.append('ERROR: Will not accept a TestingDataPrediction outside of the '
-                                 'TestingEpisodeActive state!')
-            else:
-                if request.end_early:
-                    self._exper_end_experiment_early = True
-                # Get the episode.
-                episode = self._experiment.novelty_groups[self._exper_novelty_index] \
-                              .trials[self._exper_trial_index] \
-                              .episodes[self._exper_episode_index]
-                current_episode = episode
-                # Get the trial.
-                trial = self._experiment.novelty_groups[self._exper_novelty_index] \
-                            .trials[self._exper_trial_index]
-
-                # Process the prediction.
-                data = self.process_episode_data_prediction(request=request,
-                                                            episode=episode,
-                                                            errormsgs=errormsgs)
-
-                # Check to see if we received an objects.TestingEpisodeEnd.
-                if isinstance(data, objects.EpisodeEnd):
-                    self.stop_trial_episode(trial_episode_id=self.trial_episode_id,
-                                            errormsgs=errormsgs)
-                    # Check to see if we have a next testing episode.
-                    next_episode_index = self._exper_episode_index + 1
-                    if next_episode_index < len(trial.episodes) and \
-                            not self._exper_end_experiment_early:
-                        # We still have more testing episodes!
-                        # Increment the testing episode index.
-                        self._exper_episode_index += 1
-                        self.STATE = objects.TestingEpisodeStart(
-                            episode_number=self._exper_episode_index)
-                    else:
-                        # This was the last testing episode in the trial.
-                        self.STATE = objects.TestingEnd()
-                    self.log_message(
-                        msg=LogMessage(model_experiment_id=self.model_experiment_id,
-                                       action=data.obj_type,
-                                       data_object=data.get_json_obj(),
-                                       experiment_trial_id=self.experiment_trial_id))
-        elif isinstance(request, objects.TestingEpisodeNovelty):
-            if not isinstance(self.STATE, (objects.TestingEpisodeStart, objects.TestingEnd)):
-                errormsgs.append('ERROR: Will not accept a TestingEpisodeNovelty in this state!')
-            else:
-                # Save the episode data.
-                self.set_trial_episode_stats(
-                    trial_episode_id=self.trial_episode_id,
-                    novelty=request.novelty,
-                    performance=self.trial_episode_performance,
-                    novelty_probability=request.novelty_probability,
-                    novelty_threshold=request.novelty_threshold,
-                    novelty_characterization=request.novelty_characterization,
-                    hint_json=self.episode_hint_json,
-                    errormsgs=errormsgs)
+    def sail_on_testing_novelty(self, request: objects.TestingEpisodeNovelty,
+                                errormsgs: list) -> tuple:
+        self.save_episode_novelty(request=request, errormsgs=errormsgs)
+        # Respond with a TestingEpisodeNoveltyAck.
+        return objects.TestingEpisodeNoveltyAck(), None
 
-                if not self.trial_budget_active:
-                    # Check if they predicted novelty.
-                    if request.novelty_probability is not None \
-                            and request.novelty_threshold is not None:
-                        if request.novelty_probability >= request.novelty_threshold:
-                            self.trial_predicted_novelty = True
-                            self.trial_budget_active = True
+    def on_sail_on_request(self, ch, method, props, body, request):
+        self.log.debug('on_sail_on_request( %s )', objects.LogSummary(request))
+        self.log.debug('STATE: %s', self.STATE)
+        errormsgs = list()
+        data = None
+        current_episode = None
+        self.refresh_dataset_cache = False
 
-                # Respond with a TestingEpisodeNoveltyAck.
-                data = objects.TestingEpisodeNoveltyAck()
+        if self._AMQP_EXP_CALLBACK_ID is not None:
+            self.amqp.cancel_call_later(timeout_id=self._AMQP_EXP_CALLBACK_ID)
+            self._AMQP_EXP_CALLBACK_ID = None
 
-        if len(errormsgs) > 0:
-            response.add_error(
-                casas_error=objects.CasasError(
-                    error_type='error',
-                    message='There were errors processing part or all of '
-                            'your request, please see errors for details.',
-                    error_dict=dict({'errors': errormsgs})))
+        # The transitions are in build_sail_on_transitions(), the per tick requests resolve to
+        # their handler with one lookup.
+        handler, name = self.get_sail_on_transition(request=request)
+        if handler is not None:
+            start = time.perf_counter()
+            data, current_episode = handler(request=request, errormsgs=errormsgs)
+            timing = self._sail_on_timing.get(name)
+            if timing is None:
+                timing = rabbitmq.LatencyHistogram()
+                self._sail_on_timing[name] = timing
+            timing.record_usec((time.perf_counter() - start) * 1e6)
 
         if props.reply_to is not None:
-            if response.status == 'error':
-                self.log.debug('RESPONSE: {}'.format(str(response.get_json())))
+            if len(errormsgs) > 0:
+                response = objects.CasasResponse(status='success',
+                                                 response_type='data',
+                                                 error_message='No Errors')
+                response.add_error(
+                    casas_error=objects.CasasError(
+                        error_type='error',
+                        message='There were errors processing part or all of '
+                                'your request, please see errors for details.',
+                        error_dict=dict({'errors': errormsgs})))
+                self.log.debug('RESPONSE: %s', objects.LogSummary(response))
                 self.amqp.publish_to_queue(queue_name=props.reply_to,
                                            casas_object=response,
                                            correlation_id=props.correlation_id)
             elif data is not None:
-                self.log.debug('RESPONSE: {}'.format(str(data.get_json())))
-                self.amqp.publish_to_queue(queue_name=props.reply_to,
-                                           casas_object=data,
-                                           correlation_id=props.correlation_id)
+                self.log.debug('RESPONSE: %s', objects.LogSummary(data))
+                self.amqp.publish_to_queue(
+                    queue_name=props.reply_to,
+                    casas_object=data,
+                    correlation_id=props.correlation_id,
+                    binary_segments=self.amqp.accepts_binary_segments(props),
+                    content_type=self.amqp.response_content_type(props))
 
-        self.log.debug('STATE: {}'.format(str(self.STATE)))
+        self.log.debug('STATE: %s', self.STATE)
 
         if self.refresh_dataset_cache and current_episode is not None:
-            # Get the next episode_id, episode_index, and dataset_id for the episode.
-            episode_id = current_episode.episode_id
-            episode_index = current_episode.episode_index
-            dataset_id = self.get_episode_dataset_id(episode_id=episode_id,
-                                                     episode_index=episode_index)
-            # Get the current data_index for the episode.
-            data_index = self.episode_cache[dataset_id][episode_index]['data_index']
-            # Load the episode data to the data_cache.
-            self.load_data_to_cache(
-                episode_id=episode_id,
-                at_data_index=data_index,
-                errormsgs=errormsgs)
+            self.refresh_episode_data_cache(episode=current_episode,
+                                            errormsgs=errormsgs)
 
         if self.STATE is not None:
             self._AMQP_EXP_CALLBACK_ID = self.amqp.call_later(
                 seconds=self._AMQP_EXPERIMENT_TIMEOUT,
-                function=self.force_end_experiment)
+                function=functools.partial(self.on_session_timeout, self.private_queue))
 
         if self.is_profiling:
             if isinstance(self.STATE, objects.ExperimentEnd):
@@ -5379,6 +6653,10 @@ class TA1:
 
     def force_end_experiment(self):
         self.log.warning('force_end_experiment({})'.format(self.model_experiment_id))
+        self.flush_db_writes(errormsgs=list())
+        self.stop_data_prefetch()
+        if self._db_writer is not None:
+            self._db_writer.forget_trial_episode(trial_episode_id=self.trial_episode_id)
         if self.experiment_type == objects.TYPE_EXPERIMENT_AIQ:
             if self.model_experiment_id is not None:
                 self.log_message(msg=LogMessage(
@@ -5388,10 +6666,7 @@ class TA1:
                         self._AMQP_EXPERIMENT_TIMEOUT)),
                     experiment_trial_id=self.experiment_trial_id))
             errormsgs = list()
-            if self.private_queue is not None:
-                self.amqp.remove_subscribe_to_queue(queue_name=self.private_queue)
-            self.subscribe_experiment_queue()
-            self.subscribe_sota_queue()
+            self.end_session()
             self.private_queue = None
             self.current_domain = None
             self.model_experiment_id = None
@@ -5417,6 +6692,7 @@ class TA1:
             self._exper_just_one_trial = False
             del self._exper_generator_config
             self._exper_generator_config = None
+            self._novelty_descriptions = dict()
             self.benchmark_data = None
             self.STATE = None
             del self.domain_ids
@@ -5442,11 +6718,9 @@ class TA1:
                     message=('Experiment timed out after {} seconds'.format(
                         self._AMQP_EXPERIMENT_TIMEOUT)),
                     experiment_trial_id=self.experiment_trial_id))
+                self.log_sail_on_timing()
             errormsgs = list()
-            if self.private_queue is not None:
-                self.amqp.remove_subscribe_to_queue(queue_name=self.private_queue)
-            self.subscribe_experiment_queue()
-            self.subscribe_sota_queue()
+            self.end_session()
             self.private_queue = None
             self.current_domain = None
             self.model_experiment_id = None
@@ -5472,6 +6746,8 @@ class TA1:
             self._exper_just_one_trial = False
             del self._exper_generator_config
             self._exper_generator_config = None
+            self._novelty_descriptions = dict()
+            self._sail_on_timing = dict()
             self.benchmark_data = None
             self.STATE = None
             del self.domain_ids
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Per-Tick Allocation Benchmark                                               ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Measures the memory allocated and the time taken by the objects a single tick builds on its way
+# from the generator to the TA2: the TestingData sent and decoded, the prediction and the ack.
+# Run it from the source directory before and after a change to compare:
+#     python3 benchmarks/allocation.py --walls=300
+
+import copy
+import optparse
+import os.path
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+
+def build_feature_vector(walls: int, enemies: int) -> dict:
+    rand = random.Random(42)
+    feature_vector = dict({'player': dict({'id': 1, 'x': 1.0, 'y': 2.0, 'z': 0.0, 'angle': 90.0,
+                                           'health': 100.0, 'ammo': 20}),
+                           'enemies': [dict({'id': i, 'name': 'ZombieMan', 'x': rand.random(),
+                                             'y': rand.random(), 'z': 0.0,
+                                             'angle': rand.random(), 'health': 10.0})
+                                       for i in range(enemies)],
+                           'walls': [dict({'x1': rand.random(), 'y1': rand.random(),
+                                           'x2': rand.random(), 'y2': rand.random()})
+                                     for i in range(walls)],
+                           'time_stamp': 1600000000.0})
+    return feature_vector
+
+
+def tick(feature_vector: dict, counters: dict):
+    # Generator/TA1 side, build and send the data.
+    data = objects.TestingData(secret='secret',
+                               feature_vector=feature_vector,
+                               utc_remote_epoch_received=time.time(),
+                               novelty_indicator=None)
+    body = objects.encode_body(body_obj=[data.get_json_obj()])
+    # TA2 side, decode the data and answer it.
+    received = objects.build_objects_from_json(body)[0]
+    prediction = objects.TestingDataPrediction(secret='secret',
+                                               label_prediction=dict({'action': 'left'}))
+    objects.build_objects_from_json(objects.encode_body(body_obj=[prediction.get_json_obj()]))
+    ack = objects.TestingDataAck(secret='secret', performance=0.5, feedback=None)
+    objects.build_objects_from_json(objects.encode_body(body_obj=[ack.get_json_obj()]))
+    counters['ticks'] += 1
+    return received
+
+
+def main(options):
+    feature_vector = build_feature_vector(walls=options.walls, enemies=options.enemies)
+    counters = dict({'ticks': 0})
+
+    # Count the deep copies made per tick.
+    deepcopy = copy.deepcopy
+    deepcopy_calls = dict({'calls': 0})
+
+    def counting_deepcopy(x, memo=None, _nil=[]):
+        if memo is None:
+            deepcopy_calls['calls'] += 1
+        return deepcopy(x, memo, _nil)
+
+    copy.deepcopy = counting_deepcopy
+    tick(feature_vector=feature_vector, counters=counters)
+    copy.deepcopy = deepcopy
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    tick(feature_vector=feature_vector, counters=counters)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for i in range(options.number):
+        tick(feature_vector=feature_vector, counters=counters)
+    usec = (time.perf_counter() - start) / options.number * 1e6
+
+    print('walls={} enemies={}'.format(options.walls, options.enemies))
+    print('{:<28} {:>12}'.format('deepcopy calls per tick', deepcopy_calls['calls']))
+    print('{:<28} {:>12.1f}'.format('peak KiB per tick', peak / 1024.0))
+    print('{:<28} {:>12.1f}'.format('usec per tick', usec))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--walls',
+                      dest='walls',
+                      help='Number of walls in the feature vector.',
+                      type=int,
+                      default=300)
+    parser.add_option('--enemies',
+                      dest='enemies',
+                      help='Number of enemies in the feature vector.',
+                      type=int,
+                      default=20)
+    parser.add_option('--number',
+                      dest='number',
+                      help='Number of timed ticks.',
+                      type=int,
+                      default=500)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 Database Write Behind Benchmark                                         ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Times the database writes the TA1 makes on the critical path of a live tick (create_data_instance,
+# update_episode_size, create_test_instance, update_test_instance and create_test_label) with
+# the sync write_mode and with the write behind, against a stand-in psycopg2 connection that
+# takes --rtt-ms for every statement and --commit-ms more for every commit.  No postgres is
+# needed, the statements are counted and not run.
+#     python3 benchmarks/db_write_behind.py --ticks=2000 --rtt-ms=0.3 --commit-ms=1.0
+
+import contextlib
+import importlib.util
+import json
+import logging
+import optparse
+import os.path
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+
+class StandInCursor(object):
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = list()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def mogrify(self, sql, args=None):
+        # Serialize the values like psycopg2 would, so the cost stays with the caller.
+        values = list()
+        for arg in args:
+            if isinstance(arg, ta1_partial.Json):
+                arg = json.dumps(arg.adapted)
+            values.append(str(arg))
+        return ('(' + ','.join(values) + ')').encode()
+
+    def execute(self, sql, args=None):
+        self.connection.round_trip(seconds=self.connection.rtt)
+        self.connection.statements += 1
+        self.connection.pending = True
+        self.rows = list()
+        if 'generate_series' in str(sql):
+            self.rows = [(self.connection.new_id(),) for i in range(args[1])]
+        elif 'RETURNING' in str(sql):
+            self.rows = [(self.connection.new_id(),)]
+        return
+
+    def fetchone(self):
+        if len(self.rows) == 0:
+            return None
+        return self.rows.pop(0)
+
+    def fetchall(self):
+        rows = self.rows
+        self.rows = list()
+        return rows
+
+
+class StandInConnection(object):
+    def __init__(self, rtt: float, commit: float):
+        self.rtt = rtt
+        self.commit_time = commit
+        self.encoding = 'UTF8'
+        self.closed = 0
+        self.statements = 0
+        self.commits = 0
+        self.pending = False
+        self.last_id = 0
+        self.lock = threading.Lock()
+        return
+
+    @staticmethod
+    def round_trip(seconds: float):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            time.sleep(0.0001)
+        return
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.last_id += 1
+            return self.last_id
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.commit()
+        return False
+
+    def cursor(self):
+        return StandInCursor(connection=self)
+
+    def commit(self):
+        if self.pending:
+            self.round_trip(seconds=self.rtt + self.commit_time)
+            self.commits += 1
+            self.pending = False
+        return
+
+    def close(self):
+        self.closed = 1
+        return
+
+
+class StandInPool(object):
+    # Hands out the one stand-in connection like DatabasePool.connection().
+    def __init__(self, rtt: float, commit: float):
+        self.conn = StandInConnection(rtt=rtt, commit=commit)
+        return
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self.conn:
+            yield self.conn
+
+
+def build_ta1(options, write_mode: str):
+    # Only the attributes the per tick database methods use.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1.db_pool = StandInPool(rtt=options.rtt_ms / 1000.0, commit=options.commit_ms / 1000.0)
+    ta1._db_write_mode = write_mode
+    ta1._db_write_rows = options.batch_rows
+    ta1._db_id_pool = dict()
+    ta1._db_writer = None
+    ta1._log_writer = None
+    if write_mode != objects.DB_WRITE_SYNC:
+        ta1._db_writer = ta1_partial.DatabaseWriteBehind(
+            log=ta1.log,
+            db_pool=StandInPool(rtt=options.rtt_ms / 1000.0, commit=options.commit_ms / 1000.0),
+            batch_rows=options.batch_rows)
+        ta1._db_writer.start()
+    return ta1
+
+
+def run_episode(ta1, options) -> list:
+    feature_vector = dict({'player': dict({'x': 1.0, 'y': 2.0}),
+                           'walls': [dict({'x1': 0.1 * i, 'y1': 0.2, 'x2': 0.3, 'y2': 0.4})
+                                     for i in range(options.walls)]})
+    label = dict({'action': 'left'})
+    errormsgs = list()
+    samples = list()
+    for data_index in range(options.ticks):
+        start = time.perf_counter()
+        data_id = ta1.create_data_instance(episode_id=1, feature_vector=feature_vector,
+                                           label=label, data_index=data_index,
+                                           errormsgs=errormsgs)
+        ta1.update_episode_size(episode_id=1, size=data_index + 1, errormsgs=errormsgs)
+        test_instance_id = ta1.create_test_instance(data_id=data_id, trial_episode_id=1,
+                                                    errormsgs=errormsgs)
+        ta1.update_test_instance(test_instance_id=test_instance_id,
+                                 remote_stamp_arrived=objects.epoch_to_stamp(time.time()),
+                                 remote_stamp_delivered=objects.epoch_to_stamp(time.time()),
+                                 errormsgs=errormsgs)
+        ta1.create_test_label(test_instance_id=test_instance_id, label_prediction=label,
+                              performance=0.5, errormsgs=errormsgs)
+        samples.append((time.perf_counter() - start) * 1e6)
+    if len(errormsgs) > 0:
+        print('errors: {}'.format(errormsgs))
+    return samples
+
+
+def main(options):
+    logging.basicConfig(level=logging.WARNING)
+    print('ticks={} walls={} rtt_ms={} commit_ms={} batch_rows={}'.format(
+        options.ticks, options.walls, options.rtt_ms, options.commit_ms, options.batch_rows))
+    print('{:<10} {:>12} {:>12} {:>12} {:>12} {:>10} {:>10}'.format(
+        'write_mode', 'p50 usec', 'p99 usec', 'episode s', 'episode end', 'statements',
+        'commits'))
+    for write_mode in [objects.DB_WRITE_SYNC, objects.DB_WRITE_EPISODE]:
+        ta1 = build_ta1(options=options, write_mode=write_mode)
+        start = time.perf_counter()
+        samples = run_episode(ta1=ta1, options=options)
+        # What stop_trial_episode() waits for at the end of the episode.
+        end_start = time.perf_counter()
+        errormsgs = list()
+        ta1.flush_db_writes(errormsgs=errormsgs)
+        end = time.perf_counter()
+        statements = ta1.db_pool.conn.statements
+        commits = ta1.db_pool.conn.commits
+        if ta1._db_writer is not None:
+            statements += ta1._db_writer.db_pool.conn.statements
+            commits += ta1._db_writer.db_pool.conn.commits
+            ta1._db_writer.stop()
+        samples.sort()
+        print('{:<10} {:>12.1f} {:>12.1f} {:>12.3f} {:>12.3f} {:>10} {:>10}'.format(
+            write_mode, samples[len(samples) // 2],
+            samples[min(len(samples) - 1, int(0.99 * len(samples)))],
+            end - start, end - end_start, statements, commits))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--ticks',
+                      dest='ticks',
+                      help='Number of ticks in the episode.',
+                      type=int,
+                      default=2000)
+    parser.add_option('--walls',
+                      dest='walls',
+                      help='Number of walls in the feature vector.',
+                      type=int,
+                      default=50)
+    parser.add_option('--rtt-ms',
+                      dest='rtt_ms',
+                      help='Milliseconds the stand-in database takes for every statement.',
+                      type=float,
+                      default=0.3)
+    parser.add_option('--commit-ms',
+                      dest='commit_ms',
+                      help='Milliseconds more the stand-in database takes for every commit.',
+                      type=float,
+                      default=1.0)
+    parser.add_option('--batch-rows',
+                      dest='batch_rows',
+                      help='Rows per write behind batch (write_batch_rows).',
+                      type=int,
+                      default=objects.DEFAULT_TA1_DB_WRITE_ROWS)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Object Decoding Microbenchmark                                              ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Times objects.build_objects_from_json() on the message types sent every tick of an episode.
+# Run it from the source directory before and after a change to compare:
+#     python3 benchmarks/decode_objects.py --number=20000
+
+import optparse
+import os.path
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+
+def build_messages() -> dict:
+    feature_vector = dict({'cart': dict({'x_position': 0.1, 'y_position': -0.2,
+                                         'z_position': 0.0, 'x_velocity': 0.01,
+                                         'y_velocity': 0.02, 'z_velocity': 0.0}),
+                           'pole': dict({'x_quaternion': 0.0, 'y_quaternion': 0.1,
+                                         'z_quaternion': 0.0, 'w_quaternion': 1.0,
+                                         'x_velocity': 0.0, 'y_velocity': 0.3,
+                                         'z_velocity': 0.0}),
+                           'blocks': [dict({'id': i, 'x_position': i * 1.5, 'y_position': -i,
+                                            'z_position': 2.0, 'x_velocity': 0.1,
+                                            'y_velocity': 0.1, 'z_velocity': 0.0})
+                                      for i in range(4)],
+                           'time_stamp': 1600000000.0})
+    label = dict({'action': 'left'})
+    messages = dict()
+    messages['RequestState'] = objects.RequestState()
+    messages['TrainingData'] = objects.TrainingData(secret='secret',
+                                                    feature_vector=feature_vector,
+                                                    feature_label=label,
+                                                    utc_remote_epoch_received=1600000000.0,
+                                                    utc_remote_epoch_sent=1600000000.1)
+    messages['TrainingDataPrediction'] = objects.TrainingDataPrediction(
+        secret='secret', utc_remote_epoch_received=1600000000.0,
+        utc_remote_epoch_sent=1600000000.1, label_prediction=label)
+    messages['TrainingDataAck'] = objects.TrainingDataAck(secret='secret', performance=0.5,
+                                                          feedback=None)
+    messages['TestingData'] = objects.TestingData(secret='secret',
+                                                  feature_vector=feature_vector,
+                                                  utc_remote_epoch_received=1600000000.0,
+                                                  utc_remote_epoch_sent=1600000000.1,
+                                                  novelty_indicator=None)
+    messages['TestingDataPrediction'] = objects.TestingDataPrediction(
+        secret='secret', utc_remote_epoch_received=1600000000.0,
+        utc_remote_epoch_sent=1600000000.1, label_prediction=label)
+    messages['TestingDataAck'] = objects.TestingDataAck(secret='secret', performance=0.5,
+                                                        feedback=None)
+    messages['TestingEpisodeEnd'] = objects.TestingEpisodeEnd(performance=0.5, feedback=None)
+    return messages
+
+
+def main(options):
+    messages = build_messages()
+    total = 0.0
+    print('{:<26} {:>12}'.format('obj_type', 'usec/decode'))
+    for name, casas_object in messages.items():
+        body = '[{}]'.format(casas_object.get_json())
+        decoded = objects.build_objects_from_json(body)
+        if type(decoded[0]) is not type(casas_object):
+            raise ValueError('{} decoded as {}'.format(name, str(decoded)))
+        seconds = min(timeit.repeat(lambda: objects.build_objects_from_json(body),
+                                    number=options.number,
+                                    repeat=options.repeat))
+        usec = seconds / options.number * 1e6
+        total += usec
+        print('{:<26} {:>12.2f}'.format(name, usec))
+    print('{:<26} {:>12.2f}'.format('total', total))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--number',
+                      dest='number',
+                      help='Number of decodes per timing run.',
+                      type=int,
+                      default=10000)
+    parser.add_option('--repeat',
+                      dest='repeat',
+                      help='Number of timing runs, the fastest is reported.',
+                      type=int,
+                      default=5)
+    (options, args) = parser.parse_args()
+    main(options=options)
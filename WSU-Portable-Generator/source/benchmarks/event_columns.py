@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Columnar Event Decoding Benchmark                                           ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+
+# Decodes a message with a JSON array of CASAS events (a day of a busy smart home) with
+# build_objects_from_json(), which makes an Event per event, and with build_event_columns(),
+# which keeps the events as numpy columns, comparing the time and the memory held afterwards.
+# A sample of events materialized from the columns must match the Event objects, the script
+# exits with status 1 if they do not.
+#     python3 benchmarks/event_columns.py --events=100000
+
+import json
+import optparse
+import os.path
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+
+def build_message(events: int) -> bytes:
+    rand = random.Random(42)
+    start = 1590969600.0
+    blob = list()
+    for i in range(events):
+        target = rand.randrange(60)
+        blob.append(dict({'action': objects.EVENT,
+                          'channel': 'rawevents',
+                          'site': 'kyoto',
+                          'data': dict({'uuid': '{:032x}'.format(rand.getrandbits(128)),
+                                        'epoch': start + i * 0.4,
+                                        'serial': 'S{:03d}'.format(target),
+                                        'target': 'M{:03d}'.format(target),
+                                        'message': rand.choice(['ON', 'OFF']),
+                                        'by': 'Insteon',
+                                        'category': 'entity',
+                                        'sensor_type': 'Control4-Motion',
+                                        'package_type': 'Insteon'})}))
+    return json.dumps(blob).encode('utf-8')
+
+
+def measure(function) -> (object, float, int):
+    # Timed without tracemalloc, which slows allocation down, then run again for the memory.
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = function()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, held
+
+
+def main(options):
+    message = build_message(events=options.events)
+    print('events={} message MiB={:.1f}'.format(options.events, len(message) / 1024.0 / 1024.0))
+    print('{:<26} {:>10} {:>12} {:>12}'.format('decoder', 'seconds', 'events/sec', 'held MiB'))
+    results = dict()
+    for name, function in [('build_objects_from_json', lambda: objects.build_objects_from_json(
+                                message=message)),
+                           ('build_event_columns', lambda: objects.build_event_columns(
+                               message=message))]:
+        result, elapsed, held = measure(function)
+        results[name] = result
+        print('{:<26} {:>10.3f} {:>12.1f} {:>12.1f}'.format(name, elapsed, options.events / elapsed,
+                                                            held / 1024.0 / 1024.0))
+        del result
+
+    event_list = results['build_objects_from_json']
+    columns = results['build_event_columns']
+    passed = len(event_list) == len(columns)
+    for index in random.Random(1).sample(range(len(columns)), min(1000, len(columns))):
+        if columns[index].get_json() != event_list[index].get_json():
+            passed = False
+    if not passed:
+        print('FAILED: the events materialized from the columns do not match.')
+        sys.exit(1)
+
+    # A typical analytics query, ON messages of one sensor in the second half of the day.
+    start = time.perf_counter()
+    mask = (columns.codes['target'] == columns.code('target', 'M007')) \
+        & (columns.codes['message'] == columns.code('message', 'ON')) \
+        & (columns.epoch >= columns.epoch[len(columns) // 2])
+    selected = columns[mask]
+    print('{:<26} {:>10.3f} {:>12}'.format('columnar query', time.perf_counter() - start,
+                                           len(selected)))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--events',
+                      dest='events',
+                      help='Number of events in the message.',
+                      type=int,
+                      default=100000)
+    (options, args) = parser.parse_args()
+    main(options=options)
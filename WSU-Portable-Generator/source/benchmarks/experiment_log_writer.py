@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 Experiment Log Writer Benchmark                                         ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Times TA1.log_message() for --messages state requests with the sync write_mode, one INSERT
+# and commit per record, and with the ExperimentLogWriter, against a stand-in psycopg2
+# connection that takes --rtt-ms for every statement and --commit-ms more for every commit.  A
+# third run makes every commit take --stall-ms, the records that do not fit in --max-rows are
+# spilled to a file without the caller waiting.  A fourth run has the database down the whole
+# time, flush() and stop() must still return, and a fifth starts a new writer on the spill file
+# of the fourth with the database back.  Every record must end up in the database or the spill
+# file.  No postgres is needed, the statements are counted and not run.
+#     python3 benchmarks/experiment_log_writer.py --messages=5000 --rtt-ms=0.3 --commit-ms=1.0
+
+import contextlib
+import importlib.util
+import json
+import logging
+import optparse
+import os.path
+import psycopg2
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+
+class StandInCursor(object):
+    def __init__(self, connection):
+        self.connection = connection
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def mogrify(self, sql, args=None):
+        # Serialize the values like psycopg2 would, so the cost stays with the caller.
+        self.connection.rows += 1
+        values = list()
+        for arg in args:
+            if isinstance(arg, ta1_partial.Json):
+                arg = json.dumps(arg.adapted)
+            values.append(str(arg))
+        return ('(' + ','.join(values) + ')').encode()
+
+    def execute(self, sql, args=None):
+        time.sleep(self.connection.rtt)
+        self.connection.statements += 1
+        if args is not None:
+            self.connection.rows += 1
+        self.connection.pending = True
+        return
+
+
+class StandInConnection(object):
+    def __init__(self, rtt: float, commit: float):
+        self.rtt = rtt
+        self.commit_time = commit
+        self.encoding = 'UTF8'
+        self.statements = 0
+        self.rows = 0
+        self.commits = 0
+        self.pending = False
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.commit()
+        return False
+
+    def cursor(self):
+        return StandInCursor(connection=self)
+
+    def commit(self):
+        if self.pending:
+            time.sleep(self.rtt + self.commit_time)
+            self.commits += 1
+            self.pending = False
+        return
+
+
+class StandInPool(object):
+    # Hands out the one stand-in connection like DatabasePool.connection(), or fails like a
+    # database that is down.
+    def __init__(self, rtt: float, commit: float, down: bool = False):
+        self.conn = StandInConnection(rtt=rtt, commit=commit)
+        self.down = down
+        return
+
+    @contextlib.contextmanager
+    def connection(self):
+        if self.down:
+            raise psycopg2.InterfaceError('The stand-in database is down.')
+        with self.conn:
+            yield self.conn
+
+
+def build_ta1(options, buffered: bool, commit_ms: float, spill_path: str, down: bool = False):
+    # Only the attributes log_message() uses.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1.db_pool = StandInPool(rtt=options.rtt_ms / 1000.0, commit=commit_ms / 1000.0, down=down)
+    ta1._log_writer = None
+    if buffered:
+        ta1._log_writer = ta1_partial.ExperimentLogWriter(
+            log=ta1.log,
+            db_pool=ta1.db_pool,
+            flush_seconds=objects.DEFAULT_TA1_LOG_FLUSH_SECONDS,
+            flush_rows=objects.DEFAULT_TA1_LOG_FLUSH_ROWS,
+            max_rows=options.max_rows,
+            spill_path=spill_path)
+        ta1._log_writer.start()
+    return ta1
+
+
+def spilled_records(spill_path: str) -> int:
+    spilled = 0
+    for path in [spill_path, spill_path + '.replay']:
+        if os.path.exists(path):
+            with open(path) as spill_file:
+                spilled += len(spill_file.readlines())
+    return spilled
+
+
+def run(options, name: str, buffered: bool, commit_ms: float, spill_path: str,
+        down: bool = False, messages: int = None) -> bool:
+    if messages is None:
+        messages = options.messages
+    ta1 = build_ta1(options=options, buffered=buffered, commit_ms=commit_ms,
+                    spill_path=spill_path, down=down)
+    samples = list()
+    start = time.perf_counter()
+    for i in range(messages):
+        msg = ta1_partial.LogMessage(model_experiment_id=1, action='state_request',
+                                     data_object=dict({'episode': 3, 'index': i}),
+                                     experiment_trial_id=7)
+        log_start = time.perf_counter()
+        ta1.log_message(msg=msg)
+        samples.append((time.perf_counter() - log_start) * 1e6)
+    elapsed = time.perf_counter() - start
+    stop_seconds = 0.0
+    if ta1._log_writer is not None:
+        stop_start = time.perf_counter()
+        ta1._log_writer.flush()
+        ta1._log_writer.stop()
+        stop_seconds = time.perf_counter() - stop_start
+    spilled = spilled_records(spill_path=spill_path)
+    samples.sort()
+    print('{:<10} {:>10.1f} {:>10.1f} {:>10.3f} {:>10.3f} {:>10} {:>8} {:>8} {:>8}'.format(
+        name, samples[len(samples) // 2] if len(samples) > 0 else 0.0,
+        samples[min(len(samples) - 1, int(0.99 * len(samples)))] if len(samples) > 0 else 0.0,
+        elapsed, stop_seconds, ta1.db_pool.conn.statements, ta1.db_pool.conn.commits,
+        ta1.db_pool.conn.rows, spilled))
+    return ta1.db_pool.conn.rows + spilled == options.messages
+
+
+def main(options):
+    logging.basicConfig(level=logging.CRITICAL)
+    print('messages={} rtt_ms={} commit_ms={} stall_ms={} max_rows={}'.format(
+        options.messages, options.rtt_ms, options.commit_ms, options.stall_ms, options.max_rows))
+    print('{:<10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>8} {:>8} {:>8}'.format(
+        'log', 'p50 usec', 'p99 usec', 'total s', 'stop s', 'statements', 'commits', 'rows',
+        'spilled'))
+    spill_dir = tempfile.mkdtemp(prefix='experiment_log_writer')
+    passed = True
+    try:
+        for name, buffered, commit_ms, down in [('sync', False, options.commit_ms, False),
+                                                ('buffered', True, options.commit_ms, False),
+                                                ('stalled', True, options.stall_ms, False),
+                                                ('down', True, options.commit_ms, True)]:
+            spill_path = os.path.join(spill_dir, '{}.spill'.format(name))
+            if not run(options=options, name=name, buffered=buffered, commit_ms=commit_ms,
+                       spill_path=spill_path, down=down):
+                print('FAILED: the {} run lost experiment log records.'.format(name))
+                passed = False
+        # A new writer on the spill file of the outage writes its records.
+        if not run(options=options, name='restart', buffered=True, commit_ms=options.commit_ms,
+                   spill_path=os.path.join(spill_dir, 'down.spill'), messages=0):
+            print('FAILED: the spilled records were not written after the restart.')
+            passed = False
+    finally:
+        shutil.rmtree(spill_dir)
+    if not passed:
+        sys.exit(1)
+    print('ok')
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--messages',
+                      dest='messages',
+                      help='Number of experiment log records.',
+                      type=int,
+                      default=5000)
+    parser.add_option('--rtt-ms',
+                      dest='rtt_ms',
+                      help='Milliseconds the stand-in database takes for every statement.',
+                      type=float,
+                      default=0.3)
+    parser.add_option('--commit-ms',
+                      dest='commit_ms',
+                      help='Milliseconds more the stand-in database takes for every commit.',
+                      type=float,
+                      default=1.0)
+    parser.add_option('--stall-ms',
+                      dest='stall_ms',
+                      help='Milliseconds every commit takes in the stalled run.',
+                      type=float,
+                      default=200.0)
+    parser.add_option('--max-rows',
+                      dest='max_rows',
+                      help='Most records the writer holds (log_max_rows).',
+                      type=int,
+                      default=1000)
+    (options, args) = parser.parse_args()
+    main(options=options)
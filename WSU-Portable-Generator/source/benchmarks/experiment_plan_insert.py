@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 Experiment Plan Insert Benchmark                                        ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Times saving the trials and episodes of an experiment plan of --groups novelty groups with
+# --trials trials of --episodes episodes each.  The per row path requests a novelty description
+# for every trial and inserts every trial and episode in its own transaction, the way
+# add_all_experiment_trials() did before.  The bulk path is add_all_experiment_trials(), which
+# requests the distinct descriptions together and refreshes the AMQP heartbeats between the
+# pages of its inserts.  The stand-in psycopg2 connection takes --rtt-ms for every statement and
+# --commit-ms more for every commit, and a novelty description takes --amqp-ms.  No postgres or
+# rabbitmq is needed.
+#     python3 benchmarks/experiment_plan_insert.py --groups=9 --trials=30 --episodes=40
+
+import contextlib
+import importlib.util
+import json
+import logging
+import optparse
+import os.path
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+
+class StandInCursor(object):
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = list()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def mogrify(self, sql, args=None):
+        # Serialize the values like psycopg2 would, so the cost stays with the caller.
+        values = list()
+        for arg in args:
+            if isinstance(arg, ta1_partial.Json):
+                arg = json.dumps(arg.adapted)
+            values.append(str(arg))
+        return ('(' + ','.join(values) + ')').encode()
+
+    def execute(self, sql, args=None):
+        time.sleep(self.connection.rtt)
+        self.connection.statements += 1
+        self.connection.pending = True
+        self.rows = list()
+        if 'generate_series' in str(sql):
+            self.rows = [(self.connection.new_id(),) for i in range(args[1])]
+        elif 'RETURNING' in str(sql):
+            self.rows = [(self.connection.new_id(),)]
+        return
+
+    def fetchone(self):
+        if len(self.rows) == 0:
+            return None
+        return self.rows.pop(0)
+
+    def fetchall(self):
+        rows = self.rows
+        self.rows = list()
+        return rows
+
+
+class StandInConnection(object):
+    def __init__(self, rtt: float, commit: float):
+        self.rtt = rtt
+        self.commit_time = commit
+        self.encoding = 'UTF8'
+        self.statements = 0
+        self.commits = 0
+        self.pending = False
+        self.last_id = 0
+        return
+
+    def new_id(self) -> int:
+        self.last_id += 1
+        return self.last_id
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.commit()
+        return False
+
+    def cursor(self):
+        return StandInCursor(connection=self)
+
+    def commit(self):
+        if self.pending:
+            time.sleep(self.rtt + self.commit_time)
+            self.commits += 1
+            self.pending = False
+        return
+
+
+class StandInPool(object):
+    # Hands out the one stand-in connection like DatabasePool.connection().
+    def __init__(self, rtt: float, commit: float):
+        self.conn = StandInConnection(rtt=rtt, commit=commit)
+        return
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self.conn:
+            yield self.conn
+
+
+class StandInAmqp(object):
+    def __init__(self):
+        self.heartbeats = 0
+        return
+
+    def process_data_events(self):
+        self.heartbeats += 1
+        return
+
+
+class StandInNoveltyDescriptionThread(threading.Thread):
+    # Answers like NoveltyDescriptionThread after the time a new AMQP connection and request take.
+    amqp_seconds = 0.0
+    requests = 0
+
+    def __init__(self, response_queue, domain: str, novelty: int, difficulty: str, **kwargs):
+        threading.Thread.__init__(self, daemon=True)
+        self.response_queue = response_queue
+        self.description = dict({'domain': domain, 'novelty': novelty, 'difficulty': difficulty})
+        StandInNoveltyDescriptionThread.requests += 1
+        return
+
+    def run(self):
+        time.sleep(self.amqp_seconds)
+        self.response_queue.put(objects.NoveltyDescription(novelty_description=self.description))
+        return
+
+    def stop(self):
+        return
+
+
+def build_ta1(options):
+    # Only the attributes the experiment plan methods use.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1.db_pool = StandInPool(rtt=options.rtt_ms / 1000.0, commit=options.commit_ms / 1000.0)
+    ta1.amqp = StandInAmqp()
+    ta1.amqp_user = ta1.amqp_pass = ta1.amqp_host = ta1.amqp_port = ta1.amqp_vhost = None
+    ta1.amqp_ssl = False
+    ta1._AMQP_EXPERIMENT_TIMEOUT = 60
+    ta1._HEARTBEAT_SLICE = 2.0
+    ta1._novelty_descriptions = dict()
+    return ta1
+
+
+def build_experiment(options) -> objects.Experiment:
+    novelty_groups = list()
+    for g in range(options.groups):
+        novelty = objects.VALID_NOVELTY[g % len(objects.VALID_NOVELTY)]
+        difficulty = objects.VALID_DIFFICULTY[g % len(objects.VALID_DIFFICULTY)]
+        trials = list()
+        for t in range(options.trials):
+            episodes = [objects.Episode(novelty=novelty, difficulty=difficulty, seed=e,
+                                        domain=objects.DOMAIN_CARTPOLE,
+                                        data_type=objects.DTYPE_LIVE_TEST,
+                                        trial_novelty=novelty, trial_episode_index=e)
+                        for e in range(options.episodes)]
+            trials.append(objects.Trial(episodes=episodes, novelty=novelty,
+                                        novelty_visibility=0, difficulty=difficulty,
+                                        hint_level=objects.HINT_NONE))
+        novelty_groups.append(objects.NoveltyGroup(trials=trials))
+    return objects.Experiment(training=None, novelty_groups=novelty_groups, budget=0.0,
+                              phase=objects.PHASE_3)
+
+
+def add_per_row(ta1, experiment: objects.Experiment, errormsgs: list):
+    for novelty_group in experiment.novelty_groups:
+        for i, trial in enumerate(novelty_group.trials):
+            ta1._novelty_descriptions = dict()
+            description = ta1.get_novelty_description(domain=trial.episodes[0].domain,
+                                                      novelty=trial.novelty,
+                                                      difficulty=trial.difficulty)
+            experiment_trial_id = ta1.handle_experiment_trial(
+                model_experiment_id=1, novelty_description=description.novelty_description,
+                trial=i, novelty=trial.novelty, novelty_visibility=trial.novelty_visibility,
+                difficulty=trial.difficulty, is_active=False, hint_level=trial.hint_level,
+                errormsgs=errormsgs)
+            for row in ta1.trial_episode_rows(experiment_trial_id=experiment_trial_id,
+                                              trial=trial):
+                ta1.handle_trial_episode(experiment_trial_id=row[0], episode_index=row[1],
+                                         novelty=row[2], novelty_initiated=row[3],
+                                         hint_level=row[4], errormsgs=errormsgs)
+    return
+
+
+def main(options):
+    logging.basicConfig(level=logging.WARNING)
+    ta1_partial.NoveltyDescriptionThread = StandInNoveltyDescriptionThread
+    StandInNoveltyDescriptionThread.amqp_seconds = options.amqp_ms / 1000.0
+    experiment = build_experiment(options=options)
+    print('groups={} trials={} episodes={} rtt_ms={} commit_ms={} amqp_ms={}'.format(
+        options.groups, options.trials, options.episodes, options.rtt_ms, options.commit_ms,
+        options.amqp_ms))
+    print('{:<10} {:>10} {:>12} {:>10} {:>14} {:>11}'.format(
+        'plan', 'seconds', 'statements', 'commits', 'descriptions', 'heartbeats'))
+    for name in ['per row', 'bulk']:
+        ta1 = build_ta1(options=options)
+        errormsgs = list()
+        StandInNoveltyDescriptionThread.requests = 0
+        start = time.perf_counter()
+        if name == 'bulk':
+            ta1.add_all_experiment_trials(model_experiment_id=1, experiment=experiment,
+                                          errormsgs=errormsgs)
+        else:
+            add_per_row(ta1=ta1, experiment=experiment, errormsgs=errormsgs)
+        elapsed = time.perf_counter() - start
+        if len(errormsgs) > 0:
+            print('errors: {}'.format(errormsgs[:5]))
+        print('{:<10} {:>10.3f} {:>12} {:>10} {:>14} {:>11}'.format(
+            name, elapsed, ta1.db_pool.conn.statements, ta1.db_pool.conn.commits,
+            StandInNoveltyDescriptionThread.requests, ta1.amqp.heartbeats))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--groups',
+                      dest='groups',
+                      help='Number of novelty groups in the experiment.',
+                      type=int,
+                      default=9)
+    parser.add_option('--trials',
+                      dest='trials',
+                      help='Number of trials in each novelty group.',
+                      type=int,
+                      default=30)
+    parser.add_option('--episodes',
+                      dest='episodes',
+                      help='Number of episodes in each trial.',
+                      type=int,
+                      default=40)
+    parser.add_option('--rtt-ms',
+                      dest='rtt_ms',
+                      help='Milliseconds the stand-in database takes for every statement.',
+                      type=float,
+                      default=0.3)
+    parser.add_option('--commit-ms',
+                      dest='commit_ms',
+                      help='Milliseconds more the stand-in database takes for every commit.',
+                      type=float,
+                      default=1.0)
+    parser.add_option('--amqp-ms',
+                      dest='amqp_ms',
+                      help='Milliseconds a novelty description request takes.',
+                      type=float,
+                      default=50.0)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 Experiment Planner Benchmark                                            ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Times TA1.build_sail_on_experiment() for live and recorded cartpole experiments with every
+# testing novelty, difficulty, visibility and hint level, --trials trials of --test-episodes
+# episodes each and --train-episodes training episodes.  The plan is checked for unique live
+# seeds in every configuration and unique recorded episodes in every trial.  The time the draw
+# with the list membership test and list.remove() used before takes for the same draws is shown
+# for comparison.  No database is needed, the dataset sizes are set by --dataset-episodes.
+#     python3 benchmarks/experiment_planner.py --trials=5 --test-episodes=100
+
+import importlib.util
+import logging
+import optparse
+import os.path
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+DOMAIN_ID = 1
+
+
+class StandInAmqp(object):
+    def process_data_events(self):
+        return
+
+
+def build_ta1(options):
+    # Only the attributes build_sail_on_experiment() uses.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1.amqp = StandInAmqp()
+    ta1.is_demo = False
+    domain = objects.DOMAIN_CARTPOLE
+    ta1.domain_names = dict({DOMAIN_ID: domain})
+    ta1._ep_by_domain = dict({domain: dict({objects.DTYPE_TRAIN: options.train_episodes,
+                                            objects.DTYPE_TEST: options.test_episodes,
+                                            'pre-novel': options.test_episodes // 4})})
+    ta1._image_by_domain = dict({domain: False})
+    ta1._budget_by_domain = dict({domain: 0.0})
+    ta1._server_novelty = list(objects.TESTING_NOVELTY)
+    ta1._server_difficulty = list(objects.VALID_DIFFICULTY)
+    ta1._server_novelty_visibility = list([0, 1])
+    ta1._server_hint = list([objects.HINT_NONE])
+    ta1._SAIL_ON_TRIALS = options.trials
+    ta1._testing_novelty_p2 = 0.5
+    ta1._PHASE = objects.PHASE_3
+    size = dict({'episodes': options.dataset_episodes})
+    ta1.dataset_cache = dict({DOMAIN_ID: dict()})
+    for data_type in [objects.DTYPE_TRAIN, objects.DTYPE_TEST]:
+        ta1.dataset_cache[DOMAIN_ID][data_type] = dict()
+        for novelty in objects.VALID_NOVELTY:
+            ta1.dataset_cache[DOMAIN_ID][data_type][novelty] = dict()
+            for difficulty in objects.VALID_DIFFICULTY:
+                ta1.dataset_cache[DOMAIN_ID][data_type][novelty][difficulty] = dict(
+                    [(trial_novelty, size) for trial_novelty in objects.VALID_NOVELTY])
+    return ta1
+
+
+def check_plan(experiment: objects.Experiment, data_source: str) -> (int, bool):
+    episodes = len(experiment.training.episodes)
+    passed = True
+    if data_source == objects.SOURCE_LIVE:
+        seeds = [ep.seed for ep in experiment.training.episodes]
+        passed = passed and len(seeds) == len(set(seeds))
+    for novelty_group in experiment.novelty_groups:
+        seeds = list()
+        for trial in novelty_group.trials:
+            episodes += len(trial.episodes)
+            if data_source == objects.SOURCE_LIVE:
+                seeds.extend([ep.seed for ep in trial.episodes])
+            else:
+                for novelty in set([ep.novelty for ep in trial.episodes]):
+                    indexes = [ep.episode_index for ep in trial.episodes
+                               if ep.novelty == novelty]
+                    passed = passed and len(indexes) == len(set(indexes))
+        passed = passed and len(seeds) == len(set(seeds))
+    return episodes, passed
+
+
+def list_draw_seconds(experiment: objects.Experiment, data_source: str, options) -> float:
+    # The same draws with the list membership test and list.remove() the planner used before.
+    start = time.perf_counter()
+    for novelty_group in experiment.novelty_groups:
+        drawn = list()
+        for trial in novelty_group.trials:
+            indexes = list(range(options.dataset_episodes))
+            for i in range(len(trial.episodes)):
+                if data_source == objects.SOURCE_LIVE:
+                    seed = random.randint(objects.SEED_NUM_TRAINING, objects.SEED_NUM_TESTING)
+                    while seed in drawn:
+                        seed = random.randint(objects.SEED_NUM_TRAINING,
+                                              objects.SEED_NUM_TESTING)
+                    drawn.append(seed)
+                else:
+                    episode_index = random.choice(indexes)
+                    indexes.remove(episode_index)
+    return time.perf_counter() - start
+
+
+def main(options):
+    logging.basicConfig(level=logging.WARNING)
+    print('trials={} test_episodes={} train_episodes={} dataset_episodes={}'.format(
+        options.trials, options.test_episodes, options.train_episodes, options.dataset_episodes))
+    print('{:<10} {:>10} {:>10} {:>14} {:>8}'.format(
+        'source', 'episodes', 'build s', 'list draw s', 'check'))
+    passed = True
+    for data_source in [objects.SOURCE_LIVE, objects.SOURCE_RECORDED]:
+        ta1 = build_ta1(options=options)
+        start = time.perf_counter()
+        experiment = ta1.build_sail_on_experiment(domain_id=DOMAIN_ID, data_source=data_source)
+        elapsed = time.perf_counter() - start
+        episodes, ok = check_plan(experiment=experiment, data_source=data_source)
+        passed = passed and ok
+        print('{:<10} {:>10} {:>10.3f} {:>14.3f} {:>8}'.format(
+            data_source, episodes, elapsed,
+            list_draw_seconds(experiment=experiment, data_source=data_source, options=options),
+            'ok' if ok else 'FAILED'))
+    if not passed:
+        print('FAILED: a seed or episode was drawn twice.')
+        sys.exit(1)
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--trials',
+                      dest='trials',
+                      help='Number of trials in every configuration.',
+                      type=int,
+                      default=5)
+    parser.add_option('--test-episodes',
+                      dest='test_episodes',
+                      help='Number of episodes in every trial.',
+                      type=int,
+                      default=100)
+    parser.add_option('--train-episodes',
+                      dest='train_episodes',
+                      help='Number of training episodes.',
+                      type=int,
+                      default=1000)
+    parser.add_option('--dataset-episodes',
+                      dest='dataset_episodes',
+                      help='Number of episodes in every recorded dataset.',
+                      type=int,
+                      default=5000)
+    (options, args) = parser.parse_args()
+    main(options=options)
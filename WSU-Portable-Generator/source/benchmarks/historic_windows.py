@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Historic Window Fetch Benchmark                                             ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+
+# Times rabbitmq.Connection.request_events_historic() over a range of days with one window and
+# with several windows outstanding, on the loopback broker.  A stand-in server answers every
+# window after --latency-ms (varied by up to --jitter of it, so later windows can finish first)
+# with --events events and the closing request, like the CASAS system request processor.  The
+# events must reach the callback in order either way, the script exits with status 1 if they
+# do not.
+#     python3 benchmarks/historic_windows.py --days=30 --latency-ms=50 --windows=1,4,8
+
+import datetime
+import logging
+import optparse
+import os.path
+import random
+import sys
+import threading
+import time
+
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+from objects import rabbitmq
+
+
+class StandInServer(object):
+    # Answers RequestEvents windows from its own IO loop, several at once.
+    def __init__(self, latency: float, jitter: float, events: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.events = events
+        self.rand = random.Random(42)
+        self.amqp = rabbitmq.Connection(agent_name='Server', amqp_user='loopback',
+                                        amqp_pass='loopback',
+                                        amqp_host=objects.AMQP_LOOPBACK_HOST, amqp_port=5672,
+                                        amqp_ssl=False)
+        self.amqp.setup_subscribe_to_queue(queue_name=objects.QUEUE_SYSTEM_REQUESTS,
+                                           queue_durable=True,
+                                           casas_events=True,
+                                           callback_function=self.on_request,
+                                           callback_full_params=True)
+        self.thread = threading.Thread(target=self.serve, name='StandInServer', daemon=True)
+        return
+
+    def serve(self):
+        self.amqp.run()
+        self.amqp.start_consuming()
+        return
+
+    def on_request(self, ch, method, props, body, request):
+        latency = self.latency * (1.0 + self.jitter * (2.0 * self.rand.random() - 1.0))
+        self.amqp.call_later(seconds=latency,
+                             function=lambda: self.answer(props=props, request=request))
+        return
+
+    def answer(self, props, request):
+        start = request.start_stamp.timestamp()
+        step = (request.end_stamp.timestamp() - start) / self.events
+        for i in range(self.events):
+            event = objects.Event(category='entity', package_type='Insteon',
+                                  sensor_type='Control4-Motion', message='ON', target='M001',
+                                  serial='1', by='bench', channel='rawevents', site=request.site,
+                                  epoch=start + i * step)
+            self.amqp.publish_to_queue(queue_name=props.reply_to, casas_object=event,
+                                       correlation_id=props.correlation_id)
+        self.amqp.publish_to_queue(queue_name=props.reply_to, casas_object=request,
+                                   correlation_id=props.correlation_id)
+        return
+
+
+def main(options):
+    logging.basicConfig(level=logging.WARNING)
+    server = StandInServer(latency=options.latency_ms / 1000.0, jitter=options.jitter,
+                           events=options.events)
+    server.thread.start()
+    client = rabbitmq.Connection(agent_name='Client', amqp_user='loopback',
+                                 amqp_pass='loopback', amqp_host=objects.AMQP_LOOPBACK_HOST,
+                                 amqp_port=5672, amqp_ssl=False)
+    client.run()
+
+    end_stamp = datetime.datetime(2020, 6, 1, tzinfo=pytz.utc)
+    start_stamp = end_stamp - datetime.timedelta(days=options.days)
+    passed = True
+    print('days={} events per window={} latency_ms={}'.format(options.days, options.events,
+                                                              options.latency_ms))
+    print('{:<10} {:>10} {:>12} {:>10}'.format('windows', 'seconds', 'events/sec', 'in order'))
+    for windows in [int(x) for x in options.windows.split(',')]:
+        epochs = list()
+        start = time.perf_counter()
+        client.request_events_historic(site='bench', start_stamp=start_stamp,
+                                       end_stamp=end_stamp, key='k', secret='s',
+                                       callback=lambda response: epochs.append(
+                                           response.epoch),
+                                       parallel_windows=windows)
+        elapsed = time.perf_counter() - start
+        in_order = epochs == sorted(epochs) and len(epochs) == options.days * options.events
+        passed = passed and in_order
+        print('{:<10} {:>10.3f} {:>12.1f} {:>10}'.format(windows, elapsed, len(epochs) / elapsed,
+                                                          str(in_order)))
+
+    server.amqp.call_later_threadsafe(function=server.amqp.stop_consuming)
+    server.thread.join(timeout=5.0)
+    client.stop()
+    if not passed:
+        print('FAILED: the events did not reach the callback in order.')
+        sys.exit(1)
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--days',
+                      dest='days',
+                      help='Number of days of events to request.',
+                      type=int,
+                      default=30)
+    parser.add_option('--events',
+                      dest='events',
+                      help='Number of events the server sends for each day.',
+                      type=int,
+                      default=200)
+    parser.add_option('--latency-ms',
+                      dest='latency_ms',
+                      help='Milliseconds the server takes before answering a window.',
+                      type=float,
+                      default=50.0)
+    parser.add_option('--jitter',
+                      dest='jitter',
+                      help='Fraction of the latency each window varies by.',
+                      type=float,
+                      default=0.5)
+    parser.add_option('--windows',
+                      dest='windows',
+                      help='Comma separated numbers of outstanding windows to time.',
+                      default='1,4,8')
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Hot Path Logging Cost Check                                                 ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Runs one tick of messages through rabbitmq.Connection.publish_to_queue() and
+# rabbitmq.ConsumeCallback.on_message() at INFO and at DEBUG, counting the objects rendered for
+# the logs. Nothing may be rendered at INFO, the script exits with status 1 if anything is.
+# No broker is needed, the published messages are delivered straight to the consumer.
+#     python3 benchmarks/logging_cost.py --walls=300
+
+import io
+import logging
+import optparse
+import os.path
+import random
+import sys
+import time
+
+import pika
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+from objects import rabbitmq
+
+
+class LoopbackChannel(object):
+    # Stands in for the pika channel, keeping the last message published.
+    def __init__(self):
+        self.published = None
+        return
+
+    def basic_publish(self, exchange, routing_key, properties, body):
+        self.published = (properties, body)
+        return
+
+
+def build_feature_vector(walls: int) -> dict:
+    rand = random.Random(42)
+    feature_vector = dict({'player': dict({'id': 1, 'x': 1.0, 'y': 2.0, 'angle': 90.0}),
+                           'walls': [dict({'x1': rand.random(), 'y1': rand.random(),
+                                           'x2': rand.random(), 'y2': rand.random()})
+                                     for i in range(walls)],
+                           'image': bytes(bytearray(rand.getrandbits(8) for i in range(4096))),
+                           'time_stamp': 1600000000.0})
+    return feature_vector
+
+
+def deliver(amqp: rabbitmq.Connection, consumer: rabbitmq.ConsumeCallback):
+    properties, body = amqp._channel.published
+    consumer.on_message(channel=amqp._channel,
+                        basic_deliver=pika.spec.Basic.Deliver(delivery_tag=1),
+                        properties=properties,
+                        body=body)
+    return
+
+
+def tick(client: rabbitmq.Connection, server: rabbitmq.Connection, feature_vector: dict):
+    server_consumer = rabbitmq.ConsumeCallback(
+        callback_function=lambda ch, method, props, body, request: None,
+        auto_ack=True,
+        callback_full_params=True)
+    client_consumer = rabbitmq.ConsumeCallback(
+        callback_function=client.process_system_request_callback,
+        auto_ack=True,
+        callback_full_params=True)
+    for request, response in [(objects.RequestTestingData(model_experiment_id=1, secret='s'),
+                               objects.TestingData(secret='s', feature_vector=feature_vector)),
+                              (objects.TestingDataPrediction(
+                                  secret='s', label_prediction=dict({'action': 'left'})),
+                               objects.TestingDataAck(secret='s', performance=0.5))]:
+        client._on_request_callbacks['corr'] = None
+        client.publish_to_queue(queue_name='server', casas_object=request, correlation_id='corr',
+                                reply_to='client')
+        deliver(amqp=client, consumer=server_consumer)
+        properties = client._channel.published[0]
+        server.publish_to_queue(queue_name='client', casas_object=response,
+                                correlation_id='corr',
+                                binary_segments=server.accepts_binary_segments(properties),
+                                content_type=server.response_content_type(properties))
+        deliver(amqp=server, consumer=client_consumer)
+    return
+
+
+def main(options):
+    feature_vector = build_feature_vector(walls=options.walls)
+    client = rabbitmq.Connection(agent_name='TA2', amqp_user='', amqp_pass='', amqp_host='',
+                                 amqp_port='')
+    server = rabbitmq.Connection(agent_name='TA1', amqp_user='', amqp_pass='', amqp_host='',
+                                 amqp_port='')
+    client._channel = LoopbackChannel()
+    server._channel = LoopbackChannel()
+
+    # Count every object rendered for the logs.
+    renders = dict({'calls': 0})
+    summarize_for_log = objects.summarize_for_log
+    get_json_str = objects.AiqObject.get_json_str
+
+    def counting_summarize_for_log(*args, **kwargs):
+        renders['calls'] += 1
+        return summarize_for_log(*args, **kwargs)
+
+    def counting_get_json_str(self):
+        renders['calls'] += 1
+        return get_json_str(self)
+
+    objects.summarize_for_log = counting_summarize_for_log
+    objects.AiqObject.get_json_str = counting_get_json_str
+
+    root_log = logging.getLogger()
+    root_log.addHandler(logging.StreamHandler(io.StringIO()))
+    passed = True
+    print('{:<8} {:>16} {:>14}'.format('level', 'renders per tick', 'usec per tick'))
+    for level in [logging.INFO, logging.DEBUG]:
+        root_log.setLevel(level)
+        renders['calls'] = 0
+        tick(client=client, server=server, feature_vector=feature_vector)
+        calls = renders['calls']
+        start = time.perf_counter()
+        for i in range(options.number):
+            tick(client=client, server=server, feature_vector=feature_vector)
+        usec = (time.perf_counter() - start) / options.number * 1e6
+        print('{:<8} {:>16} {:>14.1f}'.format(logging.getLevelName(level), calls, usec))
+        if level == logging.INFO and calls > 0:
+            passed = False
+
+    objects.summarize_for_log = summarize_for_log
+    objects.AiqObject.get_json_str = get_json_str
+    if not passed:
+        print('FAILED: objects were rendered for log records that are not emitted at INFO.')
+        sys.exit(1)
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--walls',
+                      dest='walls',
+                      help='Number of walls in the feature vector.',
+                      type=int,
+                      default=300)
+    parser.add_option('--number',
+                      dest='number',
+                      help='Number of timed ticks per level.',
+                      type=int,
+                      default=200)
+    (options, args) = parser.parse_args()
+    main(options=options)
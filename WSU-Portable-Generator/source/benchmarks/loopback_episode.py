@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Loopback Episode Benchmark                                                  ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Plays live episodes between a GeneratorLogic and the TA1 side of rabbitmq.Connection (what the
+# LiveGeneratorThread does) with both running in this process on the loopback broker
+# (host = loopback in the [amqp] config section), so no RabbitMQ is needed.  The generator
+# serves a fixed feature vector instead of a simulator, so the time per tick is the protocol
+# and transport overhead alone.  --rpc-stats adds the TA1 connection's own per request type
+# statistics (rabbitmq.Connection.get_rpc_stats()).
+#     python3 benchmarks/loopback_episode.py --ticks=2000 --walls=300 --rpc-stats
+
+import logging
+import optparse
+import os
+import os.path
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+from objects import rabbitmq
+from objects.GENERATOR_logic import GeneratorLogic
+
+
+class FixedGenerator(GeneratorLogic):
+    # Serves the same feature vector every tick and ends the episode after episode_size ticks.
+    def __init__(self, config_file: str, feature_vector: dict, episode_size: int):
+        super().__init__(config_file=config_file, printout=False, debug=False, fulldebug=False,
+                         logfile=None, domain=None)
+        self.feature_vector = feature_vector
+        self.episode_size = episode_size
+        self.ticks = 0
+        return
+
+    def get_novelty_description(self, domain: str, novelty: int, difficulty: str) -> dict:
+        return dict()
+
+    def initilize_generator(self, domain: str, novelty: int, difficulty: str, seed: int,
+                            trial_novelty: int, day_offset: int, use_image: bool,
+                            ta2_generator_config: dict, hint_level: int, phase: str):
+        self.is_episode_done = False
+        self.ticks = 0
+        return
+
+    def get_feature_vector(self) -> (dict, dict):
+        return self.feature_vector, dict({'action': 'left'})
+
+    def apply_action(self, label_prediction: dict) -> float:
+        self.ticks += 1
+        if self.ticks >= self.episode_size:
+            self.is_episode_done = True
+        return 1.0
+
+    def cleanup_generator(self):
+        return
+
+
+def build_feature_vector(walls: int) -> dict:
+    rand = random.Random(42)
+    feature_vector = dict({'player': dict({'id': 1, 'x': 1.0, 'y': 2.0, 'angle': 90.0}),
+                           'walls': [dict({'x1': rand.random(), 'y1': rand.random(),
+                                           'x2': rand.random(), 'y2': rand.random()})
+                                     for i in range(walls)],
+                           'time_stamp': 1600000000.0})
+    return feature_vector
+
+
+def write_config(domain: str) -> str:
+    handle, config_file = tempfile.mkstemp(suffix='.config')
+    with os.fdopen(handle, 'w') as config:
+        config.write('[sail-on]\ndomain = {}\n\n[amqp]\nuser = loopback\npass = loopback\n'
+                     'host = {}\nvhost = /\nport = 5672\nssl = False\n'
+                     .format(domain, objects.AMQP_LOOPBACK_HOST))
+    return config_file
+
+
+def main(options):
+    logging.basicConfig(level=logging.WARNING)
+    config_file = write_config(domain=objects.DOMAIN_CARTPOLE)
+    generator = FixedGenerator(config_file=config_file,
+                               feature_vector=build_feature_vector(walls=options.walls),
+                               episode_size=options.episode_size)
+    os.remove(config_file)
+    generator_thread = threading.Thread(target=generator.run, name='Generator', daemon=True)
+    generator_thread.start()
+
+    amqp = rabbitmq.Connection(agent_name='TA1', amqp_user='loopback', amqp_pass='loopback',
+                               amqp_host=objects.AMQP_LOOPBACK_HOST, amqp_port=5672,
+                               amqp_ssl=False)
+    amqp.run()
+    samples = list()
+    episodes = 0
+    start = time.perf_counter()
+    while len(samples) < options.ticks:
+        amqp.start_generator(domain=objects.DOMAIN_CARTPOLE, novelty=objects.NOVELTY_200,
+                             difficulty=objects.DIFFICULTY_EASY, seed=episodes,
+                             trial_novelty=objects.NOVELTY_200, day_offset=0,
+                             request_timeout=60, use_image=False,
+                             hint_level=objects.HINT_NONE, phase=objects.PHASE_3)
+        episodes += 1
+        response = None
+        while not isinstance(response, objects.EpisodeEnd) and len(samples) < options.ticks:
+            tick_start = time.perf_counter()
+            amqp.send_generator_data(data_request=objects.RequestTestingData(
+                model_experiment_id=1, secret='s'))
+            response = amqp.send_generator_data(data_request=objects.TestingDataPrediction(
+                secret='s', label_prediction=dict({'action': 'left'})))
+            samples.append((time.perf_counter() - tick_start) * 1e6)
+        if not isinstance(response, objects.EpisodeEnd):
+            amqp.send_generator_data(data_request=objects.GeneratorReset())
+    elapsed = time.perf_counter() - start
+
+    generator.keyboard_ended = True
+    generator.amqp.call_later_threadsafe(function=generator.amqp.stop_consuming)
+    generator_thread.join(timeout=5.0)
+    amqp.stop()
+
+    samples.sort()
+    print('walls={} episodes={} ticks={}'.format(options.walls, episodes, len(samples)))
+    print('{:<24} {:>12.1f}'.format('ticks per second', len(samples) / elapsed))
+    print('{:<24} {:>12.1f}'.format('p50 usec per tick', samples[len(samples) // 2]))
+    print('{:<24} {:>12.1f}'.format('p99 usec per tick',
+                                     samples[min(len(samples) - 1, int(0.99 * len(samples)))]))
+    if options.rpc_stats:
+        stats = amqp.get_rpc_stats()
+        print('{:<24} {:>8} {:>10} {:>10} {:>12} {:>12}'.format(
+            'request', 'count', 'p50 usec', 'p99 usec', 'decode p50', 'bytes in'))
+        for name, request in stats['requests'].items():
+            print('{:<24} {:>8} {:>10} {:>10} {:>12} {:>12}'.format(
+                name, request['count'], request['latency_usec']['p50'],
+                request['latency_usec']['p99'], request['decode_usec']['p50'],
+                request['bytes_in']))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--ticks',
+                      dest='ticks',
+                      help='Number of timed ticks.',
+                      type=int,
+                      default=2000)
+    parser.add_option('--episode-size',
+                      dest='episode_size',
+                      help='Number of ticks per episode.',
+                      type=int,
+                      default=200)
+    parser.add_option('--walls',
+                      dest='walls',
+                      help='Number of walls in the feature vector.',
+                      type=int,
+                      default=300)
+    parser.add_option('--rpc-stats',
+                      dest='rpc_stats',
+                      action='store_true',
+                      help='Print the RPC statistics of the TA1 connection.',
+                      default=False)
+    (options, args) = parser.parse_args()
+    main(options=options)
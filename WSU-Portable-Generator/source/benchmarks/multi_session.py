@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 Multi-Session Benchmark                                                 ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Opens --sessions experiments on one TA1 the way on_experiment_request() does, each with a
+# data_cache of --rows recorded data instances, and sends --requests requests round robin to
+# their private queues through a stand-in AMQP connection.  The time the TA1 takes to switch to
+# the session of a request is reported next to requests that stay on one session, every request
+# must be handled with the fields of its own experiment, and the memory of every session is
+# logged.  The general queues must be left while --max-sessions are running and taken again when
+# one ends.  No AMQP server or postgres is needed.
+#     python3 benchmarks/multi_session.py --sessions=8 --max-sessions=8 --requests=20000
+
+import importlib.util
+import logging
+import optparse
+import os.path
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+
+class StandInAmqp(object):
+    # Keeps the callbacks of the subscribed queues instead of consuming them.
+    def __init__(self):
+        self.callbacks = dict()
+        return
+
+    def setup_subscribe_to_queue(self, queue_name: str, callback_function=None, **kwargs):
+        self.callbacks[queue_name] = callback_function
+        return
+
+    def remove_subscribe_to_queue(self, queue_name: str):
+        self.callbacks.pop(queue_name, None)
+        return
+
+    def cancel_call_later(self, timeout_id):
+        return
+
+
+def build_ta1(options):
+    # Only the attributes the session methods use.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1.amqp = StandInAmqp()
+    ta1._max_sessions = options.max_sessions
+    ta1._AMQP_SESSION_TIMEOUT = objects.GLOBAL_TIMEOUT_SECONDS
+    ta1._sessions = dict()
+    ta1._session_queues = dict()
+    ta1._session = None
+    ta1._session_field_names = list(ta1.new_session_fields())
+    ta1._accepting_experiments = False
+    ta1.park_session()
+    ta1.start_accepting_experiments()
+    return ta1
+
+
+def open_sessions(ta1, options) -> list:
+    private_queues = list()
+    for model_experiment_id in range(1, options.sessions + 1):
+        # What on_experiment_request() leaves in the fields of a new experiment.
+        ta1.park_session()
+        ta1.model_experiment_id = model_experiment_id
+        ta1.data_cache[model_experiment_id] = dict()
+        for data_index in range(options.rows):
+            ta1.data_cache[model_experiment_id][data_index] = dict({
+                'data_id': model_experiment_id * 1000000 + data_index,
+                'feature_vector': dict({'player': dict({'x': 1.0 * data_index, 'y': 2.0}),
+                                        'walls': [dict({'x1': 0.1 * i, 'y1': 0.2})
+                                                  for i in range(options.walls)]}),
+                'label': dict({'action': 'left'})})
+        ta1.open_session(callback_function=ta1.on_benchmark_request)
+        private_queues.append(ta1.private_queue)
+    return private_queues
+
+
+def on_benchmark_request(ta1, ch, method, props, body, request):
+    # Stands in for on_sail_on_request(), checks it was given the fields of its experiment.
+    if request != ta1.model_experiment_id or request not in ta1.data_cache:
+        ta1.mixed_requests += 1
+    ta1.episode_data_count += 1
+    return
+
+
+def send_requests(ta1, private_queues: list, requests: int, round_robin: bool) -> list:
+    samples = list()
+    for i in range(requests):
+        private_queue = private_queues[i % len(private_queues) if round_robin else 0]
+        request = ta1._session_queues[private_queue]
+        start = time.perf_counter()
+        ta1.amqp.callbacks[private_queue](None, None, None, None, request)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return samples
+
+
+def main(options):
+    logging.basicConfig(level=logging.INFO if options.verbose else logging.WARNING)
+    print('sessions={} max_sessions={} rows={} walls={} requests={}'.format(
+        options.sessions, options.max_sessions, options.rows, options.walls, options.requests))
+    ta1_partial.TA1.on_benchmark_request = on_benchmark_request
+    ta1 = build_ta1(options=options)
+    ta1.mixed_requests = 0
+    private_queues = open_sessions(ta1=ta1, options=options)
+    passed = True
+    if ta1._accepting_experiments == (options.sessions >= options.max_sessions):
+        print('FAILED: the general queues were not left at max_sessions.')
+        passed = False
+
+    print('{:<12} {:>10} {:>10} {:>10}'.format('requests', 'p50 usec', 'p99 usec', 'mixed'))
+    for round_robin in [False, True]:
+        samples = send_requests(ta1=ta1, private_queues=private_queues,
+                                requests=options.requests, round_robin=round_robin)
+        print('{:<12} {:>10.1f} {:>10.1f} {:>10}'.format(
+            'round robin' if round_robin else 'one session', samples[len(samples) // 2],
+            samples[min(len(samples) - 1, int(0.99 * len(samples)))], ta1.mixed_requests))
+    if ta1.mixed_requests > 0:
+        print('FAILED: requests were handled with the fields of another experiment.')
+        passed = False
+
+    # Every session counted its own requests.
+    counts = dict()
+    total_bytes = 0
+    for session in ta1._sessions.values():
+        fields = session.fields
+        if session is ta1._session:
+            fields = ta1.save_session_fields()
+        counts[session.model_experiment_id] = fields['episode_data_count']
+        total_bytes += session.memory_bytes(fields=fields)
+        if fields['episode_data_count'] != session.requests:
+            passed = False
+    print('requests by session: {}'.format(counts))
+    print('memory: {:.1f} MB in {} sessions, {:.2f} MB each'.format(
+        total_bytes / 1048576.0, len(ta1._sessions),
+        total_bytes / 1048576.0 / max(1, len(ta1._sessions))))
+    ta1.log_sessions()
+
+    # End the sessions the way the ExperimentEnd of on_sail_on_request() does.
+    for private_queue in private_queues:
+        ta1.activate_session(private_queue=private_queue)
+        ta1.end_session()
+        ta1.park_session()
+    if not ta1._accepting_experiments or len(ta1._sessions) > 0 or len(ta1.amqp.callbacks) != 2:
+        print('FAILED: the sessions did not end cleanly.')
+        passed = False
+    if not passed:
+        sys.exit(1)
+    print('ok')
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--sessions',
+                      dest='sessions',
+                      help='Number of experiments to run at the same time.',
+                      type=int,
+                      default=8)
+    parser.add_option('--max-sessions',
+                      dest='max_sessions',
+                      help='The TA1 max_sessions option.',
+                      type=int,
+                      default=8)
+    parser.add_option('--rows',
+                      dest='rows',
+                      help='Data instances in the data_cache of every session.',
+                      type=int,
+                      default=100)
+    parser.add_option('--walls',
+                      dest='walls',
+                      help='Number of walls in the feature vectors.',
+                      type=int,
+                      default=50)
+    parser.add_option('--requests',
+                      dest='requests',
+                      help='Number of requests to send.',
+                      type=int,
+                      default=20000)
+    parser.add_option('--verbose',
+                      dest='verbose',
+                      action='store_true',
+                      help='Show the session log of the TA1.',
+                      default=False)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Object Memory and Construction Benchmark                                    ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Measures the memory held by a large experiment plan (objects.Experiment of objects.Episode) and
+# the time to construct the objects created every tick.
+# Run it from the source directory before and after a change to compare:
+#     python3 benchmarks/object_memory.py --trials=200 --episodes=200
+
+import optparse
+import os.path
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+
+def build_episode(index: int) -> objects.Episode:
+    return objects.Episode(novelty=objects.NOVELTY_200,
+                           difficulty=objects.DIFFICULTY_EASY,
+                           seed=index,
+                           domain=objects.DOMAIN_CARTPOLE,
+                           data_type=objects.VALID_DATA_TYPE[0],
+                           episode_index=index,
+                           trial_episode_index=index)
+
+
+def build_experiment(trials: int, episodes: int) -> objects.Experiment:
+    training = objects.Training(episodes=[build_episode(i) for i in range(episodes)])
+    trial_list = list()
+    for t in range(trials):
+        trial_list.append(objects.Trial(episodes=[build_episode(i) for i in range(episodes)],
+                                        novelty=objects.NOVELTY_200,
+                                        novelty_visibility=0,
+                                        difficulty=objects.DIFFICULTY_EASY,
+                                        hint_level=objects.HINT_NONE))
+    return objects.Experiment(training=training,
+                              novelty_groups=[objects.NoveltyGroup(trials=trial_list)],
+                              budget=0.5,
+                              phase=objects.PHASE_3)
+
+
+def main(options):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    experiment = build_experiment(trials=options.trials, episodes=options.episodes)
+    plan_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    total_episodes = (options.trials + 1) * options.episodes
+
+    print('{:<34} {:>12}'.format('episodes in plan', total_episodes))
+    print('{:<34} {:>12.1f}'.format('plan MiB', plan_bytes / 1024.0 / 1024.0))
+    print('{:<34} {:>12.1f}'.format('bytes per episode', plan_bytes / total_episodes))
+    del experiment
+
+    feature_vector = dict({'x': 1.0})
+    label = dict({'action': 'left'})
+    constructors = dict({
+        'Episode': lambda: build_episode(1),
+        'TrainingData': lambda: objects.TrainingData(secret='s',
+                                                     feature_vector=feature_vector,
+                                                     feature_label=label,
+                                                     utc_remote_epoch_received=1.0),
+        'TestingData': lambda: objects.TestingData(secret='s',
+                                                   feature_vector=feature_vector,
+                                                   utc_remote_epoch_received=1.0),
+        'TestingDataPrediction': lambda: objects.TestingDataPrediction(secret='s',
+                                                                       label_prediction=label),
+        'TestingDataAck': lambda: objects.TestingDataAck(secret='s', performance=0.5),
+        'BasicData': lambda: objects.BasicData(feature_vector=feature_vector,
+                                               feature_label=label),
+        'BasicDataAck': lambda: objects.BasicDataAck(performance=0.5)})
+    print('{:<34} {:>12}'.format('construction', 'usec'))
+    for name, constructor in constructors.items():
+        seconds = min(timeit.repeat(constructor, number=options.number, repeat=5))
+        print('  {:<32} {:>12.3f}'.format(name, seconds / options.number * 1e6))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--trials',
+                      dest='trials',
+                      help='Number of trials in the plan.',
+                      type=int,
+                      default=200)
+    parser.add_option('--episodes',
+                      dest='episodes',
+                      help='Number of episodes per trial.',
+                      type=int,
+                      default=200)
+    parser.add_option('--number',
+                      dest='number',
+                      help='Number of constructions per timing run.',
+                      type=int,
+                      default=20000)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 Recorded Episode Prefetch Benchmark                                     ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Serves a recorded episode of --ticks data instances the way the TA1 does, refreshing the
+# data_cache when fewer than _DATA_CACHE_RELOAD rows are left, once with the synchronous
+# load_data_to_cache() and once with the RecordedDataPrefetcher.  The stand-in database takes
+# --query-ms for every query or FETCH and --row-us more for every row, and the TA2 takes
+# --think-ms between ticks.  The time the TA1 spends on a tick is reported.  No postgres is
+# needed.
+#     python3 benchmarks/recorded_prefetch.py --ticks=3000 --query-ms=20 --think-ms=1
+
+import contextlib
+import importlib.util
+import logging
+import optparse
+import os.path
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+SYNC = 'sync'
+PREFETCH = 'prefetch'
+
+
+class StandInCursor(object):
+    def __init__(self, connection, name: str = None):
+        self.connection = connection
+        self.name = name
+        self.rows = list()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def wait(self, rows: int):
+        time.sleep(self.connection.query + rows * self.connection.row)
+        return
+
+    def execute(self, sql, args=None):
+        self.connection.statements += 1
+        episode_id = args[0]
+        first = args[1]
+        last = self.connection.ticks - 1
+        if 'BETWEEN' in sql:
+            last = min(last, args[2])
+        if 'LIMIT' in sql:
+            last = min(last, first + args[2] - 1)
+        self.rows = [(data_index, self.connection.feature_vector(data_index), dict({'action': 0}),
+                      episode_id * 1000000 + data_index)
+                     for data_index in range(first, last + 1)]
+        if self.name is None:
+            # A client side cursor gets every row with the query.
+            self.wait(rows=len(self.rows))
+        else:
+            # A server side cursor only declares the query.
+            self.wait(rows=0)
+        return
+
+    def fetchone(self):
+        if len(self.rows) == 0:
+            return None
+        return self.rows.pop(0)
+
+    def fetchall(self):
+        rows = self.rows
+        self.rows = list()
+        return rows
+
+    def fetchmany(self, size: int):
+        self.connection.statements += 1
+        rows = self.rows[:size]
+        self.rows = self.rows[size:]
+        self.wait(rows=len(rows))
+        return rows
+
+
+class StandInConnection(object):
+    def __init__(self, ticks: int, walls: int, query: float, row: float):
+        self.ticks = ticks
+        self.walls = walls
+        self.query = query
+        self.row = row
+        self.statements = 0
+        return
+
+    def feature_vector(self, data_index: int) -> dict:
+        return dict({'player': dict({'x': 1.0, 'y': float(data_index)}),
+                     'walls': [dict({'x1': 0.1 * i, 'y1': 0.2, 'x2': 0.3, 'y2': 0.4})
+                               for i in range(self.walls)]})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def cursor(self, name: str = None):
+        return StandInCursor(connection=self, name=name)
+
+
+class StandInPool(object):
+    # Hands out the one stand-in connection like DatabasePool.connection().
+    def __init__(self, options):
+        self.conn = StandInConnection(ticks=options.ticks, walls=options.walls,
+                                      query=options.query_ms / 1000.0,
+                                      row=options.row_us / 1000000.0)
+        return
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self.conn:
+            yield self.conn
+
+
+def build_ta1(options):
+    # Only the attributes the data_cache methods use.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1.db_pool = StandInPool(options=options)
+    ta1.data_cache = dict()
+    ta1._data_prefetch = None
+    ta1._DATA_CACHE_SIZE = 100
+    ta1._DATA_CACHE_RELOAD = 2
+    return ta1
+
+
+def run_episode(ta1, options, mode: str) -> list:
+    errormsgs = list()
+    samples = list()
+    episode_id = 1
+    if mode == SYNC:
+        ta1.load_data_to_cache(episode_id=episode_id, at_data_index=0, errormsgs=errormsgs)
+    else:
+        ta1.start_data_prefetch(episode_id=episode_id, at_data_index=0)
+        ta1.fill_data_cache(episode_id=episode_id, at_data_index=0, errormsgs=errormsgs)
+    for data_index in range(options.ticks):
+        start = time.perf_counter()
+        data = ta1.data_cache[episode_id].pop(data_index)
+        if data['data_index'] != data_index:
+            errormsgs.append('Got data_index {} for {}.'.format(data['data_index'], data_index))
+        if len(ta1.data_cache[episode_id]) < ta1._DATA_CACHE_RELOAD:
+            if mode == SYNC:
+                ta1.load_data_to_cache(episode_id=episode_id, at_data_index=data_index + 1,
+                                       errormsgs=errormsgs)
+            else:
+                ta1.fill_data_cache(episode_id=episode_id, at_data_index=data_index + 1,
+                                    errormsgs=errormsgs)
+        samples.append((time.perf_counter() - start) * 1000.0)
+        time.sleep(options.think_ms / 1000.0)
+    if len(errormsgs) > 0:
+        print('errors: {}'.format(errormsgs[:5]))
+    return samples
+
+
+def main(options):
+    logging.basicConfig(level=logging.WARNING)
+    print('ticks={} walls={} query_ms={} row_us={} think_ms={}'.format(
+        options.ticks, options.walls, options.query_ms, options.row_us, options.think_ms))
+    print('{:<10} {:>10} {:>10} {:>10} {:>10} {:>12} {:>10}'.format(
+        'cache', 'p50 ms', 'p99 ms', 'max ms', 'total ms', 'statements', 'chunk'))
+    for mode in [SYNC, PREFETCH]:
+        ta1 = build_ta1(options=options)
+        samples = run_episode(ta1=ta1, options=options, mode=mode)
+        chunk = ta1._DATA_CACHE_SIZE
+        if ta1._data_prefetch is not None:
+            chunk = ta1._data_prefetch.chunk_size
+        ta1.stop_data_prefetch()
+        total = sum(samples)
+        samples.sort()
+        print('{:<10} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.1f} {:>12} {:>10}'.format(
+            mode, samples[len(samples) // 2],
+            samples[min(len(samples) - 1, int(0.99 * len(samples)))],
+            samples[-1], total, ta1.db_pool.conn.statements, chunk))
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--ticks',
+                      dest='ticks',
+                      help='Number of data instances in the episode.',
+                      type=int,
+                      default=3000)
+    parser.add_option('--walls',
+                      dest='walls',
+                      help='Number of walls in the feature vector.',
+                      type=int,
+                      default=50)
+    parser.add_option('--query-ms',
+                      dest='query_ms',
+                      help='Milliseconds the stand-in database takes for every query or FETCH.',
+                      type=float,
+                      default=20.0)
+    parser.add_option('--row-us',
+                      dest='row_us',
+                      help='Microseconds more the stand-in database takes for every row.',
+                      type=float,
+                      default=50.0)
+    parser.add_option('--think-ms',
+                      dest='think_ms',
+                      help='Milliseconds the TA2 takes between ticks.',
+                      type=float,
+                      default=1.0)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON RPC Latency Benchmark                                                       ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Times rabbitmq.Connection._set_system_request() round trips (p50/p99 per request type) against
+# a stand-in broker, and counts how often the waiting client wakes up in its IO loop.  The
+# stand-in connection follows pika's BlockingConnection.process_data_events(): it returns as soon
+# as it has dispatched a delivery or callback, or when time_limit has passed.  A server thread
+# answers every request after --service-ms, like the TA1 or the generator would.
+# --polling times the fixed 50 ms slice wait loop used before for comparison.
+#     python3 benchmarks/rpc_latency.py --number=500 --service-ms=2
+
+import optparse
+import os.path
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+from objects import rabbitmq
+
+
+class StandInBroker(object):
+    # Routes published messages to the server thread or to the client's reply queue.
+    def __init__(self, service_time: float):
+        self.service_time = service_time
+        self.requests = queue.Queue()
+        self.condition = threading.Condition()
+        self.deliveries = list()
+        self.done = False
+        self.server = threading.Thread(target=self.serve, name='StandInServer', daemon=True)
+        return
+
+    def serve(self):
+        while not self.done:
+            try:
+                properties, body = self.requests.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            request = rabbitmq.decode_message(properties=properties, body=body)[1][0]
+            time.sleep(self.service_time)
+            body, headers, content_type = rabbitmq.encode_message(
+                casas_object=self.respond(request=request),
+                content_type=rabbitmq.Connection.response_content_type(properties))
+            reply = rabbitmq.pika.BasicProperties(correlation_id=properties.correlation_id,
+                                                  content_type=content_type,
+                                                  headers=headers)
+            with self.condition:
+                self.deliveries.append((reply, body))
+                self.condition.notify_all()
+        return
+
+    @staticmethod
+    def respond(request: objects.AiqObject) -> objects.AiqObject:
+        if isinstance(request, objects.RequestState):
+            return objects.ExperimentResponse(server_rpc_queue='server', experiment_secret='s',
+                                              model_experiment_id=1, experiment_timeout=60.0)
+        if isinstance(request, objects.RequestTestingData):
+            return objects.TestingData(secret='s', feature_vector=dict({'x': 1.0}),
+                                       utc_remote_epoch_received=time.time())
+        if isinstance(request, objects.TestingDataPrediction):
+            return objects.TestingDataAck(secret='s', performance=0.5)
+        return objects.GeneratorResponse(generator_rpc_queue='generator')
+
+
+class StandInChannel(object):
+    def __init__(self, broker: StandInBroker):
+        self.broker = broker
+        self.is_open = True
+        return
+
+    def basic_publish(self, exchange, routing_key, properties, body):
+        self.broker.requests.put((properties, body))
+        return
+
+
+class StandInConnection(object):
+    # Delivers the client's replies through the consumer callback like BlockingConnection.
+    def __init__(self, broker: StandInBroker, consumer: rabbitmq.ConsumeCallback):
+        self.broker = broker
+        self.consumer = consumer
+        self.wakeups = 0
+        return
+
+    def process_data_events(self, time_limit=0):
+        deadline = None
+        if time_limit is not None:
+            deadline = time.perf_counter() + time_limit
+        with self.broker.condition:
+            while len(self.broker.deliveries) == 0:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0.0:
+                        break
+                self.broker.condition.wait(timeout=remaining)
+            self.wakeups += 1
+            deliveries = self.broker.deliveries
+            self.broker.deliveries = list()
+        for properties, body in deliveries:
+            self.consumer.on_message(channel=None,
+                                     basic_deliver=rabbitmq.pika.spec.Basic.Deliver(
+                                         delivery_tag=1),
+                                     properties=properties,
+                                     body=body)
+        return
+
+
+def polling_wait_for_response(amqp: rabbitmq.Connection, corr_id: str, deadline: float = None):
+    # The wait used before, re-checking the response every 50 ms slice of the IO loop.
+    while amqp._request_response.get(corr_id) is None \
+            and (deadline is None or float(time.time()) < deadline):
+        amqp.process_data_events(time_limit=0.05)
+    return amqp._request_response.pop(corr_id, None)
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(options):
+    broker = StandInBroker(service_time=options.service_ms / 1000.0)
+    broker.server.start()
+    client = rabbitmq.Connection(agent_name='TA2', amqp_user='', amqp_pass='', amqp_host='',
+                                 amqp_port='')
+    consumer = rabbitmq.ConsumeCallback(callback_function=client.process_system_request_callback,
+                                        auto_ack=True,
+                                        callback_full_params=True)
+    client._channel = StandInChannel(broker=broker)
+    client._connection = StandInConnection(broker=broker, consumer=consumer)
+    client._rpc_reply_queue = 'reply'
+    client._rpc_publish_queues['server'] = True
+    if options.polling:
+        client._wait_for_response = lambda corr_id, deadline=None: polling_wait_for_response(
+            amqp=client, corr_id=corr_id, deadline=deadline)
+
+    requests = dict({
+        'RequestState': objects.RequestState(),
+        'RequestTestingData': objects.RequestTestingData(model_experiment_id=1, secret='s'),
+        'TestingDataPrediction': objects.TestingDataPrediction(
+            secret='s', label_prediction=dict({'action': 'left'})),
+        'StartGenerator': objects.StartGenerator(domain=objects.DOMAIN_CARTPOLE,
+                                                 novelty=objects.NOVELTY_200,
+                                                 difficulty=objects.DIFFICULTY_EASY, seed=1,
+                                                 server_rpc_queue='server',
+                                                 trial_novelty=objects.NOVELTY_200)})
+    print('wait={} service_ms={}'.format('polling' if options.polling else 'event',
+                                         options.service_ms))
+    print('{:<24} {:>10} {:>10} {:>14}'.format('request', 'p50 usec', 'p99 usec',
+                                              'wakeups/rpc'))
+    for name, request in requests.items():
+        samples = list()
+        client._connection.wakeups = 0
+        for i in range(options.number):
+            start = time.perf_counter()
+            client._set_system_request(casas_object=request, queue_name='server')
+            samples.append((time.perf_counter() - start) * 1e6)
+        print('{:<24} {:>10.1f} {:>10.1f} {:>14.2f}'.format(
+            name, percentile(samples, 0.50), percentile(samples, 0.99),
+            client._connection.wakeups / float(options.number)))
+
+    # Wakeups while waiting on a response that takes --idle-ms to arrive.
+    broker.service_time = options.idle_ms / 1000.0
+    client._connection.wakeups = 0
+    client._set_system_request(casas_object=objects.RequestState(), queue_name='server')
+    print('{:<24} {:>10} {:>10} {:>14}'.format('idle {} ms'.format(options.idle_ms), '', '',
+                                              client._connection.wakeups))
+    broker.done = True
+    broker.server.join()
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--number',
+                      dest='number',
+                      help='Number of timed round trips per request type.',
+                      type=int,
+                      default=500)
+    parser.add_option('--service-ms',
+                      dest='service_ms',
+                      help='Milliseconds the stand-in server takes to answer a request.',
+                      type=float,
+                      default=2.0)
+    parser.add_option('--idle-ms',
+                      dest='idle_ms',
+                      help='Milliseconds the server takes to answer the idle wait request.',
+                      type=float,
+                      default=1000.0)
+    parser.add_option('--polling',
+                      dest='polling',
+                      action='store_true',
+                      help='Time the fixed slice polling wait used before.',
+                      default=False)
+    (options, args) = parser.parse_args()
+    main(options=options)
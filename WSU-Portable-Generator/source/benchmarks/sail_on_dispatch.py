@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON TA1 State Machine Dispatch Benchmark                                        ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Checks that the transition table of TA1.on_sail_on_request() picks the same handler as the
+# isinstance chain it replaced for every SAIL-ON state and request class, then times finding the
+# handler of the per tick requests with the chain and with the table, and the cost of the
+# timing kept for every transition.  No AMQP server or postgres is needed.
+#     python3 benchmarks/sail_on_dispatch.py --lookups=200000
+
+import importlib.util
+import logging
+import optparse
+import os.path
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+from objects import rabbitmq
+
+spec = importlib.util.spec_from_file_location(
+    'ta1_partial', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'TA1-PARTIAL.py'))
+ta1_partial = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ta1_partial)
+
+STATES = list([None,
+               objects.BenchmarkRequest,
+               objects.ExperimentStart,
+               objects.TrainingStart,
+               objects.TrainingEpisodeStart,
+               objects.TrainingEpisodeActive,
+               objects.TrainingEnd,
+               objects.TrainingModelEnd,
+               objects.TrialStart,
+               objects.TestingStart,
+               objects.TestingEpisodeStart,
+               objects.TestingEpisodeActive,
+               objects.TestingEnd,
+               objects.TrialEnd,
+               objects.ExperimentEnd])
+REQUESTS = list([objects.RequestState,
+                 objects.BenchmarkData,
+                 objects.RequestTrainingData,
+                 objects.TrainingDataPrediction,
+                 objects.TrainingDataStep,
+                 objects.TrainingEpisodeNovelty,
+                 objects.RequestTestingData,
+                 objects.TestingDataPrediction,
+                 objects.TestingDataStep,
+                 objects.TestingEpisodeNovelty,
+                 objects.BenchmarkAck])
+STATE_HANDLERS = list([(objects.BenchmarkRequest, 'sail_on_benchmark_request'),
+                       (objects.ExperimentStart, 'sail_on_experiment_start'),
+                       (objects.TrainingStart, 'sail_on_training_start'),
+                       (objects.TrainingEpisodeStart, 'sail_on_training_episode_start'),
+                       (objects.TrainingEnd, 'sail_on_training_end'),
+                       (objects.TrainingModelEnd, 'sail_on_training_model_end'),
+                       (objects.TrialStart, 'sail_on_trial_start'),
+                       (objects.TestingStart, 'sail_on_testing_start'),
+                       (objects.TestingEpisodeStart, 'sail_on_testing_episode_start'),
+                       (objects.TestingEnd, 'sail_on_testing_end'),
+                       (objects.TrialEnd, 'sail_on_trial_end'),
+                       (objects.ExperimentEnd, 'sail_on_experiment_end')])
+
+
+def chain_handler(state, request) -> str:
+    # The isinstance chain on_sail_on_request() walked before, naming the branch it took.
+    if isinstance(request, objects.RequestState):
+        for state_class, name in STATE_HANDLERS:
+            if isinstance(state, state_class):
+                return name
+        return 'sail_on_report_state'
+    elif isinstance(request, objects.BenchmarkData):
+        if not isinstance(state, objects.ExperimentStart):
+            return 'sail_on_reject'
+        return 'sail_on_benchmark_data'
+    elif isinstance(request, objects.RequestTrainingData):
+        if not isinstance(state, objects.TrainingEpisodeActive):
+            return 'sail_on_reject'
+        return 'sail_on_training_data'
+    elif isinstance(request, objects.TrainingDataPrediction):
+        if not isinstance(state, objects.TrainingEpisodeActive):
+            return 'sail_on_reject'
+        return 'sail_on_training_prediction'
+    elif isinstance(request, objects.TrainingEpisodeNovelty):
+        if not isinstance(state, (objects.TrainingEpisodeStart, objects.TrainingEnd)):
+            return 'sail_on_reject'
+        return 'sail_on_training_novelty'
+    elif isinstance(request, objects.RequestTestingData):
+        if not isinstance(state, objects.TestingEpisodeActive):
+            return 'sail_on_reject'
+        return 'sail_on_testing_data'
+    elif isinstance(request, objects.TestingDataPrediction):
+        if not isinstance(state, objects.TestingEpisodeActive):
+            return 'sail_on_reject'
+        return 'sail_on_testing_prediction'
+    elif isinstance(request, objects.TestingEpisodeNovelty):
+        if not isinstance(state, (objects.TestingEpisodeStart, objects.TestingEnd)):
+            return 'sail_on_reject'
+        return 'sail_on_testing_novelty'
+    return None
+
+
+def handler_name(handler) -> str:
+    if handler is None:
+        return None
+    if hasattr(handler, 'func'):
+        handler = handler.func
+    return handler.__name__
+
+
+def build_ta1():
+    # Only the attributes the state machine lookup uses.
+    ta1 = ta1_partial.TA1.__new__(ta1_partial.TA1)
+    ta1.log = logging.getLogger('TA1')
+    ta1._SAIL_ON_TRANSITIONS = ta1.build_sail_on_transitions()
+    ta1._sail_on_dispatch = dict()
+    ta1.STATE = None
+    return ta1
+
+
+def instance(cls):
+    if cls is None:
+        return None
+    return cls.__new__(cls)
+
+
+def main(options):
+    ta1 = build_ta1()
+    mismatches = 0
+    for state_class in STATES:
+        for request_class in REQUESTS:
+            ta1.STATE = instance(state_class)
+            request = instance(request_class)
+            handler, name = ta1.get_sail_on_transition(request=request)
+            expected = chain_handler(state=ta1.STATE, request=request)
+            if handler_name(handler) != expected:
+                print('MISMATCH {}: table {} chain {}'.format(name, handler_name(handler),
+                                                             expected))
+                mismatches += 1
+    print('{} state and request pairs checked, {} mismatches'.format(
+        len(STATES) * len(REQUESTS), mismatches))
+
+    print('{:<46} {:>12} {:>12}'.format('lookup', 'chain nsec', 'table nsec'))
+    per_tick = list([(objects.TrainingEpisodeActive, objects.RequestTrainingData),
+                     (objects.TrainingEpisodeActive, objects.TrainingDataStep),
+                     (objects.TestingEpisodeActive, objects.RequestTestingData),
+                     (objects.TestingEpisodeActive, objects.TestingDataPrediction),
+                     (objects.TestingEpisodeActive, objects.TestingDataStep)])
+    for state_class, request_class in per_tick:
+        ta1.STATE = instance(state_class)
+        request = instance(request_class)
+        start = time.perf_counter()
+        for i in range(options.lookups):
+            chain_handler(state=ta1.STATE, request=request)
+        chain = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(options.lookups):
+            ta1.get_sail_on_transition(request=request)
+        table = time.perf_counter() - start
+        print('{:<46} {:>12.1f} {:>12.1f}'.format(
+            '{}.{}'.format(state_class.__name__, request_class.__name__),
+            chain / options.lookups * 1e9, table / options.lookups * 1e9))
+
+    # What on_sail_on_request() adds to every request to time it.
+    timing = dict()
+    start = time.perf_counter()
+    for i in range(options.lookups):
+        handler_start = time.perf_counter()
+        histogram = timing.get('TestingEpisodeActive.TestingDataStep')
+        if histogram is None:
+            histogram = rabbitmq.LatencyHistogram()
+            timing['TestingEpisodeActive.TestingDataStep'] = histogram
+        histogram.record_usec((time.perf_counter() - handler_start) * 1e6)
+    print('transition timing: {:.1f} nsec per request'.format(
+        (time.perf_counter() - start) / options.lookups * 1e9))
+    if mismatches > 0:
+        sys.exit(1)
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--lookups',
+                      dest='lookups',
+                      help='Number of lookups to time for every per tick request.',
+                      type=int,
+                      default=200000)
+    (options, args) = parser.parse_args()
+    main(options=options)
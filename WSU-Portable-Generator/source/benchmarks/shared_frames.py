@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Shared Frame Ring Benchmark                                                 ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+
+# Times handing one camera frame per tick from the generator to the TA2 through the two message
+# hops (generator to TA1 as BasicData, TA1 to TA2 as TestingData), encoding and decoding each
+# message like rabbitmq.Connection does, without the broker itself.
+#   inline: blosc.pack_array() on the generator, the packed bytes beside the JSON on both hops
+#           and blosc.unpack_array() on the TA2 (what is sent by default).
+#   shared: the raw frame written to an objects.SharedFrameRing, only the reference on both hops
+#           and the frame copied out on the TA2 (shared_frames = True in the TA2 config).
+# The time the broker takes to move the message bytes comes on top of this for both.  A frame
+# read from the ring must stay the same after the ring wraps, and reading its reference again
+# must fail.
+#     python3 benchmarks/shared_frames.py --number=200
+
+import optparse
+import os.path
+import sys
+import time
+import uuid
+
+import blosc
+import numpy
+import pika
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+from objects import rabbitmq
+
+
+def build_frame(height: int, width: int) -> numpy.ndarray:
+    # A smooth gradient with some noise, so blosc has about as much to work with as a render.
+    rand = numpy.random.RandomState(42)
+    rows = numpy.linspace(0, 255, height, dtype=numpy.float32)[:, None, None]
+    cols = numpy.linspace(0, 255, width, dtype=numpy.float32)[None, :, None]
+    frame = (rows + cols) / 2.0 + rand.randint(0, 16, size=(height, width, 3))
+    return frame.astype(numpy.uint8)
+
+
+def hop(casas_object: objects.AiqObject) -> (objects.AiqObject, int):
+    # Encode a response the way the RPC server publishes it and decode it on the other side.
+    body, headers, content_type = rabbitmq.encode_message(casas_object=casas_object,
+                                                          binary_segments=True)
+    properties = pika.BasicProperties(headers=headers, content_type=content_type)
+    return rabbitmq.decode_message(properties=properties, body=body)[1][0], len(body)
+
+
+def tick(frame: numpy.ndarray, ring: objects.SharedFrameRing) -> (numpy.ndarray, int):
+    if ring is None:
+        image = blosc.pack_array(frame)
+    else:
+        image = ring.write(frame=frame)
+    basic_data, size1 = hop(objects.BasicData(feature_vector=dict({'image': image}),
+                                              feature_label=dict({'action': 'left'})))
+    testing_data, size2 = hop(objects.TestingData(secret='s',
+                                                  feature_vector=basic_data.feature_vector,
+                                                  utc_remote_epoch_received=time.time()))
+    image = testing_data.feature_vector['image']
+    if ring is None:
+        image = blosc.unpack_array(image)
+    else:
+        image = objects.SharedFrameRing.read_frame(ref=image)
+    return image, size1 + size2
+
+
+def check_wrap(frame: numpy.ndarray, ring: objects.SharedFrameRing):
+    ref = ring.write(frame=frame)
+    image = objects.SharedFrameRing.read_frame(ref=ref)
+    for i in range(ring.slots):
+        ring.write(frame=numpy.zeros_like(frame))
+    if not numpy.array_equal(image, frame):
+        print('FAILED: a frame read from the ring changed when the ring wrapped.')
+        sys.exit(1)
+    try:
+        objects.SharedFrameRing.read_frame(ref=ref)
+    except objects.AiqDataException:
+        print('ok: {} frames after the ring wrapped'.format(ring.slots))
+        return
+    print('FAILED: a frame that was overwritten was read.')
+    sys.exit(1)
+
+
+def main(options):
+    frame = build_frame(height=options.height, width=options.width)
+    ring = objects.SharedFrameRing(name='aiq-frames-bench-{}'.format(str(uuid.uuid4().hex)))
+    print('frame {} bytes, ring in {}'.format(frame.nbytes, objects.SHARED_FRAME_DIR))
+    print('{:<8} {:>14} {:>14} {:>16}'.format('path', 'p50 usec', 'p99 usec', 'bytes per tick'))
+    try:
+        for name, path_ring in [('inline', None), ('shared', ring)]:
+            image, size = tick(frame=frame, ring=path_ring)
+            if not numpy.array_equal(image, frame):
+                print('FAILED: the {} path changed the frame.'.format(name))
+                sys.exit(1)
+            samples = list()
+            for i in range(options.number):
+                start = time.perf_counter()
+                tick(frame=frame, ring=path_ring)
+                samples.append((time.perf_counter() - start) * 1e6)
+            samples.sort()
+            print('{:<8} {:>14.1f} {:>14.1f} {:>16}'.format(
+                name, samples[len(samples) // 2],
+                samples[min(len(samples) - 1, int(0.99 * len(samples)))], size))
+        check_wrap(frame=frame, ring=ring)
+    finally:
+        objects.SharedFrameRing.detach_all()
+        ring.close()
+        ring.unlink()
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--number',
+                      dest='number',
+                      help='Number of timed ticks per path.',
+                      type=int,
+                      default=200)
+    parser.add_option('--height',
+                      dest='height',
+                      help='Frame height in pixels.',
+                      type=int,
+                      default=480)
+    parser.add_option('--width',
+                      dest='width',
+                      help='Frame width in pixels.',
+                      type=int,
+                      default=640)
+    (options, args) = parser.parse_args()
+    main(options=options)
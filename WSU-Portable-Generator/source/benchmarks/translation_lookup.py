@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Translation Lookup Benchmark                                                ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+
+# Times translating a day of events against a TranslationGroup whose sensors were re-mapped many
+# times: the linear scan of every translation of the target used before, CasasObject.translate()
+# (a bisect per event) and TranslationGroup.translate_many().  All three must give the same
+# sensor_1/sensor_2, the script exits with status 1 if they do not.
+#     python3 benchmarks/translation_lookup.py --targets=50 --remaps=200 --events=100000
+
+import datetime
+import optparse
+import os.path
+import random
+import sys
+import time
+
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import objects
+
+
+def build_group(targets: int, remaps: int, start: float, span: float) -> objects.TranslationGroup:
+    translations = list()
+    for t in range(targets):
+        edges = [None] + [start + span * (i + 1) / remaps for i in range(remaps - 1)] + [None]
+        for i in range(remaps):
+            translations.append(objects.Translation(site='bench', target='M{:03d}'.format(t),
+                                                    sensor_1='Room{}'.format(i),
+                                                    sensor_2='Area{}'.format(i),
+                                                    start_epoch=edges[i],
+                                                    end_epoch=edges[i + 1]))
+    return objects.TranslationGroup(site='bench', group_name='bench', translations=translations)
+
+
+def build_events(targets: int, events: int, start: float, span: float) -> list:
+    rand = random.Random(42)
+    epochs = sorted(start + rand.random() * span for i in range(events))
+    event_list = list()
+    for epoch in epochs:
+        event_list.append(objects.Event(category='entity', package_type='Insteon',
+                                        sensor_type='Control4-Motion', message='ON',
+                                        target='M{:03d}'.format(rand.randrange(targets)),
+                                        serial='1', by='bench', channel='rawevents',
+                                        site='bench', epoch=epoch,
+                                        stamp=datetime.datetime.fromtimestamp(epoch, tz=pytz.utc)))
+    return event_list
+
+
+def linear_translate(event: objects.Event, group: objects.TranslationGroup):
+    # The scan CasasObject.translate() did before, over every translation of the target.
+    for translate in group.t_dict.get(event.target, list()):
+        if (translate.start_stamp is None or translate.start_stamp <= event.stamp) \
+                and (translate.end_stamp is None or event.stamp < translate.end_stamp):
+            event.sensor_1 = translate.sensor_1
+            event.sensor_2 = translate.sensor_2
+    return
+
+
+def main(options):
+    start = 1590969600.0
+    span = 24.0 * 60.0 * 60.0
+    group = build_group(targets=options.targets, remaps=options.remaps, start=start, span=span)
+    events = build_events(targets=options.targets, events=options.events, start=start,
+                          span=span)
+
+    results = dict()
+    timings = list([('linear scan', lambda: [linear_translate(event, group) for event in events]),
+                    ('translate()', lambda: [event.translate(group) for event in events]),
+                    ('translate_many()', lambda: group.translate_many(events))])
+    print('targets={} remaps={} events={}'.format(options.targets, options.remaps,
+                                                  options.events))
+    print('{:<18} {:>10} {:>14}'.format('path', 'seconds', 'events/sec'))
+    for name, function in timings:
+        for event in events:
+            event.sensor_1 = None
+            event.sensor_2 = None
+        begin = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - begin
+        results[name] = [(event.sensor_1, event.sensor_2) for event in events]
+        print('{:<18} {:>10.3f} {:>14.1f}'.format(name, elapsed, len(events) / elapsed))
+
+    if any(result != results['linear scan'] for result in results.values()):
+        print('FAILED: the translations do not match the linear scan.')
+        sys.exit(1)
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--targets',
+                      dest='targets',
+                      help='Number of sensor targets.',
+                      type=int,
+                      default=50)
+    parser.add_option('--remaps',
+                      dest='remaps',
+                      help='Number of translations of each target over the day.',
+                      type=int,
+                      default=200)
+    parser.add_option('--events',
+                      dest='events',
+                      help='Number of events in the day.',
+                      type=int,
+                      default=100000)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# ************************************************************************************************ #
+# **                                                                                            ** #
+# **    AIQ-SAIL-ON Trial Claim Contention Benchmark                                            ** #
+# **                                                                                            ** #
+# **  Tools by the AI Lab - Artificial Intelligence Quotient (AIQ) in the School of Electrical  ** #
+# **  Engineering and Computer Science at Washington State University.                          ** #
+# **                                                                                            ** #
+# **  Copyright Washington State University, 2020                                               ** #
+# **                                                                                            ** #
+# **  All rights reserved                                                                       ** #
+# **  Modification, distribution, and sale of this work is prohibited without permission from   ** #
+# **  Washington State University.                                                              ** #
+# **                                                                                            ** #
+# ************************************************************************************************ #
+
+# Runs --workers simulated TA1s, each on its own connection, that claim the trials of one
+# experiment until none are left, the way TA1.lock_experiment_trial() does.  The claims are timed
+# with the SELECT, UPDATE, SELECT and random sleep polling used before and with the single
+# UPDATE ... FOR UPDATE SKIP LOCKED, and every trial must be claimed exactly once.  It needs a
+# postgres database it may create the table bench_experiment_trial in (dropped at the end).
+#     python3 benchmarks/trial_claim_contention.py --dsn="dbname=aiq_data user=aiq_user" \
+#         --workers=16 --trials=400
+
+import optparse
+import random
+import sys
+import threading
+import time
+import uuid
+
+import psycopg2
+
+POLLING = 'polling'
+SKIP_LOCKED = 'skip-locked'
+
+
+def setup_table(dsn: str, trials: int):
+    conn = psycopg2.connect(dsn)
+    with conn:
+        with conn.cursor() as cr:
+            cr.execute('DROP TABLE IF EXISTS bench_experiment_trial;')
+            cr.execute('CREATE TABLE bench_experiment_trial ('
+                       'experiment_trial_id bigserial PRIMARY KEY, '
+                       'model_experiment_id bigint NOT NULL, '
+                       'trial integer NOT NULL, '
+                       'is_active boolean DEFAULT false NOT NULL, '
+                       'is_complete boolean DEFAULT false NOT NULL, '
+                       'locked_by uuid);')
+            cr.execute('INSERT INTO bench_experiment_trial (model_experiment_id, trial) '
+                       'SELECT 1, t FROM generate_series(0, %s) AS t;', (trials - 1,))
+    conn.close()
+    return
+
+
+def drop_table(dsn: str):
+    conn = psycopg2.connect(dsn)
+    with conn:
+        with conn.cursor() as cr:
+            cr.execute('DROP TABLE IF EXISTS bench_experiment_trial;')
+    conn.close()
+    return
+
+
+def claim_polling(conn, stats: dict) -> int:
+    # The claim used before, with its 10 second limit.
+    my_uuid = str(uuid.uuid4())
+    end_time = time.time() + 10.0
+    while time.time() < end_time:
+        with conn:
+            with conn.cursor() as cr:
+                cr.execute('SELECT experiment_trial_id FROM bench_experiment_trial WHERE '
+                           'model_experiment_id=%s AND is_active=%s AND is_complete=%s AND '
+                           'locked_by IS NULL ORDER BY trial LIMIT 1;', (1, False, False))
+                stats['statements'] += 1
+                row = cr.fetchone()
+                if row is None:
+                    return None
+                cr.execute('UPDATE bench_experiment_trial SET locked_by=%s WHERE '
+                           'model_experiment_id=%s AND is_active=%s AND is_complete=%s AND '
+                           'locked_by IS NULL AND experiment_trial_id=%s;',
+                           (my_uuid, 1, False, False, row[0]))
+                conn.commit()
+                cr.execute('SELECT experiment_trial_id FROM bench_experiment_trial WHERE '
+                           'locked_by=%s AND model_experiment_id=%s AND experiment_trial_id=%s;',
+                           (my_uuid, 1, row[0]))
+                stats['statements'] += 2
+                row = cr.fetchone()
+                if row is not None:
+                    return row[0]
+        stats['retries'] += 1
+        time.sleep(random.random() / 2.0)
+    stats['timeouts'] += 1
+    return None
+
+
+def claim_skip_locked(conn, stats: dict) -> int:
+    with conn:
+        with conn.cursor() as cr:
+            cr.execute('UPDATE bench_experiment_trial SET locked_by=%s '
+                       'WHERE experiment_trial_id=('
+                       'SELECT experiment_trial_id FROM bench_experiment_trial WHERE '
+                       'model_experiment_id=%s AND is_active=%s AND is_complete=%s AND '
+                       'locked_by IS NULL ORDER BY trial LIMIT 1 FOR UPDATE SKIP LOCKED) '
+                       'RETURNING experiment_trial_id;',
+                       (str(uuid.uuid4()), 1, False, False))
+            stats['statements'] += 1
+            row = cr.fetchone()
+    if row is None:
+        return None
+    return row[0]
+
+
+def worker(dsn: str, mode: str, claimed: list, samples: list, stats: dict, lock: threading.Lock,
+           start: threading.Barrier):
+    conn = psycopg2.connect(dsn)
+    claim = claim_polling if mode == POLLING else claim_skip_locked
+    my_stats = dict({'statements': 0, 'retries': 0, 'timeouts': 0})
+    my_claimed = list()
+    my_samples = list()
+    start.wait()
+    while True:
+        claim_start = time.perf_counter()
+        experiment_trial_id = claim(conn=conn, stats=my_stats)
+        if experiment_trial_id is None:
+            break
+        my_samples.append(time.perf_counter() - claim_start)
+        my_claimed.append(experiment_trial_id)
+    conn.close()
+    with lock:
+        claimed.extend(my_claimed)
+        samples.extend(my_samples)
+        for key in my_stats:
+            stats[key] += my_stats[key]
+    return
+
+
+def run(options, mode: str) -> bool:
+    setup_table(dsn=options.dsn, trials=options.trials)
+    claimed = list()
+    samples = list()
+    stats = dict({'statements': 0, 'retries': 0, 'timeouts': 0})
+    lock = threading.Lock()
+    start = threading.Barrier(options.workers + 1)
+    threads = [threading.Thread(target=worker,
+                                args=(options.dsn, mode, claimed, samples, stats, lock, start))
+               for i in range(options.workers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    run_start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - run_start
+
+    samples.sort()
+    passed = len(claimed) == options.trials and len(set(claimed)) == options.trials
+    print('{:<12} {:>10.2f} {:>10.1f} {:>10.1f} {:>10.2f} {:>8} {:>8} {:>6}'.format(
+        mode, elapsed,
+        samples[len(samples) // 2] * 1000.0 if len(samples) > 0 else 0.0,
+        samples[min(len(samples) - 1, int(0.99 * len(samples)))] * 1000.0
+        if len(samples) > 0 else 0.0,
+        stats['statements'] / float(max(1, len(claimed))), stats['retries'], stats['timeouts'],
+        'ok' if passed else 'FAILED'))
+    return passed
+
+
+def main(options):
+    if options.dsn is None:
+        print('--dsn is required.')
+        sys.exit(2)
+    print('workers={} trials={}'.format(options.workers, options.trials))
+    print('{:<12} {:>10} {:>10} {:>10} {:>10} {:>8} {:>8} {:>6}'.format(
+        'claim', 'drain s', 'p50 ms', 'p99 ms', 'stmts/claim', 'retries', 'timeouts', 'check'))
+    passed = True
+    try:
+        for mode in [POLLING, SKIP_LOCKED]:
+            passed = run(options=options, mode=mode) and passed
+    finally:
+        drop_table(dsn=options.dsn)
+    if not passed:
+        print('FAILED: a trial was claimed twice or not at all.')
+        sys.exit(1)
+    return
+
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage='usage: %prog [options]')
+    parser.add_option('--dsn',
+                      dest='dsn',
+                      help='psycopg2 connection string of the database to use.',
+                      type=str,
+                      default=None)
+    parser.add_option('--workers',
+                      dest='workers',
+                      help='Number of simulated TA1 workers.',
+                      type=int,
+                      default=16)
+    parser.add_option('--trials',
+                      dest='trials',
+                      help='Number of trials in the experiment.',
+                      type=int,
+                      default=400)
+    (options, args) = parser.parse_args()
+    main(options=options)
@@ -106,6 +106,7 @@ class GeneratorLogic(object):
         self.ta2_generator_config = None
         self.hint_level = None
         self.phase = None
+        self._shared_frames = None
 
         self.GENERATOR = None
 
@@ -278,18 +279,19 @@ class GeneratorLogic(object):
         return
 
     def on_data_request(self, ch, method, props, body, request):
-        self.log.debug('on_data_request( {} )'.format(str(request)))
+        self.log.debug('on_data_request( %s )', objects.LogSummary(request))
         response = None
 
         if isinstance(request, objects.RequestData):
             feature_vector, feature_label = self.get_feature_vector()
+            feature_vector = self._share_frame(feature_vector=feature_vector)
 
             response = objects.BasicData(feature_vector=feature_vector,
                                          feature_label=feature_label)
         elif isinstance(request, objects.BasicDataPrediction):
             performance = self.apply_action(label_prediction=request.label_prediction)
 
-            self.log.debug('self.is_episode_done = {}'.format(self.is_episode_done))
+            self.log.debug('self.is_episode_done = %s', self.is_episode_done)
             if not self.is_episode_done:
                 response = objects.BasicDataAck(performance=performance)
             else:
@@ -304,9 +306,12 @@ class GeneratorLogic(object):
 
         if response is not None:
             if props.reply_to is not None:
-                self.amqp.publish_to_queue(queue_name=props.reply_to,
-                                           casas_object=response,
-                                           correlation_id=props.correlation_id)
+                self.amqp.publish_to_queue(
+                    queue_name=props.reply_to,
+                    casas_object=response,
+                    correlation_id=props.correlation_id,
+                    binary_segments=self.amqp.accepts_binary_segments(props),
+                    content_type=self.amqp.response_content_type(props))
 
                 self._reset_timeout()
 
@@ -314,6 +319,27 @@ class GeneratorLogic(object):
                 self._reset_system()
         return
 
+    def _share_frame(self, feature_vector: dict) -> dict:
+        # Put the image in the shared frame ring when the TA2 asked for it and is on this host,
+        # the message then only carries the reference.
+        if not isinstance(self.ta2_generator_config, dict) \
+                or not self.ta2_generator_config.get(objects.SHARED_FRAMES) \
+                or not isinstance(feature_vector, dict) \
+                or feature_vector.get('image') is None:
+            return feature_vector
+
+        if self._shared_frames is None:
+            self._shared_frames = objects.SharedFrameRing(
+                name='aiq-frames-{}'.format(str(uuid.uuid4().hex)))
+            self.log.info('Created shared frame ring %s', self._shared_frames.path)
+        ref = self._shared_frames.write(frame=feature_vector['image'])
+        if ref is None:
+            self.log.warning('Frame does not fit in a shared frame slot, sending it inline.')
+            return feature_vector
+        feature_vector = dict(feature_vector)
+        feature_vector['image'] = ref
+        return feature_vector
+
     def _run_sail_on(self):
         self.log.debug('_run_sail_on()')
         try:
@@ -336,6 +362,10 @@ class GeneratorLogic(object):
     def stop(self):
         self.log.debug('stop()')
         self.amqp.stop()
+        if self._shared_frames is not None:
+            self._shared_frames.close()
+            self._shared_frames.unlink()
+            self._shared_frames = None
         return
 
     def get_novelty_description(self, domain: str, novelty: int, difficulty: str) -> dict:
@@ -22,18 +22,40 @@
 # ** Contact: Brian L. Thomas (bthomas1@wsu.edu)
 # ** Contact: Diane J. Cook (djcook@wsu.edu)
 # *****************************************************************************#
+import base64
+import bisect
 import copy
 import datetime
 import dateutil
 import json
 import logging
 import logging.handlers
+import mmap
+import os
+import os.path
 import pytz
 import re
+import struct
+import tempfile
 import time
 import types
 import uuid
 
+# Optional faster wire codecs, JSON through the json module is always available.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+# Only needed to map shared frames as arrays, see SharedFrameRing.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 __major_version__ = '0.8'
 __minor_version__ = '2'
 __db_version__ = '0.6'
@@ -48,6 +70,11 @@ DATABASE_PATTERN = '{}_v{}'.format('{}', __database_version__)
 # AIQ Global Timeout
 GLOBAL_TIMEOUT_SECONDS = 60 * 20  # 20 minutes
 
+# Historic event and dataset requests are split into windows of this many hours, and this many
+# windows are requested at once by default (see rabbitmq.Connection.request_events_historic()).
+HISTORIC_WINDOW_HOURS = 24
+HISTORIC_PARALLEL_WINDOWS = 4
+
 # AIQ Object Strings
 REQ_MODEL = 'request_model'
 REQ_STATE = 'request_state'
@@ -85,6 +112,8 @@ REQ_TRAIN_DATA = 'request_training_data'
 TRAINING_DATA = 'training_data'
 TRAIN_DATA_PRED = 'training_data_prediction'
 TRAIN_DATA_ACK = 'training_data_ack'
+TRAIN_DATA_STEP = 'training_data_step'
+TRAIN_DATA_STEP_RESP = 'training_data_step_response'
 TESTING_START = 'testing_start'
 TESTING_ACTIVE = 'testing_active'
 TESTING_END = 'testing_end'
@@ -97,6 +126,8 @@ REQ_TEST_DATA = 'request_testing_data'
 TESTING_DATA = 'testing_data'
 TEST_DATA_PRED = 'testing_data_prediction'
 TEST_DATA_ACK = 'testing_data_ack'
+TEST_DATA_STEP = 'testing_data_step'
+TEST_DATA_STEP_RESP = 'testing_data_step_response'
 END_EXPERIMENT = 'end_experiment'
 WAIT_ON_SOTA = 'waiting_on_sota'
 SOTA_IDLE = 'sota_idle'
@@ -335,6 +366,10 @@ PHASE_NOVELTY_LISTS = dict({PHASE_1: list([NOVELTY_200,
                                             NOVELTY_208])
                             })
 
+# AMQP host that selects the in-process loopback broker (rabbitmq.LoopbackBroker) instead of
+# connecting to RabbitMQ, every component then has to run in the same process.
+AMQP_LOOPBACK_HOST = 'loopback'
+
 # AIQ Queues
 SERVER_MODEL_QUEUE = 'model.request.v{}'.format(__major_version__)
 SERVER_EXPERIMENT_QUEUE = 'experiment.request.v{}'.format(__major_version__)
@@ -360,6 +395,30 @@ DEFAULT_TA1_SAVE_EXPERIMENT_JSON = False
 DEFAULT_TA1_LOAD_EXPERIMENT_JSON = False
 DEFAULT_TA1_JSON_EXPERIMENT_FILE = 'config/experiment_file.json'
 DEFAULT_TA1_SLEEP_WINDOW = 1.0
+# Experiments one TA1 serves at the same time, it stops taking new ones while this many run.
+DEFAULT_TA1_MAX_SESSIONS = 1
+
+# How the TA1 writes the rows it creates every tick (data, test_instance, test_label).
+# sync writes each row in its own transaction before answering the TA2, episode writes them in
+# batches behind the TA2 and waits for them at the end of every episode, async never waits.
+DB_WRITE_SYNC = 'sync'
+DB_WRITE_EPISODE = 'episode'
+DB_WRITE_ASYNC = 'async'
+VALID_DB_WRITE_MODES = list([DB_WRITE_SYNC,
+                             DB_WRITE_EPISODE,
+                             DB_WRITE_ASYNC])
+DEFAULT_TA1_DB_WRITE_MODE = DB_WRITE_SYNC
+DEFAULT_TA1_DB_WRITE_ROWS = 500
+# Connections in the TA1 database pool, and the seconds to wait for a free one.
+DEFAULT_TA1_DB_POOL_SIZE = 5
+DEFAULT_TA1_DB_POOL_TIMEOUT = 30.0
+# Seconds and records between writes of the buffered experiment log, the most records held in
+# memory while the database is slow, and the file the records that do not fit are spilled to
+# ({} is the host name).
+DEFAULT_TA1_LOG_FLUSH_SECONDS = 1.0
+DEFAULT_TA1_LOG_FLUSH_ROWS = 200
+DEFAULT_TA1_LOG_MAX_ROWS = 10000
+DEFAULT_TA1_LOG_SPILL_FILE = 'experiment_log.{}.spill'
 
 # CASAS object strings
 CASAS_ERROR = 'casas_error'
@@ -412,6 +471,27 @@ EXCHANGE_STATESUMMARY = 'all.statesummary.testbed.casas'
 EXCHANGE_SYSTEM_ALG_PROC = 'all.system.algorithm.processing'
 EXCHANGE_REQUEST_STATESUMMARY = 'request.statesummary.testbed.casas'
 
+# AMQP headers for sending binary payloads (images) beside the JSON body instead of base64.
+HEADER_BINARY_ACCEPT = 'aiq_binary_accept'
+HEADER_BINARY_SEGMENTS = 'aiq_binary_segments'
+
+# AMQP content types for the message body, and the header an RPC request uses to list the ones
+# it can decode in the response.
+CONTENT_TYPE_JSON = 'application/json'
+CONTENT_TYPE_MSGPACK = 'application/msgpack'
+HEADER_ACCEPT_CONTENT_TYPES = 'aiq_accept_content_types'
+
+# Shared memory frames between a generator and a TA2 on the same host (see SharedFrameRing), the
+# generator_config key a TA2 sets to ask for them and the ring the generator creates.
+SHARED_FRAMES = 'shared_frames'
+SHARED_FRAME_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+SHARED_FRAME_SLOTS = 8
+SHARED_FRAME_SLOT_SIZE = 4 * 1024 * 1024
+
+# Longest string and list rendered for a message or object in the logs (see LogSummary).
+LOG_SUMMARY_LENGTH = 1000
+LOG_SUMMARY_ITEMS = 10
+
 
 class CasasDatetimeException(Exception):
     """A custom exception to help enforce the use of timezones in datetime objects across CASAS.
@@ -568,6 +648,9 @@ class CasasObject(object):
         The key value that is paired with secret for uploading events. If this is not provided
         it is removed from the JSON object before returning.
     """
+    # Empty so that AiqObject subclasses can be slotted, subclasses that do not declare
+    # __slots__ still get an instance __dict__ for the attributes above.
+    __slots__ = tuple()
 
     def __init__(self):
         """Initialize a new CasasObject object.
@@ -605,36 +688,22 @@ class CasasObject(object):
         return
 
     def translate(self, translate_group):
+        """Set sensor_1 and sensor_2 from the translation of the target valid at this stamp,
+        see TranslationGroup.lookup().  TranslationGroup.translate_many() does the same for a
+        batch of objects.
+
+        Parameters
+        ----------
+        translate_group : TranslationGroup
+            The translations for the site of this object.
+        """
         if self.action not in ['event', 'tag', 'control']:
             return
 
-        if self.target in translate_group.t_dict:
-            if len(translate_group.t_dict[self.target]) == 1:
-                # If there is only one entry for this target, then go ahead and translate it.
-                self.sensor_1 = translate_group.t_dict[self.target][0].sensor_1
-                self.sensor_2 = translate_group.t_dict[self.target][0].sensor_2
-            else:
-                # There are either 0 or more than 1 translations for this target, we will iterate
-                # over the options and check for valid matches.
-                for translate in translate_group.t_dict[self.target]:
-                    if translate.start_stamp is None and translate.end_stamp is None:
-                        # If both the start_epoch and end_epoch values are None, then this
-                        # translation is considered valid for all times.  Technically this should
-                        # only show up as a single entry.
-                        self.sensor_1 = translate.sensor_1
-                        self.sensor_2 = translate.sensor_2
-                    elif translate.start_stamp is None and translate.end_stamp is not None:
-                        if self.stamp < translate.end_stamp:
-                            self.sensor_1 = translate.sensor_1
-                            self.sensor_2 = translate.sensor_2
-                    elif translate.start_stamp is not None and translate.end_stamp is None:
-                        if translate.start_stamp <= self.stamp:
-                            self.sensor_1 = translate.sensor_1
-                            self.sensor_2 = translate.sensor_2
-                    elif translate.start_stamp is not None and translate.end_stamp is not None:
-                        if translate.start_stamp <= self.stamp < translate.end_stamp:
-                            self.sensor_1 = translate.sensor_1
-                            self.sensor_2 = translate.sensor_2
+        translation = translate_group.lookup(target=self.target, stamp=self.stamp)
+        if translation is not None:
+            self.sensor_1 = translation.sensor_1
+            self.sensor_2 = translation.sensor_2
         return
 
     def get_json(self, secret=None, key=None):
@@ -2672,6 +2741,9 @@ class TranslationGroup(CasasObject):
         A dictionary where the keys are the targets, and the values are lists of Translation
         objects. This allows for quick lookups and validation when targets have different
         Translation objects across multiple times.
+    t_index : dict({'target':tuple(list(datetime.datetime), list(Translation))})
+        The translations of each target in temporal order with the start stamps of all but the
+        first, so the translation valid at a stamp is found with a bisect (see lookup()).
     """
 
     def __init__(self, site, group_name, translations=None):
@@ -2697,6 +2769,7 @@ class TranslationGroup(CasasObject):
         else:
             self.translations = list()
         self.t_dict = dict()
+        self.t_index = dict()
         self.build_translation_structure()
         return
 
@@ -2712,8 +2785,90 @@ class TranslationGroup(CasasObject):
             self.t_dict[item.target].append(item)
 
         self.validate_translation_group()
+
+        # The validated translations of a target cover all time without overlapping, so the one
+        # valid at a stamp is the last one starting at or before it.
+        self.t_index = dict()
+        for target in self.t_dict:
+            ordered = sorted(self.t_dict[target], key=self._start_sort_key)
+            self.t_index[target] = (list([item.start_stamp for item in ordered[1:]]), ordered)
         return
 
+    @staticmethod
+    def _start_sort_key(translation):
+        # A translation without a start is valid from the beginning of time.
+        if translation.start_epoch is None:
+            return float('-inf')
+        return float(translation.start_epoch)
+
+    def lookup(self, target, stamp):
+        """Find the translation of a target valid at a given stamp.
+
+        Parameters
+        ----------
+        target : str
+            The sensor name to translate.
+        stamp : datetime.datetime
+            The UTC stamp of the event, only needed when the target has more than one
+            translation.
+
+        Returns
+        -------
+        Translation
+            The valid translation, or None if the target has no translations.
+        """
+        index = self.t_index.get(target)
+        if index is None:
+            return None
+        starts, ordered = index
+        if len(starts) == 0:
+            return ordered[0]
+        return ordered[bisect.bisect_right(starts, stamp)]
+
+    def translate_many(self, casas_objects):
+        """Translate a batch of objects, such as a day of historic events, in place.  Objects
+        in temporal order (as the historic requests return them) mostly reuse the translation
+        of the previous object with the same target instead of searching again.
+
+        Parameters
+        ----------
+        casas_objects : list(CasasObject)
+            The events, tags and controls to translate, other objects are skipped.
+
+        Returns
+        -------
+        list(CasasObject)
+            The same list, for convenience.
+        """
+        # Per target, the translation found last and the stamps it is valid between.
+        current = dict()
+        for casas_object in casas_objects:
+            if casas_object.action not in ['event', 'tag', 'control']:
+                continue
+            index = self.t_index.get(casas_object.target)
+            if index is None:
+                continue
+            starts, ordered = index
+            if len(starts) == 0:
+                translation = ordered[0]
+            else:
+                stamp = casas_object.stamp
+                found = current.get(casas_object.target)
+                if found is not None \
+                        and (found[1] is None or found[1] <= stamp) \
+                        and (found[2] is None or stamp < found[2]):
+                    translation = found[0]
+                else:
+                    position = bisect.bisect_right(starts, stamp)
+                    translation = ordered[position]
+                    current[casas_object.target] = (
+                        translation,
+                        starts[position - 1] if position > 0 else None,
+                        starts[position] if position < len(starts) else None)
+            casas_object.sensor_1 = translation.sensor_1
+            casas_object.sensor_2 = translation.sensor_2
+        return casas_objects
+
     def validate_translation_group(self):
         """Validates the TranslationGroup Translation objects for the targets.
 
@@ -2782,7 +2937,10 @@ class TranslationGroup(CasasObject):
                         start_stop[-1][0] = float(start_stop[-1][0])
                     if start_stop[-1][1] is not None:
                         start_stop[-1][1] = float(start_stop[-1][1])
-                start_stop = sorted(start_stop, key=lambda item: item[0])
+                # The first translation has no start, sort it before the others.
+                start_stop = sorted(start_stop,
+                                    key=lambda item: float('-inf') if item[0] is None
+                                    else item[0])
                 # First, check the first entry to make sure the start_epoch is None.
                 if start_stop[0][0] is not None:
                     error_msg = ("The earliest translation window does not have a start_epoch of "
@@ -3939,12 +4097,97 @@ class RequestDataset(CasasObject):
         return json.dumps(obj)
 
 
+# Maps each obj_type to the AiqObject subclass that decodes it, filled in as the classes are
+# defined (see AiqObject.__init_subclass__()).
+AIQ_OBJECT_TYPES = dict()
+
+
 class AiqObject(CasasObject):
+    # AiqObjects take ownership of the feature vectors, feedback and object lists passed to them
+    # instead of copying them, and get_json_obj() returns a new dictionary sharing those values.
+    # Do not modify them once they are handed over.
+
+    # The obj_type this class is decoded from, the JSON attributes passed to the constructor
+    # (OPTIONAL_FIELDS only when present), and the attributes holding nested AIQ objects or
+    # lists of them.
+    OBJ_TYPE = None
+    REQUIRED_FIELDS = tuple()
+    OPTIONAL_FIELDS = tuple()
+    SUBOBJECT_FIELDS = tuple()
+    SUBOBJECT_LIST_FIELDS = tuple()
+
+    # The objects created every tick and the Episodes of an experiment plan declare __slots__ so
+    # they are stored without an instance __dict__, the rest still have one. AiqObjects do not use
+    # the CasasObject attributes, they read as None here instead of being set on every instance.
+    __slots__ = ('obj_type',)
+    action = None
+    target = None
+    serial = None
+    sensor_1 = None
+    sensor_2 = None
+    sensor_type = None
+    package_type = None
+    site = None
+    epoch = None
+    stamp = None
+    stamp_local = None
+    secret = None
+    key = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'OBJ_TYPE' in cls.__dict__:
+            AIQ_OBJECT_TYPES[cls.OBJ_TYPE] = cls
+        return
+
     def __init__(self):
-        super().__init__()
         self.obj_type = 'BASE_CLASS'
         return
 
+    @classmethod
+    def from_json_obj(cls, obj: dict, errormsgs: list, amqp_obj=None):
+        """Build an instance of this class from its decoded JSON dictionary.
+
+        Parameters
+        ----------
+        obj : dict
+            The decoded JSON dictionary, obj['obj_type'] is cls.OBJ_TYPE.
+        errormsgs : list
+            Any problems with the JSON are appended to this list.
+        amqp_obj : object (optional)
+            A rabbitmq.py Connection object to help keep things alive during large objects.
+
+        Returns
+        -------
+        AiqObject
+            The new object, or None if errors were appended to errormsgs.
+        """
+        kwargs = dict()
+        for field in cls.REQUIRED_FIELDS:
+            if field in obj:
+                kwargs[field] = obj[field]
+            else:
+                errormsgs.append('Could not obtain attribute {0}, '
+                                 'please include json attribute {0}.'.format(field))
+        if len(errormsgs) > 0:
+            return None
+        for field in cls.OPTIONAL_FIELDS:
+            if field in obj:
+                kwargs[field] = obj[field]
+        for field in cls.SUBOBJECT_FIELDS:
+            if kwargs[field] is not None:
+                kwargs[field] = get_subobject(casas_object=kwargs[field],
+                                              errormsgs=errormsgs,
+                                              amqp_obj=amqp_obj)
+        for field in cls.SUBOBJECT_LIST_FIELDS:
+            if len(kwargs[field]) > 0:
+                kwargs[field] = get_subobject_list(casas_object=kwargs[field],
+                                                   errormsgs=errormsgs,
+                                                   amqp_obj=amqp_obj)
+        if len(errormsgs) > 0:
+            return None
+        return cls(**kwargs)
+
     def __str__(self):
         return self.get_json_str()
 
@@ -3955,10 +4198,13 @@ class AiqObject(CasasObject):
         raise ValueError('This object did not implement get_json_obj().')
 
     def get_json_str(self) -> str:
-        return json.dumps(self.get_json_obj())
+        return json.dumps(self.get_json_obj(), default=json_default)
 
 
 class RequestModel(AiqObject):
+    OBJ_TYPE = REQ_MODEL
+    REQUIRED_FIELDS = ('aiq_username', 'aiq_secret', 'model_name', 'organization', 'description')
+
     def __init__(self, aiq_username: str, aiq_secret: str, model_name: str, organization: str,
                  description: str = None):
         super().__init__()
@@ -3977,10 +4223,12 @@ class RequestModel(AiqObject):
                'model_name': self.model_name,
                'organization': self.organization,
                'description': self.description}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestState(AiqObject):
+    OBJ_TYPE = REQ_STATE
+
     def __init__(self):
         super().__init__()
         self.obj_type = REQ_STATE
@@ -3988,10 +4236,13 @@ class RequestState(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class Model(AiqObject):
+    OBJ_TYPE = MODEL
+    REQUIRED_FIELDS = ('aiq_username', 'aiq_secret', 'model_name', 'organization', 'description')
+
     def __init__(self, model_name: str, organization: str, aiq_username: str, aiq_secret: str,
                  description: str = None):
         super().__init__()
@@ -4011,10 +4262,16 @@ class Model(AiqObject):
                'description': self.description,
                'aiq_username': self.aiq_username,
                'aiq_secret': self.aiq_secret}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestExperiment(AiqObject):
+    OBJ_TYPE = REQ_EXPERIMENT
+    REQUIRED_FIELDS = ('model', 'novelty', 'novelty_visibility', 'client_rpc_queue', 'git_version',
+                       'seed', 'domain_dict', 'experiment_type', 'no_testing', 'description')
+    OPTIONAL_FIELDS = ('epoch', 'generator_config')
+    SUBOBJECT_FIELDS = ('model',)
+
     def __init__(self, model: Model, novelty: int, novelty_visibility: int, client_rpc_queue: str,
                  git_version: str, experiment_type: str, seed: int = None,
                  domain_dict: dict = None, epoch: float = None, no_testing: bool = False,
@@ -4066,10 +4323,15 @@ class RequestExperiment(AiqObject):
                'experiment_type': self.experiment_type,
                'description': self.description,
                'generator_config': self.generator_config}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestExperimentTrials(RequestExperiment):
+    OBJ_TYPE = REQ_EXP_TRIALS
+    REQUIRED_FIELDS = ('model', 'experiment_secret', 'client_rpc_queue', 'experiment_type',
+                       'just_one_trial', 'domain_dict')
+    OPTIONAL_FIELDS = ('epoch', 'generator_config')
+
     def __init__(self, model: Model, experiment_secret: str, client_rpc_queue: str,
                  experiment_type: str, just_one_trial: bool = False, epoch: float = None,
                  domain_dict: dict = None, generator_config: dict = None):
@@ -4102,18 +4364,24 @@ class RequestExperimentTrials(RequestExperiment):
                'domain_dict': self.domain_dict,
                'epoch': self.epoch,
                'generator_config': self.generator_config}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class ExperimentResponse(AiqObject):
+    OBJ_TYPE = EXPERIMENT_RESP
+    REQUIRED_FIELDS = ('server_rpc_queue', 'experiment_secret', 'model_experiment_id',
+                       'experiment_timeout')
+    OPTIONAL_FIELDS = ('step_rpc',)
+
     def __init__(self, server_rpc_queue: str, experiment_secret: str, model_experiment_id: int,
-                 experiment_timeout: float):
+                 experiment_timeout: float, step_rpc: bool = False):
         super().__init__()
         self.obj_type = EXPERIMENT_RESP
         self.server_rpc_queue = server_rpc_queue
         self.experiment_secret = experiment_secret
         self.model_experiment_id = model_experiment_id
         self.experiment_timeout = experiment_timeout
+        self.step_rpc = step_rpc
         return
 
     def get_json_obj(self):
@@ -4121,11 +4389,14 @@ class ExperimentResponse(AiqObject):
                'server_rpc_queue': self.server_rpc_queue,
                'experiment_secret': self.experiment_secret,
                'model_experiment_id': self.model_experiment_id,
-               'experiment_timeout': self.experiment_timeout}
-        return copy.deepcopy(obj)
+               'experiment_timeout': self.experiment_timeout,
+               'step_rpc': self.step_rpc}
+        return obj
 
 
 class ExperimentStart(AiqObject):
+    OBJ_TYPE = EXPERIMENT_START
+
     def __init__(self):
         super().__init__()
         self.obj_type = EXPERIMENT_START
@@ -4133,10 +4404,12 @@ class ExperimentStart(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class ExperimentEnd(AiqObject):
+    OBJ_TYPE = EXPERIMENT_END
+
     def __init__(self):
         super().__init__()
         self.obj_type = EXPERIMENT_END
@@ -4144,23 +4417,34 @@ class ExperimentEnd(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class ExperimentException(AiqObject):
+    OBJ_TYPE = EXPERIMENT_EXCEPTION
+
     def __init__(self, message: str):
         super().__init__()
         self.obj_type = EXPERIMENT_EXCEPTION
         self.message = message
         return
 
+    @classmethod
+    def from_json_obj(cls, obj: dict, errormsgs: list, amqp_obj=None):
+        if 'message' not in obj:
+            raise AiqExperimentException(value='Experiment Exception raised without a message!')
+        raise AiqExperimentException(value=obj['message'])
+
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'message': self.message}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BenchmarkRequest(AiqObject):
+    OBJ_TYPE = BENCHMARK_REQ
+    REQUIRED_FIELDS = ('benchmark_script',)
+
     def __init__(self, benchmark_script: str):
         super().__init__()
         self.obj_type = BENCHMARK_REQ
@@ -4170,10 +4454,13 @@ class BenchmarkRequest(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'benchmark_script': self.benchmark_script}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BenchmarkData(AiqObject):
+    OBJ_TYPE = BENCHMARK_DATA
+    REQUIRED_FIELDS = ('benchmark_data',)
+
     def __init__(self, benchmark_data: dict):
         super().__init__()
         self.obj_type = BENCHMARK_DATA
@@ -4183,10 +4470,12 @@ class BenchmarkData(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'benchmark_data': self.benchmark_data}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BenchmarkAck(AiqObject):
+    OBJ_TYPE = BENCHMARK_ACK
+
     def __init__(self):
         super().__init__()
         self.obj_type = BENCHMARK_ACK
@@ -4194,10 +4483,12 @@ class BenchmarkAck(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class NoveltyStart(AiqObject):
+    OBJ_TYPE = NOVELTY_START
+
     def __init__(self):
         super().__init__()
         self.obj_type = NOVELTY_START
@@ -4205,10 +4496,12 @@ class NoveltyStart(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class NoveltyEnd(AiqObject):
+    OBJ_TYPE = NOVELTY_END
+
     def __init__(self):
         super().__init__()
         self.obj_type = NOVELTY_END
@@ -4216,10 +4509,13 @@ class NoveltyEnd(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrialStart(AiqObject):
+    OBJ_TYPE = TRIAL_START
+    REQUIRED_FIELDS = ('trial_number', 'total_trials', 'message', 'novelty_description')
+
     def __init__(self, trial_number: int = 0, total_trials: int = 0, message: str = None,
                  novelty_description: dict = None):
         super().__init__()
@@ -4238,10 +4534,12 @@ class TrialStart(AiqObject):
                'total_trials': self.total_trials,
                'message': self.message,
                'novelty_description': self.novelty_description}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrialEnd(AiqObject):
+    OBJ_TYPE = TRIAL_END
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRIAL_END
@@ -4249,10 +4547,12 @@ class TrialEnd(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingStart(AiqObject):
+    OBJ_TYPE = TRAINING_START
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRAINING_START
@@ -4260,10 +4560,12 @@ class TrainingStart(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingActive(AiqObject):
+    OBJ_TYPE = TRAINING_ACTIVE
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRAINING_ACTIVE
@@ -4271,10 +4573,13 @@ class TrainingActive(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingEnd(AiqObject):
+    OBJ_TYPE = TRAINING_END
+    REQUIRED_FIELDS = ('message',)
+
     def __init__(self, message: str = None):
         super().__init__()
         self.obj_type = TRAINING_END
@@ -4284,10 +4589,12 @@ class TrainingEnd(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'message': self.message}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingModelEnd(AiqObject):
+    OBJ_TYPE = TRAINING_MODEL_END
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRAINING_MODEL_END
@@ -4295,10 +4602,12 @@ class TrainingModelEnd(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingEndEarly(AiqObject):
+    OBJ_TYPE = TRAINING_END_EARLY
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRAINING_END_EARLY
@@ -4306,10 +4615,13 @@ class TrainingEndEarly(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingEpisodeStart(AiqObject):
+    OBJ_TYPE = TRAIN_EPISODE_START
+    REQUIRED_FIELDS = ('episode_number', 'total_episodes')
+
     def __init__(self, episode_number: int = 0, total_episodes: int = 0):
         super().__init__()
         self.obj_type = TRAIN_EPISODE_START
@@ -4321,10 +4633,12 @@ class TrainingEpisodeStart(AiqObject):
         obj = {'obj_type': self.obj_type,
                'episode_number': self.episode_number,
                'total_episodes': self.total_episodes}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingEpisodeActive(AiqObject):
+    OBJ_TYPE = TRAIN_EPISODE_ACTIVE
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRAIN_EPISODE_ACTIVE
@@ -4332,25 +4646,33 @@ class TrainingEpisodeActive(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class EpisodeEnd(AiqObject):
+    OBJ_TYPE = EPISODE_END
+    REQUIRED_FIELDS = ('performance', 'feedback')
+    __slots__ = ('performance', 'feedback')
+
     def __init__(self, performance: float, feedback: dict = None):
         super().__init__()
         self.obj_type = EPISODE_END
         self.performance = performance
-        self.feedback = copy.deepcopy(feedback)
+        self.feedback = feedback
         return
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'performance': self.performance,
                'feedback': self.feedback}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BasicData(AiqObject):
+    OBJ_TYPE = BASIC_DATA
+    REQUIRED_FIELDS = ('feature_vector', 'feature_label')
+    __slots__ = ('feature_vector', 'feature_label')
+
     def __init__(self, feature_vector: dict, feature_label: dict):
         super().__init__()
         self.obj_type = BASIC_DATA
@@ -4369,10 +4691,15 @@ class BasicData(AiqObject):
         obj = {'obj_type': self.obj_type,
                'feature_vector': self.feature_vector,
                'feature_label': self.feature_label}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BasicDataPrediction(AiqObject):
+    OBJ_TYPE = BASIC_DATA_PREDICTION
+    REQUIRED_FIELDS = ('label_prediction',)
+    __slots__ = ('label_prediction', 'utc_remote_epoch_received', 'utc_remote_epoch_sent',
+                 'end_early')
+
     def __init__(self, label_prediction: dict = None):
         super().__init__()
         self.obj_type = BASIC_DATA_PREDICTION
@@ -4392,15 +4719,19 @@ class BasicDataPrediction(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'label_prediction': self.label_prediction}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BasicDataAck(AiqObject):
+    OBJ_TYPE = BASIC_DATA_ACK
+    REQUIRED_FIELDS = ('performance', 'feedback')
+    __slots__ = ('performance', 'feedback')
+
     def __init__(self, performance: float = None, feedback: dict = None):
         super().__init__()
         self.obj_type = BASIC_DATA_ACK
         self.performance = performance
-        self.feedback = copy.deepcopy(feedback)
+        self.feedback = feedback
         if self.feedback is None:
             self.feedback = dict()
         return
@@ -4409,10 +4740,14 @@ class BasicDataAck(AiqObject):
         obj = {'obj_type': self.obj_type,
                'performance': self.performance,
                'feedback': self.feedback}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class BasicEpisodeNovelty(AiqObject):
+    OBJ_TYPE = BASIC_EPISODE_NOVELTY
+    REQUIRED_FIELDS = ('novelty_probability', 'novelty_threshold', 'novelty',
+                       'novelty_characterization')
+
     def __init__(self, novelty_probability: float = None, novelty_threshold: float = None,
                  novelty: int = None, novelty_characterization: dict = None):
         super().__init__()
@@ -4429,10 +4764,13 @@ class BasicEpisodeNovelty(AiqObject):
                'novelty_threshold': self.novelty_threshold,
                'novelty': self.novelty,
                'novelty_characterization': self.novelty_characterization}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingEpisodeEnd(EpisodeEnd):
+    OBJ_TYPE = TRAIN_EPISODE_END
+    __slots__ = tuple()
+
     def __init__(self, performance: float = None, feedback: dict = None):
         super().__init__(performance=performance,
                          feedback=feedback)
@@ -4443,10 +4781,13 @@ class TrainingEpisodeEnd(EpisodeEnd):
         obj = {'obj_type': self.obj_type,
                'performance': self.performance,
                'feedback': self.feedback}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestData(AiqObject):
+    OBJ_TYPE = REQ_DATA
+    __slots__ = tuple()
+
     def __init__(self):
         super().__init__()
         self.obj_type = REQ_DATA
@@ -4454,10 +4795,14 @@ class RequestData(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestTrainingData(RequestData):
+    OBJ_TYPE = REQ_TRAIN_DATA
+    REQUIRED_FIELDS = ('model_experiment_id', 'secret')
+    __slots__ = ('model_experiment_id', 'secret')
+
     def __init__(self, model_experiment_id: str, secret: str):
         super().__init__()
         self.obj_type = REQ_TRAIN_DATA
@@ -4469,16 +4814,22 @@ class RequestTrainingData(RequestData):
         obj = {'obj_type': self.obj_type,
                'model_experiment_id': self.model_experiment_id,
                'secret': self.secret}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingData(AiqObject):
+    OBJ_TYPE = TRAINING_DATA
+    REQUIRED_FIELDS = ('secret', 'feature_vector', 'feature_label', 'utc_remote_epoch_received',
+                       'utc_remote_epoch_sent')
+    __slots__ = ('secret', 'feature_vector', 'feature_label', 'utc_remote_epoch_received',
+                 'utc_remote_epoch_sent')
+
     def __init__(self, secret: str, feature_vector: dict, feature_label: dict,
                  utc_remote_epoch_received: float = None, utc_remote_epoch_sent: float = None):
         super().__init__()
         self.obj_type = TRAINING_DATA
         self.secret = secret
-        self.feature_vector = copy.deepcopy(feature_vector)
+        self.feature_vector = feature_vector
         self.feature_label = dict()
         valid_label = False
         if 'action' in feature_label:
@@ -4500,10 +4851,15 @@ class TrainingData(AiqObject):
                'feature_label': self.feature_label,
                'utc_remote_epoch_received': self.utc_remote_epoch_received,
                'utc_remote_epoch_sent': time.time()}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingDataPrediction(BasicDataPrediction):
+    OBJ_TYPE = TRAIN_DATA_PRED
+    REQUIRED_FIELDS = ('secret', 'utc_remote_epoch_received', 'utc_remote_epoch_sent',
+                       'label_prediction', 'end_early')
+    __slots__ = ('secret',)
+
     def __init__(self, secret: str, utc_remote_epoch_received: float = None,
                  utc_remote_epoch_sent: float = None, label_prediction: dict = None,
                  end_early: bool = False):
@@ -4532,16 +4888,20 @@ class TrainingDataPrediction(BasicDataPrediction):
                'utc_remote_epoch_sent': time.time(),
                'label_prediction': self.label_prediction,
                'end_early': self.end_early}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingDataAck(AiqObject):
+    OBJ_TYPE = TRAIN_DATA_ACK
+    REQUIRED_FIELDS = ('secret', 'performance', 'feedback')
+    __slots__ = ('secret', 'performance', 'feedback')
+
     def __init__(self, secret: str, performance: float = None, feedback: dict = None):
         super().__init__()
         self.obj_type = TRAIN_DATA_ACK
         self.secret = secret
         self.performance = performance
-        self.feedback = copy.deepcopy(feedback)
+        self.feedback = feedback
         return
 
     def get_json_obj(self):
@@ -4549,10 +4909,51 @@ class TrainingDataAck(AiqObject):
                'secret': self.secret,
                'performance': self.performance,
                'feedback': self.feedback}
-        return copy.deepcopy(obj)
+        return obj
+
+
+class TrainingDataStep(TrainingDataPrediction):
+    OBJ_TYPE = TRAIN_DATA_STEP
+    __slots__ = tuple()
+
+    def __init__(self, secret: str, utc_remote_epoch_received: float = None,
+                 utc_remote_epoch_sent: float = None, label_prediction: dict = None,
+                 end_early: bool = False):
+        super().__init__(secret=secret,
+                         utc_remote_epoch_received=utc_remote_epoch_received,
+                         utc_remote_epoch_sent=utc_remote_epoch_sent,
+                         label_prediction=label_prediction,
+                         end_early=end_early)
+        self.obj_type = TRAIN_DATA_STEP
+        return
+
+
+class TrainingDataStepResponse(AiqObject):
+    OBJ_TYPE = TRAIN_DATA_STEP_RESP
+    REQUIRED_FIELDS = ('ack', 'data')
+    SUBOBJECT_FIELDS = ('ack', 'data')
+    __slots__ = ('ack', 'data')
+
+    def __init__(self, ack: AiqObject, data: AiqObject = None):
+        super().__init__()
+        self.obj_type = TRAIN_DATA_STEP_RESP
+        self.ack = ack
+        self.data = data
+        return
+
+    def get_json_obj(self):
+        data = None
+        if self.data is not None:
+            data = self.data.get_json_obj()
+        obj = {'obj_type': self.obj_type,
+               'ack': self.ack.get_json_obj(),
+               'data': data}
+        return obj
 
 
 class TrainingEpisodeNovelty(BasicEpisodeNovelty):
+    OBJ_TYPE = TRAIN_EPISODE_NOVELTY
+
     def __init__(self, novelty_probability: float = None, novelty_threshold: float = None,
                  novelty: int = None, novelty_characterization: dict = None):
         super().__init__(novelty_probability=novelty_probability,
@@ -4568,10 +4969,12 @@ class TrainingEpisodeNovelty(BasicEpisodeNovelty):
                'novelty_threshold': self.novelty_threshold,
                'novelty': self.novelty,
                'novelty_characterization': self.novelty_characterization}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TrainingEpisodeNoveltyAck(AiqObject):
+    OBJ_TYPE = TRAIN_EPISODE_NOVELTY_ACK
+
     def __init__(self):
         super().__init__()
         self.obj_type = TRAIN_EPISODE_NOVELTY_ACK
@@ -4579,10 +4982,12 @@ class TrainingEpisodeNoveltyAck(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingStart(AiqObject):
+    OBJ_TYPE = TESTING_START
+
     def __init__(self):
         super().__init__()
         self.obj_type = TESTING_START
@@ -4590,10 +4995,12 @@ class TestingStart(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingActive(AiqObject):
+    OBJ_TYPE = TESTING_ACTIVE
+
     def __init__(self):
         super().__init__()
         self.obj_type = TESTING_ACTIVE
@@ -4601,10 +5008,12 @@ class TestingActive(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingEnd(AiqObject):
+    OBJ_TYPE = TESTING_END
+
     def __init__(self):
         super().__init__()
         self.obj_type = TESTING_END
@@ -4612,10 +5021,13 @@ class TestingEnd(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingEpisodeStart(AiqObject):
+    OBJ_TYPE = TEST_EPISODE_START
+    REQUIRED_FIELDS = ('episode_number', 'total_episodes')
+
     def __init__(self, episode_number: int = 0, total_episodes: int = 0):
         super().__init__()
         self.obj_type = TEST_EPISODE_START
@@ -4627,10 +5039,12 @@ class TestingEpisodeStart(AiqObject):
         obj = {'obj_type': self.obj_type,
                'episode_number': self.episode_number,
                'total_episodes': self.total_episodes}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingEpisodeActive(AiqObject):
+    OBJ_TYPE = TEST_EPISODE_ACTIVE
+
     def __init__(self):
         super().__init__()
         self.obj_type = TEST_EPISODE_ACTIVE
@@ -4638,10 +5052,13 @@ class TestingEpisodeActive(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingEpisodeEnd(EpisodeEnd):
+    OBJ_TYPE = TEST_EPISODE_END
+    __slots__ = tuple()
+
     def __init__(self, performance: float = None, feedback: dict = None):
         super().__init__(performance=performance,
                          feedback=feedback)
@@ -4652,10 +5069,14 @@ class TestingEpisodeEnd(EpisodeEnd):
         obj = {'obj_type': self.obj_type,
                'performance': self.performance,
                'feedback': self.feedback}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestTestingData(RequestData):
+    OBJ_TYPE = REQ_TEST_DATA
+    REQUIRED_FIELDS = ('model_experiment_id', 'secret')
+    __slots__ = ('model_experiment_id', 'secret')
+
     def __init__(self, model_experiment_id: str, secret: str):
         super().__init__()
         self.obj_type = REQ_TEST_DATA
@@ -4667,16 +5088,22 @@ class RequestTestingData(RequestData):
         obj = {'obj_type': self.obj_type,
                'model_experiment_id': self.model_experiment_id,
                'secret': self.secret}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingData(AiqObject):
+    OBJ_TYPE = TESTING_DATA
+    REQUIRED_FIELDS = ('secret', 'feature_vector', 'utc_remote_epoch_received',
+                       'utc_remote_epoch_sent', 'novelty_indicator')
+    __slots__ = ('secret', 'feature_vector', 'utc_remote_epoch_received', 'utc_remote_epoch_sent',
+                 'novelty_indicator')
+
     def __init__(self, secret: str, feature_vector: dict, utc_remote_epoch_received: float = None,
                  utc_remote_epoch_sent: float = None, novelty_indicator: bool = None):
         super().__init__()
         self.obj_type = TESTING_DATA
         self.secret = secret
-        self.feature_vector = copy.deepcopy(feature_vector)
+        self.feature_vector = feature_vector
         self.utc_remote_epoch_received = utc_remote_epoch_received
         if self.utc_remote_epoch_received is None:
             self.utc_remote_epoch_received = time.time()
@@ -4691,10 +5118,15 @@ class TestingData(AiqObject):
                'utc_remote_epoch_received': self.utc_remote_epoch_received,
                'utc_remote_epoch_sent': time.time(),
                'novelty_indicator': self.novelty_indicator}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingDataPrediction(BasicDataPrediction):
+    OBJ_TYPE = TEST_DATA_PRED
+    REQUIRED_FIELDS = ('secret', 'utc_remote_epoch_received', 'utc_remote_epoch_sent',
+                       'label_prediction', 'end_early')
+    __slots__ = ('secret',)
+
     def __init__(self, secret: str, utc_remote_epoch_received: float = None,
                  utc_remote_epoch_sent: float = None, label_prediction: dict = None,
                  end_early: bool = False):
@@ -4723,16 +5155,20 @@ class TestingDataPrediction(BasicDataPrediction):
                'utc_remote_epoch_sent': time.time(),
                'label_prediction': self.label_prediction,
                'end_early': self.end_early}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingDataAck(AiqObject):
+    OBJ_TYPE = TEST_DATA_ACK
+    REQUIRED_FIELDS = ('secret', 'performance', 'feedback')
+    __slots__ = ('secret', 'performance', 'feedback')
+
     def __init__(self, secret: str, performance: float = None, feedback: dict = None):
         super().__init__()
         self.obj_type = TEST_DATA_ACK
         self.secret = secret
         self.performance = performance
-        self.feedback = copy.deepcopy(feedback)
+        self.feedback = feedback
         return
 
     def get_json_obj(self):
@@ -4740,10 +5176,51 @@ class TestingDataAck(AiqObject):
                'secret': self.secret,
                'performance': self.performance,
                'feedback': self.feedback}
-        return copy.deepcopy(obj)
+        return obj
+
+
+class TestingDataStep(TestingDataPrediction):
+    OBJ_TYPE = TEST_DATA_STEP
+    __slots__ = tuple()
+
+    def __init__(self, secret: str, utc_remote_epoch_received: float = None,
+                 utc_remote_epoch_sent: float = None, label_prediction: dict = None,
+                 end_early: bool = False):
+        super().__init__(secret=secret,
+                         utc_remote_epoch_received=utc_remote_epoch_received,
+                         utc_remote_epoch_sent=utc_remote_epoch_sent,
+                         label_prediction=label_prediction,
+                         end_early=end_early)
+        self.obj_type = TEST_DATA_STEP
+        return
+
+
+class TestingDataStepResponse(AiqObject):
+    OBJ_TYPE = TEST_DATA_STEP_RESP
+    REQUIRED_FIELDS = ('ack', 'data')
+    SUBOBJECT_FIELDS = ('ack', 'data')
+    __slots__ = ('ack', 'data')
+
+    def __init__(self, ack: AiqObject, data: AiqObject = None):
+        super().__init__()
+        self.obj_type = TEST_DATA_STEP_RESP
+        self.ack = ack
+        self.data = data
+        return
+
+    def get_json_obj(self):
+        data = None
+        if self.data is not None:
+            data = self.data.get_json_obj()
+        obj = {'obj_type': self.obj_type,
+               'ack': self.ack.get_json_obj(),
+               'data': data}
+        return obj
 
 
 class TestingEpisodeNovelty(BasicEpisodeNovelty):
+    OBJ_TYPE = TEST_EPISODE_NOVELTY
+
     def __init__(self, novelty_probability: float = None, novelty_threshold: float = None,
                  novelty: int = None, novelty_characterization: dict = None):
         super().__init__(novelty_probability=novelty_probability,
@@ -4759,10 +5236,12 @@ class TestingEpisodeNovelty(BasicEpisodeNovelty):
                'novelty_threshold': self.novelty_threshold,
                'novelty': self.novelty,
                'novelty_characterization': self.novelty_characterization}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class TestingEpisodeNoveltyAck(AiqObject):
+    OBJ_TYPE = TEST_EPISODE_NOVELTY_ACK
+
     def __init__(self):
         super().__init__()
         self.obj_type = TEST_EPISODE_NOVELTY_ACK
@@ -4770,10 +5249,13 @@ class TestingEpisodeNoveltyAck(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class EndExperiment(AiqObject):
+    OBJ_TYPE = END_EXPERIMENT
+    REQUIRED_FIELDS = ('model_experiment_id', 'secret')
+
     def __init__(self, model_experiment_id: str, secret: str):
         super().__init__()
         self.obj_type = END_EXPERIMENT
@@ -4785,10 +5267,12 @@ class EndExperiment(AiqObject):
         obj = {'obj_type': self.obj_type,
                'model_experiment_id': self.model_experiment_id,
                'secret': self.secret}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class WaitOnSota(AiqObject):
+    OBJ_TYPE = WAIT_ON_SOTA
+
     def __init__(self):
         super().__init__()
         self.obj_type = WAIT_ON_SOTA
@@ -4796,10 +5280,12 @@ class WaitOnSota(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class SotaIdle(AiqObject):
+    OBJ_TYPE = SOTA_IDLE
+
     def __init__(self):
         super().__init__()
         self.obj_type = SOTA_IDLE
@@ -4807,10 +5293,18 @@ class SotaIdle(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class Episode(AiqObject):
+    OBJ_TYPE = OBJ_EPISODE
+    REQUIRED_FIELDS = ('novelty', 'difficulty', 'seed', 'domain', 'data_type', 'episode_index',
+                       'episode_id', 'trial_novelty', 'day_offset', 'trial_episode_index',
+                       'use_image', 'hint_level', 'phase')
+    __slots__ = ('novelty', 'difficulty', 'seed', 'domain', 'data_type', 'episode_index',
+                 'episode_id', 'trial_novelty', 'day_offset', 'trial_episode_index', 'use_image',
+                 'hint_level', 'phase')
+
     def __init__(self, novelty: int, difficulty: str, seed: int, domain: str, data_type: str,
                  episode_index: int = None, episode_id: int = None,
                  trial_novelty: int = NOVELTY_200, day_offset: int = 0,
@@ -4862,14 +5356,18 @@ class Episode(AiqObject):
                'use_image': self.use_image,
                'hint_level': self.hint_level,
                'phase': self.phase}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class Training(AiqObject):
+    OBJ_TYPE = OBJ_TRAINING
+    REQUIRED_FIELDS = ('episodes',)
+    SUBOBJECT_LIST_FIELDS = ('episodes',)
+
     def __init__(self, episodes: list):
         super().__init__()
         self.obj_type = OBJ_TRAINING
-        self.episodes = copy.deepcopy(episodes)
+        self.episodes = list(episodes)
         return
 
     def get_json_obj(self):
@@ -4877,15 +5375,19 @@ class Training(AiqObject):
                'episodes': list()}
         for ep in self.episodes:
             obj['episodes'].append(ep.get_json_obj())
-        return copy.deepcopy(obj)
+        return obj
 
 
 class Trial(AiqObject):
+    OBJ_TYPE = OBJ_TRIAL
+    REQUIRED_FIELDS = ('episodes', 'novelty', 'novelty_visibility', 'difficulty', 'hint_level')
+    SUBOBJECT_LIST_FIELDS = ('episodes',)
+
     def __init__(self, episodes: list, novelty: int, novelty_visibility: int, difficulty: str,
                  hint_level: int):
         super().__init__()
         self.obj_type = OBJ_TRIAL
-        self.episodes = copy.deepcopy(episodes)
+        self.episodes = list(episodes)
         self.novelty = novelty
         self.novelty_visibility = novelty_visibility
         self.difficulty = difficulty
@@ -4901,14 +5403,18 @@ class Trial(AiqObject):
                'hint_level': self.hint_level}
         for ep in self.episodes:
             obj['episodes'].append(ep.get_json_obj())
-        return copy.deepcopy(obj)
+        return obj
 
 
 class NoveltyGroup(AiqObject):
+    OBJ_TYPE = OBJ_NOVELTY_GRP
+    REQUIRED_FIELDS = ('trials',)
+    SUBOBJECT_LIST_FIELDS = ('trials',)
+
     def __init__(self, trials: list):
         super().__init__()
         self.obj_type = OBJ_NOVELTY_GRP
-        self.trials = copy.deepcopy(trials)
+        self.trials = list(trials)
         return
 
     def get_json_obj(self):
@@ -4916,15 +5422,20 @@ class NoveltyGroup(AiqObject):
                'trials': list()}
         for trial in self.trials:
             obj['trials'].append(trial.get_json_obj())
-        return copy.deepcopy(obj)
+        return obj
 
 
 class Experiment(AiqObject):
+    OBJ_TYPE = OBJ_EXPERIMENT
+    REQUIRED_FIELDS = ('training', 'novelty_groups', 'budget', 'phase')
+    SUBOBJECT_FIELDS = ('training',)
+    SUBOBJECT_LIST_FIELDS = ('novelty_groups',)
+
     def __init__(self, training: Training, novelty_groups: list, budget: float, phase: str):
         super().__init__()
         self.obj_type = OBJ_EXPERIMENT
-        self.training = copy.deepcopy(training)
-        self.novelty_groups = copy.deepcopy(novelty_groups)
+        self.training = training
+        self.novelty_groups = list(novelty_groups)
         self.budget = budget
         self.phase = phase
         self.model_experiment_id = None
@@ -4938,10 +5449,13 @@ class Experiment(AiqObject):
                'phase': self.phase}
         for nov_group in self.novelty_groups:
             obj['novelty_groups'].append(nov_group.get_json_obj())
-        return copy.deepcopy(obj)
+        return obj
 
 
 class RequestNoveltyDescription(AiqObject):
+    OBJ_TYPE = REQ_NOVELTY_DESCRIPTION
+    REQUIRED_FIELDS = ('domain', 'novelty', 'difficulty')
+
     def __init__(self, r_domain: str, novelty: int, difficulty: str):
         super().__init__()
         self.obj_type = REQ_NOVELTY_DESCRIPTION
@@ -4956,15 +5470,29 @@ class RequestNoveltyDescription(AiqObject):
         self.difficulty = difficulty
         return
 
+    @classmethod
+    def from_json_obj(cls, obj: dict, errormsgs: list, amqp_obj=None):
+        # The constructor takes the domain as r_domain.
+        for field in cls.REQUIRED_FIELDS:
+            if field not in obj:
+                errormsgs.append('Could not obtain attribute {0}, '
+                                 'please include json attribute {0}.'.format(field))
+        if len(errormsgs) > 0:
+            return None
+        return cls(r_domain=obj['domain'], novelty=obj['novelty'], difficulty=obj['difficulty'])
+
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'domain': self.domain,
                'novelty': self.novelty,
                'difficulty': self.difficulty}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class NoveltyDescription(AiqObject):
+    OBJ_TYPE = OBJ_NOVELTY_DESCRIPTION
+    REQUIRED_FIELDS = ('novelty_description',)
+
     def __init__(self, novelty_description: dict):
         super().__init__()
         self.obj_type = OBJ_NOVELTY_DESCRIPTION
@@ -4974,10 +5502,12 @@ class NoveltyDescription(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'novelty_description': self.novelty_description}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class GeneratorIdle(AiqObject):
+    OBJ_TYPE = GENERATOR_IDLE
+
     def __init__(self):
         super().__init__()
         self.obj_type = GENERATOR_IDLE
@@ -4985,10 +5515,12 @@ class GeneratorIdle(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class GeneratorReset(AiqObject):
+    OBJ_TYPE = GENERATOR_RESET
+
     def __init__(self):
         super().__init__()
         self.obj_type = GENERATOR_RESET
@@ -4996,10 +5528,16 @@ class GeneratorReset(AiqObject):
 
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class StartGenerator(AiqObject):
+    OBJ_TYPE = START_GENERATOR
+    REQUIRED_FIELDS = ('domain', 'novelty', 'difficulty', 'seed', 'server_rpc_queue',
+                       'trial_novelty', 'epoch', 'day_offset', 'request_timeout', 'use_image',
+                       'hint_level', 'phase')
+    OPTIONAL_FIELDS = ('generator_config',)
+
     def __init__(self, domain: str, novelty: int, difficulty: str, seed: int, server_rpc_queue: str,
                  trial_novelty: int, epoch: float = None, day_offset: int = 0,
                  request_timeout: int = 20, use_image: bool = False, generator_config: dict = None,
@@ -5050,10 +5588,13 @@ class StartGenerator(AiqObject):
                'generator_config': self.generator_config,
                'hint_level': self.hint_level,
                'phase': self.phase}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class GeneratorResponse(AiqObject):
+    OBJ_TYPE = GENERATOR_RESPONSE
+    REQUIRED_FIELDS = ('generator_rpc_queue',)
+
     def __init__(self, generator_rpc_queue: str):
         super().__init__()
         self.obj_type = GENERATOR_RESPONSE
@@ -5063,10 +5604,13 @@ class GeneratorResponse(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'generator_rpc_queue': self.generator_rpc_queue}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class AnalysisReady(AiqObject):
+    OBJ_TYPE = ANALYSIS_READY
+    REQUIRED_FIELDS = ('model_experiment_id',)
+
     def __init__(self, model_experiment_id: int):
         super().__init__()
         self.obj_type = ANALYSIS_READY
@@ -5076,10 +5620,13 @@ class AnalysisReady(AiqObject):
     def get_json_obj(self):
         obj = {'obj_type': self.obj_type,
                'model_experiment_id': self.model_experiment_id}
-        return copy.deepcopy(obj)
+        return obj
 
 
 class AnalysisPartial(AiqObject):
+    OBJ_TYPE = ANALYSIS_PARTIAL
+    REQUIRED_FIELDS = ('model_experiment_id', 'experiment_trial_id')
+
     def __init__(self, model_experiment_id: int, experiment_trial_id: int):
         super().__init__()
         self.obj_type = ANALYSIS_PARTIAL
@@ -5091,7 +5638,7 @@ class AnalysisPartial(AiqObject):
         obj = {'obj_type': self.obj_type,
                'model_experiment_id': self.model_experiment_id,
                'experiment_trial_id': self.experiment_trial_id}
-        return copy.deepcopy(obj)
+        return obj
 
 
 """
@@ -5283,15 +5830,687 @@ def build_routing_key(action=EVENT, sensor_type='*', package_type='*', site='*',
     return routing_key
 
 
-def build_objects_from_json(message, amqp_obj=None):
+def json_default(value):
+    """This function is used as the json.dumps() default to encode binary payloads as base64
+    strings when they are not sent beside the JSON body.
+
+    Parameters
+    ----------
+    value : object
+        The value json.dumps() could not serialize.
+
+    Returns
+    -------
+    str
+        The base64 encoding of the bytes value.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+def _log_safe(value, max_length: int):
+    """This function returns a copy of a JSON ready value with the large parts summarized, see
+    summarize_for_log().
+    """
+    if isinstance(value, AiqObject):
+        value = value.get_json_obj()
+    if isinstance(value, dict):
+        return dict([(str(key), _log_safe(value=item, max_length=max_length))
+                     for key, item in value.items()])
+    if isinstance(value, (list, tuple)):
+        summary = [_log_safe(value=item, max_length=max_length)
+                   for item in value[:LOG_SUMMARY_ITEMS]]
+        if len(value) > LOG_SUMMARY_ITEMS:
+            summary.append('<{} more items>'.format(len(value) - LOG_SUMMARY_ITEMS))
+        return summary
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '<{} bytes>'.format(len(value))
+    if isinstance(value, str) and len(value) > max_length:
+        return '{}<{} more characters>'.format(value[:max_length], len(value) - max_length)
+    if isinstance(value, CasasObject):
+        return value.get_json()
+    return value
+
+
+def summarize_for_log(value, max_length: int = LOG_SUMMARY_LENGTH) -> str:
+    """This function renders a message body or object for the logs, binary payloads are replaced
+    by their size and long lists, strings (base64 images) and the result are truncated.
+
+    Parameters
+    ----------
+    value : object
+        An AiqObject, a list of them, a decoded JSON object or a message body.
+    max_length : int (optional)
+        The longest string to render, LOG_SUMMARY_LENGTH by default.
+
+    Returns
+    -------
+    str
+        The summary of value.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        try:
+            value = bytes(value[:max_length + 1]).decode('utf-8')
+        except UnicodeDecodeError:
+            return '<{} bytes>'.format(len(value))
+    text = _log_safe(value=value, max_length=max_length)
+    if not isinstance(text, str):
+        text = json.dumps(text, default=str)
+    if len(text) > max_length:
+        text = '{}...'.format(text[:max_length])
+    return text
+
+
+class LogSummary(object):
+    """Pass one of these as a logging argument to defer summarize_for_log() until the record is
+    emitted, nothing is rendered when the level is disabled:
+        self.log.debug('on_message(%s)', objects.LogSummary(body))
+    """
+    __slots__ = ('value', 'max_length')
+
+    def __init__(self, value, max_length: int = LOG_SUMMARY_LENGTH):
+        self.value = value
+        self.max_length = max_length
+        return
+
+    def __str__(self):
+        return summarize_for_log(value=self.value, max_length=self.max_length)
+
+
+def get_content_types() -> list:
+    """This function lists the content types this install can encode and decode, in order of
+    preference.
+
+    Returns
+    -------
+    list(str)
+        The supported content types, CONTENT_TYPE_JSON is always included.
+    """
+    content_types = list([CONTENT_TYPE_JSON])
+    if msgpack is not None:
+        # JSON through orjson encodes and decodes observations faster than msgpack, without it
+        # msgpack is preferred over the json module.
+        if orjson is None:
+            content_types.insert(0, CONTENT_TYPE_MSGPACK)
+        else:
+            content_types.append(CONTENT_TYPE_MSGPACK)
+    return content_types
+
+
+def encode_body(body_obj, content_type: str = None) -> bytes:
+    """This function encodes a JSON ready object for the wire.
+
+    Parameters
+    ----------
+    body_obj : list|dict
+        The object to encode, usually a list of get_json_obj() dictionaries.
+    content_type : str (optional)
+        CONTENT_TYPE_MSGPACK or CONTENT_TYPE_JSON, JSON is used when None.
+
+    Returns
+    -------
+    bytes
+        The encoded message body.
+    """
+    if content_type == CONTENT_TYPE_MSGPACK:
+        return msgpack.packb(body_obj, use_bin_type=True)
+    if orjson is not None:
+        try:
+            return orjson.dumps(body_obj,
+                                default=json_default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # orjson is stricter than json (integers beyond 64 bits), fall back to json.
+            pass
+    return json.dumps(body_obj, default=json_default).encode('utf-8')
+
+
+def decode_body(body, content_type: str = None):
+    """This function decodes a message body encoded with encode_body().
+
+    Parameters
+    ----------
+    body : bytes|str
+        The message body.
+    content_type : str (optional)
+        The AMQP content_type of the message, JSON is assumed when None.
+
+    Returns
+    -------
+    list|dict
+        The decoded object.
+    """
+    if content_type == CONTENT_TYPE_MSGPACK:
+        if msgpack is None:
+            raise ValueError('Received a {} message but msgpack is not '
+                             'installed.'.format(CONTENT_TYPE_MSGPACK))
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except ValueError:
+            # orjson rejects NaN and Infinity which json accepts, fall back to json.
+            pass
+    return json.loads(body)
+
+
+def extract_binary_segments(json_obj, path=None, segments=None):
+    """This function removes the bytes values from a JSON ready object so they can be sent
+    beside the JSON body. Only the dictionaries and lists holding bytes values are copied, the
+    rest is shared with json_obj which is left untouched.
+
+    Parameters
+    ----------
+    json_obj : dict
+        The dictionary returned from get_json_obj().
+    path : list (optional)
+        The path of keys/indexes leading to json_obj.
+    segments : list (optional)
+        The list to append the segments to.
+
+    Returns
+    -------
+    tuple(dict, list(tuple(list, bytes)))
+        The object with each bytes value replaced by None, and a list of (path, value) tuples in
+        the order they should be sent.
+    """
+    if path is None:
+        path = list()
+    if segments is None:
+        segments = list()
+    if isinstance(json_obj, dict):
+        items = list(json_obj.items())
+    elif isinstance(json_obj, list):
+        items = list(enumerate(json_obj))
+    else:
+        return json_obj, segments
+    stripped = json_obj
+    for key, value in items:
+        if isinstance(value, (bytes, bytearray)):
+            segments.append((path + [key], bytes(value)))
+            new_value = None
+        elif isinstance(value, (dict, list)):
+            new_value, segments = extract_binary_segments(json_obj=value,
+                                                          path=path + [key],
+                                                          segments=segments)
+        else:
+            continue
+        if new_value is not value:
+            if stripped is json_obj:
+                stripped = copy.copy(json_obj)
+            stripped[key] = new_value
+    return stripped, segments
+
+
+def split_binary_body(body, header):
+    """This function splits a message body sent with extract_binary_segments() into the JSON
+    body and its binary segments.
+
+    Parameters
+    ----------
+    body : bytes
+        The message body, the JSON body followed by each binary segment.
+    header : str
+        The HEADER_BINARY_SEGMENTS value, a JSON list of [path, length] pairs.
+
+    Returns
+    -------
+    tuple(bytes, list(tuple(list, bytes)))
+        The JSON body and the list of (path, value) segments.
+    """
+    layout = json.loads(header)
+    body = memoryview(body)
+    end = len(body)
+    segments = list()
+    for path, length in reversed(layout):
+        segments.append((path, body[end - length:end].tobytes()))
+        end -= length
+    segments.reverse()
+    return body[:end].tobytes(), segments
+
+
+def attach_binary_segments(blob, segments):
+    """This function puts the binary segments back into the decoded JSON blob.
+
+    Parameters
+    ----------
+    blob : list
+        The decoded JSON list of dictionaries.
+    segments : list(tuple(list, bytes))
+        The (path, value) segments from split_binary_body().
+    """
+    for path, value in segments:
+        target = blob
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+    return
+
+
+class SharedFrameRing(object):
+    """A ring of fixed size frame slots in a memory mapped file under SHARED_FRAME_DIR (/dev/shm
+    when there is one), so a generator can hand camera frames to a TA2 on the same host without
+    sending them through the broker. The generator writes each frame into the next slot and sends
+    the small reference write() returns in place of the image, the TA2 copies the frame out with
+    read_frame().
+
+    A slot is reused after `slots` more frames. read() raises an AiqDataException if the slot was
+    reused before or while the frame was copied out of it. read(copy=False) maps the frame
+    without copying it, that frame must be used or copied before the slot is reused. The rings
+    read_frame() attaches to stay mapped until detach_all().
+
+    Attributes
+    ----------
+    name : str
+        The file name of the ring in SHARED_FRAME_DIR, this is what the references carry.
+    slots : int
+        The number of frames the ring holds.
+    slot_size : int
+        The largest frame in bytes a slot can hold.
+    """
+    _HEADER = struct.Struct('<QQ')
+    _attached = dict()
+
+    def __init__(self, name: str, slots: int = SHARED_FRAME_SLOTS,
+                 slot_size: int = SHARED_FRAME_SLOT_SIZE, create: bool = True):
+        """Initialize a SharedFrameRing object.
+
+        Parameters
+        ----------
+        name : str
+            The file name of the ring in SHARED_FRAME_DIR.
+        slots : int
+            The number of frames the ring holds, only used when creating it.
+        slot_size : int
+            The largest frame in bytes a slot can hold, only used when creating it.
+        create : bool
+            True to create the ring for writing, False to attach to an existing one read only.
+        """
+        if name != os.path.basename(name) or name in ['', '.', '..']:
+            raise AiqDataException('Invalid shared frame ring name {}'.format(name))
+        self.name = name
+        self.path = os.path.join(SHARED_FRAME_DIR, name)
+        self._next_slot = 0
+        self._seq = 0
+        if create:
+            self.slots = int(slots)
+            self.slot_size = int(slot_size)
+            self._file = open(self.path, 'w+b')
+            self._file.truncate(self._HEADER.size
+                                + self.slots * (self._HEADER.size + self.slot_size))
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+            self._HEADER.pack_into(self._mmap, 0, self.slots, self.slot_size)
+        else:
+            try:
+                self._file = open(self.path, 'rb')
+            except OSError as e:
+                raise AiqDataException('Unable to attach to shared frame ring {}: {}'
+                                       .format(name, str(e)))
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.slots, self.slot_size = self._HEADER.unpack_from(self._mmap, 0)
+        return
+
+    def _slot_offset(self, slot: int) -> int:
+        return self._HEADER.size + slot * (self._HEADER.size + self.slot_size)
+
+    def write(self, frame) -> dict:
+        """Write a frame into the next slot of the ring.
+
+        Parameters
+        ----------
+        frame : numpy.ndarray or bytes
+            The frame, an array is stored raw with its shape and dtype, bytes (such as a
+            blosc.pack_array() result) are stored as they are.
+
+        Returns
+        -------
+        dict
+            The reference to send in place of the frame, or None if the frame does not fit in a
+            slot and has to be sent inline.
+        """
+        shape = None
+        dtype = None
+        if numpy is not None and isinstance(frame, numpy.ndarray):
+            frame = numpy.ascontiguousarray(frame)
+            shape = list(frame.shape)
+            dtype = frame.dtype.str
+        data = memoryview(frame).cast('B')
+        if data.nbytes > self.slot_size:
+            return None
+
+        self._seq += 1
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+        offset = self._slot_offset(slot)
+        # Clear the sequence number first so a reader never matches a half written frame.
+        self._HEADER.pack_into(self._mmap, offset, 0, 0)
+        start = offset + self._HEADER.size
+        self._mmap[start:start + data.nbytes] = data
+        self._HEADER.pack_into(self._mmap, offset, self._seq, data.nbytes)
+        return dict({'shared_frame': self.name,
+                     'slot': slot,
+                     'seq': self._seq,
+                     'shape': shape,
+                     'dtype': dtype})
+
+    def _check_seq(self, ref: dict, offset: int) -> int:
+        seq, length = self._HEADER.unpack_from(self._mmap, offset)
+        if seq != ref['seq']:
+            raise AiqDataException('Shared frame {} in ring {} was overwritten before it was read'
+                                   .format(ref['seq'], self.name))
+        return length
+
+    def read(self, ref: dict, copy: bool = True):
+        """Read a frame from the ring.
+
+        Parameters
+        ----------
+        ref : dict
+            The reference write() returned for the frame.
+        copy : bool
+            True to copy the frame out of the ring, False to map it without copying it.
+
+        Returns
+        -------
+        numpy.ndarray or bytes or memoryview
+            An array for a frame written as an array, otherwise the stored bytes. With copy False
+            a read only array or a memoryview that is only valid until the slot is reused.
+        """
+        slot = int(ref['slot'])
+        if slot < 0 or slot >= self.slots:
+            raise AiqDataException('Invalid shared frame slot {} in ring {}'
+                                   .format(slot, self.name))
+        if ref.get('dtype') is not None and numpy is None:
+            raise AiqDataException('numpy is needed to read shared frames stored as arrays')
+        offset = self._slot_offset(slot)
+        length = self._check_seq(ref=ref, offset=offset)
+        start = offset + self._HEADER.size
+        view = memoryview(self._mmap)[start:start + length]
+        if copy:
+            # An array gets a writable copy like the one blosc.unpack_array() returns.
+            if ref.get('dtype') is None:
+                view = bytes(view)
+            else:
+                view = bytearray(view)
+            # The writer clears the sequence number before it touches the slot, so a frame that
+            # was overwritten while it was copied no longer matches.
+            self._check_seq(ref=ref, offset=offset)
+        if ref.get('dtype') is None:
+            return view
+        return numpy.frombuffer(view, dtype=numpy.dtype(ref['dtype'])).reshape(ref['shape'])
+
+    @classmethod
+    def read_frame(cls, ref: dict, copy: bool = True):
+        """Read a frame from the ring named in the reference, attaching to it the first time.
+
+        Parameters
+        ----------
+        ref : dict
+            The reference write() returned for the frame.
+        copy : bool
+            True to copy the frame out of the ring, False to map it, see read().
+
+        Returns
+        -------
+        numpy.ndarray or bytes or memoryview
+            The frame, see read().
+        """
+        ring = cls._attached.get(ref['shared_frame'])
+        if ring is None:
+            ring = cls(name=ref['shared_frame'], create=False)
+            cls._attached[ring.name] = ring
+        return ring.read(ref=ref, copy=copy)
+
+    @classmethod
+    def detach_all(cls):
+        """Unmap every ring read_frame() attached to, such as when an experiment ends.
+        """
+        for ring in cls._attached.values():
+            ring.close()
+        cls._attached.clear()
+        return
+
+    @staticmethod
+    def is_frame_ref(value) -> bool:
+        """Check if a value is a reference from write() instead of an inline frame.
+
+        Parameters
+        ----------
+        value : object
+            The image value of a feature vector.
+
+        Returns
+        -------
+        bool
+            True if the value is a shared frame reference.
+        """
+        return isinstance(value, dict) and 'shared_frame' in value
+
+    def close(self):
+        """Unmap the ring, frames already read from it stay mapped until they are released.
+        """
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+        return
+
+    def unlink(self):
+        """Remove the ring file, readers still attached keep their mapping.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return
+
+
+class EventColumns(object):
+    """A batch of CASAS events held as columns instead of one Event object per event, built by
+    build_event_columns().  The epochs are a float64 numpy array, the string fields are numpy
+    arrays of codes into a list of the distinct values, so days of events can be filtered and
+    counted with numpy.  Event objects are only made for the events that are accessed.
+
+        columns = objects.build_event_columns(message=body)
+        motion = columns.codes['sensor_type'] == columns.code('sensor_type', 'Control4-Motion')
+        for event in columns[motion & (columns.epoch >= start)]:
+            ...
+
+    Attributes
+    ----------
+    epoch : numpy.ndarray
+        The float64 UTC epoch of each event.
+    codes : dict({str: numpy.ndarray})
+        For each field in CATEGORICAL_FIELDS, the int32 index of each event's value in
+        categories[field].
+    categories : dict({str: list(str)})
+        For each field in CATEGORICAL_FIELDS, the distinct values in order of first appearance.
+    uuid : list(str)
+        The uuid of each event.
+    """
+    CATEGORICAL_FIELDS = ('target', 'sensor_type', 'message', 'category', 'package_type',
+                          'serial', 'by', 'channel', 'site')
+
+    def __init__(self, epoch, codes: dict, categories: dict, uuid: list):
+        """Initialize an EventColumns object, see build_event_columns().
+        """
+        self.epoch = epoch
+        self.codes = codes
+        self.categories = categories
+        self.uuid = uuid
+        return
+
+    def __len__(self):
+        return len(self.epoch)
+
+    def code(self, field: str, value: str) -> int:
+        """Get the code of a value in a categorical column, for comparing with codes[field].
+
+        Parameters
+        ----------
+        field : str
+            One of CATEGORICAL_FIELDS.
+        value : str
+            The value to look up.
+
+        Returns
+        -------
+        int
+            The code, or -1 (which matches no event) if no event has this value.
+        """
+        try:
+            return self.categories[field].index(value)
+        except ValueError:
+            return -1
+
+    def values(self, field: str):
+        """Get the values of a categorical column as an array of strings.
+
+        Parameters
+        ----------
+        field : str
+            One of CATEGORICAL_FIELDS.
+
+        Returns
+        -------
+        numpy.ndarray
+            The value of each event, an object array.
+        """
+        return numpy.array(self.categories[field], dtype=object)[self.codes[field]]
+
+    def event(self, index: int) -> Event:
+        """Build the Event object for one event.
+
+        Parameters
+        ----------
+        index : int
+            The position of the event.
+
+        Returns
+        -------
+        Event
+            A new Event, the same as build_objects_from_json() would have made except that the
+            epoch is always a float.
+        """
+        fields = dict()
+        for field in self.CATEGORICAL_FIELDS:
+            fields[field] = self.categories[field][self.codes[field][index]]
+        return Event(epoch=float(self.epoch[index]), uuid=self.uuid[index], **fields)
+
+    def __getitem__(self, index):
+        """An int gives the Event at that position, a slice, index array or boolean mask gives
+        a new EventColumns with those events, sharing the categories.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            if index < 0:
+                index += len(self)
+            if index < 0 or index >= len(self):
+                raise IndexError('EventColumns index out of range')
+            return self.event(index=index)
+        positions = numpy.arange(len(self))[index]
+        return EventColumns(epoch=self.epoch[positions],
+                            codes=dict({field: self.codes[field][positions]
+                                        for field in self.codes}),
+                            categories=self.categories,
+                            uuid=[self.uuid[i] for i in positions])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.event(index=index)
+
+
+def build_event_columns(message, content_type=None, others=None, errormsgs=None):
+    """This function converts a message with a JSON array of CASAS events into EventColumns,
+    without making an Event object per event like build_objects_from_json() does.  Requires
+    numpy.
+
+    Parameters
+    ----------
+    message : str|bytes|list
+        The message body, or an already decoded list.
+    content_type : str (optional)
+        The AMQP content_type the message was encoded with, see decode_body().
+    others : list (optional)
+        Anything in the array that is not an event (such as the closing RequestEvents) is built
+        with build_objects_from_json() and appended here, it is dropped when None.
+    errormsgs : list (optional)
+        A message is appended here for each event that is missing a field, such events are
+        skipped.
+
+    Returns
+    -------
+    EventColumns
+        The events of the message.
+
+    Raises
+    ------
+    AiqDataException
+        If numpy is not available.
+    """
+    if numpy is None:
+        raise AiqDataException('numpy is needed for build_event_columns()')
+    if isinstance(message, (dict, list)):
+        blob = message
+    else:
+        blob = decode_body(body=message, content_type=content_type)
+    if isinstance(blob, dict):
+        blob = list([blob])
+
+    fields = EventColumns.CATEGORICAL_FIELDS
+    lookups = dict({field: dict() for field in fields})
+    code_lists = dict({field: list() for field in fields})
+    epochs = list()
+    uuids = list()
+    for obj in blob:
+        if obj.get('action') != EVENT:
+            if others is not None:
+                others.extend(build_objects_from_json(message=list([obj])))
+            continue
+        data = obj.get('data', dict())
+        try:
+            values = list([data['target'], data['sensor_type'], data['message'],
+                           data['category'], data['package_type'], data['serial'],
+                           data['by'], obj['channel'], obj['site']])
+            epoch = float(data['epoch'])
+            event_uuid = data['uuid']
+        except (KeyError, TypeError, ValueError) as err:
+            if errormsgs is not None:
+                errormsgs.append('Skipped an event without a valid {}.'.format(str(err)))
+            continue
+        for field, value in zip(fields, values):
+            # Empty values become 'unknown' as in Event.validate_event().
+            if value == '':
+                value = 'unknown'
+            lookup = lookups[field]
+            code = lookup.get(value)
+            if code is None:
+                code = len(lookup)
+                lookup[value] = code
+            code_lists[field].append(code)
+        epochs.append(epoch)
+        uuids.append(event_uuid)
+
+    return EventColumns(epoch=numpy.array(epochs, dtype=numpy.float64),
+                        codes=dict({field: numpy.array(code_lists[field], dtype=numpy.int32)
+                                    for field in fields}),
+                        categories=dict({field: list(lookups[field]) for field in fields}),
+                        uuid=uuids)
+
+
+def build_objects_from_json(message, amqp_obj=None, binary_segments=None, content_type=None):
     """This function converts a string message into a list of casas.objects.
 
     Parameters
     ----------
     message : str
-        A string of a JSON list containing dictionaries.
+        A string of a JSON list containing dictionaries, an already decoded list or dictionary
+        is also accepted.
     amqp_obj : object (optional)
         A rabbitmq.py Connection object to help keep things alive during large objects.
+    binary_segments : list (optional)
+        The (path, value) segments from split_binary_body() to put back into the decoded JSON.
+    content_type : str (optional)
+        The AMQP content_type the message was encoded with, see decode_body().
 
     Returns
     -------
@@ -5299,19 +6518,25 @@ def build_objects_from_json(message, amqp_obj=None):
         A list containing Event, Tag, Control, Heartbeat, or Translation objects.
         This list can be mixed for different types so make sure to check the action variable.
     """
-    log.debug("build_objects_from_json( {} )".format(str(message)))
+    log.debug('build_objects_from_json( %s )', LogSummary(message))
     response = CasasResponse(status='success',
                              response_type='data',
                              error_message='No Errors')
     return_objects = list()
     result = None
     try:
-        blob = json.loads(message)
+        if isinstance(message, (dict, list)):
+            blob = message
+        else:
+            blob = decode_body(body=message, content_type=content_type)
 
         # AIQ quick modification.
         if isinstance(blob, dict):
             if 'obj_type' in blob:
-                blob = list([copy.deepcopy(blob)])
+                blob = list([blob])
+
+        if binary_segments is not None:
+            attach_binary_segments(blob=blob, segments=binary_segments)
 
         if len(blob) == 0:
             response.add_error(
@@ -5320,796 +6545,20 @@ def build_objects_from_json(message, amqp_obj=None):
 
         element_id = 0
         for obj in blob:
-            log.debug("object: {}".format(str(obj)))
+            log.debug('object: %s', LogSummary(obj))
             errormsgs = list()
             obj_uuid = "unknown"
 
             if 'obj_type' in obj:
-                if obj['obj_type'] == REQ_MODEL:
-                    if 'aiq_username' not in obj:
-                        errormsgs.append('Could not obtain attribute aiq_username, '
-                                         'please include json attribute aiq_username.')
-                    if 'aiq_secret' not in obj:
-                        errormsgs.append('Could not obtain attribute aiq_secret, '
-                                         'please include json attribute aiq_secret.')
-                    if 'model_name' not in obj:
-                        errormsgs.append('Could not obtain attribute model_name, '
-                                         'please include json attribute model_name.')
-                    if 'organization' not in obj:
-                        errormsgs.append('Could not obtain attribute organization, '
-                                         'please include json attribute organization.')
-                    if 'description' not in obj:
-                        errormsgs.append('Could not obtain attribute description, '
-                                         'please include json attribute description.')
-                    if len(errormsgs) == 0:
-                        result = RequestModel(aiq_username=obj['aiq_username'],
-                                              aiq_secret=obj['aiq_secret'],
-                                              model_name=obj['model_name'],
-                                              organization=obj['organization'],
-                                              description=obj['description'])
-                elif obj['obj_type'] == REQ_STATE:
-                    if len(errormsgs) == 0:
-                        result = RequestState()
-                elif obj['obj_type'] == MODEL:
-                    if 'aiq_username' not in obj:
-                        errormsgs.append('Could not obtain attribute aiq_username, '
-                                         'please include json attribute aiq_username.')
-                    if 'aiq_secret' not in obj:
-                        errormsgs.append('Could not obtain attribute aiq_secret, '
-                                         'please include json attribute aiq_secret.')
-                    if 'model_name' not in obj:
-                        errormsgs.append('Could not obtain attribute model_name, '
-                                         'please include json attribute model_name.')
-                    if 'organization' not in obj:
-                        errormsgs.append('Could not obtain attribute organization, '
-                                         'please include json attribute organization.')
-                    if 'description' not in obj:
-                        errormsgs.append('Could not obtain attribute description, '
-                                         'please include json attribute description.')
-                    result = Model(model_name=obj['model_name'],
-                                   organization=obj['organization'],
-                                   aiq_username=obj['aiq_username'],
-                                   aiq_secret=obj['aiq_secret'],
-                                   description=obj['description'])
-                elif obj['obj_type'] == REQ_EXPERIMENT:
-                    model = None
-                    epoch = None
-                    if 'model' in obj:
-                        model = get_subobject(casas_object=obj['model'],
-                                              errormsgs=errormsgs,
-                                              amqp_obj=amqp_obj)
-                    else:
-                        errormsgs.append('Could not obtain attribute model, '
-                                         'please include json attribute model.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'novelty_visibility' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_visibility, '
-                                         'please include json attribute novelty_visibility.')
-                    if 'client_rpc_queue' not in obj:
-                        errormsgs.append('Could not obtain attribute client_rpc_queue, '
-                                         'please include json attribute client_rpc_queue.')
-                    if 'git_version' not in obj:
-                        errormsgs.append('Could not obtain attribute git_version, '
-                                         'please include json attribute git_version.')
-                    if 'seed' not in obj:
-                        errormsgs.append('Could not obtain attribute seed, '
-                                         'please include json attribute seed.')
-                    if 'domain_dict' not in obj:
-                        errormsgs.append('Could not obtain attribute domain_dict, '
-                                         'please include json attribute domain_dict.')
-                    if 'experiment_type' not in obj:
-                        errormsgs.append('Could not obtain attribute experiment_type, '
-                                         'please include json attribute experiment_type.')
-                    if 'no_testing' not in obj:
-                        errormsgs.append('Could not obtain attribute no_testing, '
-                                         'please include json attribute no_testing.')
-                    if 'description' not in obj:
-                        errormsgs.append('Could not obtain attribute description, '
-                                         'please include json attribute description.')
-                    if 'generator_config' not in obj:
-                        obj['generator_config'] = None
-                    if 'epoch' in obj:
-                        epoch = obj['epoch']
-                    if len(errormsgs) == 0:
-                        result = RequestExperiment(model=model,
-                                                   novelty=obj['novelty'],
-                                                   novelty_visibility=obj['novelty_visibility'],
-                                                   client_rpc_queue=obj['client_rpc_queue'],
-                                                   git_version=obj['git_version'],
-                                                   experiment_type=obj['experiment_type'],
-                                                   seed=obj['seed'],
-                                                   domain_dict=obj['domain_dict'],
-                                                   epoch=epoch,
-                                                   no_testing=obj['no_testing'],
-                                                   description=obj['description'],
-                                                   generator_config=obj['generator_config'])
-                elif obj['obj_type'] == REQ_EXP_TRIALS:
-                    model = None
-                    epoch = None
-                    if 'model' in obj:
-                        model = get_subobject(casas_object=obj['model'],
-                                              errormsgs=errormsgs,
-                                              amqp_obj=amqp_obj)
-                    else:
-                        errormsgs.append('Could not obtain attribute model, '
-                                         'please include json attribute model.')
-                    if 'experiment_secret' not in obj:
-                        errormsgs.append('Could not obtain attribute experiment_secret, '
-                                         'please include json attribute experiment_secret.')
-                    if 'client_rpc_queue' not in obj:
-                        errormsgs.append('Could not obtain attribute client_rpc_queue, '
-                                         'please include json attribute client_rpc_queue.')
-                    if 'experiment_type' not in obj:
-                        errormsgs.append('Could not obtain attribute experiment_type, '
-                                         'please include json attribute experiment_type.')
-                    if 'just_one_trial' not in obj:
-                        errormsgs.append('Could not obtain attribute just_one_trial, '
-                                         'please include json attribute just_one_trial.')
-                    if 'domain_dict' not in obj:
-                        errormsgs.append('Could not obtain attribute domain_dict, '
-                                         'please include json attribute domain_dict.')
-                    if 'generator_config' not in obj:
-                        obj['generator_config'] = None
-                    if 'epoch' in obj:
-                        epoch = obj['epoch']
-                    if len(errormsgs) == 0:
-                        result = RequestExperimentTrials(
-                            model=model,
-                            experiment_secret=obj['experiment_secret'],
-                            client_rpc_queue=obj['client_rpc_queue'],
-                            experiment_type=obj['experiment_type'],
-                            just_one_trial=obj['just_one_trial'],
-                            domain_dict=obj['domain_dict'],
-                            epoch=epoch,
-                            generator_config=obj['generator_config'])
-                elif obj['obj_type'] == EXPERIMENT_RESP:
-                    if 'server_rpc_queue' not in obj:
-                        errormsgs.append('Could not obtain attribute server_rpc_queue, '
-                                         'please include json attribute server_rpc_queue.')
-                    if 'experiment_secret' not in obj:
-                        errormsgs.append('Could not obtain attribute experiment_secret, '
-                                         'please include json attribute experiment_secret.')
-                    if 'model_experiment_id' not in obj:
-                        errormsgs.append('Could not obtain attribute model_experiment_id, '
-                                         'please include json attribute model_experiment_id.')
-                    if 'experiment_timeout' not in obj:
-                        errormsgs.append('Could not obtain attribute experiment_timeout, '
-                                         'please include json attribute experiment_timeout.')
-                    if len(errormsgs) == 0:
-                        result = ExperimentResponse(server_rpc_queue=obj['server_rpc_queue'],
-                                                    experiment_secret=obj['experiment_secret'],
-                                                    model_experiment_id=obj['model_experiment_id'],
-                                                    experiment_timeout=obj['experiment_timeout'])
-                elif obj['obj_type'] == EXPERIMENT_START:
-                    if len(errormsgs) == 0:
-                        result = ExperimentStart()
-                elif obj['obj_type'] == EXPERIMENT_END:
-                    if len(errormsgs) == 0:
-                        result = ExperimentEnd()
-                elif obj['obj_type'] == EXPERIMENT_EXCEPTION:
-                    if 'message' not in obj:
-                        raise AiqExperimentException(
-                            value='Experiment Exception raised without a message!')
-                    else:
-                        raise AiqExperimentException(value=obj['message'])
-                elif obj['obj_type'] == BENCHMARK_REQ:
-                    if 'benchmark_script' not in obj:
-                        errormsgs.append('Could not obtain attribute benchmark_script, '
-                                         'please include json attribute benchmark_script.')
-                    if len(errormsgs) == 0:
-                        result = BenchmarkRequest(benchmark_script=obj['benchmark_script'])
-                elif obj['obj_type'] == BENCHMARK_DATA:
-                    if 'benchmark_data' not in obj:
-                        errormsgs.append('Could not obtain attribute benchmark_data, '
-                                         'please include json attribute benchmark_data.')
-                    if len(errormsgs) == 0:
-                        result = BenchmarkData(benchmark_data=obj['benchmark_data'])
-                elif obj['obj_type'] == BENCHMARK_ACK:
-                    if len(errormsgs) == 0:
-                        result = BenchmarkAck()
-                elif obj['obj_type'] == NOVELTY_START:
-                    if len(errormsgs) == 0:
-                        result = NoveltyStart()
-                elif obj['obj_type'] == NOVELTY_END:
-                    if len(errormsgs) == 0:
-                        result = NoveltyEnd()
-                elif obj['obj_type'] == TRIAL_START:
-                    if 'trial_number' not in obj:
-                        errormsgs.append('Could not obtain attribute trial_number, '
-                                         'please include json attribute trial_number.')
-                    if 'total_trials' not in obj:
-                        errormsgs.append('Could not obtain attribute total_trials, '
-                                         'please include json attribute total_trials.')
-                    if 'message' not in obj:
-                        errormsgs.append('Could not obtain attribute message, '
-                                         'please include json attribute message.')
-                    if 'novelty_description' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_description, '
-                                         'please include json attribute novelty_description.')
-                    if len(errormsgs) == 0:
-                        result = TrialStart(trial_number=obj['trial_number'],
-                                            total_trials=obj['total_trials'],
-                                            message=obj['message'],
-                                            novelty_description=obj['novelty_description'])
-                elif obj['obj_type'] == TRIAL_END:
-                    if len(errormsgs) == 0:
-                        result = TrialEnd()
-                elif obj['obj_type'] == TRAINING_START:
-                    if len(errormsgs) == 0:
-                        result = TrainingStart()
-                elif obj['obj_type'] == TRAINING_ACTIVE:
-                    if len(errormsgs) == 0:
-                        result = TrainingActive()
-                elif obj['obj_type'] == TRAINING_END:
-                    if 'message' not in obj:
-                        errormsgs.append('Could not obtain attribute message, '
-                                         'please include json attribute message.')
-                    if len(errormsgs) == 0:
-                        result = TrainingEnd(message=obj['message'])
-                elif obj['obj_type'] == TRAINING_MODEL_END:
-                    if len(errormsgs) == 0:
-                        result = TrainingModelEnd()
-                elif obj['obj_type'] == TRAINING_END_EARLY:
-                    if len(errormsgs) == 0:
-                        result = TrainingEndEarly()
-                elif obj['obj_type'] == TRAIN_EPISODE_START:
-                    if 'episode_number' not in obj:
-                        errormsgs.append('Could not obtain attribute episode_number, '
-                                         'please include json attribute episode_number.')
-                    if 'total_episodes' not in obj:
-                        errormsgs.append('Could not obtain attribute total_episodes, '
-                                         'please include json attribute total_episodes.')
-                    if len(errormsgs) == 0:
-                        result = TrainingEpisodeStart(episode_number=obj['episode_number'],
-                                                      total_episodes=obj['total_episodes'])
-                elif obj['obj_type'] == TRAIN_EPISODE_ACTIVE:
-                    if len(errormsgs) == 0:
-                        result = TrainingEpisodeActive()
-                elif obj['obj_type'] == TRAIN_EPISODE_END:
-                    if 'performance' not in obj:
-                        errormsgs.append('Could not obtain attribute performance, '
-                                         'please include json attribute performance.')
-                    if 'feedback' not in obj:
-                        errormsgs.append('Could not obtain attribute feedback, '
-                                         'please include json attribute feedback.')
-                    if len(errormsgs) == 0:
-                        result = TrainingEpisodeEnd(performance=obj['performance'],
-                                                    feedback=obj['feedback'])
-                elif obj['obj_type'] == EPISODE_END:
-                    if 'performance' not in obj:
-                        errormsgs.append('Could not obtain attribute performance, '
-                                         'please include json attribute performance.')
-                    if 'feedback' not in obj:
-                        errormsgs.append('Could not obtain attribute feedback, '
-                                         'please include json attribute feedback.')
-                    if len(errormsgs) == 0:
-                        result = EpisodeEnd(performance=obj['performance'],
-                                            feedback=obj['feedback'])
-                elif obj['obj_type'] == BASIC_DATA:
-                    if 'feature_vector' not in obj:
-                        errormsgs.append('Could not obtain attribute feature_vector, '
-                                         'please include json attribute feature_vector.')
-                    if 'feature_label' not in obj:
-                        errormsgs.append('Could not obtain attribute feature_label, '
-                                         'please include json attribute feature_label.')
-                    if len(errormsgs) == 0:
-                        result = BasicData(feature_vector=obj['feature_vector'],
-                                           feature_label=obj['feature_label'])
-                elif obj['obj_type'] == BASIC_DATA_PREDICTION:
-                    if 'label_prediction' not in obj:
-                        errormsgs.append('Could not obtain attribute label_prediction, '
-                                         'please include json attribute label_prediction.')
-                    if len(errormsgs) == 0:
-                        result = BasicDataPrediction(label_prediction=obj['label_prediction'])
-                elif obj['obj_type'] == BASIC_DATA_ACK:
-                    if 'performance' not in obj:
-                        errormsgs.append('Could not obtain attribute performance, '
-                                         'please include json attribute performance.')
-                    if 'feedback' not in obj:
-                        errormsgs.append('Could not obtain attribute feedback, '
-                                         'please include json attribute feedback.')
-                    if len(errormsgs) == 0:
-                        result = BasicDataAck(performance=obj['performance'],
-                                              feedback=obj['feedback'])
-                elif obj['obj_type'] == BASIC_EPISODE_NOVELTY:
-                    if 'novelty_probability' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_probability, '
-                                         'please include json attribute novelty_probability.')
-                    if 'novelty_threshold' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_threshold, '
-                                         'please include json attribute novelty_threshold.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'novelty_characterization' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_characterization, '
-                                         'please include json attribute novelty_characterization.')
-                    if len(errormsgs) == 0:
-                        result = BasicEpisodeNovelty(
-                            novelty_probability=obj['novelty_probability'],
-                            novelty_threshold=obj['novelty_threshold'],
-                            novelty=obj['novelty'],
-                            novelty_characterization=obj['novelty_characterization'])
-                elif obj['obj_type'] == REQ_DATA:
-                    if len(errormsgs) == 0:
-                        result = RequestData()
-                elif obj['obj_type'] == REQ_TRAIN_DATA:
-                    if 'model_experiment_id' not in obj:
-                        errormsgs.append('Could not obtain attribute model_experiment_id, '
-                                         'please include json attribute model_experiment_id.')
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if len(errormsgs) == 0:
-                        result = RequestTrainingData(model_experiment_id=obj['model_experiment_id'],
-                                                     secret=obj['secret'])
-                elif obj['obj_type'] == TRAINING_DATA:
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if 'feature_vector' not in obj:
-                        errormsgs.append('Could not obtain attribute feature_vector, '
-                                         'please include json attribute feature_vector.')
-                    if 'feature_label' not in obj:
-                        errormsgs.append('Could not obtain attribute feature_label, '
-                                         'please include json attribute feature_label.')
-                    if 'utc_remote_epoch_received' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_received, '
-                                         'please include json attribute utc_remote_epoch_received.')
-                    if 'utc_remote_epoch_sent' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_sent, '
-                                         'please include json attribute utc_remote_epoch_sent.')
-                    if len(errormsgs) == 0:
-                        result = TrainingData(
-                            secret=obj['secret'],
-                            feature_vector=obj['feature_vector'],
-                            feature_label=obj['feature_label'],
-                            utc_remote_epoch_received=obj['utc_remote_epoch_received'],
-                            utc_remote_epoch_sent=obj['utc_remote_epoch_sent'])
-                elif obj['obj_type'] == TRAIN_DATA_PRED:
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if 'utc_remote_epoch_received' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_received, '
-                                         'please include json attribute utc_remote_epoch_received.')
-                    if 'utc_remote_epoch_sent' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_sent, '
-                                         'please include json attribute utc_remote_epoch_sent.')
-                    if 'label_prediction' not in obj:
-                        errormsgs.append('Could not obtain attribute label_prediction, '
-                                         'please include json attribute label_prediction.')
-                    if 'end_early' not in obj:
-                        errormsgs.append('Could not obtain attribute end_early, '
-                                         'please include json attribute end_early.')
-                    if len(errormsgs) == 0:
-                        result = TrainingDataPrediction(
-                            secret=obj['secret'],
-                            utc_remote_epoch_received=obj['utc_remote_epoch_received'],
-                            utc_remote_epoch_sent=obj['utc_remote_epoch_sent'],
-                            label_prediction=obj['label_prediction'],
-                            end_early=obj['end_early'])
-                elif obj['obj_type'] == TRAIN_DATA_ACK:
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if 'performance' not in obj:
-                        errormsgs.append('Could not obtain attribute performance, '
-                                         'please include json attribute performance.')
-                    if 'feedback' not in obj:
-                        errormsgs.append('Could not obtain attribute feedback, '
-                                         'please include json attribute feedback.')
-                    if len(errormsgs) == 0:
-                        result = TrainingDataAck(
-                            secret=obj['secret'],
-                            performance=obj['performance'],
-                            feedback=obj['feedback'])
-                elif obj['obj_type'] == TRAIN_EPISODE_NOVELTY:
-                    if 'novelty_probability' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_probability, '
-                                         'please include json attribute novelty_probability.')
-                    if 'novelty_threshold' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_threshold, '
-                                         'please include json attribute novelty_threshold.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'novelty_characterization' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_characterization, '
-                                         'please include json attribute novelty_characterization.')
-                    if len(errormsgs) == 0:
-                        result = TrainingEpisodeNovelty(
-                            novelty_probability=obj['novelty_probability'],
-                            novelty_threshold=obj['novelty_threshold'],
-                            novelty=obj['novelty'],
-                            novelty_characterization=obj['novelty_characterization'])
-                elif obj['obj_type'] == TRAIN_EPISODE_NOVELTY_ACK:
-                    if len(errormsgs) == 0:
-                        result = TrainingEpisodeNoveltyAck()
-                elif obj['obj_type'] == TESTING_START:
-                    if len(errormsgs) == 0:
-                        result = TestingStart()
-                elif obj['obj_type'] == TESTING_ACTIVE:
-                    if len(errormsgs) == 0:
-                        result = TestingActive()
-                elif obj['obj_type'] == TESTING_END:
-                    if len(errormsgs) == 0:
-                        result = TestingEnd()
-                elif obj['obj_type'] == TEST_EPISODE_START:
-                    if 'episode_number' not in obj:
-                        errormsgs.append('Could not obtain attribute episode_number, '
-                                         'please include json attribute episode_number.')
-                    if 'total_episodes' not in obj:
-                        errormsgs.append('Could not obtain attribute total_episodes, '
-                                         'please include json attribute total_episodes.')
-                    if len(errormsgs) == 0:
-                        result = TestingEpisodeStart(episode_number=obj['episode_number'],
-                                                     total_episodes=obj['total_episodes'])
-                elif obj['obj_type'] == TEST_EPISODE_ACTIVE:
-                    if len(errormsgs) == 0:
-                        result = TestingEpisodeActive()
-                elif obj['obj_type'] == TEST_EPISODE_END:
-                    if 'performance' not in obj:
-                        errormsgs.append('Could not obtain attribute performance, '
-                                         'please include json attribute performance.')
-                    if 'feedback' not in obj:
-                        errormsgs.append('Could not obtain attribute feedback, '
-                                         'please include json attribute feedback.')
-                    if len(errormsgs) == 0:
-                        result = TestingEpisodeEnd(performance=obj['performance'],
-                                                   feedback=obj['feedback'])
-                elif obj['obj_type'] == REQ_TEST_DATA:
-                    if 'model_experiment_id' not in obj:
-                        errormsgs.append('Could not obtain attribute model_experiment_id, '
-                                         'please include json attribute model_experiment_id.')
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if len(errormsgs) == 0:
-                        result = RequestTestingData(model_experiment_id=obj['model_experiment_id'],
-                                                    secret=obj['secret'])
-                elif obj['obj_type'] == TESTING_DATA:
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if 'feature_vector' not in obj:
-                        errormsgs.append('Could not obtain attribute feature_vector, '
-                                         'please include json attribute feature_vector.')
-                    if 'utc_remote_epoch_received' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_received, '
-                                         'please include json attribute utc_remote_epoch_received.')
-                    if 'utc_remote_epoch_sent' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_sent, '
-                                         'please include json attribute utc_remote_epoch_sent.')
-                    if 'novelty_indicator' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_indicator, '
-                                         'please include json attribute novelty_indicator.')
-                    if len(errormsgs) == 0:
-                        result = TestingData(
-                            secret=obj['secret'],
-                            feature_vector=obj['feature_vector'],
-                            utc_remote_epoch_received=obj['utc_remote_epoch_received'],
-                            utc_remote_epoch_sent=obj['utc_remote_epoch_sent'],
-                            novelty_indicator=obj['novelty_indicator'])
-                elif obj['obj_type'] == TEST_DATA_PRED:
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if 'utc_remote_epoch_received' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_received, '
-                                         'please include json attribute utc_remote_epoch_received.')
-                    if 'utc_remote_epoch_sent' not in obj:
-                        errormsgs.append('Could not obtain attribute utc_remote_epoch_sent, '
-                                         'please include json attribute utc_remote_epoch_sent.')
-                    if 'label_prediction' not in obj:
-                        errormsgs.append('Could not obtain attribute label_prediction, '
-                                         'please include json attribute label_prediction.')
-                    if 'end_early' not in obj:
-                        errormsgs.append('Could not obtain attribute end_early, '
-                                         'please include json attribute end_early.')
-                    if len(errormsgs) == 0:
-                        result = TestingDataPrediction(
-                            secret=obj['secret'],
-                            utc_remote_epoch_received=obj['utc_remote_epoch_received'],
-                            utc_remote_epoch_sent=obj['utc_remote_epoch_sent'],
-                            label_prediction=obj['label_prediction'],
-                            end_early=obj['end_early'])
-                elif obj['obj_type'] == TEST_DATA_ACK:
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if 'performance' not in obj:
-                        errormsgs.append('Could not obtain attribute performance, '
-                                         'please include json attribute performance.')
-                    if 'feedback' not in obj:
-                        errormsgs.append('Could not obtain attribute feedback, '
-                                         'please include json attribute feedback.')
-                    if len(errormsgs) == 0:
-                        result = TestingDataAck(secret=obj['secret'],
-                                                performance=obj['performance'],
-                                                feedback=obj['feedback'])
-                elif obj['obj_type'] == TEST_EPISODE_NOVELTY:
-                    if 'novelty_probability' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_probability, '
-                                         'please include json attribute novelty_probability.')
-                    if 'novelty_threshold' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_threshold, '
-                                         'please include json attribute novelty_threshold.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'novelty_characterization' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_characterization, '
-                                         'please include json attribute novelty_characterization.')
-                    if len(errormsgs) == 0:
-                        result = TestingEpisodeNovelty(
-                            novelty_probability=obj['novelty_probability'],
-                            novelty_threshold=obj['novelty_threshold'],
-                            novelty=obj['novelty'],
-                            novelty_characterization=obj['novelty_characterization'])
-                elif obj['obj_type'] == TEST_EPISODE_NOVELTY_ACK:
-                    if len(errormsgs) == 0:
-                        result = TestingEpisodeNoveltyAck()
-                elif obj['obj_type'] == END_EXPERIMENT:
-                    if 'model_experiment_id' not in obj:
-                        errormsgs.append('Could not obtain attribute model_experiment_id, '
-                                         'please include json attribute model_experiment_id.')
-                    if 'secret' not in obj:
-                        errormsgs.append('Could not obtain attribute secret, '
-                                         'please include json attribute secret.')
-                    if len(errormsgs) == 0:
-                        result = EndExperiment(model_experiment_id=obj['model_experiment_id'],
-                                               secret=obj['secret'])
-                elif obj['obj_type'] == WAIT_ON_SOTA:
-                    if len(errormsgs) == 0:
-                        result = WaitOnSota()
-                elif obj['obj_type'] == SOTA_IDLE:
-                    if len(errormsgs) == 0:
-                        result = SotaIdle()
-                elif obj['obj_type'] == OBJ_EPISODE:
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'difficulty' not in obj:
-                        errormsgs.append('Could not obtain attribute difficulty, '
-                                         'please include json attribute difficulty.')
-                    if 'seed' not in obj:
-                        errormsgs.append('Could not obtain attribute seed, '
-                                         'please include json attribute seed.')
-                    if 'domain' not in obj:
-                        errormsgs.append('Could not obtain attribute domain, '
-                                         'please include json attribute domain.')
-                    if 'data_type' not in obj:
-                        errormsgs.append('Could not obtain attribute data_type, '
-                                         'please include json attribute data_type.')
-                    if 'episode_index' not in obj:
-                        errormsgs.append('Could not obtain attribute episode_index, '
-                                         'please include json attribute episode_index.')
-                    if 'episode_id' not in obj:
-                        errormsgs.append('Could not obtain attribute episode_id, '
-                                         'please include json attribute episode_id.')
-                    if 'trial_novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute trial_novelty, '
-                                         'please include json attribute trial_novelty.')
-                    if 'day_offset' not in obj:
-                        errormsgs.append('Could not obtain attribute day_offset, '
-                                         'please include json attribute day_offset.')
-                    if 'trial_episode_index' not in obj:
-                        errormsgs.append('Could not obtain attribute trial_episode_index, '
-                                         'please include json attribute trial_episode_index.')
-                    if 'use_image' not in obj:
-                        errormsgs.append('Could not obtain attribute use_image, '
-                                         'please include json attribute use_image.')
-                    if 'hint_level' not in obj:
-                        errormsgs.append('Could not obtain attribute hint_level, '
-                                         'please include json attribute hint_level.')
-                    if 'phase' not in obj:
-                        errormsgs.append('Could not obtain attribute phase, '
-                                         'please include json attribute phase.')
-                    if len(errormsgs) == 0:
-                        result = Episode(novelty=obj['novelty'],
-                                         difficulty=obj['difficulty'],
-                                         domain=obj['domain'],
-                                         data_type=obj['data_type'],
-                                         seed=obj['seed'],
-                                         episode_index=obj['episode_index'],
-                                         episode_id=obj['episode_id'],
-                                         trial_novelty=obj['trial_novelty'],
-                                         day_offset=obj['day_offset'],
-                                         trial_episode_index=obj['trial_episode_index'],
-                                         use_image=obj['use_image'],
-                                         hint_level=obj['hint_level'],
-                                         phase=obj['phase'])
-                elif obj['obj_type'] == OBJ_TRAINING:
-                    if 'episodes' not in obj:
-                        errormsgs.append('Could not obtain attribute episodes, '
-                                         'please include json attribute episodes.')
-                    episodes = list()
-                    if len(errormsgs) == 0:
-                        if len(obj['episodes']) > 0:
-                            episodes = get_subobject_list(
-                                casas_object=json.dumps(obj['episodes']),
-                                errormsgs=errormsgs,
-                                amqp_obj=amqp_obj)
-                    if len(errormsgs) == 0:
-                        result = Training(episodes=episodes)
-                elif obj['obj_type'] == OBJ_TRIAL:
-                    if 'episodes' not in obj:
-                        errormsgs.append('Could not obtain attribute episodes, '
-                                         'please include json attribute episodes.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'novelty_visibility' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_visibility, '
-                                         'please include json attribute novelty_visibiliy.')
-                    if 'difficulty' not in obj:
-                        errormsgs.append('Could not obtain attribute difficulty, '
-                                         'please include json attribute difficulty.')
-                    if 'hint_level' not in obj:
-                        errormsgs.append('Could not obtain attribute hint_level, '
-                                         'please include json attribute hint_level.')
-                    episodes = list()
-                    if len(errormsgs) == 0:
-                        if len(obj['episodes']) > 0:
-                            episodes = get_subobject_list(
-                                casas_object=json.dumps(obj['episodes']),
-                                errormsgs=errormsgs,
-                                amqp_obj=amqp_obj)
-                    if len(errormsgs) == 0:
-                        result = Trial(episodes=episodes,
-                                       novelty=obj['novelty'],
-                                       novelty_visibility=obj['novelty_visibility'],
-                                       difficulty=obj['difficulty'],
-                                       hint_level=obj['hint_level'])
-                elif obj['obj_type'] == OBJ_NOVELTY_GRP:
-                    if 'trials' not in obj:
-                        errormsgs.append('Could not obtain attribute trials, '
-                                         'please include json attribute trials.')
-                    trials = list()
-                    if len(errormsgs) == 0:
-                        if len(obj['trials']) > 0:
-                            trials = get_subobject_list(
-                                casas_object=json.dumps(obj['trials']),
-                                errormsgs=errormsgs,
-                                amqp_obj=amqp_obj)
-                    if len(errormsgs) == 0:
-                        result = NoveltyGroup(trials=trials)
-                elif obj['obj_type'] == OBJ_EXPERIMENT:
-                    if 'training' not in obj:
-                        errormsgs.append('Could not obtain attribute training, '
-                                         'please include json attribute training.')
-                    if 'novelty_groups' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty_groups, '
-                                         'please include json attribute novelty_groups.')
-                    if 'budget' not in obj:
-                        errormsgs.append('Could not obtain attribute budget, '
-                                         'please include json attribute budget.')
-                    if 'phase' not in obj:
-                        errormsgs.append('Could not obtain attribute phase, '
-                                         'please include json attribute phase.')
-                    training = None
-                    nov_groups = list()
-                    if len(errormsgs) == 0:
-                        training = get_subobject(
-                            casas_object='[{}]'.format(json.dumps(obj['training'])),
-                            errormsgs=errormsgs,
-                            amqp_obj=amqp_obj)
-                    if len(errormsgs) == 0:
-                        if len(obj['novelty_groups']) > 0:
-                            nov_groups = get_subobject_list(
-                                casas_object=json.dumps(obj['novelty_groups']),
-                                errormsgs=errormsgs,
-                                amqp_obj=amqp_obj)
-                    if len(errormsgs) == 0:
-                        result = Experiment(training=training,
-                                            novelty_groups=nov_groups,
-                                            budget=obj['budget'],
-                                            phase=obj['phase'])
-                elif obj['obj_type'] == REQ_NOVELTY_DESCRIPTION:
-                    if 'domain' not in obj:
-                        errormsgs.append('Could not obtain attribute domain, '
-                                         'please include json attribute domain.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'difficulty' not in obj:
-                        errormsgs.append('Could not obtain attribute difficulty, '
-                                         'please include json attribute difficulty.')
-                    if len(errormsgs) == 0:
-                        result = RequestNoveltyDescription(r_domain=obj['domain'],
-                                                           novelty=obj['novelty'],
-                                                           difficulty=obj['difficulty'])
-                elif obj['obj_type'] == OBJ_NOVELTY_DESCRIPTION:
-                    if 'novelty_description' not in obj:
-                        errormsgs.append('Coule not obtain attribute novelty_description, '
-                                         'please include json attribute novelty_description.')
-                    if len(errormsgs) == 0:
-                        result = NoveltyDescription(novelty_description=obj['novelty_description'])
-                elif obj['obj_type'] == GENERATOR_IDLE:
-                    if len(errormsgs) == 0:
-                        result = GeneratorIdle()
-                elif obj['obj_type'] == GENERATOR_RESET:
-                    if len(errormsgs) == 0:
-                        result = GeneratorReset()
-                elif obj['obj_type'] == START_GENERATOR:
-                    if 'domain' not in obj:
-                        errormsgs.append('Could not obtain attribute domain, '
-                                         'please include json attribute domain.')
-                    if 'novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute novelty, '
-                                         'please include json attribute novelty.')
-                    if 'difficulty' not in obj:
-                        errormsgs.append('Could not obtain attribute difficulty, '
-                                         'please include json attribute difficulty.')
-                    if 'seed' not in obj:
-                        errormsgs.append('Could not obtain attribute seed, '
-                                         'please include json attribute seed.')
-                    if 'server_rpc_queue' not in obj:
-                        errormsgs.append('Could not obtain attribute server_rpc_queue, '
-                                         'please include json attribute server_rpc_queue.')
-                    if 'trial_novelty' not in obj:
-                        errormsgs.append('Could not obtain attribute trial_novelty, '
-                                         'please include json attribute trial_novelty.')
-                    if 'epoch' not in obj:
-                        errormsgs.append('Could not obtain attribute epoch, '
-                                         'please include json attribute epoch.')
-                    if 'day_offset' not in obj:
-                        errormsgs.append('Could not obtain attribute day_offset, '
-                                         'please include json attribute day_offset.')
-                    if 'request_timeout' not in obj:
-                        errormsgs.append('Could not obtain attribute request_timeout, '
-                                         'please include json attribute request_timeout.')
-                    if 'use_image' not in obj:
-                        errormsgs.append('Could not obtain attribute use_image, '
-                                         'please include json attribute use_image.')
-                    if 'generator_config' not in obj:
-                        obj['generator_config'] = None
-                    if 'hint_level' not in obj:
-                        errormsgs.append('Could not obtain attribute hint_level, '
-                                         'please include json attribute hint_level.')
-                    if 'phase' not in obj:
-                        errormsgs.append('Could not obtain attribute phase, '
-                                         'please include json attribute phase.')
-                    if len(errormsgs) == 0:
-                        result = StartGenerator(domain=obj['domain'],
-                                                novelty=obj['novelty'],
-                                                difficulty=obj['difficulty'],
-                                                seed=obj['seed'],
-                                                server_rpc_queue=obj['server_rpc_queue'],
-                                                trial_novelty=obj['trial_novelty'],
-                                                epoch=obj['epoch'],
-                                                day_offset=obj['day_offset'],
-                                                request_timeout=obj['request_timeout'],
-                                                use_image=obj['use_image'],
-                                                generator_config=obj['generator_config'],
-                                                hint_level=obj['hint_level'],
-                                                phase=obj['phase'])
-                elif obj['obj_type'] == GENERATOR_RESPONSE:
-                    if 'generator_rpc_queue' not in obj:
-                        errormsgs.append('Could not obtain attribute generator_rpc_queue, '
-                                         'please include json attribute generator_rpc_queue.')
-                    if len(errormsgs) == 0:
-                        result = GeneratorResponse(generator_rpc_queue=obj['generator_rpc_queue'])
-                elif obj['obj_type'] == ANALYSIS_READY:
-                    if 'model_experiment_id' not in obj:
-                        errormsgs.append('Could not obtain attribute model_experiment_id, '
-                                         'please include json attribute model_experiment_id.')
-                    if len(errormsgs) == 0:
-                        result = AnalysisReady(model_experiment_id=obj['model_experiment_id'])
-                elif obj['obj_type'] == ANALYSIS_PARTIAL:
-                    if 'model_experiment_id' not in obj:
-                        errormsgs.append('Could not obtain attribute model_experiment_id, '
-                                         'please include json attribute model_experiment_id.')
-                    if 'experiment_trial_id' not in obj:
-                        errormsgs.append('Could not obtain attribute experiment_trial_id, '
-                                         'please include json attribute experiment_trial_id.')
-                    if len(errormsgs) == 0:
-                        result = AnalysisPartial(model_experiment_id=obj['model_experiment_id'],
-                                                 experiment_trial_id=obj['experiment_trial_id'])
-                return_objects.append(copy.deepcopy(result))
+                result = None
+                aiq_class = AIQ_OBJECT_TYPES.get(obj['obj_type'])
+                if aiq_class is not None:
+                    result = aiq_class.from_json_obj(obj=obj,
+                                                     errormsgs=errormsgs,
+                                                     amqp_obj=amqp_obj)
+                else:
+                    errormsgs.append('Unknown obj_type {}.'.format(obj['obj_type']))
+                return_objects.append(result)
             elif 'action' not in obj:
                 errormsgs.append("Could not obtain attribute action, "
                                  "please include json attribute action.")
@@ -22,11 +22,13 @@
 # ** Contact: Brian L. Thomas (bthomas1@wsu.edu)
 # ** Contact: Diane J. Cook (djcook@wsu.edu)
 # *****************************************************************************#
+import asyncio
 import copy
 import datetime
 import json
 import logging
 import logging.handlers
+import os
 import pika
 import pytz
 import re
@@ -35,9 +37,401 @@ import threading
 import time
 import uuid
 
+from pika.adapters.asyncio_connection import AsyncioConnection
+
 from . import objects
 
 
+def encode_message(casas_object=None, body_str=None, key=None, secret=None, reply_to=None,
+                   binary_segments=False, content_type=None):
+    """Encode a message body and its headers for publishing to a queue, see
+    Connection.publish_to_queue() for the parameters.
+
+    Returns
+    -------
+    tuple(bytes|str, dict, str)
+        The message body, the AMQP headers (None when there are none) and the content type.
+    """
+    headers = None
+    body = None
+    if reply_to is not None:
+        # Let the RPC server know how we can decode the response.
+        headers = dict({objects.HEADER_BINARY_ACCEPT: True,
+                        objects.HEADER_ACCEPT_CONTENT_TYPES: ','.join(objects.get_content_types())})
+    if content_type is None:
+        content_type = objects.CONTENT_TYPE_JSON
+    if casas_object is not None:
+        if isinstance(casas_object, objects.AiqObject):
+            json_obj = casas_object.get_json_obj()
+            segments = list()
+            # msgpack carries bytes values natively.
+            if binary_segments and content_type == objects.CONTENT_TYPE_JSON:
+                json_obj, segments = objects.extract_binary_segments(json_obj=json_obj,
+                                                                     path=[0])
+            body = objects.encode_body(body_obj=[json_obj], content_type=content_type)
+            if len(segments) > 0:
+                if headers is None:
+                    headers = dict()
+                headers[objects.HEADER_BINARY_SEGMENTS] = json.dumps(
+                    [[path, len(value)] for path, value in segments])
+                body = b''.join([body] + [value for path, value in segments])
+        else:
+            body_str = casas_object.get_json(secret=secret, key=key)
+            body_str = "[{}]".format(body_str)
+    if body is None:
+        body = str(body_str)
+    return body, headers, content_type
+
+
+def decode_message(properties, body, amqp_obj=None):
+    """Decode the objects in a message published with encode_message().
+
+    Parameters
+    ----------
+    properties : pika.Spec.BasicProperties
+        The message properties.
+    body : bytes|str
+        The message body.
+    amqp_obj : object (optional)
+        A Connection object to help keep things alive during large objects.
+
+    Returns
+    -------
+    tuple(bytes|str, list)
+        The JSON part of the body and the list of objects built from it.
+    """
+    binary_segments = None
+    if properties.headers is not None \
+            and objects.HEADER_BINARY_SEGMENTS in properties.headers:
+        body, binary_segments = objects.split_binary_body(
+            body=body,
+            header=properties.headers[objects.HEADER_BINARY_SEGMENTS])
+    obj = objects.build_objects_from_json(body,
+                                          amqp_obj=amqp_obj,
+                                          binary_segments=binary_segments,
+                                          content_type=properties.content_type)
+    return body, obj
+
+
+class LatencyHistogram(object):
+    """An HDR style histogram of durations in microseconds. Values below 128 usec get a bucket
+    each, above that every power of two is split in 64 buckets, so a percentile is within
+    about 1.5% of the recorded value whatever its magnitude, with only a few hundred buckets
+    for anything up to hours.
+    """
+    _SUB_BITS = 7
+    _SUB_HALF = 1 << (_SUB_BITS - 1)
+    _LINEAR = 1 << _SUB_BITS
+
+    def __init__(self):
+        """Initialize an empty LatencyHistogram object.
+        """
+        self.counts = dict()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        return
+
+    def record_usec(self, usec: int):
+        """Add one duration to the histogram.
+
+        Parameters
+        ----------
+        usec : int
+            The duration in microseconds, negative values are recorded as 0.
+        """
+        usec = max(0, int(usec))
+        if usec < self._LINEAR:
+            index = usec
+        else:
+            shift = usec.bit_length() - self._SUB_BITS
+            index = self._LINEAR + (shift - 1) * self._SUB_HALF \
+                + (usec >> shift) - self._SUB_HALF
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += usec
+        if self.min is None or usec < self.min:
+            self.min = usec
+        if self.max is None or usec > self.max:
+            self.max = usec
+        return
+
+    def record(self, seconds: float):
+        """Add one duration in seconds (a difference of time.perf_counter() values).
+
+        Parameters
+        ----------
+        seconds : float
+            The duration in seconds.
+        """
+        self.record_usec(usec=seconds * 1000000.0)
+        return
+
+    def _bucket_top(self, index: int) -> int:
+        if index < self._LINEAR:
+            return index
+        shift = (index - self._LINEAR) // self._SUB_HALF + 1
+        top = (index - self._LINEAR) % self._SUB_HALF + self._SUB_HALF
+        return ((top + 1) << shift) - 1
+
+    def percentile(self, fraction: float) -> int:
+        """Get the highest value equivalent to the given percentile.
+
+        Parameters
+        ----------
+        fraction : float
+            The percentile as a fraction, 0.5 for the median.
+
+        Returns
+        -------
+        int
+            The percentile in microseconds, None if nothing has been recorded.
+        """
+        if self.count == 0:
+            return None
+        target = max(1, int(round(fraction * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bucket_top(index=index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Get the count, mean, min, max and usual percentiles of the histogram.
+
+        Returns
+        -------
+        dict
+            The summary with all durations in microseconds.
+        """
+        mean = None
+        if self.count > 0:
+            mean = self.total / float(self.count)
+        return dict({'count': self.count,
+                     'mean': mean,
+                     'min': self.min,
+                     'p50': self.percentile(0.50),
+                     'p90': self.percentile(0.90),
+                     'p99': self.percentile(0.99),
+                     'p999': self.percentile(0.999),
+                     'max': self.max})
+
+
+class RpcStats(object):
+    """Per request type statistics of the RPCs sent through a Connection or AsyncConnection:
+    the publish to response latency, the time to decode the response and the bytes sent and
+    received. Each request type also belongs to a phase (training, testing or control), so the
+    time spent waiting on the server can be broken down the same way the TA1 stamps are.
+    """
+
+    def __init__(self):
+        """Initialize an empty RpcStats object.
+        """
+        self._pending = dict()
+        self._types = dict()
+        self.started = time.time()
+        self.dump_interval = None
+        self.dump_filename = None
+        self._last_dump = time.time()
+        return
+
+    @staticmethod
+    def get_phase(request_type: str) -> str:
+        """Get the phase a request type belongs to.
+
+        Parameters
+        ----------
+        request_type : str
+            The class name of the request.
+
+        Returns
+        -------
+        str
+            'training', 'testing' or 'control'.
+        """
+        if 'Training' in request_type:
+            return 'training'
+        if 'Testing' in request_type:
+            return 'testing'
+        return 'control'
+
+    def start(self, corr_id: str, casas_object):
+        """Start timing an RPC, call this right before the request is published.
+
+        Parameters
+        ----------
+        corr_id : str
+            The correlation id of the request.
+        casas_object : objects.AiqObject
+            The request.
+        """
+        self._pending[corr_id] = [type(casas_object).__name__, time.perf_counter(), 0, 0, None]
+        return
+
+    def record_sent(self, corr_id: str, size: int):
+        """Record the size of the published request, ignored for ids that are not being timed.
+
+        Parameters
+        ----------
+        corr_id : str
+            The correlation id of the request.
+        size : int
+            The size of the message body in bytes.
+        """
+        pending = self._pending.get(corr_id)
+        if pending is not None:
+            pending[2] = size
+        return
+
+    def record_received(self, corr_id: str, size: int, decode_seconds: float):
+        """Record the size of a response and the time it took to decode, ignored for ids that
+        are not being timed.
+
+        Parameters
+        ----------
+        corr_id : str
+            The correlation id of the response.
+        size : int
+            The size of the message body in bytes.
+        decode_seconds : float
+            The time spent decoding the message body into objects.
+        """
+        pending = self._pending.get(corr_id)
+        if pending is not None:
+            pending[3] = size
+            pending[4] = decode_seconds
+        return
+
+    def finish(self, corr_id: str, answered: bool = True):
+        """Stop timing an RPC and add it to the statistics of its request type.
+
+        Parameters
+        ----------
+        corr_id : str
+            The correlation id of the request.
+        answered : bool, optional
+            False when the request timed out or was abandoned, it is then only counted.
+        """
+        pending = self._pending.pop(corr_id, None)
+        if pending is None:
+            return
+        request_type, start, sent, received, decode_seconds = pending
+        stats = self._types.get(request_type)
+        if stats is None:
+            stats = dict({'latency': LatencyHistogram(),
+                          'decode': LatencyHistogram(),
+                          'bytes_out': 0,
+                          'bytes_in': 0,
+                          'unanswered': 0})
+            self._types[request_type] = stats
+        stats['bytes_out'] += sent
+        if not answered:
+            stats['unanswered'] += 1
+            return
+        stats['latency'].record(seconds=time.perf_counter() - start)
+        stats['bytes_in'] += received
+        if decode_seconds is not None:
+            stats['decode'].record(seconds=decode_seconds)
+        return
+
+    def get_stats(self) -> dict:
+        """Get a snapshot of the statistics, suitable for json.dumps().
+
+        Returns
+        -------
+        dict
+            'elapsed' seconds since the statistics were started or reset, 'requests' with the
+            count, rate per second, latency and decode summaries (usec) and bytes for each
+            request type, and 'phases' with the count, rate and total latency of each phase.
+        """
+        elapsed = max(time.time() - self.started, 1e-9)
+        requests = dict()
+        phases = dict()
+        for request_type in sorted(self._types):
+            stats = self._types[request_type]
+            latency = stats['latency']
+            phase = self.get_phase(request_type=request_type)
+            requests[request_type] = dict({'phase': phase,
+                                           'count': latency.count,
+                                           'unanswered': stats['unanswered'],
+                                           'per_second': latency.count / elapsed,
+                                           'latency_usec': latency.summary(),
+                                           'decode_usec': stats['decode'].summary(),
+                                           'bytes_out': stats['bytes_out'],
+                                           'bytes_in': stats['bytes_in']})
+            if phase not in phases:
+                phases[phase] = dict({'count': 0, 'per_second': 0.0, 'latency_usec_total': 0})
+            phases[phase]['count'] += latency.count
+            phases[phase]['per_second'] += latency.count / elapsed
+            phases[phase]['latency_usec_total'] += latency.total
+        return dict({'started': self.started,
+                     'elapsed': elapsed,
+                     'requests': requests,
+                     'phases': phases})
+
+    def reset(self):
+        """Forget every finished RPC and restart the rate clock, RPCs in flight are kept.
+        """
+        self._types = dict()
+        self.started = time.time()
+        return
+
+    def set_dump(self, interval: float, filename: str = None):
+        """Dump the statistics every interval seconds, see maybe_dump().
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between dumps, None to stop dumping.
+        filename : str, optional
+            The JSON file to write, replaced on every dump. The statistics are logged at INFO
+            when None.
+        """
+        self.dump_interval = interval
+        self.dump_filename = filename
+        self._last_dump = time.time()
+        return
+
+    def dump(self, log: logging.Logger):
+        """Write the statistics to the dump file, or to the log when there is none.
+
+        Parameters
+        ----------
+        log : logging.Logger
+            The logger of the connection.
+        """
+        self._last_dump = time.time()
+        stats = self.get_stats()
+        if self.dump_filename is None:
+            log.info('RPC stats %s', json.dumps(stats, sort_keys=True))
+            return
+        # Write beside the file and rename so a reader never sees a partial dump.
+        temp_filename = '{}.tmp'.format(self.dump_filename)
+        try:
+            with open(temp_filename, 'w') as stats_file:
+                json.dump(stats, stats_file, sort_keys=True, indent=2)
+            os.replace(temp_filename, self.dump_filename)
+        except OSError as err:
+            log.warning('Unable to write the RPC stats to %s: %s', self.dump_filename, err)
+        return
+
+    def maybe_dump(self, log: logging.Logger):
+        """Dump the statistics if dumps are enabled and the interval has passed, called after
+        every RPC so no timer is needed.
+
+        Parameters
+        ----------
+        log : logging.Logger
+            The logger of the connection.
+        """
+        if self.dump_interval is not None \
+                and float(time.time()) - self._last_dump >= self.dump_interval:
+            self.dump(log=log)
+        return
+
+
 class ConsumeCallback(object):
     """This is a helper class for subscribing to RabbitMQ exchanges and queues then using
     callback functions with the processed results.
@@ -48,7 +442,7 @@ class ConsumeCallback(object):
                  is_exchange=False, exchange_name=None, is_queue=False,
                  queue_name=None, limit_to_sensor_types=None, auto_ack=False,
                  callback_full_params=False, translations=None,
-                 timezone=None, manual_ack=False):
+                 timezone=None, manual_ack=False, rpc_stats=None):
         """Initialize an instance of a ConsumeCallback object.
 
         Parameters
@@ -84,6 +478,8 @@ class ConsumeCallback(object):
             ack.  This variable is overridden to False if auto_ack is True or if
             callback_full_params is False (as you need those to send the ack).  The default value
             is False.
+        rpc_stats : RpcStats, optional
+            Record the size and decode time of each message as an RPC response in these stats.
         """
         self.log = logging.getLogger(__name__).getChild('ConsumeCallback')
         self.casas_events = casas_events
@@ -115,6 +511,7 @@ class ConsumeCallback(object):
         self.manual_ack = manual_ack
         if auto_ack is True:
             self.manual_ack = False
+        self.rpc_stats = rpc_stats
         return
 
     def on_message(self, channel, basic_deliver, properties, body):
@@ -136,12 +533,20 @@ class ConsumeCallback(object):
         body : str|unicode
             The message body.
         """
-        self.log.debug("on_message({})".format(str(body)))
+        self.log.debug('on_message(%s)', objects.LogSummary(body))
 
         if self.casas_events:
-            obj = objects.build_objects_from_json(body)
-            self.log.debug("obj = {}".format(str(obj)))
-            self.log.debug("size of obj = {}".format(str(len(obj))))
+            if self.rpc_stats is not None:
+                size = len(body)
+                decode_start = time.perf_counter()
+                body, obj = decode_message(properties=properties, body=body)
+                self.rpc_stats.record_received(corr_id=properties.correlation_id,
+                                               size=size,
+                                               decode_seconds=time.perf_counter() - decode_start)
+            else:
+                body, obj = decode_message(properties=properties, body=body)
+            self.log.debug('obj = %s', objects.LogSummary(obj))
+            self.log.debug('size of obj = %d', len(obj))
             if len(obj) > 0:
                 if self.callback_full_params:
                     self.callback_function(channel, basic_deliver, properties, body, obj[0])
@@ -237,7 +642,12 @@ class Connection:
         self._model_experiment_secret = None
         self._server_experiment_rpc_queue = None
         self._client_rpc_queue = None
+        self._server_step_rpc = False
+        self._rpc_reply_queue = None
+        self._rpc_publish_queues = dict()
+        self._broker_declarations = 0
         self._local_epoch_received = time.time()
+        self._rpc_stats = RpcStats()
 
         self.amqp_user = amqp_user
         self.amqp_pass = amqp_pass
@@ -575,8 +985,8 @@ class Connection:
         return response
 
     def get_novelty_description(self, domain: str, novelty: int, difficulty: str):
-        self.log.debug('get_novelty_description(domain={}, novelty={}, difficulty={})'.format(
-            domain, novelty, difficulty))
+        self.log.debug('get_novelty_description(domain=%s, novelty=%s, difficulty=%s)',
+                       domain, novelty, difficulty)
 
         req_nov_desc = objects.RequestNoveltyDescription(r_domain=domain,
                                                          novelty=novelty,
@@ -644,6 +1054,49 @@ class Connection:
                                             client_callback_queue=self._client_rpc_queue)
         return response
 
+    def send_training_step(self, label_prediction: dict, end_early: bool = False):
+        """Send a training prediction and receive the acknowledgement together with the next
+        training data in a single round trip.
+
+        Parameters
+        ----------
+        label_prediction : dict
+            The label prediction of the format {'action': label}.
+        end_early : bool, optional
+            Request that TA1 ends training early.
+
+        Returns
+        -------
+        (objects.AiqObject, objects.AiqObject)
+            The acknowledgement (or episode end) object and the next TrainingData, the second value
+            is None when the episode has ended. Any other response is returned as the first value.
+
+        Raises
+        ------
+        objects.CasasRabbitMQException
+            If an experiment has not been established or TA1 does not support step requests.
+        """
+        self.log.debug('send_training_step()')
+
+        if self._server_experiment_rpc_queue is None:
+            raise objects.CasasRabbitMQException('You have not established an experiment yet!')
+        if not self._server_step_rpc:
+            raise objects.CasasRabbitMQException('The TA1 for this experiment does not support '
+                                                 'step requests!')
+
+        training_step = objects.TrainingDataStep(
+            secret=self._model_experiment_secret,
+            label_prediction=label_prediction,
+            end_early=end_early)
+
+        response = self._set_system_request(casas_object=training_step,
+                                            queue_name=self._server_experiment_rpc_queue,
+                                            declare_server_queue=False,
+                                            client_callback_queue=self._client_rpc_queue)
+        if isinstance(response, objects.TrainingDataStepResponse):
+            return response.ack, response.data
+        return response, None
+
     def send_training_episode_novelty(self, novelty_characterization: dict,
                                       novelty_probability: float = 0.0,
                                       novelty_threshold: float = 0.0, novelty: int = 0):
@@ -711,6 +1164,49 @@ class Connection:
                                             client_callback_queue=self._client_rpc_queue)
         return response
 
+    def send_testing_step(self, label_prediction: dict, end_early: bool = False):
+        """Send a testing prediction and receive the acknowledgement together with the next
+        testing data in a single round trip.
+
+        Parameters
+        ----------
+        label_prediction : dict
+            The label prediction of the format {'action': label}.
+        end_early : bool, optional
+            Request that TA1 ends testing early.
+
+        Returns
+        -------
+        (objects.AiqObject, objects.AiqObject)
+            The acknowledgement (or episode end) object and the next TestingData, the second value
+            is None when the episode has ended. Any other response is returned as the first value.
+
+        Raises
+        ------
+        objects.CasasRabbitMQException
+            If an experiment has not been established or TA1 does not support step requests.
+        """
+        self.log.debug('send_testing_step()')
+
+        if self._server_experiment_rpc_queue is None:
+            raise objects.CasasRabbitMQException('You have not established an experiment yet!')
+        if not self._server_step_rpc:
+            raise objects.CasasRabbitMQException('The TA1 for this experiment does not support '
+                                                 'step requests!')
+
+        testing_step = objects.TestingDataStep(
+            secret=self._model_experiment_secret,
+            label_prediction=label_prediction,
+            end_early=end_early)
+
+        response = self._set_system_request(casas_object=testing_step,
+                                            queue_name=self._server_experiment_rpc_queue,
+                                            declare_server_queue=False,
+                                            client_callback_queue=self._client_rpc_queue)
+        if isinstance(response, objects.TestingDataStepResponse):
+            return response.ack, response.data
+        return response, None
+
     def send_testing_episode_novelty(self, novelty_characterization: dict,
                                      novelty_probability: float = 0.0,
                                      novelty_threshold: float = 0.0, novelty: int = 0):
@@ -750,8 +1246,21 @@ class Connection:
         self._model_experiment_id = None
         self._model_experiment_secret = None
         self._server_experiment_rpc_queue = None
+        self._server_step_rpc = False
         return
 
+    @property
+    def step_rpc_available(self):
+        """Returns True if the TA1 for the current experiment accepts step requests that combine
+        the prediction and the next data request into one round trip.
+
+        Returns
+        -------
+        bool
+            True if send_training_step() and send_testing_step() may be used.
+        """
+        return self._server_step_rpc
+
     def _set_system_request(self, casas_object, key=None, secret=None,
                             queue_name=objects.QUEUE_SYSTEM_REQUESTS, declare_server_queue=True,
                             client_callback_queue=None, disable_timeout=False):
@@ -786,46 +1295,42 @@ class Connection:
         start_time = float(time.time())
         max_time_delta = self._request_timeout
         response = None
+        corr_id = None
+        if client_callback_queue is None:
+            callback_queue = self._get_rpc_reply_queue()
+        else:
+            callback_queue = client_callback_queue
         while response is None:
             if not disable_timeout:
                 if abs(float(time.time()) - start_time) > max_time_delta:
+                    self._clear_system_request(corr_id=corr_id)
                     raise objects.AiqExperimentException('Server took too long to respond.')
+            # Forget about any earlier attempt so a late response to it is ignored.
+            self._clear_system_request(corr_id=corr_id)
             corr_id = str(uuid.uuid4())
-            if client_callback_queue is None:
-                callback_queue = 'rpc.system.request.{}'.format(str(uuid.uuid4().hex))
-            else:
-                callback_queue = client_callback_queue
             try:
                 self._on_request_callbacks[corr_id] = dict()
                 self._on_request_callbacks[corr_id]['casas_object'] = casas_object
                 self._on_request_callbacks[corr_id]['queue'] = callback_queue
                 self._on_request_callbacks[corr_id]['corr_id'] = corr_id
                 self._on_request_callbacks[corr_id]['publish_queue'] = queue_name
-                self._on_request_callbacks[corr_id]['keep_queue'] = True
-                if client_callback_queue is None:
-                    self._on_request_callbacks[corr_id]['keep_queue'] = False
-                    # Subscribe to the callback queue.
-                    self.setup_subscribe_to_queue(
-                        queue_name=callback_queue,
-                        queue_exclusive=True,
-                        queue_auto_delete=True,
-                        casas_events=True,
-                        callback_function=self.process_system_request_callback,
-                        callback_full_params=True)
 
                 self._request_response[corr_id] = None
 
-                # Declare the queue we are going to publish to.
-                if declare_server_queue:
+                # Declare the queue we are going to publish to, once for the life of the
+                # connection.
+                if declare_server_queue and queue_name not in self._rpc_publish_queues:
                     self.setup_publish_to_queue(queue_name=queue_name,
                                                 queue_durable=True,
                                                 queue_exclusive=False,
                                                 queue_auto_delete=False)
+                    self._rpc_publish_queues[queue_name] = True
 
                 if isinstance(casas_object, (objects.TrainingDataPrediction,
                                              objects.TestingDataPrediction)):
                     casas_object.utc_remote_epoch_received = self._local_epoch_received
                 # Publish the system request casas_object and then return.
+                self._rpc_stats.start(corr_id=corr_id, casas_object=casas_object)
                 self.publish_to_queue(queue_name=queue_name,
                                       casas_object=casas_object,
                                       correlation_id=corr_id,
@@ -835,28 +1340,132 @@ class Connection:
                                       reply_to=callback_queue)
 
                 if disable_timeout:
-                    while self._request_response[corr_id] is None:
-                        self.process_data_events(time_limit=0.02)
-                    response = copy.deepcopy(self._request_response[corr_id])
-                    del self._request_response[corr_id]
+                    response = self._wait_for_response(corr_id=corr_id)
                 else:
-                    while self._request_response[corr_id] is None and \
-                            abs(float(time.time()) - start_time) < max_time_delta:
-                        self.process_data_events(time_limit=0.05)
-                    if self._request_response[corr_id] is not None:
-                        response = copy.deepcopy(self._request_response[corr_id])
-                        del self._request_response[corr_id]
+                    response = self._wait_for_response(corr_id=corr_id,
+                                                       deadline=start_time + max_time_delta)
+                self._rpc_stats.finish(corr_id=corr_id, answered=response is not None)
             except pika.exceptions.AMQPError:
+                self._rpc_stats.finish(corr_id=corr_id, answered=False)
                 self.log.error('_set_system_request(): pika.exceptions.AMQPError '
                                'AMQP failed, trying again.')
                 self.stop()
                 time.sleep(1)
                 self.run(timeout=max_time_delta)
-                if client_callback_queue is None:
-                    self.remove_subscribe_to_queue(callback_queue)
         self._waiting_on_request = False
+        self._rpc_stats.maybe_dump(log=self.log)
         return response
 
+    def _wait_for_response(self, corr_id, deadline=None):
+        """Block in the IO loop until the response for corr_id has been stored by
+        process_system_request_callback() or process_request_events_callback(), or until the
+        deadline has passed.  The IO loop returns as soon as it has dispatched a consumer
+        callback, so the response wakes the waiter directly and nothing runs while the loop is
+        idle.
+
+        Parameters
+        ----------
+        corr_id : str
+            The correlation id of the request.
+        deadline : float, optional
+            The time.time() after which to give up, None waits until the response arrives.
+
+        Returns
+        -------
+        objects.AiqObject
+            The response, removed from self._request_response, or None if the deadline passed
+            first.
+        """
+        while self._request_response.get(corr_id) is None:
+            time_limit = None
+            if deadline is not None:
+                time_limit = deadline - float(time.time())
+                if time_limit <= 0.0:
+                    break
+            self.process_data_events(time_limit=time_limit)
+        return self._request_response.pop(corr_id, None)
+
+    def _get_rpc_reply_queue(self):
+        """Returns the reply queue shared by every RPC that does not provide its own callback
+        queue, declaring and subscribing to it the first time it is needed.
+
+        Returns
+        -------
+        str
+            The name of the reply queue.
+        """
+        if self._rpc_reply_queue is None:
+            self._rpc_reply_queue = 'rpc.system.request.{}'.format(str(uuid.uuid4().hex))
+            self.setup_subscribe_to_queue(
+                queue_name=self._rpc_reply_queue,
+                queue_exclusive=True,
+                queue_auto_delete=True,
+                casas_events=True,
+                callback_function=self.process_system_request_callback,
+                callback_full_params=True)
+        return self._rpc_reply_queue
+
+    def _clear_system_request(self, corr_id):
+        """Remove any state kept for the given correlation id.
+
+        Parameters
+        ----------
+        corr_id : str
+            The correlation id of the request, None is ignored.
+        """
+        if corr_id is not None:
+            self._on_request_callbacks.pop(corr_id, None)
+            self._request_response.pop(corr_id, None)
+        return
+
+    @property
+    def broker_declarations(self):
+        """The number of queue and exchange declarations sent to the broker since the last call
+        to reset_broker_declarations().
+
+        Returns
+        -------
+        int
+            The number of declarations.
+        """
+        return self._broker_declarations
+
+    def reset_broker_declarations(self):
+        """Reset the broker declaration counter, for example at the start of an episode.
+        """
+        self._broker_declarations = 0
+        return
+
+    def get_rpc_stats(self):
+        """Get the latency, decode time and size statistics of the RPCs sent so far, per
+        request type and per phase, see RpcStats.get_stats().
+
+        Returns
+        -------
+        dict
+            A snapshot of the statistics, suitable for json.dumps().
+        """
+        return self._rpc_stats.get_stats()
+
+    def reset_rpc_stats(self):
+        """Reset the RPC statistics, for example at the start of a trial.
+        """
+        self._rpc_stats.reset()
+        return
+
+    def set_rpc_stats_dump(self, interval, filename=None):
+        """Dump the RPC statistics every interval seconds, checked after each RPC.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between dumps, None to stop dumping.
+        filename : str, optional
+            The JSON file to write the statistics to, they are logged at INFO when None.
+        """
+        self._rpc_stats.set_dump(interval=interval, filename=filename)
+        return
+
     def process_system_request_callback(self, ch, method, props, body, response):
         """This is a callback function for processing the response to the getting or setting of a
         system request type object.
@@ -875,22 +1484,23 @@ class Connection:
             A list of processed casas.objects that have been built from the JSON provided in
             the message body.
         """
-        self.log.info('process_system_request_callback( {} )'.format(body))
+        self.log.debug('process_system_request_callback( %s )', objects.LogSummary(body))
+        # Responses are routed only by correlation id, the reply and publish queues stay
+        # declared for the whole session.
         corr_id = props.correlation_id
         if corr_id in self._on_request_callbacks:
-            # Remove our publish to the queue.
-            self.remove_publish_to_queue(self._on_request_callbacks[corr_id]['publish_queue'])
-            if not self._on_request_callbacks[corr_id]['keep_queue']:
-                # Remove our subscription to the callback queue.
-                self.remove_subscribe_to_queue(self._on_request_callbacks[corr_id]['queue'])
-
             if isinstance(response, (objects.TrainingData, objects.TestingData)):
                 self._local_epoch_received = response.utc_remote_epoch_received
+            elif isinstance(response, (objects.TrainingDataStepResponse,
+                                       objects.TestingDataStepResponse)):
+                if isinstance(response.data, (objects.TrainingData, objects.TestingData)):
+                    self._local_epoch_received = response.data.utc_remote_epoch_received
             elif isinstance(response, objects.ExperimentResponse):
                 self._request_timeout = response.experiment_timeout
                 self._model_experiment_id = response.model_experiment_id
                 self._model_experiment_secret = response.experiment_secret
                 self._server_experiment_rpc_queue = response.server_rpc_queue
+                self._server_step_rpc = response.step_rpc
             elif isinstance(response, objects.GeneratorResponse):
                 self._server_experiment_rpc_queue = response.generator_rpc_queue
             elif isinstance(response, objects.ExperimentEnd):
@@ -899,18 +1509,19 @@ class Connection:
                 self._model_experiment_id = None
                 self._model_experiment_secret = None
                 self._server_experiment_rpc_queue = None
+                self._server_step_rpc = False
 
             # We have finished processing this system request callback, now we remove the
             # entry from our dict().
             del self._on_request_callbacks[corr_id]
             self._request_response[corr_id] = response
-            self.log.info('_request_response[{}] = {}'.format(corr_id,
-                                                              self._request_response[corr_id]))
+            self.log.debug('_request_response[%s] = %s', corr_id, objects.LogSummary(response))
         return
 
     def request_dataset(self, site, start_stamp, end_stamp, experiment, dataset, key, secret,
                         sensor_types=None, callback=None, completed_callback=None,
-                        callback_full_params=False, manual_ack=False):
+                        callback_full_params=False, manual_ack=False,
+                        parallel_windows=objects.HISTORIC_PARALLEL_WINDOWS):
         """Request a dataset be sent to a provided function, event-by-event.
 
         Parameters
@@ -943,6 +1554,11 @@ class Connection:
             Boolean that determines if the calling program will manually be sending the message
             ack.  This variable is overridden to False if callback_full_params is False (as you
             need those to send the ack).  The default value is False.
+        parallel_windows : int, optional
+            The number of objects.HISTORIC_WINDOW_HOURS windows of the range requested at once,
+            the events are still passed to the callback in order.  Only one window is requested
+            at a time with manual_ack, since the events of later windows are held back until
+            the earlier ones have been acknowledged.
 
         Raises
         ------
@@ -964,12 +1580,14 @@ class Connection:
                            callback=callback,
                            completed_callback=completed_callback,
                            callback_full_params=callback_full_params,
-                           manual_ack=manual_ack)
+                           manual_ack=manual_ack,
+                           parallel_windows=parallel_windows)
         return
 
     def request_events_historic(self, site, start_stamp, end_stamp, key, secret, sensor_types=None,
                                 callback=None, completed_callback=None, callback_full_params=False,
-                                manual_ack=False):
+                                manual_ack=False,
+                                parallel_windows=objects.HISTORIC_PARALLEL_WINDOWS):
         """Request historic events in a given time range be sent to a provided function callback,
         event-by-event.
 
@@ -999,6 +1617,11 @@ class Connection:
             Boolean that determines if the calling program will manually be sending the message
             ack.  This variable is overridden to False if callback_full_params is False (as you
             need those to send the ack).  The default value is False.
+        parallel_windows : int, optional
+            The number of objects.HISTORIC_WINDOW_HOURS windows of the range requested at once,
+            the events are still passed to the callback in order.  Only one window is requested
+            at a time with manual_ack, since the events of later windows are held back until
+            the earlier ones have been acknowledged.
 
         Raises
         ------
@@ -1020,12 +1643,14 @@ class Connection:
                            callback=callback,
                            completed_callback=completed_callback,
                            callback_full_params=callback_full_params,
-                           manual_ack=manual_ack)
+                           manual_ack=manual_ack,
+                           parallel_windows=parallel_windows)
         return
 
     def _request_data(self, site, start_stamp, end_stamp, experiment, dataset, key, secret,
                       sensor_types=None, callback=None, completed_callback=None,
-                      callback_full_params=False, manual_ack=False):
+                      callback_full_params=False, manual_ack=False,
+                      parallel_windows=objects.HISTORIC_PARALLEL_WINDOWS):
         """Request data be sent to a provided function, event-by-event.  This function does not
         return until the full dataset has been received and processed by the callbacks.
 
@@ -1059,6 +1684,11 @@ class Connection:
             Boolean that determines if the calling program will manually be sending the message
             ack.  This variable is overridden to False if callback_full_params is False (as you
             need those to send the ack).  The default value is False.
+        parallel_windows : int, optional
+            The number of objects.HISTORIC_WINDOW_HOURS windows of the range requested at once,
+            the events are still passed to the callback in order.  Only one window is requested
+            at a time with manual_ack, since the events of later windows are held back until
+            the earlier ones have been acknowledged.
 
         Raises
         ------
@@ -1069,71 +1699,56 @@ class Connection:
             If the connection is currently in the consuming state and not able to be utilized for
             RPC type calls right now.
         """
-        self.log.info('_request_data( {}, {}, {}, {}, {}, {}, {}, {})'.format(site,
-                                                                              str(start_stamp),
-                                                                              str(end_stamp),
-                                                                              experiment,
-                                                                              dataset,
-                                                                              key,
-                                                                              secret,
-                                                                              str(sensor_types)))
+        self.log.info('_request_data( %s, %s, %s, %s, %s, %s, %s, %s)', site, start_stamp,
+                      end_stamp, experiment, dataset, key, secret, sensor_types)
         # Check to see if Connection is consuming, if so, then raise objects.CasasRabbitMQException.
         if self._is_consuming:
             raise objects.CasasRabbitMQException('The connection is currently in the consuming '
                                                  'state and can not be used for RPC methods '
                                                  'right now!')
-        corr_id = str(uuid.uuid4())
+        request_id = str(uuid.uuid4())
         callback_queue = 'rpc.request.events.{}'.format(str(uuid.uuid4().hex))
         queue_name = objects.QUEUE_SYSTEM_REQUESTS
 
-        td_max = datetime.timedelta(hours=24)
-        casas_object = None
-        if abs(end_stamp - start_stamp) > td_max:
-            if experiment is not None and dataset is not None:
-                casas_object = objects.RequestDataset(site=site,
-                                                      start_stamp=start_stamp,
-                                                      end_stamp=(start_stamp + td_max),
-                                                      experiment=experiment,
-                                                      dataset=dataset,
-                                                      sensor_types=sensor_types)
-            else:
-                casas_object = objects.RequestEvents(site=site,
-                                                     start_stamp=start_stamp,
-                                                     end_stamp=(start_stamp + td_max),
-                                                     sensor_types=sensor_types)
-        else:
-            if experiment is not None and dataset is not None:
-                casas_object = objects.RequestDataset(site=site,
-                                                      start_stamp=start_stamp,
-                                                      end_stamp=end_stamp,
-                                                      experiment=experiment,
-                                                      dataset=dataset,
-                                                      sensor_types=sensor_types)
-            else:
-                casas_object = objects.RequestEvents(site=site,
-                                                     start_stamp=start_stamp,
-                                                     end_stamp=end_stamp,
-                                                     sensor_types=sensor_types)
-
-        self._on_request_events[corr_id] = dict()
-        self._on_request_events[corr_id]['callback'] = callback
-        self._on_request_events[corr_id]['callback_full_params'] = callback_full_params
-        self._on_request_events[corr_id]['manual_ack'] = manual_ack
-        self._on_request_events[corr_id]['completed_callback'] = completed_callback
-        self._on_request_events[corr_id]['queue'] = callback_queue
-        self._on_request_events[corr_id]['publish_queue'] = queue_name
-        self._on_request_events[corr_id]['site'] = copy.deepcopy(site)
-        self._on_request_events[corr_id]['start_stamp'] = copy.deepcopy(start_stamp)
-        self._on_request_events[corr_id]['end_stamp'] = copy.deepcopy(end_stamp)
-        self._on_request_events[corr_id]['experiment'] = copy.deepcopy(experiment)
-        self._on_request_events[corr_id]['dataset'] = copy.deepcopy(dataset)
-        self._on_request_events[corr_id]['current_stamp'] = copy.deepcopy(start_stamp)
-        self._on_request_events[corr_id]['key'] = copy.deepcopy(key)
-        self._on_request_events[corr_id]['secret'] = copy.deepcopy(secret)
-        self._on_request_events[corr_id]['sensor_types'] = copy.deepcopy(sensor_types)
+        # Split the range into windows up front, each window is requested with its own
+        # correlation id so several can be outstanding at once.
+        td_max = datetime.timedelta(hours=objects.HISTORIC_WINDOW_HOURS)
+        windows = list()
+        current_stamp = start_stamp
+        while (current_stamp + td_max) < end_stamp:
+            windows.append((current_stamp, current_stamp + td_max))
+            current_stamp += td_max
+        windows.append((current_stamp, end_stamp))
+        if manual_ack or parallel_windows is None or parallel_windows < 1:
+            parallel_windows = 1
+
+        request = dict()
+        request['request_id'] = request_id
+        request['callback'] = callback
+        request['callback_full_params'] = callback_full_params
+        request['manual_ack'] = manual_ack
+        request['completed_callback'] = completed_callback
+        request['queue'] = callback_queue
+        request['publish_queue'] = queue_name
+        request['site'] = copy.deepcopy(site)
+        request['experiment'] = copy.deepcopy(experiment)
+        request['dataset'] = copy.deepcopy(dataset)
+        request['key'] = copy.deepcopy(key)
+        request['secret'] = copy.deepcopy(secret)
+        request['sensor_types'] = copy.deepcopy(sensor_types)
+        request['windows'] = windows
+        request['parallel_windows'] = parallel_windows
+        # The window_index of each correlation id, the next window to request, the window
+        # whose events go to the callback now, and the events and end of any later windows that
+        # arrived before it was done.
+        request['window_index'] = dict()
+        request['next_window'] = 0
+        request['deliver_window'] = 0
+        request['buffered'] = dict()
+        request['finished'] = dict()
 
         self._waiting_on_events = True
-        self._request_response[corr_id] = None
+        self._request_response[request_id] = None
 
         # Subscribe to the callback queue.
         self.setup_subscribe_to_queue(queue_name=callback_queue,
@@ -1148,16 +1763,61 @@ class Connection:
                                     queue_durable=True,
                                     queue_exclusive=False,
                                     queue_auto_delete=False)
-        # Publish the RequestEvents object and then return.
-        self.publish_to_queue(queue_name=queue_name,
+        # Publish the first windows and wait for the last one to be delivered.
+        while request['next_window'] < min(parallel_windows, len(windows)):
+            self._request_next_window(request=request)
+
+        self._wait_for_response(corr_id=request_id)
+        return
+
+    def _request_next_window(self, request):
+        """Publish the RequestEvents or RequestDataset for the next window of a historic request.
+
+        Parameters
+        ----------
+        request : dict
+            The state of the historic request, see _request_data().
+        """
+        index = request['next_window']
+        request['next_window'] += 1
+        window_start, window_end = request['windows'][index]
+        if request['experiment'] is not None and request['dataset'] is not None:
+            casas_object = objects.RequestDataset(site=request['site'],
+                                                  start_stamp=window_start,
+                                                  end_stamp=window_end,
+                                                  experiment=request['experiment'],
+                                                  dataset=request['dataset'],
+                                                  sensor_types=request['sensor_types'])
+        else:
+            casas_object = objects.RequestEvents(site=request['site'],
+                                                 start_stamp=window_start,
+                                                 end_stamp=window_end,
+                                                 sensor_types=request['sensor_types'])
+        corr_id = str(uuid.uuid4())
+        request['window_index'][corr_id] = index
+        self._on_request_events[corr_id] = request
+        self.publish_to_queue(queue_name=request['publish_queue'],
                               casas_object=casas_object,
                               correlation_id=corr_id,
-                              key=key,
-                              secret=secret,
-                              reply_to=callback_queue)
+                              key=request['key'],
+                              secret=request['secret'],
+                              reply_to=request['queue'])
+        return
 
-        while self._request_response[corr_id] is None:
-            self._connection.process_data_events(time_limit=0.05)
+    def _deliver_events(self, request, ch, method, props, body, response):
+        """Pass one message of events from a historic request to its callback, with the
+        parameters of process_request_events_callback().
+
+        Parameters
+        ----------
+        request : dict
+            The state of the historic request, see _request_data().
+        """
+        if request['callback'] is not None:
+            if request['callback_full_params']:
+                request['callback'](ch, method, props, body, response)
+            else:
+                request['callback'](response)
         return
 
     def process_request_events_callback(self, ch, method, props, body, response):
@@ -1178,108 +1838,64 @@ class Connection:
             A list of processed casas.objects that have been built from the JSON provided in
             the message body.
         """
-        self.log.debug("process_request_events_callback({})".format(str(response)))
+        self.log.debug('process_request_events_callback(%s)', objects.LogSummary(response))
         corr_id = props.correlation_id
         if corr_id in self._on_request_events:
-            # If the request dict included a callback function in the request, then send the list
-            # of objects to the callback function.
+            request = self._on_request_events[corr_id]
+            index = request['window_index'][corr_id]
+            # The server ends each window by sending back the request. ConsumeCallback passes a
+            # single object rather than the list this expected before.
+            response_objects = response
+            if not isinstance(response_objects, list):
+                response_objects = [response]
             is_request_events = False
-            for obj in response:
+            for obj in response_objects:
                 if obj.action in [objects.REQUEST_EVENTS, objects.REQUEST_DATASET]:
                     is_request_events = True
-                    if self._on_request_events[corr_id]['manual_ack']:
+                    if request['manual_ack']:
                         ch.basic_ack(delivery_tag=method.delivery_tag)
-            if self._on_request_events[corr_id]['callback'] is not None and not is_request_events:
-                if self._on_request_events[corr_id]['callback_full_params']:
-                    self._on_request_events[corr_id]['callback'](ch, method, props, body, response)
+            if not is_request_events:
+                if index == request['deliver_window']:
+                    self._deliver_events(request=request, ch=ch, method=method, props=props,
+                                         body=body, response=response)
                 else:
-                    self._on_request_events[corr_id]['callback'](response)
-
-            for obj in response:
-                if obj.action in [objects.REQUEST_EVENTS, objects.REQUEST_DATASET]:
-                    td_max = datetime.timedelta(hours=24)
-                    current_stamp = self._on_request_events[corr_id]['current_stamp']
-                    end_stamp = self._on_request_events[corr_id]['end_stamp']
-
-                    if (current_stamp + td_max) < end_stamp:
-                        # The current_stamp is still more than 1 day from the end_stamp so we will
-                        # need to increment it by 1 day and make another request.
-                        current_stamp += td_max
-                        site = self._on_request_events[corr_id]['site']
-                        experiment = self._on_request_events[corr_id]['experiment']
-                        dataset = self._on_request_events[corr_id]['dataset']
-                        sensor_types = self._on_request_events[corr_id]['sensor_types']
-                        key = self._on_request_events[corr_id]['key']
-                        secret = self._on_request_events[corr_id]['secret']
-                        queue_name = self._on_request_events[corr_id]['publish_queue']
-                        callback_queue = self._on_request_events[corr_id]['queue']
-
-                        casas_object = None
-                        if abs(end_stamp - current_stamp) > td_max:
-                            if experiment is not None and dataset is not None:
-                                casas_object = objects.RequestDataset(
-                                    site=site,
-                                    start_stamp=current_stamp,
-                                    end_stamp=(current_stamp + td_max),
-                                    experiment=experiment,
-                                    dataset=dataset,
-                                    sensor_types=sensor_types)
-                            else:
-                                casas_object = objects.RequestEvents(
-                                    site=site,
-                                    start_stamp=current_stamp,
-                                    end_stamp=(current_stamp + td_max),
-                                    sensor_types=sensor_types)
-                        else:
-                            if experiment is not None and dataset is not None:
-                                casas_object = objects.RequestDataset(
-                                    site=site,
-                                    start_stamp=current_stamp,
-                                    end_stamp=end_stamp,
-                                    experiment=experiment,
-                                    dataset=dataset,
-                                    sensor_types=sensor_types)
-                            else:
-                                casas_object = objects.RequestEvents(
-                                    site=site,
-                                    start_stamp=current_stamp,
-                                    end_stamp=end_stamp,
-                                    sensor_types=sensor_types)
-
-                        # Update the current stamp in our dict.
-                        self._on_request_events[corr_id]['current_stamp'] = \
-                            copy.deepcopy(current_stamp)
-                        # Declare the queue we are going to publish to.
-                        #self.setup_publish_to_queue(queue_name=queue_name,
-                        #                            queue_durable=True,
-                        #                            queue_exclusive=False,
-                        #                            queue_auto_delete=False)
-                        # Publish the next RequestEvents object.
-                        self.publish_to_queue(queue_name=queue_name,
-                                              casas_object=casas_object,
-                                              correlation_id=corr_id,
-                                              key=key,
-                                              secret=secret,
-                                              reply_to=callback_queue)
-                    else:
-                        # The current_stamp was less than 1 day from the end_stamp, this means that
-                        # we have received the final event from this meta RequestEvents. We will
-                        # now clean up out queues from this before returning.
-
-                        # If the request dict included a completed_callback function in the
-                        # request, then call the completed_callback function.
-                        if self._on_request_events[corr_id]['completed_callback'] is not None:
-                            self._on_request_events[corr_id]['completed_callback']()
-
-                        # Now, remove our subscription to the callback queue.
-                        self.remove_subscribe_to_queue(self._on_request_events[corr_id]['queue'])
-                        # Remove out publish to the queue.
-                        self.remove_publish_to_queue(
-                            self._on_request_events[corr_id]['publish_queue'])
-                        # Remove the full entry from our dict().
-                        del self._on_request_events[corr_id]
-                        self._waiting_on_events = False
-                        self._request_response[corr_id] = response
+                    # Hold on to events of a later window until the earlier ones are delivered.
+                    request['buffered'].setdefault(index, list()).append(
+                        (ch, method, props, body, response))
+                return
+
+            # This window is done, keep the window count outstanding.
+            del self._on_request_events[corr_id]
+            del request['window_index'][corr_id]
+            request['finished'][index] = response
+            if request['next_window'] < len(request['windows']):
+                self._request_next_window(request=request)
+
+            # Move on through every window that is done, delivering what was held back.
+            while request['deliver_window'] in request['finished']:
+                last_response = request['finished'].pop(request['deliver_window'])
+                request['deliver_window'] += 1
+                for held in request['buffered'].pop(request['deliver_window'], list()):
+                    held_ch, held_method, held_props, held_body, held_response = held
+                    self._deliver_events(request=request, ch=held_ch, method=held_method,
+                                         props=held_props, body=held_body,
+                                         response=held_response)
+
+            if request['deliver_window'] == len(request['windows']):
+                # We have received the final window of the request. We will now clean up our
+                # queues from this before returning.
+
+                # If the request dict included a completed_callback function in the request,
+                # then call the completed_callback function.
+                if request['completed_callback'] is not None:
+                    request['completed_callback']()
+
+                # Now, remove our subscription to the callback queue.
+                self.remove_subscribe_to_queue(request['queue'])
+                # Remove out publish to the queue.
+                self.remove_publish_to_queue(request['publish_queue'])
+                self._waiting_on_events = False
+                self._request_response[request['request_id']] = last_response
         return
 
     def setup_subscribe_to_exchange(self, exchange_name, exchange_type='topic', routing_key='#',
@@ -1329,13 +1945,8 @@ class Connection:
             callback_full_params is False (as you need those to send the ack).  The default value
             is False.
         """
-        self.log.info("{}({}, {}, {}, {}, {}, {})".format("setup_subscribe_to_exchange",
-                                                          str(exchange_name),
-                                                          str(exchange_type),
-                                                          str(routing_key),
-                                                          str(exchange_durable),
-                                                          str(casas_events),
-                                                          str(callback_function)))
+        self.log.info('%s(%s, %s, %s, %s, %s, %s)', "setup_subscribe_to_exchange", exchange_name,
+                      exchange_type, routing_key, exchange_durable, casas_events, callback_function)
         if callback_function is None:
             self.log.error("casas.rabbitmq.Connection.setup_subscribe_to_exchange(): "
                            "Error! callback_function needs to be provided for "
@@ -1393,8 +2004,7 @@ class Connection:
         routing_key : str, optional
             The routing key used in the subscription of the exchange.
         """
-        self.log.info('remove_subscribe_to_exchange({}, {})'.format(str(exchange_name),
-                                                                    str(routing_key)))
+        self.log.info('remove_subscribe_to_exchange(%s, %s)', exchange_name, routing_key)
         if self._channel:
             for ex in self._exchanges_subscribe:
                 if ex['exchange_name'] == exchange_name and ex['routing_key'] == routing_key:
@@ -1503,6 +2113,10 @@ class Connection:
         else:
             new_sub['limit_to_sensor_types'] = list()
         new_sub['auto_ack'] = auto_ack
+        # RPC responses also feed the size and decode time of each request to the RPC stats.
+        rpc_stats = None
+        if callback_function == self.process_system_request_callback:
+            rpc_stats = self._rpc_stats
         new_sub['consume'] = ConsumeCallback(casas_events=casas_events,
                                              callback_function=callback_function,
                                              is_queue=True,
@@ -1512,7 +2126,8 @@ class Connection:
                                              callback_full_params=callback_full_params,
                                              translations=self.translations,
                                              timezone=self.timezone,
-                                             manual_ack=manual_ack)
+                                             manual_ack=manual_ack,
+                                             rpc_stats=rpc_stats)
         new_sub['consumer_tag'] = ""
         new_sub['setup_queue'] = False
         self._queues_subscribe.append(new_sub)
@@ -1532,8 +2147,7 @@ class Connection:
         """
         if limit_to_sensor_types is None:
             limit_to_sensor_types = list()
-        self.log.info('remove_subscribe_to_queue({}, {})'.format(str(queue_name),
-                                                                 str(limit_to_sensor_types)))
+        self.log.info('remove_subscribe_to_queue(%s, %s)', queue_name, limit_to_sensor_types)
         if self._channel:
             for qu in self._queues_subscribe:
                 if qu['queue_name'] == queue_name and \
@@ -1585,13 +2199,15 @@ class Connection:
         queue_name : str
             The name of the queue we wish to stop publishing to.
         """
-        self.log.info('remove_publish_to_queue({})'.format(str(queue_name)))
+        self.log.info('remove_publish_to_queue(%s)', queue_name)
         for qu in self._queues_publish:
             if qu['queue_name'] == queue_name:
                 del qu
                 break
         self._queues_publish = [qu for qu in self._queues_publish
                                 if not qu['queue_name'] == queue_name]
+        # The next RPC to this queue has to declare it again.
+        self._rpc_publish_queues.pop(queue_name, None)
         return
 
     def _connect(self, prefetch_count=1):
@@ -1605,8 +2221,13 @@ class Connection:
             both prefetch windows (and those at the channel and connection level) allow it. The
             prefetch-count is ignored if the no-ack option is set in the consumer.
         """
-        self.log.info('Connecting to %s', self._url)
-        self._connection = pika.BlockingConnection(parameters=pika.URLParameters(self._url))
+        if str(self.amqp_host) == objects.AMQP_LOOPBACK_HOST:
+            self.log.info('Connecting to the loopback broker, vhost %s', self.amqp_vhost)
+            self._connection = LoopbackConnection(
+                broker=LoopbackBroker.get_broker(vhost=str(self.amqp_vhost)))
+        else:
+            self.log.info('Connecting to %s', self._url)
+            self._connection = pika.BlockingConnection(parameters=pika.URLParameters(self._url))
         self._channel = self._connection.channel()
         self._channel.basic_qos(prefetch_count=prefetch_count)
 
@@ -1684,28 +2305,28 @@ class Connection:
         if self._channel:
             self.log.info('Setting up defined exchanges')
             for ex in self._exchanges_subscribe:
-                self.log.info("checking: {}".format(str(ex['exchange_name'])))
-                self.log.debug('  setup_exchange = {}'.format(ex['setup_exchange']))
+                self.log.info('checking: %s', ex['exchange_name'])
+                self.log.debug('  setup_exchange = %s', ex['setup_exchange'])
                 if 'consume' in ex:
-                    self.log.debug('  setup_queue = {}'.format(ex['setup_queue']))
+                    self.log.debug('  setup_queue = %s', ex['setup_queue'])
             for ex in self._exchanges_publish:
-                self.log.info("checking: {}".format(str(ex['exchange_name'])))
-                self.log.debug('  setup_exchange = {}'.format(ex['setup_exchange']))
+                self.log.info('checking: %s', ex['exchange_name'])
+                self.log.debug('  setup_exchange = %s', ex['setup_exchange'])
             for ex in self._exchanges_subscribe:
-                self.log.info("setting up: {}".format(str(ex['exchange_name'])))
+                self.log.info('setting up: %s', ex['exchange_name'])
                 self._setup_exchange(ex)
             for ex in self._exchanges_publish:
-                self.log.info("setting up: {}".format(str(ex['exchange_name'])))
+                self.log.info('setting up: %s', ex['exchange_name'])
                 self._setup_exchange(ex)
             self._add_on_cancel_callback()
             for ex in self._exchanges_subscribe:
-                self.log.info("checking: {}".format(str(ex['exchange_name'])))
-                self.log.debug('  setup_exchange = {}'.format(ex['setup_exchange']))
+                self.log.info('checking: %s', ex['exchange_name'])
+                self.log.debug('  setup_exchange = %s', ex['setup_exchange'])
                 if 'consume' in ex:
-                    self.log.debug('  setup_queue = {}'.format(ex['setup_queue']))
+                    self.log.debug('  setup_queue = %s', ex['setup_queue'])
             for ex in self._exchanges_publish:
-                self.log.info("checking: {}".format(str(ex['exchange_name'])))
-                self.log.debug('  setup_exchange = {}'.format(ex['setup_exchange']))
+                self.log.info('checking: %s', ex['exchange_name'])
+                self.log.debug('  setup_exchange = %s', ex['setup_exchange'])
         return
 
     def _setup_exchange(self, ex):
@@ -1720,6 +2341,7 @@ class Connection:
         try:
             if not ex['setup_exchange']:
                 self.log.info('Declaring exchange %s', ex['exchange_name'])
+                self._broker_declarations += 1
                 self._channel.exchange_declare(exchange=ex['exchange_name'],
                                                exchange_type=ex['exchange_type'],
                                                durable=ex['exchange_durable'],
@@ -1727,6 +2349,7 @@ class Connection:
                 ex['setup_exchange'] = True
                 if 'consume' in ex:
                     self.log.info('Declaring queue %s', ex['queue_name'])
+                    self._broker_declarations += 1
                     self._channel.queue_declare(queue=ex['queue_name'],
                                                 durable=ex['queue_durable'],
                                                 exclusive=ex['queue_exclusive'],
@@ -1756,24 +2379,24 @@ class Connection:
         if self._channel:
             self.log.info('Setting up defined queues')
             for qu in self._queues_subscribe:
-                self.log.info("checking: {}".format(str(qu['queue_name'])))
-                self.log.debug('  setup_queue = {}'.format(qu['setup_queue']))
+                self.log.info('checking: %s', qu['queue_name'])
+                self.log.debug('  setup_queue = %s', qu['setup_queue'])
             for qu in self._queues_publish:
-                self.log.info("checking: {}".format(str(qu['queue_name'])))
-                self.log.debug('  setup_queue = {}'.format(qu['setup_queue']))
+                self.log.info('checking: %s', qu['queue_name'])
+                self.log.debug('  setup_queue = %s', qu['setup_queue'])
             for qu in self._queues_subscribe:
-                self.log.info("setting up: {}".format(str(qu['queue_name'])))
+                self.log.info('setting up: %s', qu['queue_name'])
                 self._setup_queue(qu)
             for qu in self._queues_publish:
-                self.log.info("setting up: {}".format(str(qu['queue_name'])))
+                self.log.info('setting up: %s', qu['queue_name'])
                 self._setup_queue(qu)
             self._add_on_cancel_callback()
             for qu in self._queues_subscribe:
-                self.log.info("checking: {}".format(str(qu['queue_name'])))
-                self.log.debug('  setup_queue = {}'.format(qu['setup_queue']))
+                self.log.info('checking: %s', qu['queue_name'])
+                self.log.debug('  setup_queue = %s', qu['setup_queue'])
             for qu in self._queues_publish:
-                self.log.info("checking: {}".format(str(qu['queue_name'])))
-                self.log.debug('  setup_queue = {}'.format(qu['setup_queue']))
+                self.log.info('checking: %s', qu['queue_name'])
+                self.log.debug('  setup_queue = %s', qu['setup_queue'])
         return
 
     def _setup_queue(self, qu):
@@ -1787,6 +2410,7 @@ class Connection:
         try:
             if not qu['setup_queue'] and self._connection.is_open:
                 self.log.info('Declaring queue %s', qu['queue_name'])
+                self._broker_declarations += 1
                 self._channel.queue_declare(queue=qu['queue_name'],
                                             durable=qu['queue_durable'],
                                             exclusive=qu['queue_exclusive'],
@@ -1855,14 +2479,10 @@ class Connection:
             if casas_object is not None:
                 body_str = casas_object.get_json(secret=secret, key=key)
                 body_str = "[{}]".format(body_str)
-            debug_msg = "publish_to_exchange(exchange={}, ".format(str(exchange_name))
-            debug_msg += "casas_obj={}, body={}, routing_key={}, ".format(str(casas_object),
-                                                                          str(body_str),
-                                                                          str(routing_key))
-            debug_msg += "corr_id={}, key={}, secret={})".format(str(correlation_id),
-                                                                 str(key),
-                                                                 str(secret))
-            self.log.debug(debug_msg)
+            self.log.debug('publish_to_exchange(exchange=%s, casas_obj=%s, body=%s, '
+                           'routing_key=%s, corr_id=%s, key=%s, secret=%s)',
+                           exchange_name, objects.LogSummary(casas_object),
+                           objects.LogSummary(body_str), routing_key, correlation_id, key, secret)
             self._channel.basic_publish(exchange=exchange_name,
                                         routing_key=routing_key,
                                         properties=pika.BasicProperties(
@@ -1874,7 +2494,8 @@ class Connection:
 
     def publish_to_queue(self, queue_name, casas_object=None, body_str=None,
                          correlation_id=None, delivery_mode=2, key=None,
-                         secret=None, reply_to=None):
+                         secret=None, reply_to=None, binary_segments=False,
+                         content_type=None):
         """Publish a message to the queue.
 
         Parameters
@@ -1899,50 +2520,102 @@ class Connection:
         reply_to : str, optional
             This is the name of the exclusive queue that the RPC style call on the other end
             should publish the response to.
+        binary_segments : bool, optional
+            Send any bytes values of casas_object (images) after the JSON body instead of base64
+            encoding them, only set this when the receiver accepts it (see
+            accepts_binary_segments()).
+        content_type : str, optional
+            The codec used to encode an objects.AiqObject, objects.CONTENT_TYPE_JSON when None.
+            Only use a codec the receiver accepts (see response_content_type()).
         """
         if correlation_id is None:
             correlation_id = str(uuid.uuid4())
 
         if self._channel:
-            if casas_object is not None:
-                body_str = casas_object.get_json(secret=secret, key=key)
-                body_str = "[{}]".format(body_str)
-            debug_msg = "publish_to_queue(queue={}, ".format(str(queue_name))
-            debug_msg += "casas_obj={}, body={}, corr_id={}, ".format(str(casas_object),
-                                                                      str(body_str),
-                                                                      str(correlation_id))
-            debug_msg += "del_mode={}, key={}, secret={})".format(str(delivery_mode),
-                                                                  str(key),
-                                                                  str(secret))
-            self.log.debug(debug_msg)
+            body, headers, content_type = encode_message(casas_object=casas_object,
+                                                         body_str=body_str,
+                                                         key=key,
+                                                         secret=secret,
+                                                         reply_to=reply_to,
+                                                         binary_segments=binary_segments,
+                                                         content_type=content_type)
+            self.log.debug('publish_to_queue(queue=%s, casas_obj=%s, body=%s, corr_id=%s, '
+                           'del_mode=%s, key=%s, secret=%s)',
+                           queue_name, objects.LogSummary(casas_object), objects.LogSummary(body),
+                           correlation_id, delivery_mode, key, secret)
+            self._rpc_stats.record_sent(corr_id=correlation_id, size=len(body))
             self._channel.basic_publish(exchange='',
                                         routing_key=queue_name,
                                         properties=pika.BasicProperties(
                                             correlation_id=correlation_id,
                                             delivery_mode=delivery_mode,
-                                            reply_to=reply_to),
-                                        body=str(body_str))
+                                            reply_to=reply_to,
+                                            content_type=content_type,
+                                            headers=headers),
+                                        body=body)
         return
 
-    def _add_on_cancel_callback(self):
-        """Add a callback that will be invoked if RabbitMQ cancels the consumer
-        for some reason. If RabbitMQ does cancel the consumer,
-        on_consumer_cancelled will be invoked by pika.
-        """
-        if not self._has_on_cancel_callback:
-            self.log.info('Adding consumer cancellation callback')
-            self._channel.add_on_cancel_callback(self._on_consumer_cancelled)
-            self._has_on_cancel_callback = True
-        return
-
-    def _on_consumer_cancelled(self, method_frame=None):
-        """Invoked by pika when RabbitMQ sends a Basic.Cancel for a consumer
-        receiving messages.
+    @staticmethod
+    def accepts_binary_segments(properties):
+        """Check if the sender of an RPC request can take binary segments in the response.
 
         Parameters
         ----------
-        method_frame : pika.frame.Method
-            The Basic.Cancel frame.
+        properties : pika.Spec.BasicProperties
+            Properties of the request message.
+
+        Returns
+        -------
+        bool
+            True if the response can be published with binary_segments=True.
+        """
+        return properties is not None and properties.headers is not None \
+            and bool(properties.headers.get(objects.HEADER_BINARY_ACCEPT, False))
+
+    @staticmethod
+    def response_content_type(properties):
+        """Pick the content type for the response to an RPC request, the first of our
+        objects.get_content_types() that the sender can decode.
+
+        Parameters
+        ----------
+        properties : pika.Spec.BasicProperties
+            Properties of the request message.
+
+        Returns
+        -------
+        str
+            The content type to pass to publish_to_queue(), objects.CONTENT_TYPE_JSON when the
+            sender did not list any.
+        """
+        if properties is None or properties.headers is None \
+                or objects.HEADER_ACCEPT_CONTENT_TYPES not in properties.headers:
+            return objects.CONTENT_TYPE_JSON
+        accepted = str(properties.headers[objects.HEADER_ACCEPT_CONTENT_TYPES]).split(',')
+        for content_type in objects.get_content_types():
+            if content_type in accepted:
+                return content_type
+        return objects.CONTENT_TYPE_JSON
+
+    def _add_on_cancel_callback(self):
+        """Add a callback that will be invoked if RabbitMQ cancels the consumer
+        for some reason. If RabbitMQ does cancel the consumer,
+        on_consumer_cancelled will be invoked by pika.
+        """
+        if not self._has_on_cancel_callback:
+            self.log.info('Adding consumer cancellation callback')
+            self._channel.add_on_cancel_callback(self._on_consumer_cancelled)
+            self._has_on_cancel_callback = True
+        return
+
+    def _on_consumer_cancelled(self, method_frame=None):
+        """Invoked by pika when RabbitMQ sends a Basic.Cancel for a consumer
+        receiving messages.
+
+        Parameters
+        ----------
+        method_frame : pika.frame.Method
+            The Basic.Cancel frame.
         """
         self.log.info('Consumer was cancelled remotely, shutting down: %s', str(method_frame))
         if self._channel:
@@ -2093,7 +2766,7 @@ class Connection:
         """Run the Connection object by connecting to RabbitMQ and then
         starting the IOLoop to block and allow the SelectConnection to operate.
         """
-        self.log.debug('run(prefetch_count={})'.format(prefetch_count))
+        self.log.debug('run(prefetch_count=%s)', prefetch_count)
         startup_success = False
         start_time = float(time.time())
         while not startup_success:
@@ -2234,3 +2907,1052 @@ class Connection:
             The current connection state.
         """
         return self._connection.is_closing
+
+
+class AsyncConnection:
+    """An asyncio version of the TA2 side of Connection, built on pika's AsyncioConnection.
+
+    Every RPC is a coroutine that completes when its response arrives, so several experiments
+    (one AsyncConnection each) and the TA2's own work can share one event loop without a thread
+    per connection. Only the experiment RPCs used by TA2Logic are provided.
+    """
+
+    def __init__(self, agent_name, amqp_user, amqp_pass, amqp_host, amqp_port,
+                 amqp_vhost='/', amqp_ssl=True, request_timeout=None):
+        """
+        Create a new instance of the AsyncConnection class, see Connection for the parameters.
+        """
+        self.name = re.sub('\s', '', str(agent_name))
+        self.log = logging.getLogger(__name__).getChild('AsyncConnection')
+
+        self._loop = None
+        self._connection = None
+        self._channel = None
+        self._closing = False
+        self._closed = None
+        self._pending = dict()
+        self._declared_queues = dict()
+        self._broker_declarations = 0
+        self._client_rpc_queue = None
+        self._model_experiment_id = None
+        self._model_experiment_secret = None
+        self._server_experiment_rpc_queue = None
+        self._server_step_rpc = False
+        self._local_epoch_received = time.time()
+        self._rpc_stats = RpcStats()
+
+        amqp_url_start = "amqp://"
+        if amqp_ssl:
+            amqp_url_start = "amqps://"
+        self._loopback = str(amqp_host) == objects.AMQP_LOOPBACK_HOST
+        self._request_timeout = objects.GLOBAL_TIMEOUT_SECONDS
+        if request_timeout is not None:
+            self._request_timeout = request_timeout
+
+        self._url = "{}{}:{}@{}:{}{}".format(str(amqp_url_start),
+                                             str(amqp_user),
+                                             str(amqp_pass),
+                                             str(amqp_host),
+                                             str(amqp_port),
+                                             str(amqp_vhost))
+        return
+
+    def _callback_future(self):
+        """Returns a future and a pika callback function that resolves it with its first
+        argument.
+        """
+        future = self._loop.create_future()
+
+        def callback(*args):
+            if not future.done():
+                future.set_result(args[0] if len(args) > 0 else None)
+            return
+
+        return future, callback
+
+    async def run(self, prefetch_count=1):
+        """Connect to RabbitMQ, open the channel and start consuming from the reply queue.
+
+        Parameters
+        ----------
+        prefetch_count : int
+            Specifies a prefetch window in terms of whole messages.
+        """
+        if self._loopback:
+            raise objects.CasasRabbitMQException('The loopback broker is only available to '
+                                                 'Connection, disable async_amqp to use it.')
+        self.log.info('Connecting to %s', self._url)
+        self._loop = asyncio.get_event_loop()
+        self._closing = False
+        opened = self._loop.create_future()
+        self._closed = self._loop.create_future()
+
+        def on_open(connection):
+            if not opened.done():
+                opened.set_result(connection)
+            return
+
+        def on_open_error(connection, err):
+            if not opened.done():
+                opened.set_exception(pika.exceptions.AMQPConnectionError(err))
+            return
+
+        def on_close(connection, reason):
+            self.log.info('Connection closed: %s', reason)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(objects.CasasRabbitMQException(
+                        'The connection closed before the response arrived.'))
+            if not self._closed.done():
+                self._closed.set_result(reason)
+            return
+
+        self._connection = AsyncioConnection(parameters=pika.URLParameters(self._url),
+                                             on_open_callback=on_open,
+                                             on_open_error_callback=on_open_error,
+                                             on_close_callback=on_close,
+                                             custom_ioloop=self._loop)
+        await opened
+
+        future, callback = self._callback_future()
+        self._connection.channel(on_open_callback=callback)
+        self._channel = await future
+        future, callback = self._callback_future()
+        self._channel.basic_qos(prefetch_count=prefetch_count, callback=callback)
+        await future
+
+        # One reply queue carries the responses of every RPC on this connection.
+        self._client_rpc_queue = objects.CLIENT_RPC_QUEUE + '.{}'.format(str(uuid.uuid4().hex))
+        future, callback = self._callback_future()
+        self._broker_declarations += 1
+        self._channel.queue_declare(queue=self._client_rpc_queue,
+                                    exclusive=True,
+                                    auto_delete=True,
+                                    callback=callback)
+        await future
+        future, callback = self._callback_future()
+        self._channel.basic_consume(queue=self._client_rpc_queue,
+                                    on_message_callback=self._on_response,
+                                    auto_ack=True,
+                                    callback=callback)
+        await future
+        return
+
+    async def stop(self):
+        """Close the channel and connection to RabbitMQ.
+        """
+        self.log.debug('stop()')
+        if not self._closing and self._connection is not None:
+            self._closing = True
+            if self._connection.is_open:
+                self._connection.close()
+            await self._closed
+            self._channel = None
+            self._declared_queues = dict()
+            self.log.info('Stopped')
+        return
+
+    async def sleep(self, duration):
+        await asyncio.sleep(duration)
+        return
+
+    def _on_response(self, channel, basic_deliver, properties, body):
+        """Invoked by pika when a response is delivered to the reply queue, completes the future
+        of the matching request.
+        """
+        self.log.debug('_on_response(%s)', objects.LogSummary(body))
+        future = self._pending.pop(properties.correlation_id, None)
+        if future is None or future.done():
+            # A late response to a request that timed out.
+            return
+        size = len(body)
+        decode_start = time.perf_counter()
+        try:
+            body, obj = decode_message(properties=properties, body=body)
+        except Exception as err:
+            future.set_exception(err)
+            return
+        self._rpc_stats.record_received(corr_id=properties.correlation_id,
+                                        size=size,
+                                        decode_seconds=time.perf_counter() - decode_start)
+        if len(obj) == 0:
+            future.set_exception(objects.CasasRabbitMQException('Could not decode the response.'))
+            return
+        response = obj[0]
+        if isinstance(response, (objects.TrainingData, objects.TestingData)):
+            self._local_epoch_received = response.utc_remote_epoch_received
+        elif isinstance(response, (objects.TrainingDataStepResponse,
+                                   objects.TestingDataStepResponse)):
+            if isinstance(response.data, (objects.TrainingData, objects.TestingData)):
+                self._local_epoch_received = response.data.utc_remote_epoch_received
+        elif isinstance(response, objects.ExperimentResponse):
+            self._request_timeout = response.experiment_timeout
+            self._model_experiment_id = response.model_experiment_id
+            self._model_experiment_secret = response.experiment_secret
+            self._server_experiment_rpc_queue = response.server_rpc_queue
+            self._server_step_rpc = response.step_rpc
+        elif isinstance(response, objects.ExperimentEnd):
+            self._clear_experiment()
+        future.set_result(response)
+        return
+
+    def _clear_experiment(self):
+        self._model_experiment_id = None
+        self._model_experiment_secret = None
+        self._server_experiment_rpc_queue = None
+        self._server_step_rpc = False
+        return
+
+    async def _set_system_request(self, casas_object, queue_name, declare_server_queue=True,
+                                  disable_timeout=False):
+        """Publish an RPC request and wait for its response, see
+        Connection._set_system_request().
+
+        Raises
+        ------
+        objects.AiqExperimentException
+            If the response does not arrive within the request timeout.
+        """
+        if self._channel is None:
+            raise objects.CasasRabbitMQException('The connection is not running, await run() '
+                                                 'first!')
+        # Declare the queue we are going to publish to, once for the life of the connection.
+        if declare_server_queue and queue_name not in self._declared_queues:
+            future, callback = self._callback_future()
+            self._broker_declarations += 1
+            self._channel.queue_declare(queue=queue_name,
+                                        durable=True,
+                                        exclusive=False,
+                                        auto_delete=False,
+                                        callback=callback)
+            await future
+            self._declared_queues[queue_name] = True
+
+        if isinstance(casas_object, (objects.TrainingDataPrediction,
+                                     objects.TestingDataPrediction)):
+            casas_object.utc_remote_epoch_received = self._local_epoch_received
+        corr_id = str(uuid.uuid4())
+        future = self._loop.create_future()
+        self._pending[corr_id] = future
+        body, headers, content_type = encode_message(casas_object=casas_object,
+                                                     reply_to=self._client_rpc_queue)
+        self.log.debug('publish(queue=%s, casas_obj=%s, corr_id=%s)',
+                       queue_name, objects.LogSummary(casas_object), corr_id)
+        self._rpc_stats.start(corr_id=corr_id, casas_object=casas_object)
+        self._rpc_stats.record_sent(corr_id=corr_id, size=len(body))
+        self._channel.basic_publish(exchange='',
+                                    routing_key=queue_name,
+                                    properties=pika.BasicProperties(
+                                        correlation_id=corr_id,
+                                        delivery_mode=1,
+                                        reply_to=self._client_rpc_queue,
+                                        content_type=content_type,
+                                        headers=headers),
+                                    body=body)
+        response = None
+        try:
+            if disable_timeout:
+                response = await future
+            else:
+                response = await asyncio.wait_for(future, timeout=self._request_timeout)
+        except asyncio.TimeoutError:
+            raise objects.AiqExperimentException('Server took too long to respond.')
+        finally:
+            self._pending.pop(corr_id, None)
+            self._rpc_stats.finish(corr_id=corr_id, answered=response is not None)
+        self._rpc_stats.maybe_dump(log=self.log)
+        return response
+
+    def get_rpc_stats(self):
+        """Get the RPC statistics, see Connection.get_rpc_stats().
+        """
+        return self._rpc_stats.get_stats()
+
+    def reset_rpc_stats(self):
+        """Reset the RPC statistics, see Connection.reset_rpc_stats().
+        """
+        self._rpc_stats.reset()
+        return
+
+    def set_rpc_stats_dump(self, interval, filename=None):
+        """Dump the RPC statistics every interval seconds, see Connection.set_rpc_stats_dump().
+        """
+        self._rpc_stats.set_dump(interval=interval, filename=filename)
+        return
+
+    @property
+    def broker_declarations(self):
+        """The number of queue declarations sent to the broker since the last call to
+        reset_broker_declarations(), see Connection.broker_declarations.
+        """
+        return self._broker_declarations
+
+    def reset_broker_declarations(self):
+        """Reset the broker declaration counter, see Connection.reset_broker_declarations().
+        """
+        self._broker_declarations = 0
+        return
+
+    def _check_experiment(self):
+        if self._server_experiment_rpc_queue is None:
+            raise objects.CasasRabbitMQException('You have not established an experiment yet!')
+        return
+
+    @property
+    def step_rpc_available(self):
+        """Returns True if the TA1 for the current experiment accepts step requests, see
+        Connection.step_rpc_available.
+        """
+        return self._server_step_rpc
+
+    async def get_state(self):
+        self.log.debug('get_state()')
+        self._check_experiment()
+        response = await self._set_system_request(casas_object=objects.RequestState(),
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def start_sail_on_experiment(self, model: objects.Model, domain: str, no_testing: bool,
+                                       seed: int = None, description: str = None,
+                                       generator_config: dict = None):
+        self.log.debug('start_sail_on_experiment()')
+
+        if domain not in objects.VALID_DOMAINS:
+            raise objects.AiqDataException('{} is not a VALID domain choice.'.format(domain))
+
+        experiment_request = objects.RequestExperiment(
+            model=model,
+            novelty=0,
+            novelty_visibility=0,
+            client_rpc_queue=self._client_rpc_queue,
+            git_version=objects.__version__,
+            experiment_type=objects.TYPE_EXPERIMENT_SAIL_ON,
+            seed=seed,
+            domain_dict=dict({domain: True}),
+            no_testing=no_testing,
+            description=description,
+            generator_config=generator_config)
+
+        response = await self._set_system_request(casas_object=experiment_request,
+                                                  queue_name=objects.SERVER_EXPERIMENT_QUEUE,
+                                                  disable_timeout=True)
+        return response
+
+    async def start_work_on_experiment_trials(self, model: objects.Model, experiment_secret: str,
+                                              just_one_trial: bool, domain: str,
+                                              generator_config: dict = None):
+        self.log.debug('start_work_on_experiment_trials()')
+
+        experiment_request = objects.RequestExperimentTrials(
+            model=model,
+            experiment_secret=experiment_secret,
+            client_rpc_queue=self._client_rpc_queue,
+            experiment_type=objects.TYPE_EXPERIMENT_SAIL_ON,
+            just_one_trial=just_one_trial,
+            domain_dict=dict({domain: True}),
+            generator_config=generator_config)
+
+        response = await self._set_system_request(casas_object=experiment_request,
+                                                  queue_name=objects.SERVER_EXPERIMENT_QUEUE,
+                                                  disable_timeout=True)
+        return response
+
+    async def send_benchmark_data(self, benchmark_data: dict):
+        self.log.debug('send_benchmark_data()')
+        self._check_experiment()
+        response = await self._set_system_request(
+            casas_object=objects.BenchmarkData(benchmark_data=benchmark_data),
+            queue_name=self._server_experiment_rpc_queue,
+            declare_server_queue=False)
+        return response
+
+    async def get_training_data(self):
+        self.log.debug('get_training_data()')
+        self._check_experiment()
+        training_data_request = objects.RequestTrainingData(
+            model_experiment_id=self._model_experiment_id,
+            secret=self._model_experiment_secret)
+        response = await self._set_system_request(casas_object=training_data_request,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def send_training_predictions(self, label_prediction: dict, end_early: bool = False):
+        self.log.debug('send_training_predictions()')
+        self._check_experiment()
+        training_prediction = objects.TrainingDataPrediction(
+            secret=self._model_experiment_secret,
+            label_prediction=label_prediction,
+            end_early=end_early)
+        response = await self._set_system_request(casas_object=training_prediction,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def send_training_step(self, label_prediction: dict, end_early: bool = False):
+        """Send a training prediction and receive the acknowledgement together with the next
+        training data, see Connection.send_training_step().
+        """
+        self.log.debug('send_training_step()')
+        self._check_experiment()
+        if not self._server_step_rpc:
+            raise objects.CasasRabbitMQException('The TA1 for this experiment does not support '
+                                                 'step requests!')
+        training_step = objects.TrainingDataStep(
+            secret=self._model_experiment_secret,
+            label_prediction=label_prediction,
+            end_early=end_early)
+        response = await self._set_system_request(casas_object=training_step,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        if isinstance(response, objects.TrainingDataStepResponse):
+            return response.ack, response.data
+        return response, None
+
+    async def send_training_episode_novelty(self, novelty_characterization: dict,
+                                            novelty_probability: float = 0.0,
+                                            novelty_threshold: float = 0.0, novelty: int = 0):
+        self.log.debug('send_training_episode_novelty()')
+        self._check_experiment()
+        training_episode_novelty = objects.TrainingEpisodeNovelty(
+            novelty_probability=novelty_probability,
+            novelty_threshold=novelty_threshold,
+            novelty=novelty,
+            novelty_characterization=novelty_characterization)
+        response = await self._set_system_request(casas_object=training_episode_novelty,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def end_training_early(self):
+        self.log.debug('end_training_early()')
+        self._check_experiment()
+        response = await self._set_system_request(casas_object=objects.TrainingEndEarly(),
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def get_testing_data(self):
+        self.log.debug('get_testing_data()')
+        self._check_experiment()
+        testing_data_request = objects.RequestTestingData(
+            model_experiment_id=self._model_experiment_id,
+            secret=self._model_experiment_secret)
+        response = await self._set_system_request(casas_object=testing_data_request,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def send_testing_predictions(self, label_prediction: dict, end_early: bool = False):
+        self.log.debug('send_testing_predictions()')
+        self._check_experiment()
+        testing_prediction = objects.TestingDataPrediction(
+            secret=self._model_experiment_secret,
+            label_prediction=label_prediction,
+            end_early=end_early)
+        response = await self._set_system_request(casas_object=testing_prediction,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def send_testing_step(self, label_prediction: dict, end_early: bool = False):
+        """Send a testing prediction and receive the acknowledgement together with the next
+        testing data, see Connection.send_testing_step().
+        """
+        self.log.debug('send_testing_step()')
+        self._check_experiment()
+        if not self._server_step_rpc:
+            raise objects.CasasRabbitMQException('The TA1 for this experiment does not support '
+                                                 'step requests!')
+        testing_step = objects.TestingDataStep(
+            secret=self._model_experiment_secret,
+            label_prediction=label_prediction,
+            end_early=end_early)
+        response = await self._set_system_request(casas_object=testing_step,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        if isinstance(response, objects.TestingDataStepResponse):
+            return response.ack, response.data
+        return response, None
+
+    async def send_testing_episode_novelty(self, novelty_characterization: dict,
+                                           novelty_probability: float = 0.0,
+                                           novelty_threshold: float = 0.0, novelty: int = 0):
+        self.log.debug('send_testing_episode_novelty()')
+        self._check_experiment()
+        testing_episode_novelty = objects.TestingEpisodeNovelty(
+            novelty_probability=novelty_probability,
+            novelty_threshold=novelty_threshold,
+            novelty=novelty,
+            novelty_characterization=novelty_characterization)
+        response = await self._set_system_request(casas_object=testing_episode_novelty,
+                                                  queue_name=self._server_experiment_rpc_queue,
+                                                  declare_server_queue=False)
+        return response
+
+    async def end_experiment(self):
+        self.log.debug('end_experiment()')
+        self._check_experiment()
+        end_experiment_request = objects.EndExperiment(
+            model_experiment_id=self._model_experiment_id,
+            secret=self._model_experiment_secret)
+        await self._set_system_request(casas_object=end_experiment_request,
+                                       queue_name=self._server_experiment_rpc_queue,
+                                       declare_server_queue=False)
+        self._clear_experiment()
+        return
+
+
+def _topic_matches(binding_words, routing_words):
+    """Check an AMQP topic binding key against a routing key, both split on '.'.  '*' matches
+    exactly one word and '#' matches zero or more words.
+    """
+    if len(binding_words) == 0:
+        return len(routing_words) == 0
+    if binding_words[0] == '#':
+        return any(_topic_matches(binding_words[1:], routing_words[i:])
+                   for i in range(len(routing_words) + 1))
+    if len(routing_words) == 0:
+        return False
+    if binding_words[0] in ['*', routing_words[0]]:
+        return _topic_matches(binding_words[1:], routing_words[1:])
+    return False
+
+
+class LoopbackBroker(object):
+    """An in-process stand-in for RabbitMQ, used when the AMQP host is objects.AMQP_LOOPBACK_HOST.
+
+    It routes messages between the LoopbackConnection objects of one process through the default,
+    direct, fanout and topic exchanges, with competing consumers, basic_qos() prefetch, message
+    acknowledgement and exclusive/auto-delete queues.  Nothing is persisted and there is no
+    network I/O, so every component of an experiment can run in one process, for example to
+    measure the per-tick overhead of everything but the broker.
+    """
+    _brokers = dict()
+    _brokers_lock = threading.Lock()
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.queues = dict()
+        self.exchanges = dict()
+        return
+
+    @classmethod
+    def get_broker(cls, vhost='/'):
+        """Returns the broker for the virtual host, creating it the first time.
+
+        Parameters
+        ----------
+        vhost : str, optional
+            The virtual host, each one has its own queues and exchanges.
+
+        Returns
+        -------
+        LoopbackBroker
+            The broker shared by every LoopbackConnection to vhost in this process.
+        """
+        with cls._brokers_lock:
+            if vhost not in cls._brokers:
+                cls._brokers[vhost] = LoopbackBroker()
+            return cls._brokers[vhost]
+
+    def declare_queue(self, channel, queue, durable, exclusive, auto_delete):
+        if queue == '':
+            queue = 'amq.gen-{}'.format(str(uuid.uuid4().hex))
+        if queue not in self.queues:
+            self.queues[queue] = dict({'messages': list(),
+                                       'consumers': list(),
+                                       'next_consumer': 0,
+                                       'durable': durable,
+                                       'owner': channel.connection if exclusive else None,
+                                       'auto_delete': auto_delete})
+        elif self.queues[queue]['owner'] not in [None, channel.connection]:
+            raise pika.exceptions.ChannelClosedByBroker(
+                405, "RESOURCE_LOCKED - cannot obtain exclusive access to locked queue '{}'"
+                .format(queue))
+        return queue
+
+    def delete_queue(self, queue):
+        for exchange in self.exchanges.values():
+            exchange['bindings'] = [x for x in exchange['bindings'] if x[0] != queue]
+        self.queues.pop(queue, None)
+        return
+
+    def declare_exchange(self, exchange, exchange_type):
+        if exchange_type not in ['direct', 'fanout', 'topic']:
+            raise pika.exceptions.ChannelClosedByBroker(
+                503, "COMMAND_INVALID - the loopback broker does not support exchange type '{}'"
+                .format(exchange_type))
+        if exchange not in self.exchanges:
+            self.exchanges[exchange] = dict({'type': exchange_type, 'bindings': list()})
+        return
+
+    def get_queue(self, queue):
+        if queue not in self.queues:
+            raise pika.exceptions.ChannelClosedByBroker(
+                404, "NOT_FOUND - no queue '{}' in the loopback broker".format(queue))
+        return self.queues[queue]
+
+    def get_exchange(self, exchange):
+        if exchange not in self.exchanges:
+            raise pika.exceptions.ChannelClosedByBroker(
+                404, "NOT_FOUND - no exchange '{}' in the loopback broker".format(exchange))
+        return self.exchanges[exchange]
+
+    def publish(self, exchange, routing_key, properties, body):
+        """Route a message to the bound queues and deliver what the consumers can take.  Like
+        RabbitMQ, a message that matches no queue is dropped.
+        """
+        if exchange == '':
+            targets = [routing_key] if routing_key in self.queues else list()
+        else:
+            ex = self.get_exchange(exchange)
+            routing_words = routing_key.split('.')
+            targets = list()
+            for queue, binding_key in ex['bindings']:
+                if ex['type'] == 'fanout' or \
+                        (ex['type'] == 'direct' and binding_key == routing_key) or \
+                        (ex['type'] == 'topic' and _topic_matches(binding_key.split('.'),
+                                                                  routing_words)):
+                    if queue not in targets:
+                        targets.append(queue)
+        for queue in targets:
+            self.queues[queue]['messages'].append((exchange, routing_key, properties, body, False))
+            self.deliver(queue)
+        return
+
+    def requeue(self, queue, message):
+        """Put an unacknowledged message back at the head of its queue, marked as redelivered.
+        """
+        if queue in self.queues:
+            exchange, routing_key, properties, body, redelivered = message
+            self.queues[queue]['messages'].insert(0, (exchange, routing_key, properties, body,
+                                                      True))
+            self.deliver(queue)
+        return
+
+    def deliver(self, queue):
+        """Hand the messages waiting on a queue to its consumers in turn, skipping consumers
+        whose channel has reached its prefetch count of unacknowledged messages.
+        """
+        qu = self.queues.get(queue)
+        if qu is None:
+            return
+        while len(qu['messages']) > 0 and len(qu['consumers']) > 0:
+            consumer = None
+            for i in range(len(qu['consumers'])):
+                candidate = qu['consumers'][(qu['next_consumer'] + i) % len(qu['consumers'])]
+                if candidate['channel'].can_take(consumer=candidate):
+                    consumer = candidate
+                    qu['next_consumer'] = (qu['next_consumer'] + i + 1) % len(qu['consumers'])
+                    break
+            if consumer is None:
+                break
+            consumer['channel'].push_delivery(queue=queue,
+                                              consumer=consumer,
+                                              message=qu['messages'].pop(0))
+        return
+
+
+class LoopbackConnection(object):
+    """The part of pika.BlockingConnection used by Connection, on top of a LoopbackBroker.
+
+    Consumer callbacks, call_later() timers and add_callback_threadsafe() callbacks are only
+    dispatched from process_data_events() in the thread that owns the connection, and not while
+    one of them is already being dispatched, as with pika.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self._condition = threading.Condition(broker.lock)
+        self._channels = list()
+        self._deliveries = list()
+        self._callbacks = list()
+        self._timers = dict()
+        self._dispatch_depth = 0
+        self.is_open = True
+        self.is_closed = False
+        self.is_closing = False
+        return
+
+    def channel(self, channel_number=None):
+        with self.broker.lock:
+            if channel_number is None:
+                channel_number = len(self._channels) + 1
+            channel = LoopbackChannel(connection=self, channel_number=channel_number)
+            self._channels.append(channel)
+        return channel
+
+    def close(self, reply_code=200, reply_text='Normal shutdown'):
+        with self.broker.lock:
+            if not self.is_open:
+                raise pika.exceptions.ConnectionWrongStateError(
+                    'Connection is already closed.')
+            for channel in self._channels:
+                if channel.is_open:
+                    channel.close()
+            for queue in [x for x, qu in self.broker.queues.items() if qu['owner'] is self]:
+                self.broker.delete_queue(queue)
+            self.is_open = False
+            self.is_closed = True
+            self._condition.notify_all()
+        return
+
+    def push_delivery(self, delivery):
+        # Called with the broker lock held.
+        self._deliveries.append(delivery)
+        self._condition.notify_all()
+        return
+
+    def call_later(self, delay, callback):
+        with self.broker.lock:
+            timer_id = uuid.uuid4().hex
+            self._timers[timer_id] = (time.monotonic() + delay, callback)
+            self._condition.notify_all()
+        return timer_id
+
+    def remove_timeout(self, timeout_id):
+        with self.broker.lock:
+            self._timers.pop(timeout_id, None)
+        return
+
+    def add_callback_threadsafe(self, callback):
+        with self.broker.lock:
+            if not self.is_open:
+                raise pika.exceptions.ConnectionWrongStateError(
+                    'BlockingConnection.add_callback_threadsafe() called on closed or closing '
+                    'connection.')
+            self._callbacks.append(callback)
+            self._condition.notify_all()
+        return
+
+    def add_on_connection_blocked_callback(self, callback):
+        # The loopback broker never runs low on resources.
+        return
+
+    def add_on_connection_unblocked_callback(self, callback):
+        return
+
+    def _next_timer(self):
+        if len(self._timers) == 0:
+            return None
+        return min(deadline for deadline, callback in self._timers.values())
+
+    def _has_ready_events(self):
+        next_timer = self._next_timer()
+        return len(self._callbacks) > 0 or len(self._deliveries) > 0 or \
+            (next_timer is not None and next_timer <= time.monotonic())
+
+    def process_data_events(self, time_limit=0):
+        """Wait for and dispatch consumer deliveries, timers and threadsafe callbacks, see
+        pika.BlockingConnection.process_data_events().
+
+        Parameters
+        ----------
+        time_limit : float
+            Upper bound on the time to wait in seconds, zero returns as soon as possible and
+            None waits until something has been dispatched.
+        """
+        if self.is_closed:
+            raise pika.exceptions.ConnectionWrongStateError('Connection is closed.')
+        self._dispatch_depth += 1
+        try:
+            can_dispatch = self._dispatch_depth == 1
+            deadline = None
+            if time_limit is not None:
+                deadline = time.monotonic() + time_limit
+            with self._condition:
+                while self.is_open and not (can_dispatch and self._has_ready_events()):
+                    wait = None
+                    if deadline is not None:
+                        wait = deadline - time.monotonic()
+                        if wait <= 0.0:
+                            break
+                    next_timer = self._next_timer()
+                    if can_dispatch and next_timer is not None:
+                        wait = next_timer - time.monotonic() if wait is None \
+                            else min(wait, next_timer - time.monotonic())
+                    self._condition.wait(timeout=wait)
+                if not can_dispatch:
+                    return
+                now = time.monotonic()
+                callbacks = self._callbacks
+                self._callbacks = list()
+                for timer_id in sorted([x for x, timer in self._timers.items() if timer[0] <= now],
+                                       key=lambda x: self._timers[x][0]):
+                    callbacks.append(self._timers.pop(timer_id)[1])
+                deliveries = self._deliveries
+                self._deliveries = list()
+            for callback in callbacks:
+                callback()
+            for channel, consumer, method, properties, body in deliveries:
+                if consumer['active']:
+                    consumer['callback'](channel, method, properties, body)
+        finally:
+            self._dispatch_depth -= 1
+        return
+
+    def sleep(self, duration):
+        deadline = time.monotonic() + duration
+        remaining = duration
+        while remaining > 0.0:
+            self.process_data_events(time_limit=remaining)
+            remaining = deadline - time.monotonic()
+        return
+
+
+class LoopbackChannel(object):
+    """The part of pika.adapters.blocking_connection.BlockingChannel used by Connection, on top of
+    a LoopbackBroker.
+    """
+
+    def __init__(self, connection, channel_number):
+        self.connection = connection
+        self.broker = connection.broker
+        self.channel_number = channel_number
+        self.is_open = True
+        self.is_closed = False
+        self.is_closing = False
+        self._prefetch_count = 0
+        self._global_qos = False
+        self._delivery_tag = 0
+        self._unacked = dict()
+        self._consumers = dict()
+        self._on_cancel_callbacks = list()
+        return
+
+    def _check_open(self):
+        if not self.is_open:
+            raise pika.exceptions.ChannelWrongStateError('Channel is closed.')
+        return
+
+    def can_take(self, consumer):
+        # Called with the broker lock held.  Like RabbitMQ the prefetch count applies to each
+        # consumer, or to the whole channel with global_qos.
+        if consumer['auto_ack'] or self._prefetch_count == 0:
+            return True
+        if self._global_qos:
+            return len(self._unacked) < self._prefetch_count
+        return consumer['unacked'] < self._prefetch_count
+
+    def _release(self, tag):
+        # Called with the broker lock held, forgets an unacknowledged delivery.
+        queue, message, consumer = self._unacked.pop(tag)
+        consumer['unacked'] -= 1
+        return queue, message
+
+    def _deliver_all(self):
+        # Called with the broker lock held, the consumers may take more messages now.
+        for consumer in list(self._consumers.values()):
+            self.broker.deliver(consumer['queue'])
+        return
+
+    def push_delivery(self, queue, consumer, message):
+        # Called with the broker lock held.
+        exchange, routing_key, properties, body, redelivered = message
+        self._delivery_tag += 1
+        if not consumer['auto_ack']:
+            self._unacked[self._delivery_tag] = (queue, message, consumer)
+            consumer['unacked'] += 1
+        method = pika.spec.Basic.Deliver(consumer_tag=consumer['tag'],
+                                         delivery_tag=self._delivery_tag,
+                                         redelivered=redelivered,
+                                         exchange=exchange,
+                                         routing_key=routing_key)
+        self.connection.push_delivery((self, consumer, method, properties, body))
+        return
+
+    def basic_qos(self, prefetch_size=0, prefetch_count=0, global_qos=False):
+        self._check_open()
+        with self.broker.lock:
+            self._prefetch_count = prefetch_count
+            self._global_qos = global_qos
+            self._deliver_all()
+        return
+
+    def add_on_cancel_callback(self, callback):
+        self._on_cancel_callbacks.append(callback)
+        return
+
+    def exchange_declare(self, exchange, exchange_type='direct', passive=False, durable=False,
+                         auto_delete=False, internal=False, arguments=None):
+        self._check_open()
+        with self.broker.lock:
+            if passive:
+                self.broker.get_exchange(exchange)
+            else:
+                self.broker.declare_exchange(exchange=exchange, exchange_type=exchange_type)
+        return pika.frame.Method(self.channel_number, pika.spec.Exchange.DeclareOk())
+
+    def queue_declare(self, queue, passive=False, durable=False, exclusive=False,
+                      auto_delete=False, arguments=None):
+        self._check_open()
+        with self.broker.lock:
+            if passive:
+                self.broker.get_queue(queue)
+            else:
+                queue = self.broker.declare_queue(channel=self,
+                                                  queue=queue,
+                                                  durable=durable,
+                                                  exclusive=exclusive,
+                                                  auto_delete=auto_delete)
+            qu = self.broker.queues[queue]
+            return pika.frame.Method(self.channel_number,
+                                     pika.spec.Queue.DeclareOk(
+                                         queue=queue,
+                                         message_count=len(qu['messages']),
+                                         consumer_count=len(qu['consumers'])))
+
+    def queue_bind(self, queue, exchange, routing_key=None, arguments=None):
+        self._check_open()
+        if routing_key is None:
+            routing_key = queue
+        with self.broker.lock:
+            self.broker.get_queue(queue)
+            bindings = self.broker.get_exchange(exchange)['bindings']
+            if (queue, routing_key) not in bindings:
+                bindings.append((queue, routing_key))
+        return pika.frame.Method(self.channel_number, pika.spec.Queue.BindOk())
+
+    def queue_unbind(self, queue, exchange=None, routing_key=None, arguments=None):
+        self._check_open()
+        if routing_key is None:
+            routing_key = queue
+        with self.broker.lock:
+            ex = self.broker.get_exchange(exchange)
+            ex['bindings'] = [x for x in ex['bindings'] if x != (queue, routing_key)]
+        return pika.frame.Method(self.channel_number, pika.spec.Queue.UnbindOk())
+
+    def basic_consume(self, queue, on_message_callback, auto_ack=False, exclusive=False,
+                      consumer_tag=None, arguments=None):
+        self._check_open()
+        if consumer_tag is None:
+            consumer_tag = 'ctag{}.{}'.format(self.channel_number, str(uuid.uuid4().hex))
+        with self.broker.lock:
+            qu = self.broker.get_queue(queue)
+            consumer = dict({'channel': self,
+                             'tag': consumer_tag,
+                             'queue': queue,
+                             'callback': on_message_callback,
+                             'auto_ack': auto_ack,
+                             'unacked': 0,
+                             'active': True})
+            self._consumers[consumer_tag] = consumer
+            qu['consumers'].append(consumer)
+            self.broker.deliver(queue)
+        return consumer_tag
+
+    def basic_cancel(self, consumer_tag):
+        with self.broker.lock:
+            consumer = self._consumers.pop(consumer_tag, None)
+            if consumer is None:
+                return list()
+            consumer['active'] = False
+            queue = consumer['queue']
+            # Requeue what was delivered to the consumer but not dispatched yet.
+            pending = [x for x in self.connection._deliveries if x[1] is consumer]
+            self.connection._deliveries = [x for x in self.connection._deliveries
+                                           if x[1] is not consumer]
+            for channel, consumer_, method, properties, body in reversed(pending):
+                if not consumer['auto_ack']:
+                    self.broker.requeue(queue, self._release(method.delivery_tag)[1])
+            qu = self.broker.queues.get(queue)
+            if qu is not None:
+                qu['consumers'] = [x for x in qu['consumers'] if x is not consumer]
+                if qu['auto_delete'] and len(qu['consumers']) == 0:
+                    self.broker.delete_queue(queue)
+                else:
+                    self.broker.deliver(queue)
+        return list()
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self._check_open()
+        if properties is None:
+            properties = pika.BasicProperties()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        with self.broker.lock:
+            self.broker.publish(exchange=exchange,
+                                routing_key=routing_key,
+                                properties=properties,
+                                body=body)
+        return
+
+    def basic_get(self, queue, auto_ack=False):
+        self._check_open()
+        with self.broker.lock:
+            qu = self.broker.get_queue(queue)
+            if len(qu['messages']) == 0:
+                return None, None, None
+            message = qu['messages'].pop(0)
+            exchange, routing_key, properties, body, redelivered = message
+            self._delivery_tag += 1
+            if not auto_ack:
+                # basic_get() has no consumer, so it is not held to the prefetch count.
+                self._unacked[self._delivery_tag] = (queue, message, dict({'unacked': 1}))
+            method = pika.spec.Basic.GetOk(delivery_tag=self._delivery_tag,
+                                           redelivered=redelivered,
+                                           exchange=exchange,
+                                           routing_key=routing_key,
+                                           message_count=len(qu['messages']))
+        return method, properties, body
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        self._check_open()
+        with self.broker.lock:
+            tags = [delivery_tag]
+            if multiple:
+                tags = [x for x in self._unacked if delivery_tag == 0 or x <= delivery_tag]
+            for tag in tags:
+                if tag in self._unacked:
+                    self._release(tag)
+            self._deliver_all()
+        return
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        self._check_open()
+        with self.broker.lock:
+            tags = [delivery_tag]
+            if multiple:
+                tags = [x for x in self._unacked if delivery_tag == 0 or x <= delivery_tag]
+            for tag in sorted(tags, reverse=True):
+                if tag in self._unacked:
+                    queue, message = self._release(tag)
+                    if requeue:
+                        self.broker.requeue(queue, message)
+            self._deliver_all()
+        return
+
+    def start_consuming(self):
+        """Dispatch deliveries until stop_consuming() cancels the consumers, see
+        pika.adapters.blocking_connection.BlockingChannel.start_consuming().
+        """
+        if self.connection._dispatch_depth > 0:
+            raise pika.exceptions.ReentrancyError(
+                'start_consuming may not be called from the scope of another '
+                'BlockingConnection or BlockingChannel callback')
+        while len(self._consumers) > 0 and self.is_open:
+            self.connection.process_data_events(time_limit=None)
+        return
+
+    def stop_consuming(self, consumer_tag=None):
+        if consumer_tag is not None:
+            self.basic_cancel(consumer_tag=consumer_tag)
+        else:
+            for tag in list(self._consumers.keys()):
+                self.basic_cancel(consumer_tag=tag)
+        return
+
+    def close(self, reply_code=0, reply_text='Normal shutdown'):
+        if not self.is_open:
+            raise pika.exceptions.ChannelWrongStateError('Channel is closed.')
+        with self.broker.lock:
+            for tag in list(self._consumers.keys()):
+                self.basic_cancel(consumer_tag=tag)
+            for tag in sorted(self._unacked.keys(), reverse=True):
+                queue, message = self._release(tag)
+                self.broker.requeue(queue, message)
+            self.is_open = False
+            self.is_closed = True
+        return
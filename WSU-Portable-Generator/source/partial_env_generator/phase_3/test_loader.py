@@ -6,13 +6,14 @@ import zlib
 import os.path
 
 import numpy as np
-from base64 import b64encode
 import blosc
 
 from .hints import Selector
 
 
 class TestLoader:
+    # Matches objects.SHARED_FRAME_SLOT_SIZE, the largest raw frame the generator can share.
+    SHARED_FRAME_SLOT_SIZE = 4 * 1024 * 1024
 
     def __init__(self, domain: str = 'cartpole', novelty_level: int = 0, trial_novelty: int = 0,
                  seed: int = 0, difficulty: str = 'easy', day_offset: int = 0,
@@ -41,6 +42,11 @@ class TestLoader:
                 if self.ta2_generator_config['episode_seed'] is not None:
                     self.seed = self.ta2_generator_config['episode_seed']
 
+        # A TA2 on this host can take raw frames through the generator's shared frame ring.
+        self.shared_frames = False
+        if self.ta2_generator_config is not None:
+            self.shared_frames = bool(self.ta2_generator_config.get('shared_frames', False))
+
         # Determine options
         self.use_mock = False
         self.use_novel = False
@@ -278,10 +284,14 @@ class TestLoader:
                              'action_list': self.actions,
                              'action': self.env.last_label}
 
-        # Compress image if not None
-        if self.response['sensors']['image'] is not None:
-            comp_img = blosc.pack_array(self.response['sensors']['image'])
-            self.response['sensors']['image'] = b64encode(comp_img).decode('ascii')
+        # Compress image if not None, the raw bytes are sent beside the JSON when the TA1 accepts
+        # it and base64 encoded otherwise. Frames for the shared frame ring stay raw so the TA2
+        # can map them without unpacking, unless they are too large for a ring slot
+        # (objects.SHARED_FRAME_SLOT_SIZE).
+        image = self.response['sensors']['image']
+        if image is not None:
+            if not self.shared_frames or image.nbytes > self.SHARED_FRAME_SLOT_SIZE:
+                self.response['sensors']['image'] = blosc.pack_array(image)
 
         if not self.hint_sent:
             self.hint_sent = True
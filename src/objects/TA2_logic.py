@@ -20,9 +20,12 @@
 # **  Contact: Diane J. Cook (djcook@wsu.edu)                                                   ** #
 # ************************************************************************************************ #
 
+import asyncio
 import configparser
 import datetime
 import copy
+import functools
+import inspect
 import json
 import logging
 import logging.handlers
@@ -140,6 +143,14 @@ class TA2Logic(object):
         self._episode_seed = None
         self._start_zeroed_out = False
         self._start_world_state = None
+        self._use_step_rpc = True
+        self._use_async_amqp = False
+        self._async_amqp = None
+        # True while the driver runs on the event loop of run_async().
+        self._driver_async = False
+        self._use_shared_frames = False
+        self._rpc_stats_interval = None
+        self._rpc_stats_file = None
 
         self._experiment_type = self._config.get('aiq-sail-on', 'experiment_type')
         if self._experiment_type not in objects.VALID_EXPERIMENT_TYPES:
@@ -178,6 +189,16 @@ class TA2Logic(object):
             self._no_testing = self._config.getboolean('sail-on', 'no_testing')
         if self._config.has_option('sail-on', 'just_one_trial'):
             self._just_one_trial = self._config.getboolean('sail-on', 'just_one_trial')
+        if self._config.has_option('sail-on', 'step_rpc'):
+            self._use_step_rpc = self._config.getboolean('sail-on', 'step_rpc')
+        if self._config.has_option('sail-on', 'async_amqp'):
+            self._use_async_amqp = self._config.getboolean('sail-on', 'async_amqp')
+        if self._config.has_option('sail-on', 'shared_frames'):
+            self._use_shared_frames = self._config.getboolean('sail-on', 'shared_frames')
+        if self._config.has_option('sail-on', 'rpc_stats_interval'):
+            self._rpc_stats_interval = self._config.getfloat('sail-on', 'rpc_stats_interval')
+        if self._config.has_option('sail-on', 'rpc_stats_file'):
+            self._rpc_stats_file = self._config.get('sail-on', 'rpc_stats_file')
 
         # Let any command line args overwrite settings from config file if needed.
         if no_testing:
@@ -202,6 +223,8 @@ class TA2Logic(object):
                                          amqp_port=self._amqp_port,
                                          amqp_vhost=self._amqp_vhost,
                                          amqp_ssl=self._amqp_ssl)
+        self._amqp.set_rpc_stats_dump(interval=self._rpc_stats_interval,
+                                      filename=self._rpc_stats_file)
 
         self._model_filename_pat = 'model/model.TA2.{}.{}.file'.format(self._sail_on_domain, '{}')
         self._model_filename = None
@@ -319,300 +342,371 @@ class TA2Logic(object):
                        'physical_ram': physical_ram})
         return result
 
-    def _run_sail_on_trial(self):
+    @staticmethod
+    def _decompress_image(feature_vector: dict):
+        if 'image' in feature_vector:
+            if feature_vector['image'] is not None:
+                comp_image = feature_vector['image']
+                if objects.SharedFrameRing.is_frame_ref(comp_image):
+                    # A generator on this host leaves a reference into its shared frame ring,
+                    # raw frames are copied out as they are and packed ones still need unpacking.
+                    frame = objects.SharedFrameRing.read_frame(ref=comp_image)
+                    if isinstance(frame, bytes):
+                        frame = blosc.unpack_array(frame)
+                    feature_vector['image'] = frame
+                else:
+                    # Older TA1s send the compressed image base64 encoded in the JSON.
+                    if isinstance(comp_image, str):
+                        comp_image = b64decode(comp_image)
+                    feature_vector['image'] = blosc.unpack_array(comp_image)
+        return
+
+    async def _run_sail_on_trial(self, amqp):
         # We already called the trial start function with the trial number.
 
         # Reset the model to the saved state.
-        self.reset_model(filename=self._model_filename)
+        await self._call_hook(self.reset_model, in_executor=True, filename=self._model_filename)
 
         # Expect to receive TestingStart.
-        my_state = self._amqp.get_state()
-        # self.log.info(str(my_state))
+        my_state = await self._call_hook(amqp.get_state)
         if isinstance(my_state, objects.TestingStart):
             # We have receive an objects.TestingStart.
-            self.testing_start()
+            await self._call_hook(self.testing_start)
 
             # Get the next state, should be Testing Episode Start.
-            my_state = self._amqp.get_state()
-            # self.log.info(str(my_state))
+            my_state = await self._call_hook(amqp.get_state)
 
             # Iterate over episodes.
             while isinstance(my_state, objects.TestingEpisodeStart):
                 # We just received an objects.TestingEpisodeStart.
-                self.testing_episode_start(episode_number=my_state.episode_number)
+                await self._call_hook(self.testing_episode_start,
+                                      episode_number=my_state.episode_number)
+                amqp.reset_broker_declarations()
 
                 # Collect testing data until we get TestingEpisodeEnd.
+                test_data = None
                 while not isinstance(my_state, objects.TestingEpisodeEnd):
-                    # Get testing data.
-                    test_data = self._amqp.get_testing_data()
+                    # Get testing data, unless the last step already returned it.
+                    if test_data is None:
+                        test_data = await self._call_hook(amqp.get_testing_data)
 
                     # Decompress the image if there is one.
-                    if 'image' in test_data.feature_vector:
-                        if test_data.feature_vector['image'] is not None:
-                            comp_image = b64decode(test_data.feature_vector['image'])
-                            test_data.feature_vector['image'] \
-                                = blosc.unpack_array(comp_image)
+                    self._decompress_image(feature_vector=test_data.feature_vector)
 
                     # Evaluate the testing data.
-                    label_prediction = \
-                        self.testing_instance(feature_vector=test_data.feature_vector,
-                                              novelty_indicator=test_data.novelty_indicator)
+                    label_prediction = await self._call_hook(
+                        self.testing_instance,
+                        feature_vector=test_data.feature_vector,
+                        novelty_indicator=test_data.novelty_indicator)
 
                     # Send the prediction and update my_state, expecting TestingDataAck until
-                    # the training episode is over.
-                    my_state = self._amqp.send_testing_predictions(
-                        label_prediction=label_prediction,
-                        end_early=self.end_experiment_early)
+                    # the training episode is over. When TA1 supports it, the next testing data
+                    # comes back in the same round trip.
+                    if self._use_step_rpc and amqp.step_rpc_available:
+                        my_state, test_data = await self._call_hook(
+                            amqp.send_testing_step,
+                            label_prediction=label_prediction,
+                            end_early=self.end_experiment_early)
+                    else:
+                        my_state = await self._call_hook(
+                            amqp.send_testing_predictions,
+                            label_prediction=label_prediction,
+                            end_early=self.end_experiment_early)
+                        test_data = None
                     if isinstance(my_state, objects.TestingDataAck):
-                        self.testing_performance(performance=my_state.performance,
-                                                 feedback=my_state.feedback)
+                        await self._call_hook(self.testing_performance,
+                                              performance=my_state.performance,
+                                              feedback=my_state.feedback)
+
+                self.log.debug('Broker declarations during testing episode: %s',
+                               amqp.broker_declarations)
 
                 # We are done with the training episode.
                 if isinstance(my_state, objects.TestingEpisodeEnd):
                     novelty_probability, novelty_threshold, novelty, novelty_characterization = \
-                        self.testing_episode_end(performance=my_state.performance,
-                                                 feedback=my_state.feedback)
-                    my_state = self._amqp.send_testing_episode_novelty(
+                        await self._call_hook(self.testing_episode_end,
+                                              performance=my_state.performance,
+                                              feedback=my_state.feedback)
+                    my_state = await self._call_hook(
+                        amqp.send_testing_episode_novelty,
                         novelty_characterization=novelty_characterization,
                         novelty_probability=novelty_probability,
                         novelty_threshold=novelty_threshold,
                         novelty=novelty)
 
-                self.log.debug(str(my_state))
+                self.log.debug('%s', objects.LogSummary(my_state))
 
                 # Find out if we have another episode or if the trial is over.
-                my_state = self._amqp.get_state()
-                # self.log.info(str(my_state))
+                my_state = await self._call_hook(amqp.get_state)
 
         if isinstance(my_state, objects.TestingEnd):
             # We have received an objects.TestingEnd.
-            self.testing_end()
+            await self._call_hook(self.testing_end)
 
             # Next we should receive an objects.TrialEnd.
             while not isinstance(my_state, objects.TrialEnd):
-                my_state = self._amqp.get_state()
-                # self.log.info(str(my_state))
+                my_state = await self._call_hook(amqp.get_state)
 
         # We have received an objects.TrialEnd.
-        self.trial_end()
+        await self._call_hook(self.trial_end)
         return
 
-    def _run_sail_on_experiment(self):
-        my_state = self._amqp.get_state()
+    async def _run_sail_on_experiment(self, amqp):
+        my_state = await self._call_hook(amqp.get_state)
         if isinstance(my_state, objects.BenchmarkRequest):
-            # self.log.info(str(my_state))
             benchmark_data = self._get_benchmark_data()
-            my_state = self._amqp.send_benchmark_data(benchmark_data=benchmark_data)
-            # self.log.info(str(my_state))
+            my_state = await self._call_hook(amqp.send_benchmark_data,
+                                             benchmark_data=benchmark_data)
 
         # Wait until we are ready to start experiment.
         while not isinstance(my_state, objects.ExperimentStart):
-            my_state = self._amqp.get_state()
-            # self.log.info(str(my_state))
+            my_state = await self._call_hook(amqp.get_state)
 
         # We have received objects.ExperimentStart.
-        self.experiment_start()
+        await self._call_hook(self.experiment_start)
 
         # Experiment has started, now look for TrainingStart.
         while not isinstance(my_state, objects.TrainingStart):
-            my_state = self._amqp.get_state()
-            # self.log.info(str(my_state))
+            my_state = await self._call_hook(amqp.get_state)
 
         # We have received objects.TrainingStart.
-        self.training_start()
+        await self._call_hook(self.training_start)
 
-        my_state = self._amqp.get_state()
-        # self.log.info(str(my_state))
+        my_state = await self._call_hook(amqp.get_state)
 
         # Iterate over episodes.
         while isinstance(my_state, objects.TrainingEpisodeStart):
             # We have received objects.TrainingEpisodeStart.
-            self.training_episode_start(episode_number=my_state.episode_number)
+            await self._call_hook(self.training_episode_start,
+                                  episode_number=my_state.episode_number)
+            amqp.reset_broker_declarations()
 
             # Collect training data until we get TrainingEpisodeEnd
+            training_data = None
             while not isinstance(my_state, objects.TrainingEpisodeEnd):
-                # Get training data.
-                training_data = self._amqp.get_training_data()
+                # Get training data, unless the last step already returned it.
+                if training_data is None:
+                    training_data = await self._call_hook(amqp.get_training_data)
 
                 # Decompress the image if there is one.
-                if 'image' in training_data.feature_vector:
-                    if training_data.feature_vector['image'] is not None:
-                        comp_image = b64decode(training_data.feature_vector['image'])
-                        training_data.feature_vector['image'] \
-                            = blosc.unpack_array(comp_image)
+                self._decompress_image(feature_vector=training_data.feature_vector)
                 # Handle the training data.
-                label_prediction = \
-                    self.training_instance(feature_vector=training_data.feature_vector,
-                                           feature_label=training_data.feature_label)
+                label_prediction = await self._call_hook(
+                    self.training_instance,
+                    feature_vector=training_data.feature_vector,
+                    feature_label=training_data.feature_label)
 
                 # Send the prediction and update my_state, expecting TrainingDataAck until
-                # the training episode is over.
-                my_state = self._amqp.send_training_predictions(
-                    label_prediction=label_prediction,
-                    end_early=self.end_training_early)
+                # the training episode is over. When TA1 supports it, the next training data
+                # comes back in the same round trip.
+                if self._use_step_rpc and amqp.step_rpc_available:
+                    my_state, training_data = await self._call_hook(
+                        amqp.send_training_step,
+                        label_prediction=label_prediction,
+                        end_early=self.end_training_early)
+                else:
+                    my_state = await self._call_hook(
+                        amqp.send_training_predictions,
+                        label_prediction=label_prediction,
+                        end_early=self.end_training_early)
+                    training_data = None
                 if isinstance(my_state, objects.TrainingDataAck):
-                    self.training_performance(performance=my_state.performance,
-                                              feedback=my_state.feedback)
+                    await self._call_hook(self.training_performance,
+                                          performance=my_state.performance,
+                                          feedback=my_state.feedback)
+
+            self.log.debug('Broker declarations during training episode: %s',
+                           amqp.broker_declarations)
 
             if isinstance(my_state, objects.TrainingEpisodeEnd):
                 # We have received objects.TrainingEpisodeEnd.
                 novelty_probability, novelty_threshold, novelty, novelty_characterization = \
-                    self.training_episode_end(performance=my_state.performance,
-                                              feedback=my_state.feedback)
-                my_state = self._amqp.send_training_episode_novelty(
+                    await self._call_hook(self.training_episode_end,
+                                          performance=my_state.performance,
+                                          feedback=my_state.feedback)
+                my_state = await self._call_hook(
+                    amqp.send_training_episode_novelty,
                     novelty_characterization=novelty_characterization,
                     novelty_probability=novelty_probability,
                     novelty_threshold=novelty_threshold,
                     novelty=novelty)
 
-            self.log.debug(str(my_state))
+            self.log.debug('%s', objects.LogSummary(my_state))
 
             # Find out if we are going to start another episode or not.
-            my_state = self._amqp.get_state()
+            my_state = await self._call_hook(amqp.get_state)
 
         # We must have received objects.TrainingEnd.
         if isinstance(my_state, objects.TrainingEnd):
-            self.training_end()
+            await self._call_hook(self.training_end)
 
-            # Now stop the connection for training.
-            self.log.info('Stopping connection to train model if needed.')
-            self._amqp.stop()
+            if not self._driver_async:
+                # Now stop the connection for training, on an event loop the connection is
+                # kept alive while the model trains in the executor.
+                self.log.info('Stopping connection to train model if needed.')
+                amqp.stop()
 
             # Call the function to train our model
-            self.train_model()
+            await self._call_hook(self.train_model, in_executor=True)
 
             # Save the model to disk.
-            self.save_model(filename=self._model_filename)
+            await self._call_hook(self.save_model, in_executor=True,
+                                  filename=self._model_filename)
 
-            self.log.info('Starting the connection back up.')
-            self._amqp.run()
+            if not self._driver_async:
+                self.log.info('Starting the connection back up.')
+                amqp.run()
 
             # Expect to get objects.TrainingModelEnd here.
-            my_state = self._amqp.get_state()
+            my_state = await self._call_hook(amqp.get_state)
 
-        self._run_sail_on_testing()
+        await self._run_sail_on_testing(amqp=amqp)
         return
 
-    def _run_jump_to_sail_on_testing(self):
+    async def _run_jump_to_sail_on_testing(self, amqp):
         self.log.debug('_run_jump_to_sail_on_testing()')
-        my_state = self._amqp.get_state()
-        self.log.debug(str(my_state))
+        my_state = await self._call_hook(amqp.get_state)
+        self.log.debug('%s', objects.LogSummary(my_state))
         if isinstance(my_state, objects.BenchmarkRequest):
-            # self.log.info(str(my_state))
             benchmark_data = self._get_benchmark_data()
-            my_state = self._amqp.send_benchmark_data(benchmark_data=benchmark_data)
-            self.log.debug(str(my_state))
+            my_state = await self._call_hook(amqp.send_benchmark_data,
+                                             benchmark_data=benchmark_data)
+            self.log.debug('%s', objects.LogSummary(my_state))
 
         # Wait until we are ready to start experiment.
         while not isinstance(my_state, objects.ExperimentStart):
-            my_state = self._amqp.get_state()
-            self.log.info(str(my_state))
+            my_state = await self._call_hook(amqp.get_state)
+            self.log.info('%s', my_state)
 
         # We have received objects.ExperimentStart.
         # Be nice and call experiment_start() before we begin jumping into testing.
-        self.experiment_start()
+        await self._call_hook(self.experiment_start)
 
-        self._run_sail_on_testing()
+        await self._run_sail_on_testing(amqp=amqp)
         return
 
-    def _run_sail_on_testing(self):
+    async def _run_sail_on_testing(self, amqp):
         self.log.debug('_run_sail_on_testing()')
         # Based on which path we took to reach here, the current state must be
         # objects.ExperimentStart or objects.TrainingModelEnd, the next state should be either
         # objects.TrialStart or objects.ExperimentEnd.
-        my_state = self._amqp.get_state()
-        self.log.info(str(my_state))
+        my_state = await self._call_hook(amqp.get_state)
+        self.log.info('%s', my_state)
 
         # Iterate over the trials we will run.
         while isinstance(my_state, objects.TrialStart):
             # We just received an objects.TrialStart.
-            self.trial_start(trial_number=my_state.trial_number,
-                             novelty_description=my_state.novelty_description)
+            await self._call_hook(self.trial_start,
+                                  trial_number=my_state.trial_number,
+                                  novelty_description=my_state.novelty_description)
 
             # Run the trial.
-            self._run_sail_on_trial()
+            await self._run_sail_on_trial(amqp=amqp)
 
             # Check to see if we get another go at this loop or continue.
             # This will either be objects.ExperimentEnd of objects.TrialStart.
-            my_state = self._amqp.get_state()
-            self.log.info(str(my_state))
+            my_state = await self._call_hook(amqp.get_state)
+            self.log.info('%s', my_state)
 
         # Get Confirmation of ExperimentEnd.
         while not isinstance(my_state, objects.ExperimentEnd):
-            my_state = self._amqp.get_state()
-            self.log.info(str(my_state))
-        self.experiment_end()
+            my_state = await self._call_hook(amqp.get_state)
+            self.log.info('%s', my_state)
+        await self._call_hook(self.experiment_end)
+        # The frames of this experiment are copied out, let go of the generator's rings.
+        objects.SharedFrameRing.detach_all()
+
+        if not self._driver_async:
+            amqp.process_data_events(time_limit=1)
+        return
 
-        self._amqp.process_data_events(time_limit=1)
+    async def _run_sail_on_driver(self, amqp):
+        """Run the experiment through amqp, a rabbitmq.Connection when called from run() or a
+        rabbitmq.AsyncConnection when called from run_async().  The requests and the functions
+        below are called through _call_hook(), so the same code serves both.
+        """
+        await self._call_hook(amqp.run)
+
+        # Build the model.
+        model = objects.Model(model_name=self._model_name,
+                              organization=self._organization,
+                              aiq_username=self._aiq_username,
+                              aiq_secret=self._aiq_secret)
+
+        # Let the user know we are attempting to connect to an available TA1, and we will
+        # wait if one is not available yet.
+        message = ('Attempting to connect to an available TA1, if all are currently busy '
+                   'this will wait in line until one is available.')
+        if self._printout:
+            self.log.info(message)
+        else:
+            print(message)
+
+        generator_config = dict({'episode_seed': self._episode_seed,
+                                 'start_zeroed_out': self._start_zeroed_out,
+                                 'start_world_state': self._start_world_state,
+                                 objects.SHARED_FRAMES: self._use_shared_frames})
+        # Start a SAIL-ON experiment!
+        if self._experiment_secret is None or self._no_testing:
+            # Based on these variables, we need to start a new experiment.
+            my_experiment = await self._call_hook(amqp.start_sail_on_experiment,
+                                                  model=model,
+                                                  domain=self._sail_on_domain,
+                                                  no_testing=self._no_testing,
+                                                  seed=self._seed,
+                                                  description=self._description,
+                                                  generator_config=generator_config)
+            self.log.info('experiment is gathering requirements!')
+            # Store the experiment_secret locally.
+            self._experiment_secret = my_experiment.experiment_secret
+            if self._experiment_secret is not None:
+                # Now we can set the model filename.
+                self._set_model_filename()
+                # Set the experiment_secret in the config object.
+                self._config.set('sail-on', 'experiment_secret', self._experiment_secret)
+                # Write out the config with the new experiment_secret value.
+                self._write_config_file()
+
+                # Run the SAIL-ON experiment!
+                await self._run_sail_on_experiment(amqp=amqp)
+        else:
+            self._set_model_filename()
+            # Here we don't need to start a new experiment, just register to work on 1 or
+            # many trials for the given experiment.
+            my_experiment = await self._call_hook(amqp.start_work_on_experiment_trials,
+                                                  model=model,
+                                                  experiment_secret=self._experiment_secret,
+                                                  just_one_trial=self._just_one_trial,
+                                                  domain=self._sail_on_domain,
+                                                  generator_config=generator_config)
+            if isinstance(my_experiment, objects.CasasResponse):
+                if my_experiment.status == 'error':
+                    for casas_error in my_experiment.error_list:
+                        self.log.error(casas_error.message)
+                        self.log.error(str(casas_error.error_dict))
+            else:
+                # We have our response.
+                # Start working on trials until TA1 tells us the experiment is done, or at
+                # least we are done with what we requested.
+                await self._run_jump_to_sail_on_testing(amqp=amqp)
         return
 
-    def _run_sail_on(self):
+    @staticmethod
+    def _run_blocking(coroutine):
+        # With the blocking connection nothing the driver awaits ever suspends, so the coroutine
+        # runs to the end on its first step without an event loop.
         try:
-            self._amqp.run()
-
-            # Build the model.
-            model = objects.Model(model_name=self._model_name,
-                                  organization=self._organization,
-                                  aiq_username=self._aiq_username,
-                                  aiq_secret=self._aiq_secret)
-
-            # Let the user know we are attempting to connect to an available TA1, and we will
-            # wait if one is not available yet.
-            message = ('Attempting to connect to an available TA1, if all are currently busy '
-                       'this will wait in line until one is available.')
-            if self._printout:
-                self.log.info(message)
-            else:
-                print(message)
-
-            generator_config = dict({'episode_seed': self._episode_seed,
-                                     'start_zeroed_out': self._start_zeroed_out,
-                                     'start_world_state': self._start_world_state})
-            # Start a SAIL-ON experiment!
-            if self._experiment_secret is None or self._no_testing:
-                # Based on these variables, we need to start a new experiment.
-                my_experiment = self._amqp.start_sail_on_experiment(
-                    model=model,
-                    domain=self._sail_on_domain,
-                    no_testing=self._no_testing,
-                    seed=self._seed,
-                    description=self._description,
-                    generator_config=generator_config)
-                self.log.info('experiment is gathering requirements!')
-                # self.log.debug(str(my_experiment))
-                # Store the experiment_secret locally.
-                self._experiment_secret = my_experiment.experiment_secret
-                if self._experiment_secret is not None:
-                    # Now we can set the model filename.
-                    self._set_model_filename()
-                    # Set the experiment_secret in the config object.
-                    self._config.set('sail-on', 'experiment_secret', self._experiment_secret)
-                    # Write out the config with the new experiment_secret value.
-                    self._write_config_file()
-
-                    # Run the SAIL-ON experiment!
-                    self._run_sail_on_experiment()
-            else:
-                self._set_model_filename()
-                # Here we don't need to start a new experiment, just register to work on 1 or
-                # many trials for the given experiment.
-                my_experiment = self._amqp.start_work_on_experiment_trials(
-                    model=model,
-                    experiment_secret=self._experiment_secret,
-                    just_one_trial=self._just_one_trial,
-                    domain=self._sail_on_domain,
-                    generator_config=generator_config)
-                if isinstance(my_experiment, objects.CasasResponse):
-                    if my_experiment.status == 'error':
-                        for casas_error in my_experiment.error_list:
-                            self.log.error(casas_error.message)
-                            self.log.error(str(casas_error.error_dict))
-                else:
-                    # We have our response.
-                    # Start working on trials until TA1 tells us the experiment is done, or at
-                    # least we are done with what we requested.
-                    self._run_jump_to_sail_on_testing()
+            coroutine.send(None)
+        except StopIteration as e:
+            return e.value
+        coroutine.close()
+        raise objects.AiqExperimentException('A TA2 function waited on the event loop, set '
+                                             'async_amqp = True to use coroutines.')
 
+    def _run_sail_on(self):
+        self._driver_async = False
+        try:
+            self._run_blocking(self._run_sail_on_driver(amqp=self._amqp))
         except KeyboardInterrupt:
             self._stop()
         except objects.AiqExperimentException as e:
@@ -622,9 +716,56 @@ class TA2Logic(object):
         return
 
     def run(self):
-        self._run_sail_on()
+        if self._use_async_amqp:
+            asyncio.get_event_loop().run_until_complete(self.run_async())
+        else:
+            self._run_sail_on()
         return
 
+    async def run_async(self):
+        """Run the experiment on an asyncio event loop through rabbitmq.AsyncConnection, instead
+        of the blocking rabbitmq.Connection used by run(). Several agents can be run on one loop
+        with asyncio.gather(). Any of the functions below may be defined as coroutines.
+        """
+        self._async_amqp = rabbitmq.AsyncConnection(agent_name=self._agent_name,
+                                                    amqp_user=self._amqp_user,
+                                                    amqp_pass=self._amqp_pass,
+                                                    amqp_host=self._amqp_host,
+                                                    amqp_port=self._amqp_port,
+                                                    amqp_vhost=self._amqp_vhost,
+                                                    amqp_ssl=self._amqp_ssl)
+        self._async_amqp.set_rpc_stats_dump(interval=self._rpc_stats_interval,
+                                            filename=self._rpc_stats_file)
+        self._driver_async = True
+        try:
+            await self._run_sail_on_driver(amqp=self._async_amqp)
+        except objects.AiqExperimentException as e:
+            self.log.error(e.value)
+        finally:
+            await self._async_amqp.stop()
+        return
+
+    async def _call_hook(self, function, in_executor=False, **kwargs):
+        """Call one of the functions a TA2 defines, or a request of the connection, awaiting it
+        if it is a coroutine.
+
+        Parameters
+        ----------
+        function : callable
+            The bound function to call with kwargs.
+        in_executor : bool, optional
+            On the event loop of run_async(), run a plain function in the default executor so
+            long work (training, saving and loading the model) does not stall the loop.
+        """
+        if in_executor and self._driver_async and not asyncio.iscoroutinefunction(function):
+            result = await asyncio.get_event_loop().run_in_executor(
+                None, functools.partial(function, **kwargs))
+        else:
+            result = function(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+
     def _stop(self):
         self._amqp.stop()
         return